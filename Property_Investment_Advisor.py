@@ -1,42 +1,32 @@
 import math
+import os
+import sys
 
 import streamlit as st
-import joblib
-from pathlib import Path
+
+PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 # -------------------------------------------------------
 # Load models safely for Streamlit Cloud
+# (lazily: only on the first evaluation, not at page load)
 # -------------------------------------------------------
 @st.cache_resource
-def load_models():
-    root = Path(__file__).parent
-    clf = joblib.load(root / "models" / "classifier_pipeline.pkl")
-    reg = joblib.load(root / "models" / "regression_pipeline.pkl")
-    return clf, reg
-
-clf_model, reg_model = load_models()
-
+def start_model_watcher():
+    # One per server process: hot-swaps newly promoted model versions
+    from src.models.predict import start_model_watcher
 
-# -------------------------------------------------------
-# Prediction helper function
-# -------------------------------------------------------
-def predict_property_investment(model_clf, model_reg, features):
-    """features = dict of input values"""
-    
-    import pandas as pd
-    
-    df = pd.DataFrame([features])
+    return start_model_watcher()
 
-    proba = model_clf.predict_proba(df)[0, 1]
-    label = int(proba > 0.5)
 
-    price_pred = model_reg.predict(df)[0]
+@st.cache_resource
+def load_comparables():
+    # Memory-mapped neighbour index over the listings (src/app/comparables.py),
+    # built on first use and rebuilt when the dataset changes
+    from src.app.comparables import load_comparables_index
 
-    return {
-        "good_investment_label": label,
-        "good_investment_prob": float(proba),
-        "predicted_price_lakhs": float(price_pred)
-    }
+    return load_comparables_index()
 
 
 # --------------------------------------------------
@@ -136,11 +126,22 @@ def main():
             "Future_Price_5Y": future_price_5y,
         }
 
+        from src.models.metrics import get_metrics, log_request
+
         try:
-            result = predict_property_investment(clf_model, reg_model, features)
+            from src.models.predict import predict_property_investment
+
+            # Timed per stage; one JSON line per evaluation, logged on the
+            # src.models.metrics logger
+            # (the shared predictor's cache / encode / classifier / regressor
+            # stages are recorded under this request)
+            with get_metrics().request("streamlit") as request:
+                start_model_watcher()
+                result = predict_property_investment(features)
         except Exception as e:
             st.error(f"Prediction failed: {e}")
             return
+        log_request(request)
 
         good_label = result["good_investment_label"]
         good_prob = result["good_investment_prob"]
@@ -181,6 +182,38 @@ def main():
         else:
             st.info("Model fair price is roughly equal to the asking price.")
 
+        # Nearest listings of the same city / type / BHK
+        st.markdown("### 🏘️ Comparable Listings")
+        try:
+            comparables = load_comparables().query(
+                city, property_type, bhk, size_sqft, age, calc_price_per_sqft
+            )
+        except Exception as e:
+            st.warning(f"Comparable listings unavailable: {e}")
+        else:
+            if comparables.empty:
+                st.info(f"No listings found for a {bhk} BHK {property_type} in {city}.")
+            else:
+                st.dataframe(comparables, hide_index=True, use_container_width=True)
+
+        # What-if: every growth x horizon x asking-price scenario, scored in one batch
+        st.markdown("### 🔭 What-if Scenarios")
+        try:
+            from src.app.charting import scenario_figure
+            from src.models.scenarios import scenario_grid
+
+            grid = scenario_grid(features, price_lakhs=price_lakhs)
+        except Exception as e:
+            st.warning(f"Scenario sweep unavailable: {e}")
+        else:
+            tab_prob, tab_gap = st.tabs(["Probability of good investment", "Valuation gap"])
+            with tab_prob:
+                st.plotly_chart(scenario_figure(grid, "good_prob", price_lakhs),
+                                use_container_width=True)
+            with tab_gap:
+                st.plotly_chart(scenario_figure(grid, "valuation_gap", price_lakhs),
+                                use_container_width=True)
+
         # Show debug details
         with st.expander("Show model input features (debug)"):
             st.write(features)
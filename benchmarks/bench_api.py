@@ -0,0 +1,75 @@
+"""
+Local load generator for the ASGI inference service (no network, no server).
+
+Fires concurrent single-property /predict requests through an in-process
+httpx transport and reports p50/p99 latency and throughput, once with
+micro-batching and once with it effectively disabled (batch size 1).
+
+Usage:
+    python benchmarks/bench_api.py --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import httpx  # noqa: E402
+import numpy as np  # noqa: E402
+
+from src.app.api import create_app  # noqa: E402
+from src.data.synthetic import make_listings  # noqa: E402
+from src.models.predict import ALL_FEATURES, get_prediction_cache  # noqa: E402
+
+
+async def _run_load(app, records, concurrency: int):
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def one(rec):
+                async with sem:
+                    t0 = time.perf_counter()
+                    resp = await client.post("/predict", json=rec)
+                    latencies.append(time.perf_counter() - t0)
+                    resp.raise_for_status()
+
+            await one(records[0])  # warm-up: loads both pipelines
+            latencies.clear()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(r) for r in records))
+            wall = time.perf_counter() - start
+
+    return np.array(latencies) * 1000.0, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    df = make_listings(args.requests)[ALL_FEATURES].astype({"BHK": str})
+    records = df.to_dict("records")
+
+    for label, batch_size in (("micro-batched", args.max_batch_size), ("unbatched", 1)):
+        get_prediction_cache().clear()  # measure scoring, not cache hits
+        app = create_app(max_batch_size=batch_size, max_wait_ms=args.max_wait_ms)
+        lat_ms, wall = asyncio.run(_run_load(app, records, args.concurrency))
+        print(f"{label:<14s}: p50 {np.percentile(lat_ms, 50):7.2f} ms | "
+              f"p99 {np.percentile(lat_ms, 99):7.2f} ms | "
+              f"{len(records) / wall:9,.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
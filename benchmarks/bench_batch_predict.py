@@ -0,0 +1,57 @@
+"""
+Rows/sec of the per-row loop vs. predict_properties_batch.
+
+Usage:
+    python benchmarks/bench_batch_predict.py --rows 20000 --loop-rows 500
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.models.predict import (  # noqa: E402
+    ALL_FEATURES,
+    predict_properties_batch,
+    predict_property_investment,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--loop-rows", type=int, default=500,
+                        help="Rows to time through the per-row loop (it is slow).")
+    args = parser.parse_args()
+
+    df = make_listings(args.rows)[ALL_FEATURES]
+    records = df.head(args.loop_rows).to_dict("records")
+
+    # Warm up: load both pipelines outside the timed region
+    predict_property_investment(records[0])
+
+    start = time.perf_counter()
+    loop_out = [predict_property_investment(r, use_cache=False) for r in records]
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_out = predict_properties_batch(df)
+    batch_s = time.perf_counter() - start
+
+    # Sanity: batch results match the per-row loop
+    head = batch_out.head(len(loop_out))
+    assert np.allclose(head["good_investment_prob"], [o["good_investment_prob"] for o in loop_out])
+    assert np.allclose(head["predicted_price_lakhs"], [o["predicted_price_lakhs"] for o in loop_out])
+
+    print(f"per-row loop : {len(records):>9,d} rows in {loop_s:8.3f}s -> {len(records) / loop_s:12,.0f} rows/s")
+    print(f"batch        : {len(df):>9,d} rows in {batch_s:8.3f}s -> {len(df) / batch_s:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Chart payload size and server-side render time: raw rows handed to Plotly
+vs. NumPy pre-binning (histograms) and LTTB / reservoir downsampling
+(scatter). "Render" is figure construction + JSON serialisation, i.e. what
+Streamlit does before anything reaches the browser; the browser-side draw
+time scales with the payload size reported alongside.
+
+Usage:
+    python benchmarks/bench_chart_payload.py --rows 250000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import plotly.express as px  # noqa: E402
+
+from src.app.charting import DEFAULT_MAX_POINTS, downsample, hist_figure, histogram  # noqa: E402
+from src.data.synthetic import make_listings  # noqa: E402
+
+
+def _render(make_fig):
+    """(seconds, payload bytes) for building a figure and serialising it."""
+    start = time.perf_counter()
+    payload = make_fig().to_json()
+    return time.perf_counter() - start, len(payload.encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[250000, 1000000])
+    parser.add_argument("--max-points", type=int, default=DEFAULT_MAX_POINTS)
+    args = parser.parse_args()
+
+    _render(lambda: px.bar(x=[0, 1], y=[1, 2]))  # warm up plotly
+
+    print(f"{'rows':>10s} {'chart':<28s} {'render ms':>10s} {'payload KB':>11s}")
+    for n_rows in args.rows:
+        df = make_listings(n_rows)
+        cases = {
+            "histogram (raw rows)": lambda: px.histogram(df, x="Price_in_Lakhs", nbins=50),
+            "histogram (pre-binned)": lambda: hist_figure(
+                histogram(df["Price_in_Lakhs"].to_numpy(), bins=50), "Price_in_Lakhs"
+            ),
+            "scatter (raw rows)": lambda: px.scatter(df, x="Size_in_SqFt", y="Price_in_Lakhs"),
+            "scatter (LTTB)": lambda: px.scatter(
+                downsample(df, "Size_in_SqFt", "Price_in_Lakhs", args.max_points, "lttb"),
+                x="Size_in_SqFt", y="Price_in_Lakhs",
+            ),
+            "scatter (reservoir)": lambda: px.scatter(
+                downsample(df, "Size_in_SqFt", "Price_in_Lakhs", args.max_points, "reservoir"),
+                x="Size_in_SqFt", y="Price_in_Lakhs",
+            ),
+        }
+        for name, make_fig in cases.items():
+            seconds, size = _render(make_fig)
+            print(f"{n_rows:>10,d} {name:<28s} {seconds * 1000:>10.1f} {size / 1024:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
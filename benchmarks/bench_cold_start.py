@@ -0,0 +1,73 @@
+"""
+Cold-start time: unpickling the sklearn pipelines vs. loading the native
+XGBoost + JSON sidecar exports vs. loading the NumPy tree tables (no
+xgboost import). Each measurement is a fresh interpreter that loads both
+models and scores one property.
+
+Usage:
+    python benchmarks/bench_cold_start.py --repeats 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+SAMPLE = (
+    "{'City': 'Hyderabad', 'Locality': 'Locality_1', 'Property_Type': 'Apartment', "
+    "'BHK': '3', 'Size_in_SqFt': 1500, 'Age_of_Property': 10, 'Nearby_Schools': 5, "
+    "'Nearby_Hospitals': 3, 'calc_price_per_sqft': 12000, 'Annual_Growth_Rate': 0.09, "
+    "'Future_Price_5Y': 400.0}"
+)
+
+SCRIPTS = {
+    "pickle (joblib)": f"""
+import joblib, pandas as pd
+from src.features.build_features import build_features
+from src.models.predict import ALL_FEATURES
+clf = joblib.load('models/classifier_pipeline.pkl')
+reg = joblib.load('models/regression_pipeline.pkl')
+X = build_features(pd.DataFrame([{SAMPLE}]))[ALL_FEATURES]
+clf.predict_proba(X); reg.predict(X)
+""",
+    "native (ubj+json)": f"""
+from src.models.fast_path import CompiledPipeline
+clf = CompiledPipeline.load('models', 'classifier')
+reg = CompiledPipeline.load('models', 'regression')
+clf.predict_raw([{SAMPLE}]); reg.predict_raw([{SAMPLE}])
+""",
+    "numpy (tree tables)": f"""
+from src.models.fast_path import CompiledPipeline
+clf = CompiledPipeline.load('models', 'classifier', backend='numpy')
+reg = CompiledPipeline.load('models', 'regression', backend='numpy')
+clf.predict_raw([{SAMPLE}]); reg.predict_raw([{SAMPLE}])
+""",
+}
+
+
+def _time_once(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        cwd=PROJECT_ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, code in SCRIPTS.items():
+        _time_once(code)  # warm the OS page cache
+        times = [_time_once(code) for _ in range(args.repeats)]
+        print(f"{label:<20s}: median {statistics.median(times):6.2f}s "
+              f"(min {min(times):.2f}s, max {max(times):.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
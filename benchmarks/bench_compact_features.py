@@ -0,0 +1,77 @@
+"""
+Memory and throughput of build_features: default (copy + str columns) vs.
+compact (in place, categorical + downcast dtypes), plus a prediction parity
+check between the two paths.
+
+Usage:
+    python benchmarks/bench_compact_features.py --rows 250000 1000000 5000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import pandas as pd  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models.predict import (  # noqa: E402
+    ALL_FEATURES,
+    _load_category_vocabulary,
+    predict_properties_batch,
+)
+
+
+def _run(df: pd.DataFrame, compact: bool, vocab):
+    if compact:
+        return build_features(df, compact=True, vocabulary=vocab)
+    return build_features(df)
+
+
+def _measure(df: pd.DataFrame, compact: bool, vocab):
+    """(seconds, peak traced MB, resulting frame MB); input copied outside timing."""
+    work = df.copy()
+    start = time.perf_counter()
+    out = _run(work, compact, vocab)
+    seconds = time.perf_counter() - start
+    frame_mb = out.memory_usage(deep=True).sum() / 2**20
+    del work, out
+
+    work = df.copy()
+    tracemalloc.start()
+    out = _run(work, compact, vocab)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del work, out
+    return seconds, peak / 2**20, frame_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[250000, 1000000, 5000000])
+    parser.add_argument("--parity-rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    vocab = _load_category_vocabulary()
+
+    sample = make_listings(args.parity_rows)[ALL_FEATURES]
+    if not predict_properties_batch(sample).equals(predict_properties_batch(sample, compact=True)):
+        raise SystemExit("Compact predictions differ from the default path!")
+    print(f"parity: identical predictions on {args.parity_rows:,d} rows\n")
+
+    for n in args.rows:
+        df = make_listings(n)[ALL_FEATURES]
+        for label, compact in (("default", False), ("compact", True)):
+            seconds, peak_mb, frame_mb = _measure(df, compact, vocab)
+            print(f"{n:>10,d} rows | {label:<8s}| {n / seconds:12,.0f} rows/s | "
+                  f"peak alloc {peak_mb:9.1f} MB | frame {frame_mb:9.1f} MB")
+        del df
+
+
+if __name__ == "__main__":
+    main()
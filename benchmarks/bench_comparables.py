@@ -0,0 +1,85 @@
+"""
+Comparable-listings lookup: brute-force scan of every listing per request
+(filter City / Property_Type / BHK, then rank by scaled distance) vs. the
+segment-partitioned ComparablesIndex. Also times building, saving and
+memory-mapping the index, and checks both return the same listings.
+
+Usage:
+    python benchmarks/bench_comparables.py --rows 250000 5000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.app.comparables import DEFAULT_K, DISTANCE_COLUMNS, INDEX_COLUMNS, ComparablesIndex  # noqa: E402
+from src.data.synthetic import make_listings  # noqa: E402
+
+
+def brute_force(df: pd.DataFrame, mean, scale, query, k=DEFAULT_K) -> np.ndarray:
+    """IDs of the k nearest listings, scanning the whole frame."""
+    city, property_type, bhk, size_sqft, age, price_per_sqft = query
+    m = df[(df["City"] == city) & (df["Property_Type"] == property_type) & (df["BHK"] == bhk)]
+    z = (m[DISTANCE_COLUMNS].to_numpy(dtype=np.float64) - mean) / scale
+    q = (np.array([size_sqft, age, price_per_sqft]) - mean) / scale
+    d = np.sqrt(((z - q) ** 2).sum(axis=1))
+    return m.assign(distance=d).nsmallest(k, "distance")["ID"].to_numpy()
+
+
+def _queries(df: pd.DataFrame, n: int, seed: int = 0):
+    rows = df.sample(n, random_state=seed)
+    rng = np.random.default_rng(seed)
+    return [
+        (r.City, r.Property_Type, r.BHK, r.Size_in_SqFt * rng.uniform(0.8, 1.2),
+         r.Age_of_Property, r.calc_price_per_sqft * rng.uniform(0.8, 1.2))
+        for r in rows.itertuples()
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[250_000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10s} {'build s':>8s} {'mmap ms':>8s} {'scan ms':>9s} {'index ms':>9s} {'speed-up':>9s}  same")
+    for n_rows in args.rows:
+        df = make_listings(n_rows)[INDEX_COLUMNS]
+        df["BHK"] = df["BHK"].astype(str)
+        queries = _queries(df, args.queries)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "comparables")
+            start = time.perf_counter()
+            ComparablesIndex.build(df).save(path)
+            build_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            index, _ = ComparablesIndex.load(path)
+            mmap_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            results = [index.query(*q)["ID"].to_numpy() for q in queries]
+            index_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+            scan_queries = queries[: max(10, len(queries) // 10)]
+            start = time.perf_counter()
+            expected = [brute_force(df, index.mean, index.scale, q) for q in scan_queries]
+            scan_ms = (time.perf_counter() - start) / len(scan_queries) * 1000
+
+            same = all(np.array_equal(a, b) for a, b in zip(results, expected))
+            del index
+        print(f"{n_rows:>10,d} {build_s:>8.2f} {mmap_ms:>8.2f} {scan_ms:>9.2f} {index_ms:>9.3f} "
+              f"{scan_ms / index_ms:>8.0f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Load time and resident memory: pd.read_csv vs. the memory-mapped Arrow cache.
+
+Each mode runs in a fresh interpreter (pandas + pyarrow pre-imported so only
+the load itself is measured). Uses the real processed CSV if present,
+otherwise a synthetic one of --rows rows.
+
+Usage:
+    python benchmarks/bench_data_load.py --rows 250000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.data.load_data import DATA_PATH, build_cache  # noqa: E402
+
+DASHBOARD_COLUMNS = [
+    "City", "Locality", "Property_Type", "BHK", "Price_in_Lakhs",
+    "Size_in_SqFt", "Age_of_Property", "calc_price_per_sqft", "Good_Investment",
+]
+
+_PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+import pandas as pd, pyarrow
+from src.data.load_data import load_dataset
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+
+before = rss_mb()
+t0 = time.perf_counter()
+{load}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "rss_mb": rss_mb() - before,
+                  "frame_mb": df.memory_usage(deep=True).sum() / 2**20, "rows": len(df)}}))
+"""
+
+MODES = {
+    "read_csv (all columns)": "df = pd.read_csv({csv!r})",
+    "arrow cache (all columns)": "df = load_dataset(csv_path={csv!r}, cache_dir={cache!r})",
+    "arrow cache (dashboard cols)": "df = load_dataset({cols!r}, csv_path={csv!r}, cache_dir={cache!r})",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=250000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = DATA_PATH
+        if not os.path.exists(csv_path):
+            from src.data.synthetic import make_listings
+
+            csv_path = os.path.join(tmp, "listings.csv")
+            make_listings(args.rows).to_csv(csv_path, index=False)
+        cache_dir = os.path.join(tmp, "cache")
+        build_cache(csv_path, cache_dir)  # conversion cost is paid once, not measured
+
+        for label, load in MODES.items():
+            code = _PROBE.format(
+                root=PROJECT_ROOT,
+                load=load.format(csv=csv_path, cache=cache_dir, cols=DASHBOARD_COLUMNS),
+            )
+            out = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                                 text=True, check=True).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(f"{label:<30s}: {r['seconds']:6.3f}s | +{r['rss_mb']:7.1f} MB RSS | "
+                  f"frame {r['frame_mb']:7.1f} MB | {r['rows']:,d} rows")
+
+
+if __name__ == "__main__":
+    main()
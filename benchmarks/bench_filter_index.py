@@ -0,0 +1,100 @@
+"""
+Filter latency for the dashboard's sidebar filters: chained pandas boolean
+filters (one intermediate frame per step) vs. FilterIndex.select (bitmap AND
++ searchsorted, rows materialised once). Results are checked for equality.
+
+Usage:
+    python benchmarks/bench_filter_index.py --rows 250000 5000000
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.app.filter_index import EQUALITY_COLUMNS, RANGE_COLUMNS, FilterIndex  # noqa: E402
+from src.data.synthetic import make_listings  # noqa: E402
+
+FULL = (-np.inf, np.inf)
+
+# name -> (equality filters, range filters)
+FILTER_STATES = {
+    "city": ({"City": "Pune"}, {}),
+    "city+type+bhk": ({"City": "Pune", "Property_Type": "Villa", "BHK": "3"}, {}),
+    "narrow price": ({}, {"Price_in_Lakhs": (100.0, 105.0)}),
+    "city+3 ranges": (
+        {"City": "Mumbai"},
+        {"Price_in_Lakhs": (50.0, 250.0), "Size_in_SqFt": (1000, 3000), "Age_of_Property": (5, 20)},
+    ),
+    "all filters": (
+        {"City": "Mumbai", "Property_Type": "Apartment", "BHK": "2", "Good_Investment": 1},
+        {"Price_in_Lakhs": (50.0, 250.0), "Size_in_SqFt": (1000, 3000), "Age_of_Property": (5, 20)},
+    ),
+}
+
+
+def chained(df: pd.DataFrame, equals, ranges) -> pd.DataFrame:
+    """The page's previous approach: one full-column scan + frame per filter."""
+    df_f = df.copy()
+    for col, value in equals.items():
+        df_f = df_f[df_f[col] == value]
+    for col in RANGE_COLUMNS:
+        df_f = df_f[df_f[col].between(*ranges.get(col, FULL))]
+    return df_f
+
+
+def indexed(df: pd.DataFrame, index: FilterIndex, equals, ranges) -> pd.DataFrame:
+    return index.take(df, index.select(equals, {c: ranges.get(c, FULL) for c in RANGE_COLUMNS}))
+
+
+def _best_ms(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[250000, 5000000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        df = make_listings(n_rows)
+        df["BHK"] = df["BHK"].astype(str)
+        for col in ("City", "Locality", "Property_Type", "BHK"):
+            df[col] = df[col].astype("category")
+
+        start = time.perf_counter()
+        index = FilterIndex.build(df[EQUALITY_COLUMNS + RANGE_COLUMNS])
+        build_s = time.perf_counter() - start
+        index_mb = sum(
+            a.nbytes for group in (index.bitmaps, index.order, index.values) for a in group.values()
+        ) / 2**20
+
+        print(f"\n{n_rows:,} rows  (index build {build_s:.2f} s, {index_mb:.0f} MB)")
+        print(f"{'filter':<16s} {'matches':>9s} {'chained ms':>11s} {'indexed ms':>11s} {'speedup':>8s}")
+        for name, (equals, ranges) in FILTER_STATES.items():
+            expected = chained(df, equals, ranges)
+            got = indexed(df, index, equals, ranges)
+            assert expected.index.equals(got.index), name
+
+            chained_ms = _best_ms(lambda: chained(df, equals, ranges), args.repeats)
+            indexed_ms = _best_ms(lambda: indexed(df, index, equals, ranges), args.repeats)
+            print(
+                f"{name:<16s} {len(got):>9,d} {chained_ms:>11.1f} {indexed_ms:>11.2f} "
+                f"{chained_ms / indexed_ms:>7.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
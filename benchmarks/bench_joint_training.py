@@ -0,0 +1,92 @@
+"""
+Wall-clock of training both models: the two per-task scripts' path (each
+builds features, fits its own preprocessor and its model) vs. the joint
+driver (features + preprocessor once, one shared sparse matrix, both heads
+concurrently when there are >= 2 cores). Nothing is written to models/.
+
+Usage:
+    python benchmarks/bench_joint_training.py            # real dataset
+    python benchmarks/bench_joint_training.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.data.load_data import load_dataset  # noqa: E402
+from src.data.synthetic import make_listings  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models import train_joint  # noqa: E402
+from src.models.train_joint import (  # noqa: E402
+    CAT_FEATURES,
+    CLASSIFICATION_TARGET,
+    CLASSIFIER_PARAMS,
+    NUM_FEATURES,
+    REGRESSION_TARGET,
+    REGRESSOR_PARAMS,
+)
+
+COLUMNS = NUM_FEATURES + CAT_FEATURES + [CLASSIFICATION_TARGET, REGRESSION_TARGET]
+
+
+def fit_separately(df):
+    """What running train_classification.py then train_regression.py does."""
+    from sklearn.model_selection import train_test_split
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBClassifier, XGBRegressor
+
+    from src.models.preprocessing import get_preprocessing_pipeline
+
+    for target, model in (
+        (CLASSIFICATION_TARGET, XGBClassifier(**CLASSIFIER_PARAMS, n_jobs=-1)),
+        (REGRESSION_TARGET, XGBRegressor(**REGRESSOR_PARAMS, n_jobs=-1)),
+    ):
+        frame = build_features(df)
+        X, y = frame[NUM_FEATURES + CAT_FEATURES], frame[target]
+        stratify = y if target == CLASSIFICATION_TARGET else None
+        X_train, _, y_train, _ = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=stratify
+        )
+        pipeline = Pipeline(steps=[
+            ("preprocessor", get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES)),
+            ("model", model),
+        ])
+        pipeline.fit(X_train, y_train)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=None,
+                        help="Synthetic rows instead of the processed dataset.")
+    args = parser.parse_args()
+
+    df = make_listings(args.rows)[COLUMNS] if args.rows else load_dataset(COLUMNS)
+    print(f"{len(df):,} rows, {os.cpu_count()} cores")
+
+    start = time.perf_counter()
+    fit_separately(df)
+    separate = time.perf_counter() - start
+    # Each script also loads the data itself
+    start = time.perf_counter()
+    if not args.rows:
+        load_dataset(COLUMNS)
+    separate += 2 * (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    if not args.rows:
+        df = load_dataset(COLUMNS)
+    _, _, _, timings = train_joint.fit_joint(df)
+    joint = time.perf_counter() - start
+
+    print(f"separate scripts : {separate:7.2f} s")
+    print(f"joint driver     : {joint:7.2f} s  "
+          f"({', '.join(f'{k} {v:.2f}' for k, v in timings.items())})")
+    print(f"saved            : {separate - joint:7.2f} s ({separate / joint:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Per-interaction latency of the Market Insights dashboard: the previous
+row-level path (copy + boolean filters + groupbys over the filtered frame)
+vs. one query against the pre-aggregated MarketCube (with the FilterIndex
+supplying the listings in bins a range slider cuts through). Also times the
+one-off cube build and checks that both paths report the same KPIs.
+
+Usage:
+    python benchmarks/bench_market_cube.py --rows 250000 1000000 5000000
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.app.filter_index import FilterIndex  # noqa: E402
+from src.app.market_cube import CUBE_COLUMNS, MarketCube  # noqa: E402
+from src.data.synthetic import make_listings  # noqa: E402
+
+# (city, property_type, bhk, good_only, slider ranges) filter states a user
+# clicks through; ranges not listed are at their full extent
+FILTER_STATES = [
+    ("All", "All", "All", False, {}),
+    ("Pune", "All", "All", False, {}),
+    ("Pune", "Villa", "All", False, {}),
+    ("Pune", "Villa", "3", True, {}),
+    ("All", "Apartment", "2", False, {}),
+    ("All", "All", "All", False, {"Price_in_Lakhs": (55.55, 320.25)}),
+    ("Pune", "All", "All", False,
+     {"Price_in_Lakhs": (55.55, 320.25), "Size_in_SqFt": (1200, 3100), "Age_of_Property": (5, 20)}),
+]
+
+
+def row_level(df: pd.DataFrame, city, ptype, bhk, good_only, ranges):
+    """What the page used to do on every rerun."""
+    df_f = df.copy()
+    if city != "All":
+        df_f = df_f[df_f["City"] == city]
+    if ptype != "All":
+        df_f = df_f[df_f["Property_Type"] == ptype]
+    if bhk != "All":
+        df_f = df_f[df_f["BHK"] == bhk]
+    for col in ("Price_in_Lakhs", "Size_in_SqFt", "Age_of_Property"):
+        df_f = df_f[df_f[col].between(*ranges.get(col, (df[col].min(), df[col].max())))]
+    if good_only:
+        df_f = df_f[df_f["Good_Investment"] == 1]
+
+    kpis = (
+        len(df_f),
+        float(df_f["Price_in_Lakhs"].mean()) if len(df_f) else 0.0,
+        float(df_f["Good_Investment"].mean()) if len(df_f) else 0.0,
+    )
+    df_f.groupby("City", observed=True)["calc_price_per_sqft"].mean()
+    df_f["Property_Type"].value_counts()
+    df_f.groupby("Property_Type", observed=True)["Good_Investment"].mean()
+    df_f.groupby("City", observed=True)["Good_Investment"].mean()
+    np.histogram(df_f["Price_in_Lakhs"], bins=50)
+    np.histogram(df_f["Age_of_Property"], bins=30)
+    return kpis
+
+
+def cube_level(cube: MarketCube, index: FilterIndex, df, city, ptype, bhk, good_only, ranges):
+    res = cube.query(
+        city=city,
+        property_type=ptype,
+        bhk=bhk,
+        price_range=ranges.get("Price_in_Lakhs"),
+        size_range=ranges.get("Size_in_SqFt"),
+        age_range=ranges.get("Age_of_Property"),
+        good_only=good_only,
+        index=index,
+        rows=df,
+    )
+    return res.listings, res.avg_price_lakhs, res.good_rate
+
+
+def _best_ms(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[250000, 1000000, 5000000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10s} {'build s':>8s} {'row-level ms':>13s} {'cube ms':>8s} {'speedup':>8s}")
+    for n_rows in args.rows:
+        df = make_listings(n_rows)[CUBE_COLUMNS]
+        for col in ("City", "Property_Type", "BHK"):
+            df[col] = df[col].astype(str).astype("category")
+
+        start = time.perf_counter()
+        cube = MarketCube.build(df)
+        build_s = time.perf_counter() - start
+        index = FilterIndex.build(df)
+
+        row_ms, cube_ms = [], []
+        for state in FILTER_STATES:
+            expected = row_level(df, *state)
+            got = cube_level(cube, index, df, *state)
+            assert expected[0] == got[0], (state, expected, got)
+            assert np.allclose(expected[1:], got[1:]), (state, expected, got)
+            row_ms.append(_best_ms(lambda: row_level(df, *state), args.repeats))
+            cube_ms.append(_best_ms(lambda: cube_level(cube, index, df, *state), args.repeats))
+
+        row_avg, cube_avg = np.mean(row_ms), np.mean(cube_ms)
+        print(
+            f"{n_rows:>10,d} {build_s:>8.2f} {row_avg:>13.1f} {cube_avg:>8.1f} "
+            f"{row_avg / cube_avg:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
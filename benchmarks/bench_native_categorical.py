@@ -0,0 +1,125 @@
+"""
+One-hot vs. native categorical training: fit time, peak memory, model size
+and holdout accuracy for both heads. Each (mode, task) fit runs in a fresh
+interpreter so its peak RSS is not polluted by the previous one; the
+reported peak includes loading the data. Nothing is written to models/.
+
+Usage:
+    python benchmarks/bench_native_categorical.py            # real dataset
+    python benchmarks/bench_native_categorical.py --rows 500000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.models.preprocessing import CATEGORICAL_MODES  # noqa: E402
+
+TASKS = ("classification", "regression")
+
+
+def run_case(task: str, categorical: str, rows: int = None) -> dict:
+    """Fit one head in this process and return its measurements."""
+    import resource
+    import time
+
+    from sklearn.metrics import mean_squared_error, r2_score, roc_auc_score
+    from sklearn.model_selection import train_test_split
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBClassifier, XGBRegressor
+
+    from src.data.load_data import load_dataset
+    from src.data.synthetic import make_listings
+    from src.features.build_features import build_features
+    from src.models.preprocessing import get_model_preprocessor, xgb_categorical_params
+    from src.models.train_joint import (
+        CAT_FEATURES,
+        CLASSIFICATION_TARGET,
+        CLASSIFIER_PARAMS,
+        NUM_FEATURES,
+        REGRESSION_TARGET,
+        REGRESSOR_PARAMS,
+    )
+
+    target = CLASSIFICATION_TARGET if task == "classification" else REGRESSION_TARGET
+    columns = NUM_FEATURES + CAT_FEATURES + [target]
+    df = make_listings(rows)[columns] if rows else load_dataset(columns)
+    df = build_features(df)
+    X, y = df[NUM_FEATURES + CAT_FEATURES], df[target]
+    stratify = y if task == "classification" else None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=stratify
+    )
+
+    if task == "classification":
+        model = XGBClassifier(**CLASSIFIER_PARAMS, **xgb_categorical_params(categorical), n_jobs=-1)
+    else:
+        model = XGBRegressor(**REGRESSOR_PARAMS, **xgb_categorical_params(categorical), n_jobs=-1)
+    pipeline = Pipeline(steps=[
+        ("preprocessor", get_model_preprocessor(NUM_FEATURES, CAT_FEATURES, categorical)),
+        ("model", model),
+    ])
+
+    start = time.perf_counter()
+    pipeline.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    if task == "classification":
+        proba = pipeline.predict_proba(X_test)[:, 1]
+        metrics = {"accuracy": float(((proba > 0.5) == y_test).mean()),
+                   "roc_auc": float(roc_auc_score(y_test, proba))}
+    else:
+        pred = pipeline.predict(X_test)
+        metrics = {"rmse": float(mean_squared_error(y_test, pred) ** 0.5),
+                   "r2": float(r2_score(y_test, pred))}
+
+    return {
+        "rows": len(df),
+        "n_columns": int(model.get_booster().num_features()),
+        "fit_seconds": fit_seconds,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "model_kb": len(model.get_booster().save_raw("ubj")) / 1024,
+        **metrics,
+    }
+
+
+def _run_isolated(task: str, categorical: str, rows: int = None) -> dict:
+    code = (
+        "import json, sys\n"
+        f"sys.path.insert(0, {PROJECT_ROOT!r})\n"
+        "from benchmarks.bench_native_categorical import run_case\n"
+        f"print(json.dumps(run_case({task!r}, {categorical!r}, {rows!r})))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=None,
+                        help="Synthetic rows instead of the processed dataset.")
+    args = parser.parse_args()
+
+    print(f"{'task':<15s} {'mode':<7s} {'columns':>8s} {'fit s':>7s} "
+          f"{'peak MB':>8s} {'model KB':>9s}  metrics")
+    for task in TASKS:
+        for categorical in CATEGORICAL_MODES:
+            r = _run_isolated(task, categorical, args.rows)
+            if task == "classification":
+                metrics = f"acc {r['accuracy']:.4f}  auc {r['roc_auc']:.4f}"
+            else:
+                metrics = f"rmse {r['rmse']:.3f}  r2 {r['r2']:.4f}"
+            print(f"{task:<15s} {categorical:<7s} {r['n_columns']:>8,d} {r['fit_seconds']:>7.2f} "
+                  f"{r['peak_rss_mb']:>8.0f} {r['model_kb']:>9.0f}  {metrics}")
+
+
+if __name__ == "__main__":
+    main()
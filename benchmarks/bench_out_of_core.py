@@ -0,0 +1,110 @@
+"""
+In-memory vs. out-of-core training on a synthetic listings CSV: wall-clock,
+peak RSS and holdout metrics. Both modes use the same train/holdout rows
+(the out-of-core per-chunk mask) and run in fresh interpreters so their
+peak RSS is comparable. The CSV is generated once and reused; nothing is
+written to models/.
+
+Usage:
+    python benchmarks/bench_out_of_core.py --rows 2000000
+    python benchmarks/bench_out_of_core.py --rows 10000000 --modes out_of_core
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.data.load_data import CACHE_DIR  # noqa: E402
+from src.data.synthetic import write_listings_csv  # noqa: E402
+from src.models.out_of_core import DEFAULT_CHUNK_ROWS, TASKS  # noqa: E402
+
+MODES = ("in_memory", "out_of_core")
+
+
+def run_case(mode: str, task: str, csv_path: str, chunk_rows: int) -> dict:
+    """Train one head in this process and return its measurements."""
+    import resource
+    import time
+
+    import numpy as np
+    import pandas as pd
+
+    from src.models import out_of_core
+
+    if mode == "out_of_core":
+        start = time.perf_counter()
+        report = out_of_core.train_out_of_core(task, csv_path, chunk_rows=chunk_rows, save=False)
+        seconds = time.perf_counter() - start
+        return {"seconds": seconds, "peak_rss_mb": report["peak_rss_mb"], "metrics": report["metrics"]}
+
+    # The training scripts' path: whole CSV in one frame, one-hot copy, fit
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBClassifier, XGBRegressor
+
+    from src.features.build_features import build_features
+    from src.models.incremental import evaluate
+    from src.models.preprocessing import get_preprocessing_pipeline
+
+    cfg = TASKS[task]
+    target = cfg["target"]
+    start = time.perf_counter()
+    df = build_features(pd.read_csv(csv_path, usecols=out_of_core.FEATURES + [target]))
+    starts = range(0, len(df), chunk_rows)
+    hold = np.concatenate([
+        out_of_core.holdout_mask(min(chunk_rows, len(df) - s), i) for i, s in enumerate(starts)
+    ])
+    estimator = XGBClassifier if task == "classification" else XGBRegressor
+    pipeline = Pipeline(steps=[
+        ("preprocessor", get_preprocessing_pipeline(out_of_core.NUM_FEATURES, out_of_core.CAT_FEATURES)),
+        ("model", estimator(**cfg["params"], n_jobs=-1)),
+    ])
+    pipeline.fit(df.loc[~hold, out_of_core.FEATURES], df.loc[~hold, target])
+    metrics = evaluate(task, pipeline, df.loc[hold, out_of_core.FEATURES], df.loc[hold, target])
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"seconds": seconds, "peak_rss_mb": peak, "metrics": metrics}
+
+
+def _run_isolated(mode: str, task: str, csv_path: str, chunk_rows: int) -> dict:
+    code = (
+        "import json, sys\n"
+        f"sys.path.insert(0, {PROJECT_ROOT!r})\n"
+        "from benchmarks.bench_out_of_core import run_case\n"
+        f"print(json.dumps(run_case({mode!r}, {task!r}, {csv_path!r}, {chunk_rows!r})))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--tasks", nargs="+", choices=sorted(TASKS), default=sorted(TASKS))
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    csv_path = os.path.join(CACHE_DIR, "bench", f"listings_{args.rows}.csv")
+    if not os.path.exists(csv_path):
+        write_listings_csv(csv_path, args.rows)
+    print(f"{args.rows:,} rows ({os.path.getsize(csv_path) / 1e6:,.0f} MB CSV), "
+          f"chunks of {args.chunk_rows:,}")
+
+    print(f"{'task':<15s} {'mode':<12s} {'seconds':>8s} {'peak MB':>8s}  metrics")
+    for task in args.tasks:
+        for mode in args.modes:
+            r = _run_isolated(mode, task, csv_path, args.chunk_rows)
+            metrics = "  ".join(f"{k} {v:.4f}" for k, v in r["metrics"].items())
+            print(f"{task:<15s} {mode:<12s} {r['seconds']:>8.1f} {r['peak_rss_mb']:>8,.0f}  {metrics}")
+
+
+if __name__ == "__main__":
+    main()
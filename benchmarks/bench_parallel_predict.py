@@ -0,0 +1,60 @@
+"""
+Scaling of predict_properties_parallel with the number of worker processes.
+
+Usage:
+    python benchmarks/bench_parallel_predict.py --rows 500000 --workers 1 2 4 8 16 32
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.models.predict import (  # noqa: E402
+    ALL_FEATURES,
+    make_scoring_pool,
+    predict_properties_batch,
+    predict_properties_parallel,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count()}))
+    args = parser.parse_args()
+
+    df = make_listings(args.rows)[ALL_FEATURES]
+
+    predict_properties_batch(df.head(10))  # load models outside the timed region
+
+    start = time.perf_counter()
+    expected = predict_properties_batch(df)
+    base_s = time.perf_counter() - start
+    print(f"in-process batch : {len(df) / base_s:12,.0f} rows/s")
+
+    for n in args.workers:
+        # Pool start-up (model loading) is excluded: pools are long-lived
+        with make_scoring_pool(n) as pool:
+            shard_size = -(-len(df) // n)
+            predict_properties_parallel(df.head(n), shard_size=1, executor=pool)
+
+            start = time.perf_counter()
+            out = predict_properties_parallel(df, shard_size=shard_size, executor=pool)
+            elapsed = time.perf_counter() - start
+
+        assert out.index.equals(expected.index)
+        assert np.allclose(out["predicted_price_lakhs"], expected["predicted_price_lakhs"])
+        print(f"{n:>3d} workers      : {len(df) / elapsed:12,.0f} rows/s "
+              f"(speed-up x{base_s / elapsed:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Where prediction time goes, and what measuring it costs.
+
+Scores synthetic listings through the single-property and batch paths with
+metrics disabled and enabled, reports the instrumentation overhead, then
+prints the per-stage p50 / p95 / p99 breakdown. With ``--profile N`` every
+request also runs under cProfile (or pyinstrument) and the N slowest
+profiles are written to ``--profile-dir``.
+
+Usage:
+    python benchmarks/bench_prediction_metrics.py --single 2000 --batch-rows 20000
+    python benchmarks/bench_prediction_metrics.py --profile 5 --profile-dir /tmp/profiles
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.models.metrics import PROFILING_BACKENDS, get_metrics  # noqa: E402
+from src.models.predict import ALL_FEATURES, predict_properties_batch, predict_property_investment  # noqa: E402
+
+
+def _time_paths(records, frame, repeats):
+    """(seconds per single request, seconds per batch) over the inputs."""
+    start = time.perf_counter()
+    for r in records:
+        predict_property_investment(r, use_cache=False)
+    single = (time.perf_counter() - start) / len(records)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict_properties_batch(frame)
+    return single, (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--single", type=int, default=2000, help="Single-property requests.")
+    parser.add_argument("--batch-rows", type=int, default=20_000)
+    parser.add_argument("--repeats", type=int, default=5, help="Batch requests.")
+    parser.add_argument("--profile", type=int, default=0, help="Keep the N slowest request profiles.")
+    parser.add_argument("--profile-backend", choices=PROFILING_BACKENDS, default="cprofile")
+    parser.add_argument("--profile-dir", default="profiles")
+    args = parser.parse_args()
+
+    listings = make_listings(max(args.single, args.batch_rows))[ALL_FEATURES]
+    records = listings.head(args.single).to_dict("records")
+    frame = listings.head(args.batch_rows)
+    metrics = get_metrics()
+
+    # Warm-up: model loads land in the breakdown below, not in the timings
+    _time_paths(records[:50], frame.head(100), 1)
+
+    metrics.enabled = False
+    off = _time_paths(records, frame, args.repeats)
+    metrics.enabled = True
+    on = _time_paths(records, frame, args.repeats)
+
+    print(f"{'path':<8s} {'metrics off':>12s} {'metrics on':>12s} {'overhead':>9s}")
+    for name, a, b in (("single", off[0], on[0]), ("batch", off[1], on[1])):
+        print(f"{name:<8s} {a * 1000:>9.3f} ms {b * 1000:>9.3f} ms {(b / a - 1) * 100:>8.1f}%")
+
+    print()
+    print(f"{'path':<8s} {'stage':<15s} {'count':>7s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}")
+    for path, stages in metrics.snapshot()["stages"].items():
+        for stage, s in stages.items():
+            print(f"{path:<8s} {stage:<15s} {s['count']:>7,d} {s['p50_ms']:>9.3f} "
+                  f"{s['p95_ms']:>9.3f} {s['p99_ms']:>9.3f}")
+
+    if args.profile:
+        metrics.enable_profiling(args.profile, args.profile_backend)
+        _time_paths(records, frame, args.repeats)
+        metrics.disable_profiling()
+        print()
+        for path in metrics.dump_profiles(args.profile_dir):
+            print(f"profile: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+What-if sweep: one batched ``scenario_grid`` call vs. scoring every
+(asking price, growth, horizon) cell with its own
+``predict_property_investment`` call, as a per-cell loop in the app would.
+Checks both give the same numbers, then times them.
+
+Usage:
+    python benchmarks/bench_scenarios.py
+    python benchmarks/bench_scenarios.py --price-steps 41 --repeats 20
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+
+from src.models.predict import current_models, predict_property_investment  # noqa: E402
+from src.models.scenarios import DEFAULT_GROWTH_PCT, DEFAULT_HORIZONS, scenario_grid  # noqa: E402
+
+SAMPLE = {
+    "City": "Hyderabad",
+    "Locality": "Locality_1",
+    "Property_Type": "Apartment",
+    "BHK": "3",
+    "Size_in_SqFt": 1500,
+    "Age_of_Property": 10,
+    "Nearby_Schools": 5,
+    "Nearby_Hospitals": 3,
+}
+
+
+def per_cell(prices, growth_pct, horizons):
+    """The app's single-setting formulas, one prediction per cell."""
+    size = SAMPLE["Size_in_SqFt"]
+    prob = np.empty((len(prices), len(growth_pct), len(horizons)))
+    price = np.empty_like(prob)
+    for i, p in enumerate(prices):
+        for j, g in enumerate(growth_pct):
+            for k, h in enumerate(horizons):
+                rate = g / 100.0
+                features = dict(
+                    SAMPLE,
+                    calc_price_per_sqft=(p * 100000) / size,
+                    Annual_Growth_Rate=rate,
+                    Future_Price_5Y=p * math.pow(1 + rate, h),
+                )
+                r = predict_property_investment(features, use_cache=False)
+                prob[i, j, k] = r["good_investment_prob"]
+                price[i, j, k] = r["predicted_price_lakhs"]
+    return prob, price
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--asking-price", type=float, default=250.0)
+    parser.add_argument("--price-steps", type=int, default=17)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    prices = args.asking_price * np.linspace(0.6, 1.4, args.price_steps)
+    growth_pct, horizons = DEFAULT_GROWTH_PCT, DEFAULT_HORIZONS
+    n_cells = len(prices) * len(growth_pct) * len(horizons)
+    models = current_models()
+    compiled = models.compiled() is not None
+    print(f"{len(prices)} prices x {len(growth_pct)} growth rates x {len(horizons)} horizons "
+          f"= {n_cells:,} scenarios (compiled fast path: {compiled})")
+
+    grid = scenario_grid(SAMPLE, prices, growth_pct, horizons, models=models)  # warm-up
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        grid = scenario_grid(SAMPLE, prices, growth_pct, horizons, models=models)
+    batched = (time.perf_counter() - start) / args.repeats
+
+    start = time.perf_counter()
+    prob, price = per_cell(prices, growth_pct, horizons)
+    looped = time.perf_counter() - start
+
+    print(f"max |diff|   : prob {np.abs(prob - grid.good_prob).max():.2e}, "
+          f"price {np.abs(price - grid.predicted_price).max():.2e}")
+    print(f"per-cell loop: {looped * 1000:9.1f} ms  ({looped / n_cells * 1e6:7.1f} µs/scenario)")
+    print(f"scenario_grid: {batched * 1000:9.1f} ms  ({batched / n_cells * 1e6:7.1f} µs/scenario)")
+    print(f"speed-up     : {looped / batched:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
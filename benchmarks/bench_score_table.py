@@ -0,0 +1,102 @@
+"""
+Ranked listings from the offline score table vs. scoring on the fly.
+
+For a few City / Property_Type / BHK selections, times the "top K by
+valuation gap" answer three ways:
+
+- on the fly: filter the dataset, score the matching rows with both
+  pipelines, sort;
+- full-table sort: sort the stored scores of the matching segments;
+- top-K index: merge the stored per-segment top-K lists
+  (ScoreTable.ranked_rows),
+
+checks that all three return the same listings, and times building the
+displayed frame (ScoreTable.ranked).
+
+Usage:
+    python benchmarks/bench_score_table.py --k 50
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+
+from src.app.score_table import RANKINGS, SEGMENT_COLUMNS, load_score_table  # noqa: E402
+from src.data.load_data import load_dataset  # noqa: E402
+from src.models.predict import ALL_FEATURES, predict_properties_batch  # noqa: E402
+
+SELECTIONS = [
+    ("Pune", "Apartment", "3"),
+    ("Pune", None, "3"),
+    (None, "Villa", None),
+    (None, None, None),
+]
+
+
+def _on_the_fly(df, selection, k):
+    mask = np.ones(len(df), dtype=bool)
+    for col, value in zip(SEGMENT_COLUMNS, selection):
+        if value is not None:
+            mask &= (df[col].astype(str) == value).to_numpy()
+    rows = df[mask]
+    preds = predict_properties_batch(rows[ALL_FEATURES])
+    asking = rows["Price_in_Lakhs"].to_numpy(dtype=np.float64)
+    gap_pct = ((preds["predicted_price_lakhs"].to_numpy() - asking) / asking * 100).astype(np.float32)
+    return rows["ID"].to_numpy()[np.argsort(-gap_pct.astype(np.float64), kind="stable")[:k]]
+
+
+def _ids(table, rows):
+    return np.asarray(table.columns["ID"][rows])
+
+
+def _full_sort(table, selection, k):
+    segs = table.segment_ids(*selection)
+    rows = np.concatenate([np.arange(table.offsets[s], table.offsets[s + 1]) for s in segs])
+    gap = np.asarray(table.columns[RANKINGS["undervalued"]][rows]).astype(np.float64)
+    return rows[np.lexsort((rows, -gap))][:k]
+
+
+def _time(fn, repeats):
+    result = fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return result, (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = load_score_table()
+    print(f"score table: {table.n_rows:,d} rows, {len(table.segments)} segments "
+          f"(loaded / built in {time.perf_counter() - start:.2f}s)")
+    df = load_dataset(["ID", "Price_in_Lakhs"] + ALL_FEATURES)
+
+    print(f"{'selection':<28s} {'rows':>8s} {'on the fly':>12s} {'full sort':>12s} "
+          f"{'top-K index':>12s} {'+ frame':>12s}")
+    for selection in SELECTIONS:
+        label = " / ".join(v or "All" for v in selection)
+        n_rows = int(sum(table.offsets[s + 1] - table.offsets[s] for s in table.segment_ids(*selection)))
+
+        fly, t_fly = _time(lambda: _on_the_fly(df, selection, args.k), 1)
+        full, t_full = _time(lambda: _full_sort(table, selection, args.k), args.repeats)
+        ranked, t_index = _time(lambda: table.ranked_rows("undervalued", *selection, k=args.k), args.repeats)
+        _, t_frame = _time(lambda: table.ranked("undervalued", *selection, k=args.k), args.repeats)
+        assert np.array_equal(ranked, full) and np.array_equal(_ids(table, ranked), fly), label
+
+        print(f"{label:<28s} {n_rows:>8,d} {t_fly * 1000:>9.1f} ms {t_full * 1000:>9.2f} ms "
+              f"{t_index * 1000:>9.2f} ms {t_frame * 1000:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
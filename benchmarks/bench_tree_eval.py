@@ -0,0 +1,128 @@
+"""
+NumPy tree evaluator (src/models/tree_eval.py) vs. XGBoost's predictor.
+
+Checks that the flattened node tables reproduce Pipeline.predict /
+predict_proba on synthetic rows (including unknown categories and
+unparseable numerics) to float32 rounding, then compares:
+
+- latency of the encoded rows -> predictions step at several batch sizes,
+- memory: node-table bytes vs. the booster, and peak RSS of a fresh
+  interpreter that loads both models with each backend.
+
+Cold start is covered by benchmarks/bench_cold_start.py.
+
+Usage:
+    python benchmarks/bench_tree_eval.py --rows 5000 --batch-sizes 1 16 256 4096
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models.fast_path import CompiledPipeline, native_artifact_paths  # noqa: E402
+from src.models.predict import ALL_FEATURES, MODELS_DIR, _load_classifier, _load_regressor  # noqa: E402
+
+# float32 leaf sums may round differently in the last place
+PROB_TOLERANCE = 1e-6
+PRICE_RELATIVE_TOLERANCE = 1e-6
+
+# VmHWM, not ru_maxrss: on Linux the latter keeps the parent's peak across fork + exec
+RSS_SCRIPT = """
+from src.models.fast_path import CompiledPipeline
+models = [CompiledPipeline.load('models', name, backend='{backend}') for name in ('classifier', 'regression')]
+print([line for line in open('/proc/self/status') if line.startswith('VmHWM')][0])
+"""
+
+
+def _edge_cases(records):
+    """A few rows exercising unknown categories, NaN and junk numerics."""
+    base = dict(records[0])
+    return [
+        dict(base, City="Atlantis", Locality="Nowhere"),
+        dict(base, BHK=7),
+        dict(base, Size_in_SqFt=None),
+        dict(base, Age_of_Property="not a number"),
+        dict(base, Nearby_Schools=float("nan")),
+    ]
+
+
+def _time_per_call(fn, X, budget_s=0.5):
+    fn(X)
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < budget_s:
+        fn(X)
+        calls += 1
+    return (time.perf_counter() - start) / calls
+
+
+def _peak_rss_mb(backend):
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", RSS_SCRIPT.format(backend=backend)],
+        cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    return int(out.split()[-2]) / 1024  # "VmHWM:  123456 kB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 256, 4096])
+    args = parser.parse_args()
+
+    records = make_listings(max(args.rows, max(args.batch_sizes)))[ALL_FEATURES].to_dict("records")
+    records += _edge_cases(records)
+    X = build_features(pd.DataFrame(records))[ALL_FEATURES]
+
+    clf, reg = _load_classifier(), _load_regressor()
+    xgb_clf, xgb_reg = CompiledPipeline.from_pipeline(clf), CompiledPipeline.from_pipeline(reg)
+    np_clf = CompiledPipeline.from_pipeline(clf, backend="numpy")
+    np_reg = CompiledPipeline.from_pipeline(reg, backend="numpy")
+
+    # ---- Parity ----
+    prob_ref = clf.predict_proba(X)[:, 1]
+    price_ref = reg.predict(X)
+    prob_np = np_clf.predict_raw(records)
+    price_np = np_reg.predict_raw(records)
+
+    prob_diff = np.abs(prob_np - prob_ref).max()
+    price_diff = (np.abs(price_np - price_ref) / np.abs(price_ref)).max()
+    assert prob_diff <= PROB_TOLERANCE, prob_diff
+    assert price_diff <= PRICE_RELATIVE_TOLERANCE, price_diff
+    print(f"parity over {len(records):,} rows: max |prob diff| {prob_diff:.2e}, "
+          f"max relative price diff {price_diff:.2e}, "
+          f"bit-identical {np.mean(prob_np == prob_ref):.1%} / {np.mean(price_np == price_ref):.1%}")
+
+    # ---- Latency: encoded rows -> predictions ----
+    encoded = xgb_clf.encode(records)
+    print()
+    print(f"{'model':<11s} {'rows':>6s} {'xgboost':>12s} {'numpy':>12s} {'speed-up':>9s}")
+    for name, fast, trees in (("classifier", xgb_clf, np_clf), ("regression", xgb_reg, np_reg)):
+        for n in args.batch_sizes:
+            batch = encoded[:n]
+            a = _time_per_call(fast.predict_encoded, batch)
+            b = _time_per_call(trees.predict_encoded, batch)
+            print(f"{name:<11s} {n:>6,d} {a * 1000:>9.3f} ms {b * 1000:>9.3f} ms {a / b:>8.2f}x")
+
+    # ---- Memory ----
+    print()
+    for name, model in (("classifier", np_clf), ("regression", np_reg)):
+        booster_path, _ = native_artifact_paths(MODELS_DIR, name)
+        print(f"{name:<11s} {model.trees.n_trees} trees, depth {model.trees.depth}: "
+              f"node tables {model.trees.nbytes / 1024:.0f} KB vs booster "
+              f"{os.path.getsize(booster_path) / 1024:.0f} KB (ubj)")
+    for backend in ("xgboost", "numpy"):
+        print(f"peak RSS loading both models ({backend}): {_peak_rss_mb(backend):.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Reproducible end-to-end performance suite with a regression gate.
+
+Generates schema-faithful synthetic listings (src/data/synthetic.py, fixed
+seed) at the requested scale and times every hot path of the project:
+
+    build_features        feature engineering over all rows
+    preprocess            fit_transform of the scaler + one-hot ColumnTransformer
+    predict_batch         predict_properties_batch over all rows (live models)
+    predict_single        mean latency of single-property requests (no cache)
+    train_classification  split + fit, hyperparameters of train_classification.py
+    train_regression      split + fit, hyperparameters of train_regression.py
+    dashboard_build       MarketCube + FilterIndex build
+    dashboard_query       mean cube query per filter state (exact range edges)
+
+Fast stages report the best of --repeats runs; training runs once on the
+first --train-rows rows. Results go to benchmarks/results/ as JSON with
+machine metadata. Each stage is compared with its budget for that row count
+in benchmarks/perf_baseline.json; the suite exits non-zero if any stage is
+over budget. Budgets are machine-specific: they are only checked on the
+machine (CPU, Python, package versions) that recorded them, elsewhere the
+suite reports timings only. Re-baseline with --update on the machine that
+runs the check.
+
+Usage:
+    python benchmarks/perf_suite.py                          # 250k rows, check
+    python benchmarks/perf_suite.py --rows 1000000 10000000 --stages build_features predict_batch
+    python benchmarks/perf_suite.py --update                 # re-baseline (current x headroom)
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "perf_baseline.json")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+PACKAGES = ["numpy", "pandas", "scikit-learn", "xgboost", "pyarrow"]
+
+# Dashboard filter states (MarketCube.query kwargs)
+DASHBOARD_STATES = [
+    {},
+    {"city": "Pune"},
+    {"city": "Mumbai", "property_type": "Apartment", "bhk": "2", "good_only": True},
+    {"price_range": (50.0, 250.0), "size_range": (1000, 3000), "age_range": (5, 20)},
+]
+
+
+# -------------------------------------------------------------------
+# Machine metadata
+# -------------------------------------------------------------------
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or "unknown"
+
+
+def _git(*args) -> str:
+    try:
+        out = subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=30)
+        return out.stdout.strip()
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+
+
+def machine_metadata() -> dict:
+    from importlib.metadata import PackageNotFoundError, version
+
+    packages = {}
+    for name in PACKAGES:
+        try:
+            packages[name] = version(name)
+        except PackageNotFoundError:
+            packages[name] = None
+    try:
+        memory_gb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1e9
+    except (ValueError, OSError, AttributeError):
+        memory_gb = None
+    return {
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "memory_gb": round(memory_gb, 1) if memory_gb else None,
+        "packages": packages,
+        "git_commit": _git("rev-parse", "HEAD"),
+        "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def _same_machine(a: dict, b: dict) -> bool:
+    keys = ("cpu", "cpu_count", "python", "packages")
+    return all(a.get(k) == b.get(k) for k in keys)
+
+
+# -------------------------------------------------------------------
+# Stages: each takes the suite context and returns seconds
+# -------------------------------------------------------------------
+def _best(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def stage_build_features(ctx) -> float:
+    from src.features.build_features import build_features
+
+    return _best(lambda: build_features(ctx["raw"]), ctx["repeats"])
+
+
+def stage_preprocess(ctx) -> float:
+    from src.models.preprocessing import get_preprocessing_pipeline
+    from src.models.train_joint import CAT_FEATURES, NUM_FEATURES
+
+    X = ctx["features"][NUM_FEATURES + CAT_FEATURES]
+    return _best(lambda: get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES).fit_transform(X), ctx["repeats"])
+
+
+def stage_predict_batch(ctx) -> float:
+    from src.models.predict import ALL_FEATURES, predict_properties_batch
+
+    X = ctx["raw"][ALL_FEATURES]
+    predict_properties_batch(X.head(100))  # model load is not part of the stage
+    return _best(lambda: predict_properties_batch(X), ctx["repeats"])
+
+
+def stage_predict_single(ctx) -> float:
+    from src.models.predict import ALL_FEATURES, predict_property_investment
+
+    records = ctx["raw"][ALL_FEATURES].head(ctx["single_requests"]).to_dict("records")
+    predict_property_investment(records[0], use_cache=False)
+
+    def run():
+        for r in records:
+            predict_property_investment(r, use_cache=False)
+
+    return _best(run, ctx["repeats"]) / len(records)
+
+
+def _train(ctx, task: str) -> float:
+    from sklearn.model_selection import train_test_split
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBClassifier, XGBRegressor
+
+    from src.models.preprocessing import get_preprocessing_pipeline
+    from src.models.train_joint import (
+        CAT_FEATURES,
+        CLASSIFICATION_TARGET,
+        CLASSIFIER_PARAMS,
+        NUM_FEATURES,
+        REGRESSION_TARGET,
+        REGRESSOR_PARAMS,
+    )
+
+    df = ctx["features"].head(ctx["train_rows"])
+    X = df[NUM_FEATURES + CAT_FEATURES]
+    start = time.perf_counter()
+    if task == "classification":
+        y = df[CLASSIFICATION_TARGET]
+        X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+        model = XGBClassifier(**CLASSIFIER_PARAMS, n_jobs=-1)
+    else:
+        y = df[REGRESSION_TARGET]
+        X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42)
+        model = XGBRegressor(**REGRESSOR_PARAMS, n_jobs=-1)
+    Pipeline(steps=[
+        ("preprocessor", get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES)),
+        ("model", model),
+    ]).fit(X_train, y_train)
+    return time.perf_counter() - start
+
+
+def stage_train_classification(ctx) -> float:
+    return _train(ctx, "classification")
+
+
+def stage_train_regression(ctx) -> float:
+    return _train(ctx, "regression")
+
+
+def _dashboard_frame(ctx):
+    from src.app.filter_index import EQUALITY_COLUMNS, RANGE_COLUMNS
+    from src.app.market_cube import CUBE_COLUMNS
+
+    if "dashboard" not in ctx:
+        columns = list(dict.fromkeys(CUBE_COLUMNS + EQUALITY_COLUMNS + RANGE_COLUMNS))
+        df = ctx["raw"][columns].copy()
+        # As load_dataset returns them: dictionary-encoded strings
+        for col in ("City", "Property_Type", "BHK"):
+            df[col] = df[col].astype(str).astype("category")
+        ctx["dashboard"] = df
+    return ctx["dashboard"]
+
+
+def stage_dashboard_build(ctx) -> float:
+    from src.app.filter_index import FilterIndex
+    from src.app.market_cube import MarketCube
+
+    df = _dashboard_frame(ctx)
+
+    def run():
+        ctx["cube"] = MarketCube.build(df)
+        ctx["filter_index"] = FilterIndex.build(df)
+
+    return _best(run, ctx["repeats"])
+
+
+def stage_dashboard_query(ctx) -> float:
+    from src.app.filter_index import FilterIndex
+    from src.app.market_cube import MarketCube
+
+    df = _dashboard_frame(ctx)
+    cube = ctx.get("cube") or MarketCube.build(df)
+    index = ctx.get("filter_index") or FilterIndex.build(df)
+
+    def run():
+        for cube_kwargs in DASHBOARD_STATES:
+            cube.query(**cube_kwargs, index=index, rows=df)
+
+    return _best(run, max(ctx["repeats"], 5)) / len(DASHBOARD_STATES)
+
+
+STAGES = {
+    "build_features": stage_build_features,
+    "preprocess": stage_preprocess,
+    "predict_batch": stage_predict_batch,
+    "predict_single": stage_predict_single,
+    "train_classification": stage_train_classification,
+    "train_regression": stage_train_regression,
+    "dashboard_build": stage_dashboard_build,
+    "dashboard_query": stage_dashboard_query,
+}
+
+
+# -------------------------------------------------------------------
+# Suite
+# -------------------------------------------------------------------
+def run_suite(rows: int, stages, repeats: int, train_rows: int, single_requests: int, seed: int) -> dict:
+    """Time ``stages`` on ``rows`` synthetic listings; returns {stage: seconds} + setup info."""
+    from src.features.build_features import build_features
+
+    start = time.perf_counter()
+    raw = make_listings(rows, seed=seed)
+    generate_s = time.perf_counter() - start
+    ctx = {
+        "raw": raw,
+        "features": build_features(raw),
+        "repeats": repeats,
+        "train_rows": min(train_rows, rows),
+        "single_requests": min(single_requests, rows),
+    }
+
+    timings = {}
+    for name in stages:
+        timings[name] = STAGES[name](ctx)
+        print(f"  {name:<22s} {_fmt(timings[name])}", flush=True)
+    return {"generate_seconds": generate_s, "train_rows": ctx["train_rows"],
+            "single_requests": ctx["single_requests"], "stages": timings}
+
+
+def _fmt(seconds: float) -> str:
+    return f"{seconds * 1000:10.3f} ms" if seconds < 1 else f"{seconds:10.3f} s "
+
+
+def _load_baseline() -> dict:
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            return json.load(f)
+    return {"machine": {}, "budgets": {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[250_000])
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--train-rows", type=int, default=250_000,
+                        help="Rows used by the training stages (capped by --rows).")
+    parser.add_argument("--single-requests", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--update", action="store_true",
+                        help="Write current timings x --headroom as the new budgets.")
+    parser.add_argument("--headroom", type=float, default=1.5)
+    args = parser.parse_args()
+
+    machine = machine_metadata()
+    baseline = _load_baseline()
+    gate = _same_machine(machine, baseline["machine"])
+    if baseline["machine"] and not gate and not args.update:
+        print("note: the baseline was recorded on a different machine/environment; "
+              "reporting only, budgets are not checked (re-baseline with --update)")
+
+    results = {}
+    failed = []
+    for rows in args.rows:
+        print(f"{rows:,d} rows")
+        result = run_suite(rows, args.stages, args.repeats, args.train_rows, args.single_requests, args.seed)
+        results[str(rows)] = result
+
+        budgets = baseline["budgets"].get(str(rows), {}) if gate else {}
+        for name, seconds in result["stages"].items():
+            budget = budgets.get(name)
+            if budget is not None and seconds > budget:
+                failed.append(f"{name} @ {rows:,d} rows ({_fmt(seconds).strip()} > {_fmt(budget).strip()})")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+    results_path = os.path.join(RESULTS_DIR, f"perf_{stamp}.json")
+    with open(results_path, "w") as f:
+        json.dump({"timestamp": stamp, "machine": machine, "args": vars(args), "results": results}, f, indent=2)
+    print(f"Results written to {results_path}")
+
+    if args.update:
+        for rows, result in results.items():
+            budgets = baseline["budgets"].setdefault(rows, {})
+            for name, seconds in result["stages"].items():
+                budgets[name] = float(np.format_float_positional(seconds * args.headroom, precision=4,
+                                                                 unique=False, fractional=False))
+        baseline["machine"] = machine
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Budgets written to {BASELINE_PATH}")
+        return
+
+    if failed:
+        print("\nSlower than baseline:")
+        for line in failed:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
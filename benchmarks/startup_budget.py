@@ -0,0 +1,239 @@
+"""
+Import-time budget check for every entry point, driven by `python -X importtime`.
+
+Each entry point is imported in a fresh interpreter (best of --repeats runs)
+and checked against benchmarks/startup_budget.json on two counts:
+
+- its own import time: project and standard-library modules, without the
+  time spent inside third-party packages (streamlit alone varies by
+  hundreds of ms between runs), against a budget with headroom;
+- the third-party packages it imports directly, which must stay within the
+  recorded set, so a heavy library imported eagerly fails on any machine.
+
+Timings only gate on the machine the budgets were recorded on (same CPU,
+Python and package versions); elsewhere they are reported only. Exits
+non-zero on a failure and prints the heaviest nested imports.
+
+Usage:
+    python benchmarks/startup_budget.py             # check
+    python benchmarks/startup_budget.py --update    # re-baseline (current x headroom, current imports)
+"""
+import argparse
+import functools
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import sysconfig
+from importlib.metadata import PackageNotFoundError, version
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BUDGET_PATH = os.path.join(os.path.dirname(__file__), "startup_budget.json")
+
+# Versions that decide whether recorded timings apply to this machine
+PACKAGES = ["streamlit", "numpy", "pandas", "scikit-learn", "xgboost", "pyarrow", "plotly", "starlette"]
+
+# Budget = max(measured x --headroom, measured + MIN_SLACK_MS)
+MIN_SLACK_MS = 25
+
+# Module names as seen with the project root and pages/ on sys.path
+ENTRY_POINTS = [
+    "Property_Investment_Advisor",
+    "01_Property_Market_Insights",
+    "src.models.predict",
+    "src.models.train_classification",
+    "src.models.train_regression",
+    "src.models.train_joint",
+    "src.app.api",
+]
+
+# __import__ (not importlib.import_module) goes through the C import path
+# that -X importtime instruments
+_IMPORT_CODE = (
+    "import sys; "
+    "sys.path[:0] = [{root!r}, {pages!r}]; "
+    "__import__({module!r})"
+)
+
+
+def _parse_importtime(stderr: str):
+    """[(name, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        name = name[1:]  # one separator space, then two spaces per nesting level
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cum_us), depth))
+    return rows
+
+
+_SITE_PACKAGES = tuple({sysconfig.get_paths()["purelib"], sysconfig.get_paths()["platlib"]})
+
+
+@functools.lru_cache(maxsize=None)
+def _is_third_party(root: str) -> bool:
+    """Whether the top-level package ``root`` is installed in site-packages."""
+    try:
+        spec = importlib.util.find_spec(root)
+    except (ImportError, ValueError):
+        return False
+    if spec is None:
+        return False
+    locations = list(spec.submodule_search_locations or []) + [spec.origin or ""]
+    return any(loc.startswith(_SITE_PACKAGES) for loc in locations)
+
+
+def _split(rows, module: str):
+    """
+    (own_us, {third-party root: cumulative_us}) over the subtree of ``module``.
+
+    -X importtime prints children before their parent, so walking the rows
+    backwards visits each import before the imports nested in it.
+    """
+    own_us, third_party = 0, {}
+    seen = False
+    inside = None  # depth of the enclosing third-party import
+    for name, self_us, cum_us, depth in reversed(rows):
+        if not seen:
+            seen = name == module and depth == 0
+            if seen:
+                own_us += self_us
+            continue
+        if depth == 0:
+            break  # imports made before the entry point
+        if inside is not None and depth > inside:
+            continue
+        inside = None
+        root = name.split(".")[0]
+        if _is_third_party(root):
+            inside = depth
+            third_party[root] = third_party.get(root, 0) + cum_us
+        else:
+            own_us += self_us
+    return own_us, third_party
+
+
+def measure(module: str):
+    """
+    Own import time of ``module`` in ms, cumulative time in ms, the
+    third-party packages it imports directly, and its heaviest nested imports.
+    """
+    code = _IMPORT_CODE.format(
+        root=PROJECT_ROOT, pages=os.path.join(PROJECT_ROOT, "pages"), module=module
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = _parse_importtime(proc.stderr)
+    total_us = next(cum for name, _, cum, _ in reversed(rows) if name == module)
+    own_us, third_party = _split(rows, module)
+    # Direct children of the entry point's subtree are the useful culprits
+    heaviest = sorted(
+        ((name, cum) for name, _, cum, depth in rows if depth == 1 and name != module),
+        key=lambda x: -x[1],
+    )[:5]
+    return own_us / 1000.0, total_us / 1000.0, sorted(third_party), [(n, c / 1000.0) for n, c in heaviest]
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or "unknown"
+
+
+def machine_metadata() -> dict:
+    packages = {}
+    for name in PACKAGES:
+        try:
+            packages[name] = version(name)
+        except PackageNotFoundError:
+            packages[name] = None
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "packages": packages,
+    }
+
+
+def _same_machine(a: dict, b: dict) -> bool:
+    keys = ("platform", "python", "cpu", "cpu_count", "packages")
+    return all(a.get(k) == b.get(k) for k in keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--update", action="store_true",
+                        help="Record current timings (x --headroom) and imports as the new budget.")
+    parser.add_argument("--headroom", type=float, default=2.0)
+    args = parser.parse_args()
+
+    baseline = {"machine": {}, "entry_points": {}}
+    if os.path.exists(BUDGET_PATH):
+        with open(BUDGET_PATH) as f:
+            baseline.update(json.load(f))
+    machine = machine_metadata()
+    gate_times = _same_machine(machine, baseline["machine"])
+    if baseline["machine"] and not gate_times and not args.update:
+        print("note: budgets were recorded on a different machine/environment; "
+              "timings are reported only (re-baseline with --update)")
+
+    results = {}
+    failed = []
+    print(f"{'entry point':<34s} {'own':>8s}     {'budget':>8s}     {'total':>8s}")
+    for module in ENTRY_POINTS:
+        runs = [measure(module) for _ in range(args.repeats)]
+        own_ms, total_ms, third_party, heaviest = min(runs, key=lambda r: r[0])
+        results[module] = {"own_ms": own_ms, "third_party": third_party}
+
+        budget = baseline["entry_points"].get(module, {})
+        own_budget = budget.get("own_ms")
+        over = gate_times and own_budget is not None and own_ms > own_budget
+        new_imports = sorted(set(third_party) - set(budget.get("third_party", third_party)))
+        status = "OVER" if over else ("NEW IMPORTS" if new_imports else "ok")
+        budget_str = f"{own_budget:8.0f}" if own_budget is not None else "       -"
+        print(f"{module:<34s} {own_ms:8.0f} ms  {budget_str} ms  {total_ms:8.0f} ms  {status}")
+        if new_imports:
+            print(f"    imports {', '.join(new_imports)} at startup")
+        if over or new_imports:
+            failed.append(module)
+            for name, child_ms in heaviest:
+                print(f"    {name:<40s} {child_ms:8.0f} ms")
+
+    if args.update:
+        baseline = {
+            "machine": machine,
+            "entry_points": {
+                m: {"own_ms": round(max(r["own_ms"] * args.headroom, r["own_ms"] + MIN_SLACK_MS)),
+                    "third_party": r["third_party"]}
+                for m, r in results.items()
+            },
+        }
+        with open(BUDGET_PATH, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Budgets written to {BUDGET_PATH}")
+        return
+
+    if failed:
+        print(f"\nImport budget exceeded for: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
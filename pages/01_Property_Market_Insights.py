@@ -1,22 +1,90 @@
-import pandas as pd
-import plotly.express as px
+import math
+import os
+import sys
+
 import streamlit as st
 
-# ------------------------------------
-# Page config (controls browser tab title)
-# Sidebar label is controlled by the file name in /pages/
-# ------------------------------------
-st.set_page_config(page_title="Property Market Insights", layout="wide")
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.app.charting import hist_figure  # noqa: E402
+from src.app.filter_index import load_filter_index  # noqa: E402
+from src.app.market_cube import ROW_COLUMNS, load_market_cube  # noqa: E402
+from src.app.score_table import DEFAULT_K, RANKINGS, TOP_K, open_score_table  # noqa: E402
+from src.data.load_data import load_dataset  # noqa: E402
+from src.models import registry  # noqa: E402
 
-st.title("🏡 Property Market Insights Dashboard")
+RANKING_LABELS = {
+    "undervalued": "Most undervalued (model fair price vs. asking)",
+    "good_investment": "Highest good-investment probability",
+}
+
+# plotly is imported lazily inside main(): it is only needed once the
+# charts render, and importing this module must stay cheap.
 
 # ------------------------------------
 # Helpers
 # ------------------------------------
-@st.cache_data
-def load_data():
-    # Full dataset from repo (make sure this file exists in Streamlit Cloud)
-    return pd.read_csv("data/processed/india_housing_with_targets.csv")
+@st.cache_resource
+def load_cube():
+    # Pre-aggregated counts/sums over City x Property_Type x BHK x binned
+    # price/size/age (src/app/market_cube.py). Built once from the dataset
+    # (make sure it exists in Streamlit Cloud) and persisted under
+    # data/cache/; every filter change is answered from the cube.
+    return load_market_cube()
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def query_cube(city, property_type, bhk, price_range, size_range, age_range, good_only):
+    # One cached CubeResult per filter state: revisiting a state (or any
+    # rerun that does not touch the filters) skips the query entirely.
+    # Only a narrowed slider needs the listings in the bins it cuts
+    # through, so the listings and their filter index are loaded on the
+    # first such query, never for the full-range default view.
+    cube = load_cube()
+    rows = index = None
+    if cube.narrows(price_range, size_range, age_range):
+        rows, index = load_listings()
+    return cube.query(
+        city=city,
+        property_type=property_type,
+        bhk=bhk,
+        price_range=price_range,
+        size_range=size_range,
+        age_range=age_range,
+        good_only=good_only,
+        index=index,
+        rows=rows,
+    )
+
+
+@st.cache_resource
+def load_listings():
+    # The columns the cube reads for partially covered bins (from the
+    # Arrow cache) + the filter index over them (src/app/filter_index.py)
+    return load_dataset(ROW_COLUMNS), load_filter_index()
+
+
+@st.cache_resource(show_spinner=False)
+def load_scores(versions):
+    # Both models' scores for every listing plus per-segment top-K row ids
+    # (src/app/score_table.py), memory-mapped from data/cache/. Only built
+    # by the offline job `python src/app/score_table.py`: the page never
+    # loads a model. None when the table is missing or stale. ``versions``
+    # (the registry's promoted versions) keys the cache, so promoting a
+    # model re-checks the table.
+    return open_score_table(versions=versions)
+
+
+def range_slider(label: str, edges, decimals: int = 0):
+    """Sidebar range slider over the full value range (edges[0] .. edges[-1])."""
+    scale = 10 ** decimals
+    lo = math.floor(float(edges[0]) * scale) / scale
+    hi = math.ceil(float(edges[-1]) * scale) / scale
+    if decimals == 0:
+        lo, hi = int(lo), int(hi)
+    return st.sidebar.slider(label, min_value=lo, max_value=hi, value=(lo, hi))
 
 
 def format_indian_number(n: int) -> str:
@@ -52,177 +120,165 @@ def format_inr(n: float, decimals: int = 0) -> str:
     return f"-₹ {s}" if neg else f"₹ {s}"
 
 
-def safe_mean(series: pd.Series, default: float = 0.0) -> float:
-    return float(series.mean()) if len(series) else default
-
-
-# ------------------------------------
-# Load data
-# ------------------------------------
-df = load_data()
-
-# Basic cleanup for safety
-df["City"] = df["City"].astype(str)
-df["Locality"] = df["Locality"].astype(str)
-df["Property_Type"] = df["Property_Type"].astype(str)
-df["BHK"] = df["BHK"].astype(str)
-
-# ------------------------------------
-# Sidebar Filters (dropdown with "All")
-# ------------------------------------
-st.sidebar.header("🔎 Filters")
-
-cities = ["All"] + sorted(df["City"].unique().tolist())
-types = ["All"] + sorted(df["Property_Type"].unique().tolist())
-bhks = ["All"] + sorted(df["BHK"].unique().tolist())
-
-sel_city = st.sidebar.selectbox("City", cities, index=0)
-sel_type = st.sidebar.selectbox("Property Type", types, index=0)
-sel_bhk = st.sidebar.selectbox("BHK", bhks, index=0)
-
-price_min, price_max = float(df["Price_in_Lakhs"].min()), float(df["Price_in_Lakhs"].max())
-size_min, size_max = int(df["Size_in_SqFt"].min()), int(df["Size_in_SqFt"].max())
-age_min, age_max = int(df["Age_of_Property"].min()), int(df["Age_of_Property"].max())
-
-price_range = st.sidebar.slider(
-    "Asking Price (₹ Lakhs)",
-    min_value=float(round(price_min, 2)),
-    max_value=float(round(price_max, 2)),
-    value=(float(round(price_min, 2)), float(round(price_max, 2))),
-)
-
-size_range = st.sidebar.slider(
-    "Size (SqFt)",
-    min_value=int(size_min),
-    max_value=int(size_max),
-    value=(int(size_min), int(size_max)),
-)
-
-age_range = st.sidebar.slider(
-    "Age of Property (Years)",
-    min_value=int(age_min),
-    max_value=int(age_max),
-    value=(int(age_min), int(age_max)),
-)
-
-good_only = st.sidebar.checkbox("Show only Good Investments", value=False)
-
-# ------------------------------------
-# Apply filters (defaults show FULL DATA)
-# ------------------------------------
-df_f = df.copy()
-
-if sel_city != "All":
-    df_f = df_f[df_f["City"] == sel_city]
-
-if sel_type != "All":
-    df_f = df_f[df_f["Property_Type"] == sel_type]
-
-if sel_bhk != "All":
-    df_f = df_f[df_f["BHK"] == sel_bhk]
-
-df_f = df_f[df_f["Price_in_Lakhs"].between(*price_range)]
-df_f = df_f[df_f["Size_in_SqFt"].between(*size_range)]
-df_f = df_f[df_f["Age_of_Property"].between(*age_range)]
-
-if good_only:
-    df_f = df_f[df_f["Good_Investment"] == 1]
-
 # ------------------------------------
-# Make KPI cards bigger + cleaner (no "Key Metrics" heading)
-# ------------------------------------
-st.markdown(
-    """
-    <style>
-    /* Make metric values bigger */
-    div[data-testid="stMetricValue"] { font-size: 2.1rem; font-weight: 800; }
-    div[data-testid="stMetricLabel"] { font-size: 1.05rem; font-weight: 650; opacity: 0.9; }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
-
-avg_price_lakhs = safe_mean(df_f["Price_in_Lakhs"])
-avg_rs_sqft = safe_mean(df_f["calc_price_per_sqft"])
-good_rate = safe_mean(df_f["Good_Investment"]) * 100.0
-listings = int(len(df_f))
-
-c1, c2, c3, c4 = st.columns(4)
-c1.metric("Average Price", f"₹ {avg_price_lakhs:.1f} Lakhs")
-c2.metric("Avg Price / SqFt", f"{format_inr(avg_rs_sqft, 0)}")
-c3.metric("Good Investment Rate", f"{good_rate:.1f}%")
-c4.metric("Listings", format_indian_number(listings))
-
-st.markdown("---")
-
+# Page
 # ------------------------------------
-# Charts (use FILTERED df_f everywhere)
-# ------------------------------------
-
-# 1) Price Distribution
-st.subheader("💰 Price Distribution (₹ Lakhs)")
-fig = px.histogram(
-    df_f,
-    x="Price_in_Lakhs",
-    nbins=50,
-)
-st.plotly_chart(fig, use_container_width=True)
-
-# 2) Avg Rs/sqft by City (Top 15 to keep readable)
-st.subheader("📍 Average Price per SqFt by City (Top 15)")
-city_price = (
-    df_f.groupby("City")["calc_price_per_sqft"]
-    .mean()
-    .reset_index()
-    .sort_values("calc_price_per_sqft", ascending=False)
-    .head(15)
-)
-fig = px.bar(
-    city_price,
-    x="City",
-    y="calc_price_per_sqft",
-)
-st.plotly_chart(fig, use_container_width=True)
-
-# 3) Property Type Distribution
-st.subheader("🏡 Property Type Share")
-type_counts = df_f["Property_Type"].value_counts().reset_index()
-type_counts.columns = ["Property_Type", "Count"]
-fig = px.pie(
-    type_counts,
-    names="Property_Type",
-    values="Count",
-)
-st.plotly_chart(fig, use_container_width=True)
-
-# 4) Age of Property Distribution
-st.subheader("⏳ Age of Property Distribution (Years)")
-fig = px.histogram(
-    df_f,
-    x="Age_of_Property",
-    nbins=30,
-)
-st.plotly_chart(fig, use_container_width=True)
-
-# 5) Good Investment Rate by Property Type
-st.subheader("⭐ Good Investment Rate by Property Type")
-gi_type = df_f.groupby("Property_Type")["Good_Investment"].mean().reset_index()
-gi_type["Good_Investment"] = gi_type["Good_Investment"] * 100
-fig = px.bar(
-    gi_type,
-    x="Property_Type",
-    y="Good_Investment",
-)
-st.plotly_chart(fig, use_container_width=True)
-
-# 6) Good Investment Rate by City (Top 15)
-st.subheader("🏙️ Good Investment Rate by City (Top 15)")
-gi_city = df_f.groupby("City")["Good_Investment"].mean().reset_index()
-gi_city["Good_Investment"] = gi_city["Good_Investment"] * 100
-gi_city = gi_city.sort_values("Good_Investment", ascending=False).head(15)
-fig = px.bar(
-    gi_city,
-    x="City",
-    y="Good_Investment",
-)
-st.plotly_chart(fig, use_container_width=True)
+def main():
+    # ------------------------------------
+    # Page config (controls browser tab title)
+    # Sidebar label is controlled by the file name in /pages/
+    # ------------------------------------
+    st.set_page_config(page_title="Property Market Insights", layout="wide")
+
+    st.title("🏡 Property Market Insights Dashboard")
+
+    # ------------------------------------
+    # Load aggregate cube
+    # ------------------------------------
+    cube = load_cube()
+
+    # ------------------------------------
+    # Sidebar Filters (dropdown with "All")
+    # ------------------------------------
+    st.sidebar.header("🔎 Filters")
+
+    cities = ["All"] + sorted(cube.categories["City"])
+    types = ["All"] + sorted(cube.categories["Property_Type"])
+    bhks = ["All"] + sorted(cube.categories["BHK"])
+
+    sel_city = st.sidebar.selectbox("City", cities, index=0)
+    sel_type = st.sidebar.selectbox("Property Type", types, index=0)
+    sel_bhk = st.sidebar.selectbox("BHK", bhks, index=0)
+
+    price_range = range_slider("Asking Price (₹ Lakhs)", cube.edges["Price_in_Lakhs"], decimals=2)
+    size_range = range_slider("Size (SqFt)", cube.edges["Size_in_SqFt"])
+    age_range = range_slider("Age of Property (Years)", cube.edges["Age_of_Property"])
+
+    good_only = st.sidebar.checkbox("Show only Good Investments", value=False)
+
+    # ------------------------------------
+    # Query the cube (defaults show FULL DATA)
+    # ------------------------------------
+    res = query_cube(sel_city, sel_type, sel_bhk, price_range, size_range, age_range, good_only)
+
+    # ------------------------------------
+    # Make KPI cards bigger + cleaner (no "Key Metrics" heading)
+    # ------------------------------------
+    st.markdown(
+        """
+        <style>
+        /* Make metric values bigger */
+        div[data-testid="stMetricValue"] { font-size: 2.1rem; font-weight: 800; }
+        div[data-testid="stMetricLabel"] { font-size: 1.05rem; font-weight: 650; opacity: 0.9; }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    avg_price_lakhs = res.avg_price_lakhs
+    avg_rs_sqft = res.avg_price_per_sqft
+    good_rate = res.good_rate * 100.0
+    listings = res.listings
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Average Price", f"₹ {avg_price_lakhs:.1f} Lakhs")
+    c2.metric("Avg Price / SqFt", f"{format_inr(avg_rs_sqft, 0)}")
+    c3.metric("Good Investment Rate", f"{good_rate:.1f}%")
+    c4.metric("Listings", format_indian_number(listings))
+
+    st.markdown("---")
+
+    # ------------------------------------
+    # Charts (all from the same filtered cube query). Histograms are
+    # pre-binned server-side: only bin edges + counts reach the browser.
+    # ------------------------------------
+    import plotly.express as px
+
+    # 1) Price Distribution
+    st.subheader("💰 Price Distribution (₹ Lakhs)")
+    fig = hist_figure(res.price_hist, "Price_in_Lakhs")
+    st.plotly_chart(fig, use_container_width=True)
+
+    # 2) Avg Rs/sqft by City (Top 15 to keep readable)
+    st.subheader("📍 Average Price per SqFt by City (Top 15)")
+    fig = px.bar(
+        res.city_price_per_sqft,
+        x="City",
+        y="calc_price_per_sqft",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # 3) Property Type Distribution
+    st.subheader("🏡 Property Type Share")
+    fig = px.pie(
+        res.type_counts,
+        names="Property_Type",
+        values="Count",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # 4) Age of Property Distribution
+    st.subheader("⏳ Age of Property Distribution (Years)")
+    fig = hist_figure(res.age_hist, "Age_of_Property")
+    st.plotly_chart(fig, use_container_width=True)
+
+    # 5) Good Investment Rate by Property Type
+    st.subheader("⭐ Good Investment Rate by Property Type")
+    fig = px.bar(
+        res.good_rate_by_type,
+        x="Property_Type",
+        y="Good_Investment",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # 6) Good Investment Rate by City (Top 15)
+    st.subheader("🏙️ Good Investment Rate by City (Top 15)")
+    fig = px.bar(
+        res.good_rate_by_city,
+        x="City",
+        y="Good_Investment",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # ------------------------------------
+    # Model-ranked listings (offline scores, per-segment top-K)
+    # ------------------------------------
+    st.subheader("🏆 Model-Ranked Listings")
+    r1, r2 = st.columns([3, 1])
+    ranking = r1.selectbox("Rank by", list(RANKINGS), format_func=RANKING_LABELS.get)
+    k = r2.number_input("Top", min_value=1, max_value=TOP_K, value=DEFAULT_K, step=10)
+    try:
+        scores = load_scores(registry.current_versions())
+        ranked = None if scores is None else scores.ranked(ranking, sel_city, sel_type, sel_bhk, k=int(k))
+    except Exception as e:
+        st.warning(f"Model rankings unavailable: {e}")
+    else:
+        if ranked is None:
+            load_scores.clear()  # look again on the next rerun
+            st.info(
+                "Model rankings are not built for the current dataset and models yet. "
+                "Run `python src/app/score_table.py` to build them."
+            )
+        else:
+            st.caption(
+                f"Top {len(ranked)} listings for the selected City / Property Type / BHK, "
+                "scored offline by the classification and price models "
+                "(the price, size and age sliders do not apply)."
+            )
+            st.dataframe(
+                ranked,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Price_in_Lakhs": st.column_config.NumberColumn("Asking (₹ Lakhs)", format="%.2f"),
+                    "good_investment_prob": st.column_config.NumberColumn("P(good)", format="%.3f"),
+                    "predicted_price_lakhs": st.column_config.NumberColumn("Fair price (₹ Lakhs)", format="%.2f"),
+                    "valuation_gap_lakhs": st.column_config.NumberColumn("Gap (₹ Lakhs)", format="%.2f"),
+                    "valuation_gap_pct": st.column_config.NumberColumn("Gap (%)", format="%.1f%%"),
+                },
+            )
+
+
+# Streamlit executes page scripts as __main__
+if __name__ == "__main__":
+    main()
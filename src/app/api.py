@@ -0,0 +1,307 @@
+import asyncio
+import contextlib
+import math
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+# -------------------------------------------------------------------
+# 1) Ensure project root is on sys.path
+# -------------------------------------------------------------------
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.models.metrics import DEFAULT_EXPORT_INTERVAL_S, MetricsExporter, get_metrics  # noqa: E402
+from src.models.predict import (  # noqa: E402
+    CAT_FEATURES,
+    NUM_FEATURES,
+    current_models,
+    get_prediction_cache,
+    predict_properties_batch,
+    start_model_watcher,
+    stop_model_watcher,
+)
+
+# -------------------------------------------------------------------
+# 2) Defaults
+# -------------------------------------------------------------------
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT_MS = 5.0
+
+
+def _rows_to_results(preds: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert batch predictions to the JSON shape of predict_property_investment."""
+    return [
+        {
+            "good_investment_label": int(label),
+            "good_investment_prob": float(prob),
+            "predicted_price_lakhs": float(price),
+        }
+        for label, prob, price in zip(
+            preds["good_investment_label"],
+            preds["good_investment_prob"],
+            preds["predicted_price_lakhs"],
+        )
+    ]
+
+
+def _invalid_reason(features: Dict[str, Any]) -> Optional[str]:
+    """
+    Why ``features`` cannot be scored, or None. Unparseable numbers are fine
+    (build_features makes them missing), but infinities (JSON ``1e999``)
+    make the scaler reject the whole batch, and nested values have no
+    feature encoding.
+    """
+    for name in NUM_FEATURES + CAT_FEATURES:
+        value = features.get(name)
+        if isinstance(value, (dict, list)):
+            return f"{name} must be a number or string, got {type(value).__name__}."
+        if name in NUM_FEATURES and isinstance(value, (int, float, str)) and not isinstance(value, bool):
+            try:
+                number = float(value)
+            except (TypeError, ValueError, OverflowError):
+                continue
+            if math.isinf(number):
+                return f"{name} must be finite."
+    return None
+
+
+# -------------------------------------------------------------------
+# 3) Micro-batcher: coalesce concurrent single requests
+# -------------------------------------------------------------------
+class MicroBatcher:
+    """
+    Collect concurrent single-property requests into micro-batches.
+
+    The first queued request opens a window of ``max_wait_ms``; everything
+    arriving inside it (up to ``max_batch_size``) is scored with one call to
+    ``score_fn`` in a worker thread, so the event loop keeps accepting
+    requests while the pipelines run. If that call fails, each record of
+    the batch is scored on its own, so only the ones that fail alone get
+    the error.
+
+    Parameters
+    ----------
+    score_fn : callable
+        Takes a list of feature dicts, returns a predictions DataFrame
+        (``predict_properties_batch`` by default).
+    max_batch_size : int
+        Upper bound on rows per scoring call.
+    max_wait_ms : float
+        How long the first request of a batch waits for company.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[List[Dict[str, Any]]], pd.DataFrame] = predict_properties_batch,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue = None
+        self._task: asyncio.Task = None
+        self._batch: list = []  # (features, future) pairs being scored
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        # Fail the batch being scored and anything still queued instead of
+        # leaving callers hanging
+        pending = list(self._batch)
+        self._batch = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, fut in pending:
+            if not fut.done():
+                fut.set_exception(RuntimeError("Micro-batcher stopped."))
+
+    async def submit(self, features: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue one property and wait for its prediction."""
+        if self._task is None:
+            raise RuntimeError("Micro-batcher is not running; call start() first.")
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, fut))
+        return await fut
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_s
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _score_each(self, records: List[Dict[str, Any]]) -> list:
+        """(result, None) or (None, exception) per record, scored one by one."""
+        outcomes = []
+        for record in records:
+            try:
+                outcomes.append((_rows_to_results(self.score_fn([record]))[0], None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = batch = await self._collect()
+            records = [features for features, _ in batch]
+            try:
+                preds = await loop.run_in_executor(None, self.score_fn, records)
+                outcomes = [(result, None) for result in _rows_to_results(preds)]
+            except Exception as e:
+                if len(batch) == 1:
+                    outcomes = [(None, e)]
+                else:
+                    # One bad record fails the whole call: isolate it
+                    outcomes = await loop.run_in_executor(None, self._score_each, records)
+
+            for (_, fut), (result, error) in zip(batch, outcomes):
+                if fut.done():
+                    continue
+                if error is not None:
+                    fut.set_exception(error)
+                else:
+                    fut.set_result(result)
+            self._batch = []
+
+
+# -------------------------------------------------------------------
+# 4) ASGI app
+# -------------------------------------------------------------------
+def create_app(
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    score_fn: Callable[[List[Dict[str, Any]]], pd.DataFrame] = predict_properties_batch,
+    watch_models: bool = True,
+    metrics_file: str = None,
+    log_metrics: bool = False,
+    metrics_interval_s: float = DEFAULT_EXPORT_INTERVAL_S,
+) -> Starlette:
+    """
+    Build the inference service.
+
+    With ``watch_models`` a background thread hot-swaps newly promoted
+    model versions (see ``src.models.registry``) while the app runs.
+    Every ``metrics_interval_s`` seconds the prediction metrics are written
+    to ``metrics_file`` (Prometheus text) and/or, with ``log_metrics``,
+    printed to stderr as one JSON line.
+
+    Endpoints
+    ---------
+    POST /predict        one feature dict -> one result dict (micro-batched)
+    POST /predict_batch  list of feature dicts -> {"results": [...]}
+    GET  /health         liveness probe + live model versions
+    GET  /metrics        cache counters + per-stage latency histograms (Prometheus text)
+    """
+    batcher = MicroBatcher(score_fn, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    exporter = None
+    if metrics_file or log_metrics:
+        exporter = MetricsExporter(metrics_interval_s, path=metrics_file, log=log_metrics)
+
+    async def predict(request: Request) -> JSONResponse:
+        try:
+            features = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "Body must be JSON."}, status_code=400)
+        if not isinstance(features, dict):
+            return JSONResponse({"error": "Body must be a JSON object."}, status_code=400)
+        reason = _invalid_reason(features)
+        if reason is not None:
+            return JSONResponse({"error": reason}, status_code=400)
+
+        cache = get_prediction_cache()
+        generation = current_models().generation
+        key = cache.make_key(features)
+        result = cache.get(key)
+        if result is not None:
+            return JSONResponse(result)
+
+        try:
+            result = await batcher.submit(features)
+        except Exception as e:
+            return JSONResponse({"error": f"Prediction failed: {e}"}, status_code=500)
+        cache.put(key, result, generation=generation)
+        return JSONResponse(result)
+
+    async def predict_batch(request: Request) -> JSONResponse:
+        try:
+            records = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "Body must be JSON."}, status_code=400)
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            return JSONResponse({"error": "Body must be a JSON list of objects."}, status_code=400)
+        if not records:
+            return JSONResponse({"results": []})
+        for i, record in enumerate(records):
+            reason = _invalid_reason(record)
+            if reason is not None:
+                return JSONResponse({"error": f"Record {i}: {reason}"}, status_code=400)
+
+        loop = asyncio.get_running_loop()
+        try:
+            preds = await loop.run_in_executor(None, score_fn, records)
+        except Exception as e:
+            return JSONResponse({"error": f"Prediction failed: {e}"}, status_code=500)
+        return JSONResponse({"results": _rows_to_results(preds)})
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok", "models": current_models().versions})
+
+    async def metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(get_prediction_cache().prometheus_text() + get_metrics().prometheus_text())
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        await batcher.start()
+        if watch_models:
+            start_model_watcher()
+        if exporter is not None:
+            exporter.start()
+        try:
+            yield
+        finally:
+            if exporter is not None:
+                exporter.stop()
+            if watch_models:
+                stop_model_watcher()
+            await batcher.stop()
+
+    app = Starlette(
+        routes=[
+            Route("/predict", predict, methods=["POST"]),
+            Route("/predict_batch", predict_batch, methods=["POST"]),
+            Route("/health", health, methods=["GET"]),
+            Route("/metrics", metrics, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+    app.state.batcher = batcher
+    return app
+
+
+# Run with: uvicorn src.app.api:app --host 0.0.0.0 --port 8000
+app = create_app()
@@ -0,0 +1,208 @@
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# plotly is imported lazily (only by the figure helpers): the data-reduction
+# functions here are also used outside the dashboard.
+
+# Default point budget for scatter-style views
+DEFAULT_MAX_POINTS = 2000
+
+
+# -------------------------------------------------------------------
+# Histograms: bins computed here, only edges + counts go to the browser
+# -------------------------------------------------------------------
+def histogram(
+    values: np.ndarray,
+    bins: int = 50,
+    value_range: Optional[Tuple[float, float]] = None,
+) -> pd.DataFrame:
+    """
+    Bin ``values`` with NumPy. Returns one row per bin:
+    bin_start, bin_end, count. NaNs are ignored.
+
+    The Market Insights histograms of a range-filtered selection are built
+    with this (``MarketCube.query``), on the cube's stored bin edges.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if value_range is None and len(values) == 0:
+        value_range = (0.0, 1.0)
+    counts, edges = np.histogram(values, bins=bins, range=value_range)
+    return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": counts})
+
+
+def hist_figure(hist: pd.DataFrame, x_label: str):
+    """Bar chart of pre-binned counts, drawn like a histogram."""
+    import plotly.express as px
+
+    mids = (hist["bin_start"] + hist["bin_end"]) / 2
+    fig = px.bar(
+        x=mids,
+        y=hist["count"],
+        labels={"x": x_label, "y": "count"},
+    )
+    fig.update_traces(width=(hist["bin_end"] - hist["bin_start"]).tolist())
+    fig.update_layout(bargap=0)
+    return fig
+
+
+# -------------------------------------------------------------------
+# Downsampling for scatter / line views
+# -------------------------------------------------------------------
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of ``n_out`` points that keep the
+    visual shape of the (x-sorted) series. First and last points are kept.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n - 2 interior points split into n_out - 2 buckets
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = bounds[i], bounds[i + 1]
+        # Average of the next bucket (or the last point) is the third vertex
+        if i + 2 < len(bounds):
+            nxt = slice(bounds[i + 1], bounds[i + 2])
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        bx, by = x[start:stop], y[start:stop]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def reservoir_sample(chunks: Iterable[np.ndarray], k: int, seed: int = 0) -> np.ndarray:
+    """
+    Uniform sample of ``k`` items from a stream of arrays (Algorithm R,
+    vectorised per chunk), so the full population never has to be in memory.
+    """
+    rng = np.random.default_rng(seed)
+    reservoir = None
+    seen = 0
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        if reservoir is None:
+            reservoir = np.empty(k, dtype=chunk.dtype)
+        take = min(max(k - seen, 0), len(chunk))
+        reservoir[seen:seen + take] = chunk[:take]
+        rest = chunk[take:]
+        if len(rest):
+            # Item t (0-based over the whole stream) replaces slot j ~ U[0, t]
+            t = np.arange(seen + take, seen + len(chunk))
+            j = rng.integers(0, t + 1)
+            keep = j < k
+            slots, items = j[keep], rest[keep]
+            # NumPy does not define which write wins for repeated indices;
+            # Algorithm R needs the last item per slot, so keep only that one
+            slots, last = np.unique(slots[::-1], return_index=True)
+            reservoir[slots] = items[::-1][last]
+        seen += len(chunk)
+    if reservoir is None:
+        return np.empty(0)
+    return reservoir[:min(k, seen)]
+
+
+def downsample(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    max_points: int = DEFAULT_MAX_POINTS,
+    method: str = "lttb",
+    seed: int = 0,
+    chunk_size: int = 100_000,
+) -> pd.DataFrame:
+    """
+    At most ``max_points`` rows of ``df`` for an x/y chart.
+
+    ``method="lttb"`` sorts by ``x`` and keeps the shape-defining points (for
+    line-like views); ``method="reservoir"`` keeps a uniform random sample
+    (for scatter clouds, where density matters more than extremes).
+    """
+    if len(df) <= max_points:
+        return df
+    if method == "lttb":
+        order = np.argsort(df[x].to_numpy(), kind="stable")
+        keep = order[lttb_indices(df[x].to_numpy()[order], df[y].to_numpy()[order], max_points)]
+    elif method == "reservoir":
+        row_ids = (
+            np.arange(start, min(start + chunk_size, len(df)))
+            for start in range(0, len(df), chunk_size)
+        )
+        keep = np.sort(reservoir_sample(row_ids, max_points, seed))
+    else:
+        raise ValueError(f"Unknown downsampling method {method!r}; use 'lttb' or 'reservoir'.")
+    return df.iloc[keep]
+
+
+# -------------------------------------------------------------------
+# What-if heatmaps: the whole scenario grid goes to the browser once,
+# the price slider switches between precomputed frames client-side
+# -------------------------------------------------------------------
+SCENARIO_VALUES = {
+    "good_prob": ("P(good investment)", "Viridis"),
+    "valuation_gap": ("Fair − asking price (₹ Lakhs)", "RdYlGn"),
+}
+
+
+def scenario_figure(grid, value: str = "good_prob", asking_price: Optional[float] = None):
+    """
+    Growth x horizon heatmap of a ``ScenarioGrid`` (src/models/scenarios.py),
+    one animation frame per asking price. Starts on the price closest to
+    ``asking_price`` (default: the middle of the price axis).
+    """
+    import plotly.graph_objects as go
+
+    if value not in SCENARIO_VALUES:
+        raise ValueError(f"Unknown scenario value {value!r}; use one of {sorted(SCENARIO_VALUES)}.")
+    title, colorscale = SCENARIO_VALUES[value]
+    z = getattr(grid, value)  # (P, G, H)
+    if value == "valuation_gap":
+        bound = float(np.abs(z).max()) or 1.0
+        zrange = {"zmin": -bound, "zmax": bound}
+    else:
+        zrange = {"zmin": 0.0, "zmax": 1.0}
+
+    labels = [f"₹ {p:,.0f} L" for p in grid.prices]
+    if asking_price is None:
+        start = len(grid.prices) // 2
+    else:
+        start = int(np.argmin(np.abs(grid.prices - asking_price)))
+
+    def heatmap(i):
+        return go.Heatmap(
+            x=grid.horizons, y=grid.growth_pct, z=z[i],
+            colorscale=colorscale, colorbar={"title": title}, **zrange,
+            hovertemplate="horizon %{x} y<br>growth %{y:.1f} %<br>%{z:.3f}<extra></extra>",
+        )
+
+    fig = go.Figure(
+        data=[heatmap(start)],
+        frames=[go.Frame(data=[heatmap(i)], name=labels[i]) for i in range(len(labels))],
+    )
+    fig.update_layout(
+        xaxis_title="Investment horizon (years)",
+        yaxis_title="Annual growth rate (%)",
+        sliders=[{
+            "active": start,
+            "currentvalue": {"prefix": "Asking price: "},
+            "steps": [
+                {"label": label, "method": "animate",
+                 "args": [[label], {"mode": "immediate", "frame": {"duration": 0, "redraw": True},
+                                    "transition": {"duration": 0}}]}
+                for label in labels
+            ],
+        }],
+    )
+    return fig
@@ -0,0 +1,249 @@
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.data.load_data import CACHE_DIR, DATA_PATH, dataset_fingerprint, load_dataset  # noqa: E402
+
+# -------------------------------------------------------------------
+# Index layout
+# -------------------------------------------------------------------
+# Comparables share these exactly ...
+PARTITION_COLUMNS = ["City", "Property_Type", "BHK"]
+# ... and are ranked by distance over these, each scaled to unit variance
+DISTANCE_COLUMNS = ["Size_in_SqFt", "Age_of_Property", "calc_price_per_sqft"]
+# Returned alongside (besides Locality)
+DISPLAY_COLUMNS = ["ID", "Price_in_Lakhs", "Size_in_SqFt", "Age_of_Property",
+                   "calc_price_per_sqft", "Good_Investment"]
+# Stored as float64 with the rest, returned as integers
+_INTEGER_COLUMNS = {"ID", "Size_in_SqFt", "Age_of_Property", "Good_Investment"}
+
+INDEX_COLUMNS = list(dict.fromkeys(PARTITION_COLUMNS + ["Locality"] + DISTANCE_COLUMNS + DISPLAY_COLUMNS))
+
+DEFAULT_K = 5
+
+# Bump when the stored layout changes
+INDEX_VERSION = 1
+
+_ARRAYS = ("offsets", "points", "display", "locality")
+
+# Inside the index directory: one subdirectory per saved version and a
+# pointer file naming the current one
+CURRENT_FILENAME = "CURRENT"
+
+
+def _current_dir(path: str) -> Optional[str]:
+    """Version directory ``path/CURRENT`` points at, or None if there is none."""
+    try:
+        with open(os.path.join(path, CURRENT_FILENAME)) as f:
+            version_dir = os.path.join(path, f.read().strip())
+    except FileNotFoundError:
+        return None
+    return version_dir if os.path.isdir(version_dir) else None
+
+
+class ComparablesIndex:
+    """
+    k-nearest-listing search within one City x Property_Type x BHK segment.
+
+    Rows are stored grouped by segment, so a segment is the contiguous slice
+    ``offsets[i]:offsets[i + 1]`` of every array. A query looks the segment up
+    in a dict and ranks only that slice: one vectorised distance pass plus
+    ``argpartition`` over a few hundred rows (≈ rows / 630 on the real data),
+    which is cheaper than walking a KD-tree at this size and needs no
+    pointer-based structure. The arrays are plain ``.npy`` files opened with
+    ``mmap_mode="r"``: loading costs no reads, and a query touches only the
+    pages of its own segment.
+    """
+
+    def __init__(
+        self,
+        segments: List[Tuple[str, str, str]],
+        localities: List[str],
+        mean: np.ndarray,
+        scale: np.ndarray,
+        offsets: np.ndarray,
+        points: np.ndarray,
+        display: np.ndarray,
+        locality: np.ndarray,
+    ):
+        self.segments = [tuple(s) for s in segments]
+        self.localities = localities
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.offsets = offsets      # (n_segments + 1,) row offsets
+        self.points = points        # (n, len(DISTANCE_COLUMNS)) scaled, float32
+        self.display = display      # (n, len(DISPLAY_COLUMNS)) float64
+        self.locality = locality    # (n,) codes into ``localities``
+        self._segment_ids = {s: i for i, s in enumerate(self.segments)}
+
+    @property
+    def n_rows(self) -> int:
+        return int(self.offsets[-1])
+
+    # ---------------------------------------------------------------
+    # Build / persist
+    # ---------------------------------------------------------------
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "ComparablesIndex":
+        keys = pd.DataFrame({c: df[c].astype(str) for c in PARTITION_COLUMNS})
+        seg_codes, seg_uniques = pd.MultiIndex.from_frame(keys).factorize(sort=True)
+        order = np.argsort(seg_codes, kind="stable")
+        counts = np.bincount(seg_codes, minlength=len(seg_uniques))
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        raw = df[DISTANCE_COLUMNS].to_numpy(dtype=np.float64)
+        mean = np.nanmean(raw, axis=0)
+        scale = np.nanstd(raw, axis=0)
+        scale[~(scale > 0)] = 1.0
+        # Missing values sit at the mean: they neither attract nor repel
+        points = np.nan_to_num((raw - mean) / scale)[order].astype(np.float32)
+
+        locality = pd.Categorical(df["Locality"].astype(str))
+        return cls(
+            segments=list(seg_uniques),
+            localities=[str(c) for c in locality.categories],
+            mean=mean,
+            scale=scale,
+            offsets=offsets,
+            points=np.ascontiguousarray(points),
+            display=df[DISPLAY_COLUMNS].to_numpy(dtype=np.float64)[order],
+            locality=locality.codes.astype(np.int32)[order],
+        )
+
+    def save(self, path: str, fingerprint: str = "") -> None:
+        """
+        Write a new version under the directory ``path`` and repoint
+        ``path/CURRENT`` at it with one atomic rename. Readers always see a
+        complete version; the previous one is kept (it may still be memory
+        mapped or about to be opened) and older ones are removed.
+        """
+        meta = {
+            "version": INDEX_VERSION,
+            "fingerprint": fingerprint,
+            "segments": [list(s) for s in self.segments],
+            "localities": self.localities,
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+        }
+        os.makedirs(path, exist_ok=True)
+        previous = _current_dir(path)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=path)
+        try:
+            for name in _ARRAYS:
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), getattr(self, name))
+            with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            version = "v-" + os.path.basename(tmp_dir)[len(".tmp-"):]
+            os.replace(tmp_dir, os.path.join(path, version))
+            pointer = os.path.join(path, CURRENT_FILENAME)
+            with open(pointer + ".tmp", "w") as f:
+                f.write(version)
+            os.replace(pointer + ".tmp", pointer)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        # Older versions (and files of the pre-pointer layout); in-progress
+        # saves are dot-prefixed and left alone
+        keep = {CURRENT_FILENAME, version, os.path.basename(previous or "")}
+        for entry in os.listdir(path):
+            if entry in keep or entry.startswith("."):
+                continue
+            stale = os.path.join(path, entry)
+            if os.path.isdir(stale):
+                shutil.rmtree(stale, ignore_errors=True)
+            else:
+                with contextlib.suppress(OSError):
+                    os.remove(stale)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["ComparablesIndex", Dict]:
+        """Memory-map the current version saved under ``path``."""
+        version_dir = _current_dir(path)
+        if version_dir is None:
+            raise FileNotFoundError(f"No saved comparables index in {path}")
+        with open(os.path.join(version_dir, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS}
+        index = cls(meta["segments"], meta["localities"], meta["mean"], meta["scale"], **arrays)
+        return index, meta
+
+    # ---------------------------------------------------------------
+    # Query
+    # ---------------------------------------------------------------
+    def query(
+        self,
+        city: str,
+        property_type: str,
+        bhk,
+        size_sqft: float,
+        age: float,
+        price_per_sqft: float,
+        k: int = DEFAULT_K,
+    ) -> pd.DataFrame:
+        """
+        The ``k`` listings of the same City / Property_Type / BHK closest in
+        size, age and price per sqft, nearest first. Columns:
+        ``DISPLAY_COLUMNS`` + Locality + distance (in standard deviations).
+        Empty when the segment has no listings.
+        """
+        seg = self._segment_ids.get((str(city), str(property_type), str(bhk)))
+        if seg is None:
+            return self._frame(np.empty(0, dtype=np.int64), np.empty(0))
+        start, stop = int(self.offsets[seg]), int(self.offsets[seg + 1])
+
+        q = (np.array([size_sqft, age, price_per_sqft], dtype=np.float64) - self.mean) / self.scale
+        diff = self.points[start:stop] - np.nan_to_num(q).astype(np.float32)
+        d2 = np.einsum("ij,ij->i", diff, diff)
+
+        k = min(k, len(d2))
+        nearest = np.argpartition(d2, k - 1)[:k] if k < len(d2) else np.arange(len(d2))
+        nearest = nearest[np.lexsort((nearest, d2[nearest]))]  # by distance, then row order
+        return self._frame(start + nearest, np.sqrt(d2[nearest].astype(np.float64)))
+
+    def _frame(self, rows: np.ndarray, distance: np.ndarray) -> pd.DataFrame:
+        values = np.asarray(self.display[rows])
+        columns = {
+            col: values[:, j].astype(np.int64) if col in _INTEGER_COLUMNS else values[:, j]
+            for j, col in enumerate(DISPLAY_COLUMNS)
+        }
+        columns = {
+            "ID": columns.pop("ID"),
+            "Locality": [self.localities[c] for c in self.locality[rows]],
+            **columns,
+            "distance": distance,
+        }
+        return pd.DataFrame(columns)
+
+
+# -------------------------------------------------------------------
+# Cached index for the advisor
+# -------------------------------------------------------------------
+def load_comparables_index(csv_path: str = DATA_PATH, cache_dir: str = CACHE_DIR) -> ComparablesIndex:
+    """
+    Memory-map the persisted index for the current dataset, building (and
+    saving) it first if the dataset changed.
+    """
+    fingerprint = json.dumps(
+        {"data": dataset_fingerprint(csv_path, cache_dir), "v": INDEX_VERSION}, sort_keys=True
+    )
+    path = os.path.join(cache_dir, "comparables")
+
+    if _current_dir(path) is not None:
+        index, meta = ComparablesIndex.load(path)
+        if meta.get("version") == INDEX_VERSION and meta.get("fingerprint") == fingerprint:
+            return index
+
+    index = ComparablesIndex.build(load_dataset(INDEX_COLUMNS, csv_path, cache_dir))
+    index.save(path, fingerprint)
+    return ComparablesIndex.load(path)[0]
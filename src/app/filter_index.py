@@ -0,0 +1,244 @@
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.data.load_data import CACHE_DIR, DATA_PATH, dataset_fingerprint, load_dataset  # noqa: E402
+
+# -------------------------------------------------------------------
+# Indexed columns (the dashboard's sidebar filters)
+# -------------------------------------------------------------------
+EQUALITY_COLUMNS = ["City", "Property_Type", "BHK", "Good_Investment"]
+RANGE_COLUMNS = ["Price_in_Lakhs", "Size_in_SqFt", "Age_of_Property"]
+
+# Bump when the stored layout changes
+INDEX_VERSION = 1
+
+Value = Union[str, int, float]
+
+
+class FilterIndex:
+    """
+    Row-id index for the dashboard's equality and range filters.
+
+    * Equality columns keep one packed bitmap (1 bit per row) per category,
+      so ``City == x AND Property_Type == y`` is a bitwise AND over n/8 bytes.
+    * Range columns keep the values sorted with the matching row order, so a
+      ``between`` filter is two ``searchsorted`` calls giving the exact
+      matching row ids, without scanning the column.
+
+    ``select`` combines both and returns sorted row ids; rows are only
+    materialised afterwards (``take``), never per filter step.
+    """
+
+    def __init__(
+        self,
+        n_rows: int,
+        categories: Dict[str, List[str]],
+        bitmaps: Dict[str, np.ndarray],
+        sorted_values: Dict[str, np.ndarray],
+        order: Dict[str, np.ndarray],
+        values: Dict[str, np.ndarray],
+    ):
+        self.n_rows = n_rows
+        self.categories = categories
+        self.bitmaps = bitmaps              # col -> (n_categories, ceil(n/8)) uint8
+        self.sorted_values = sorted_values  # col -> values in ascending order
+        self.order = order                  # col -> row ids in that order
+        self.values = values                # col -> values in row order
+
+    # ---------------------------------------------------------------
+    # Build / persist
+    # ---------------------------------------------------------------
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        equality_columns: Iterable[str] = EQUALITY_COLUMNS,
+        range_columns: Iterable[str] = RANGE_COLUMNS,
+    ) -> "FilterIndex":
+        n_rows = len(df)
+        categories, bitmaps = {}, {}
+        for col in equality_columns:
+            # Factorise the raw values; only the categories become strings
+            cat = pd.Categorical(df[col])
+            categories[col] = [str(c) for c in cat.categories]
+            bitmaps[col] = np.zeros((len(categories[col]), (n_rows + 7) // 8), dtype=np.uint8)
+            for i in range(len(categories[col])):
+                bitmaps[col][i] = np.packbits(cat.codes == i)
+
+        sorted_values, order, values = {}, {}, {}
+        for col in range_columns:
+            v = df[col].to_numpy(dtype=np.float64)
+            idx = np.argsort(v, kind="stable").astype(np.int32 if n_rows < 2**31 else np.int64)
+            values[col] = v
+            order[col] = idx
+            sorted_values[col] = v[idx]  # NaN sorts last, never inside a range
+
+        return cls(n_rows, categories, bitmaps, sorted_values, order, values)
+
+    def save(self, path: str, fingerprint: str = "") -> None:
+        meta = {
+            "version": INDEX_VERSION,
+            "fingerprint": fingerprint,
+            "n_rows": self.n_rows,
+            "categories": self.categories,
+            "range_columns": list(self.values),
+        }
+        arrays = {f"bitmap_{c}": b for c, b in self.bitmaps.items()}
+        for col in self.values:
+            arrays[f"order_{col}"] = self.order[col]
+            arrays[f"values_{col}"] = self.values[col]
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, meta=np.array(json.dumps(meta)), **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["FilterIndex", Dict]:
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            bitmaps = {c: data[f"bitmap_{c}"] for c in meta["categories"]}
+            order, values, sorted_values = {}, {}, {}
+            for col in meta["range_columns"]:
+                order[col] = data[f"order_{col}"]
+                values[col] = data[f"values_{col}"]
+                sorted_values[col] = values[col][order[col]]
+        index = cls(meta["n_rows"], meta["categories"], bitmaps, sorted_values, order, values)
+        return index, meta
+
+    # ---------------------------------------------------------------
+    # Primitives
+    # ---------------------------------------------------------------
+    def equals(self, col: str, value: Union[Value, Iterable[Value]]) -> np.ndarray:
+        """Packed bitmap of rows where ``col`` equals ``value`` (or any of a list)."""
+        values = [value] if isinstance(value, (str, int, float, np.generic)) else list(value)
+        out = np.zeros(self.bitmaps[col].shape[1], dtype=np.uint8)
+        for v in values:
+            try:
+                i = self.categories[col].index(str(v))
+            except ValueError:
+                continue  # unknown value matches nothing
+            np.bitwise_or(out, self.bitmaps[col][i], out=out)
+        return out
+
+    def range_bounds(self, col: str, lo: float, hi: float) -> Tuple[int, int]:
+        """[start, stop) into the sorted order of rows with lo <= value <= hi."""
+        sorted_values = self.sorted_values[col]
+        return (
+            int(np.searchsorted(sorted_values, lo, side="left")),
+            int(np.searchsorted(sorted_values, hi, side="right")),
+        )
+
+    def between(self, col: str, lo: float, hi: float) -> np.ndarray:
+        """Sorted row ids with lo <= ``col`` <= hi (inclusive, like ``Series.between``)."""
+        start, stop = self.range_bounds(col, lo, hi)
+        return np.sort(self.order[col][start:stop])
+
+    def row_ids(self, bitmap: np.ndarray) -> np.ndarray:
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.n_rows))
+
+    # ---------------------------------------------------------------
+    # Composition
+    # ---------------------------------------------------------------
+    def select(
+        self,
+        equals: Optional[Dict[str, Union[Value, Iterable[Value]]]] = None,
+        ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Sorted row ids matching every filter, or None when no filter restricts
+        anything (i.e. all rows).
+
+        Parameters
+        ----------
+        equals : dict, optional
+            column -> value or list of values. ``None`` / ``"All"`` = no filter.
+        ranges : dict, optional
+            column -> (lo, hi), inclusive. Ranges covering every row are skipped.
+        """
+        # 1) Equality filters: AND of per-category bitmaps
+        mask = None
+        for col, value in (equals or {}).items():
+            if value is None or (isinstance(value, str) and value == "All"):
+                continue
+            bits = self.equals(col, value)
+            mask = bits if mask is None else np.bitwise_and(mask, bits, out=mask)
+
+        # 2) Range filters, most selective first; full-range ones are no-ops
+        active = []
+        for col, (lo, hi) in (ranges or {}).items():
+            start, stop = self.range_bounds(col, lo, hi)
+            if stop - start < self.n_rows:
+                active.append((stop - start, col, lo, hi))
+        active.sort()
+
+        if mask is None and not active:
+            return None
+
+        if mask is not None:
+            ids = self.row_ids(mask)
+        else:
+            _, col, lo, hi = active.pop(0)
+            ids = self.between(col, lo, hi)
+
+        # 3) Remaining ranges only ever touch the surviving candidates
+        for _, col, lo, hi in active:
+            if not len(ids):
+                break
+            v = self.values[col][ids]
+            ids = ids[(v >= lo) & (v <= hi)]
+        return ids
+
+    def restrict(
+        self,
+        ids: np.ndarray,
+        equals: Optional[Dict[str, Union[Value, Iterable[Value]]]] = None,
+        ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+    ) -> np.ndarray:
+        """The row ids of ``ids`` that match every filter (same filters as ``select``)."""
+        keep = np.ones(len(ids), dtype=bool)
+        for col, value in (equals or {}).items():
+            if value is None or (isinstance(value, str) and value == "All"):
+                continue
+            bits = self.equals(col, value)
+            # np.packbits is big-endian: row i is bit 7 - i % 8 of byte i // 8
+            keep &= ((bits[ids >> 3] >> (7 - (ids & 7))) & 1).astype(bool)
+        for col, (lo, hi) in (ranges or {}).items():
+            v = self.values[col][ids]
+            keep &= (v >= lo) & (v <= hi)
+        return ids[keep]
+
+    def take(self, df: pd.DataFrame, ids: Optional[np.ndarray]) -> pd.DataFrame:
+        """Materialise the selected rows of the frame the index was built from."""
+        return df if ids is None else df.iloc[ids]
+
+
+# -------------------------------------------------------------------
+# Cached index for the dashboard
+# -------------------------------------------------------------------
+def load_filter_index(csv_path: str = DATA_PATH, cache_dir: str = CACHE_DIR) -> FilterIndex:
+    """
+    Load the persisted index for the current dataset, building (and saving)
+    it first if the dataset changed. Row ids refer to ``load_dataset`` order.
+    """
+    fingerprint = json.dumps(
+        {"data": dataset_fingerprint(csv_path, cache_dir), "v": INDEX_VERSION}, sort_keys=True
+    )
+    path = os.path.join(cache_dir, "filter_index.npz")
+
+    if os.path.exists(path):
+        index, meta = FilterIndex.load(path)
+        if meta.get("version") == INDEX_VERSION and meta.get("fingerprint") == fingerprint:
+            return index
+
+    df = load_dataset(EQUALITY_COLUMNS + RANGE_COLUMNS, csv_path, cache_dir)
+    index = FilterIndex.build(df)
+    index.save(path, fingerprint)
+    return index
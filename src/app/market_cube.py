@@ -0,0 +1,456 @@
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.app.charting import histogram  # noqa: E402
+from src.data.load_data import CACHE_DIR, DATA_PATH, dataset_fingerprint, load_dataset  # noqa: E402
+
+# -------------------------------------------------------------------
+# Cube layout
+# -------------------------------------------------------------------
+# Axis order of every measure array
+CAT_DIMS = ["City", "Property_Type", "BHK"]
+RANGE_DIMS = ["Price_in_Lakhs", "Size_in_SqFt", "Age_of_Property"]
+
+CUBE_COLUMNS = CAT_DIMS + RANGE_DIMS + ["Good_Investment", "calc_price_per_sqft"]
+# Columns of the ``rows`` frame an exact range query reads
+ROW_COLUMNS = ["City", "Property_Type", "Good_Investment", "Price_in_Lakhs", "calc_price_per_sqft"]
+
+# Bins per range dimension. The dense grid is
+# cities x types x bhks x 2 x price x size x age cells, so keep these modest.
+DEFAULT_BINS = {"Price_in_Lakhs": 20, "Size_in_SqFt": 8, "Age_of_Property": 10}
+
+# Histogram resolution (the page's original nbins). Stored as 1-D counts per
+# City x Property_Type x BHK x Good_Investment cell, next to the grid.
+HIST_BINS = {"Price_in_Lakhs": 50, "Age_of_Property": 30}
+
+# Bump when the stored layout changes
+CUBE_VERSION = 2
+
+# Index of each axis in the measure arrays
+_AX_CITY, _AX_TYPE, _AX_BHK, _AX_GOOD, _AX_PRICE, _AX_SIZE, _AX_AGE = range(7)
+
+
+def _bin_edges(values: np.ndarray, n_bins: int) -> np.ndarray:
+    lo, hi = float(np.min(values)), float(np.max(values))
+    if hi == lo:
+        hi = lo + 1.0
+    return np.linspace(lo, hi, n_bins + 1)
+
+
+def _bin_codes(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    # Right edge of the last bin is inclusive
+    return np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+
+
+def _positions(values: pd.Series, ids: np.ndarray, labels: List[str]) -> np.ndarray:
+    """Position in ``labels`` of each of ``values[ids]`` (compared as strings)."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        lookup = pd.Index(labels).get_indexer(values.cat.categories.astype(str))
+        return lookup[values.cat.codes.to_numpy()[ids]]
+    return pd.Index(labels).get_indexer(values.iloc[ids].astype(str))
+
+
+@dataclass
+class CubeResult:
+    """Everything the dashboard renders for one filter state."""
+
+    listings: int
+    avg_price_lakhs: float
+    avg_price_per_sqft: float
+    good_rate: float
+    price_hist: pd.DataFrame   # bin_start, bin_end, count
+    age_hist: pd.DataFrame     # bin_start, bin_end, count
+    city_price_per_sqft: pd.DataFrame  # City, calc_price_per_sqft
+    type_counts: pd.DataFrame  # Property_Type, Count
+    good_rate_by_type: pd.DataFrame  # Property_Type, Good_Investment (%)
+    good_rate_by_city: pd.DataFrame  # City, Good_Investment (%)
+
+
+class MarketCube:
+    """
+    Dense pre-aggregated cube over
+    City x Property_Type x BHK x Good_Investment x price bin x size bin x age bin.
+
+    Each cell stores the listing count and the sums of Price_in_Lakhs and
+    calc_price_per_sqft, so every KPI and chart on the Market Insights page
+    is a slice + reduction over the cube. The price and age histograms come
+    from finer per-category counts (``HIST_BINS``). Without range filters,
+    query cost depends on the grid size only, never on the number of
+    listings.
+
+    A range filter is answered from the bins that lie fully inside it; the
+    listings in the partially covered bins at either end are looked up in a
+    ``FilterIndex`` and added, so any slider position gives exact results.
+    """
+
+    def __init__(
+        self,
+        categories: Dict[str, List[str]],
+        edges: Dict[str, np.ndarray],
+        count: np.ndarray,
+        sum_price: np.ndarray,
+        sum_ppsf: np.ndarray,
+        hist_edges: Dict[str, np.ndarray],
+        hist_counts: Dict[str, np.ndarray],
+    ):
+        self.categories = categories
+        self.edges = edges
+        self.count = count
+        self.sum_price = sum_price
+        self.sum_ppsf = sum_ppsf
+        self.hist_edges = hist_edges    # col -> HIST_BINS[col] + 1 edges
+        self.hist_counts = hist_counts  # col -> (city, type, bhk, good, bin) counts
+
+    # ---------------------------------------------------------------
+    # Build / persist
+    # ---------------------------------------------------------------
+    @classmethod
+    def build(cls, df: pd.DataFrame, bins: Optional[Dict[str, int]] = None) -> "MarketCube":
+        """One O(rows) pass: bin every row, then bincount each measure."""
+        bins = {**DEFAULT_BINS, **(bins or {})}
+
+        categories, codes = {}, []
+        for col in CAT_DIMS:
+            cat = pd.Categorical(df[col].astype(str))
+            categories[col] = [str(c) for c in cat.categories]
+            codes.append(cat.codes.astype(np.int64))
+
+        codes.append(df["Good_Investment"].to_numpy().astype(np.int64).clip(0, 1))
+
+        edges = {}
+        for col in RANGE_DIMS:
+            values = df[col].to_numpy(dtype=np.float64)
+            edges[col] = _bin_edges(values, bins[col])
+            codes.append(_bin_codes(values, edges[col]))
+
+        shape = tuple(len(categories[c]) for c in CAT_DIMS) + (2,) + tuple(
+            bins[c] for c in RANGE_DIMS
+        )
+        flat = np.ravel_multi_index(codes, shape)
+        size = int(np.prod(shape))
+
+        count = np.bincount(flat, minlength=size).astype(np.int32).reshape(shape)
+        sum_price = np.bincount(
+            flat, weights=df["Price_in_Lakhs"].to_numpy(dtype=np.float64), minlength=size
+        ).reshape(shape)
+        sum_ppsf = np.bincount(
+            flat, weights=df["calc_price_per_sqft"].to_numpy(dtype=np.float64), minlength=size
+        ).reshape(shape)
+
+        cat_shape = shape[:4]
+        cat_flat = np.ravel_multi_index(codes[:4], cat_shape)
+        hist_edges, hist_counts = {}, {}
+        for col, n_bins in HIST_BINS.items():
+            values = df[col].to_numpy(dtype=np.float64)
+            hist_edges[col] = _bin_edges(values, n_bins)
+            hist_counts[col] = np.bincount(
+                cat_flat * n_bins + _bin_codes(values, hist_edges[col]),
+                minlength=int(np.prod(cat_shape)) * n_bins,
+            ).astype(np.int32).reshape(cat_shape + (n_bins,))
+
+        return cls(categories, edges, count, sum_price, sum_ppsf, hist_edges, hist_counts)
+
+    def save(self, path: str, fingerprint: str = "") -> None:
+        meta = {
+            "version": CUBE_VERSION,
+            "fingerprint": fingerprint,
+            "categories": self.categories,
+        }
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            meta=np.array(json.dumps(meta)),
+            count=self.count,
+            sum_price=self.sum_price,
+            sum_ppsf=self.sum_ppsf,
+            **{f"edges_{c}": e for c, e in self.edges.items()},
+            **{f"hist_edges_{c}": e for c, e in self.hist_edges.items()},
+            **{f"hist_counts_{c}": h for c, h in self.hist_counts.items()},
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["MarketCube", Dict]:
+        """(cube, meta); the cube is None when the file has another layout version."""
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != CUBE_VERSION:
+                return None, meta
+            edges = {c: data[f"edges_{c}"] for c in RANGE_DIMS}
+            hist_edges = {c: data[f"hist_edges_{c}"] for c in HIST_BINS}
+            hist_counts = {c: data[f"hist_counts_{c}"] for c in HIST_BINS}
+            cube = cls(
+                meta["categories"], edges, data["count"], data["sum_price"], data["sum_ppsf"],
+                hist_edges, hist_counts,
+            )
+        return cube, meta
+
+    # ---------------------------------------------------------------
+    # Query
+    # ---------------------------------------------------------------
+    def _cat_slice(self, col: str, value: Optional[str]):
+        if value is None or value == "All":
+            return slice(None)
+        try:
+            i = self.categories[col].index(str(value))
+        except ValueError:
+            return slice(0, 0)  # unknown value -> empty selection
+        return slice(i, i + 1)
+
+    def _range_slice(self, col: str, value_range: Optional[Tuple[float, float]]):
+        """Bins fully inside [lo, hi]."""
+        if value_range is None:
+            return slice(None)
+        edges = self.edges[col]
+        lo, hi = value_range
+        start = int(np.searchsorted(edges, lo, side="left"))
+        stop = int(np.searchsorted(edges, hi, side="right")) - 1
+        return slice(start, max(start, stop))
+
+    def _narrows(self, col: str, value_range: Optional[Tuple[float, float]]) -> bool:
+        """Whether [lo, hi] leaves out part of the value range of ``col``."""
+        if value_range is None:
+            return False
+        edges = self.edges[col]
+        return value_range[0] > edges[0] or value_range[1] < edges[-1]
+
+    def narrows(
+        self,
+        price_range: Optional[Tuple[float, float]] = None,
+        size_range: Optional[Tuple[float, float]] = None,
+        age_range: Optional[Tuple[float, float]] = None,
+    ) -> bool:
+        """
+        Whether any range leaves out part of its dimension. Only such queries
+        read ``index`` / ``rows`` in ``query``; the others are answered from
+        the cube alone.
+        """
+        ranges = zip(RANGE_DIMS, (price_range, size_range, age_range))
+        return any(self._narrows(col, value_range) for col, value_range in ranges)
+
+    def _edge_rows(self, index, equals: Dict, ranges: Dict, sel: Tuple[slice, ...]) -> np.ndarray:
+        """Row ids matching every filter that fall outside the fully covered bins."""
+        hit = None
+        for axis, col in zip((_AX_PRICE, _AX_SIZE, _AX_AGE), RANGE_DIMS):
+            if ranges.get(col) is None:
+                continue
+            lo, hi = ranges[col]
+            edges, inner = self.edges[col], sel[axis]
+            if inner.start == inner.stop:
+                partial = [(lo, hi)]  # no bin fully inside
+            else:
+                # Bin i holds [edges[i], edges[i + 1]); the last one is closed
+                partial = [(lo, np.nextafter(edges[inner.start], -np.inf))]
+                if inner.stop < len(edges) - 1:
+                    partial.append((edges[inner.stop], hi))
+            for a, b in partial:
+                if a <= b:
+                    start, stop = index.range_bounds(col, a, b)
+                    if hit is None:
+                        hit = np.zeros(index.n_rows, dtype=bool)
+                    hit[index.order[col][start:stop]] = True
+        if hit is None:
+            return np.empty(0, dtype=np.int64)
+        return index.restrict(np.flatnonzero(hit), equals, ranges)
+
+    def query(
+        self,
+        city: Optional[str] = None,
+        property_type: Optional[str] = None,
+        bhk: Optional[str] = None,
+        price_range: Optional[Tuple[float, float]] = None,
+        size_range: Optional[Tuple[float, float]] = None,
+        age_range: Optional[Tuple[float, float]] = None,
+        good_only: bool = False,
+        index=None,
+        rows: Optional[pd.DataFrame] = None,
+    ) -> CubeResult:
+        """
+        KPIs and chart series for one filter state ("All"/None = no filter).
+
+        Ranges are inclusive. Pass the dashboard's ``FilterIndex`` as
+        ``index`` and the frame it was built from (with ``ROW_COLUMNS``) as
+        ``rows`` to answer them exactly: the listings in partially covered bins are
+        added from ``rows``, and the histograms of a range-filtered
+        selection are binned from its matching rows. Without them, a range
+        only selects the bins lying fully inside it.
+        """
+        ranges = dict(zip(RANGE_DIMS, (price_range, size_range, age_range)))
+        sel = (
+            self._cat_slice("City", city),
+            self._cat_slice("Property_Type", property_type),
+            self._cat_slice("BHK", bhk),
+            slice(1, 2) if good_only else slice(None),
+            self._range_slice("Price_in_Lakhs", price_range),
+            self._range_slice("Size_in_SqFt", size_range),
+            self._range_slice("Age_of_Property", age_range),
+        )
+
+        # Size is never charted, so each measure is folded over size in one
+        # pass; everything below reduces the ~8x smaller result.
+        # Axes afterwards: (city, type, bhk, good, price, age)
+        count = self.count[sel].sum(axis=_AX_SIZE)
+        ax_age = _AX_AGE - 1
+
+        by_city_good = count.sum(axis=(_AX_TYPE, _AX_BHK, _AX_PRICE, ax_age))  # (city, good)
+        by_type_good = count.sum(axis=(_AX_CITY, _AX_BHK, _AX_PRICE, ax_age))  # (type, good)
+
+        other_axes = tuple(a for a in range(7) if a != _AX_CITY)
+        ppsf_by_city = self.sum_ppsf[sel].sum(axis=other_axes)
+        sum_price = float(self.sum_price[sel].sum())
+
+        cities = self.categories["City"][sel[_AX_CITY]]
+        types = self.categories["Property_Type"][sel[_AX_TYPE]]
+
+        narrowed = self.narrows(price_range, size_range, age_range)
+        exact = index is not None and rows is not None
+        if exact and narrowed:
+            equals = {
+                "City": city,
+                "Property_Type": property_type,
+                "BHK": bhk,
+                "Good_Investment": 1 if good_only else None,
+            }
+            active = {col: r for col, r in ranges.items() if r is not None}
+            edge = self._edge_rows(index, equals, active, sel)
+            city_pos = _positions(rows["City"], edge, cities)
+            type_pos = _positions(rows["Property_Type"], edge, types)
+            good = rows["Good_Investment"].to_numpy()[edge].astype(np.int64).clip(0, 1)
+            good_pos = good - int(good_only)  # the good axis is sliced to [1] when good_only
+            n_good = by_city_good.shape[1]
+            by_city_good = by_city_good + np.bincount(
+                city_pos * n_good + good_pos, minlength=by_city_good.size
+            ).reshape(by_city_good.shape)
+            by_type_good = by_type_good + np.bincount(
+                type_pos * n_good + good_pos, minlength=by_type_good.size
+            ).reshape(by_type_good.shape)
+            ppsf_by_city = ppsf_by_city + np.bincount(
+                city_pos, weights=rows["calc_price_per_sqft"].to_numpy(dtype=np.float64)[edge],
+                minlength=len(cities),
+            )
+            sum_price += float(rows["Price_in_Lakhs"].to_numpy(dtype=np.float64)[edge].sum())
+
+            matching = index.select(equals, active)
+            matching = np.arange(index.n_rows) if matching is None else matching
+            price_hist, age_hist = (
+                self._rows_hist(col, index.values[col][matching], ranges[col]) for col in HIST_BINS
+            )
+        elif narrowed:
+            # Whole bins only: histograms at the grid's resolution
+            price_hist = self._hist_frame(
+                "Price_in_Lakhs", sel[_AX_PRICE],
+                count.sum(axis=(_AX_CITY, _AX_TYPE, _AX_BHK, _AX_GOOD, ax_age)),
+            )
+            age_hist = self._hist_frame(
+                "Age_of_Property", sel[_AX_AGE],
+                count.sum(axis=(_AX_CITY, _AX_TYPE, _AX_BHK, _AX_GOOD, _AX_PRICE)),
+            )
+        else:
+            price_hist, age_hist = (
+                self._marginal_hist(col, sel[:_AX_PRICE]) for col in HIST_BINS
+            )
+
+        count_by_city = by_city_good.sum(axis=1)
+        good_by_city = by_city_good[:, -1]
+        count_by_type = by_type_good.sum(axis=1)
+        good_by_type = by_type_good[:, -1]
+
+        listings = int(count_by_city.sum())
+        n_good = int(good_by_city.sum())
+
+        present_city = count_by_city > 0
+        present_type = count_by_type > 0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            city_ppsf = pd.DataFrame({
+                "City": np.array(cities)[present_city],
+                "calc_price_per_sqft": (ppsf_by_city / count_by_city)[present_city],
+            }).sort_values("calc_price_per_sqft", ascending=False).head(15)
+
+            gi_city = pd.DataFrame({
+                "City": np.array(cities)[present_city],
+                "Good_Investment": (good_by_city / count_by_city * 100)[present_city],
+            }).sort_values("Good_Investment", ascending=False).head(15)
+
+            gi_type = pd.DataFrame({
+                "Property_Type": np.array(types)[present_type],
+                "Good_Investment": (good_by_type / count_by_type * 100)[present_type],
+            })
+
+        type_counts = pd.DataFrame({
+            "Property_Type": np.array(types)[present_type],
+            "Count": count_by_type[present_type],
+        }).sort_values("Count", ascending=False)
+
+        return CubeResult(
+            listings=listings,
+            avg_price_lakhs=sum_price / listings if listings else 0.0,
+            avg_price_per_sqft=float(ppsf_by_city.sum()) / listings if listings else 0.0,
+            good_rate=n_good / listings if listings else 0.0,
+            price_hist=price_hist,
+            age_hist=age_hist,
+            city_price_per_sqft=city_ppsf,
+            type_counts=type_counts,
+            good_rate_by_type=gi_type,
+            good_rate_by_city=gi_city,
+        )
+
+    def _hist_frame(self, col: str, bin_slice: slice, counts: np.ndarray) -> pd.DataFrame:
+        edges = self.edges[col]
+        start = bin_slice.start or 0
+        idx = np.arange(start, start + len(counts))
+        return pd.DataFrame({"bin_start": edges[idx], "bin_end": edges[idx + 1], "count": counts})
+
+    def _marginal_hist(self, col: str, cat_sel: Tuple[slice, ...]) -> pd.DataFrame:
+        """Fine histogram of the categorical selection (no range filter narrows it)."""
+        edges = self.hist_edges[col]
+        counts = self.hist_counts[col][cat_sel].sum(axis=(0, 1, 2, 3))
+        return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": counts})
+
+    def _rows_hist(self, col: str, values: np.ndarray, value_range) -> pd.DataFrame:
+        """Fine histogram of the matching rows, on the stored edges, cut to ``value_range``."""
+        edges = self.hist_edges[col]
+        hist = histogram(values, bins=len(edges) - 1, value_range=(edges[0], edges[-1]))
+        if value_range is not None:
+            lo, hi = value_range
+            hist = hist[(hist["bin_end"] >= lo) & (hist["bin_start"] <= hi)].reset_index(drop=True)
+        return hist
+
+
+# -------------------------------------------------------------------
+# Cached cube for the dashboard
+# -------------------------------------------------------------------
+def load_market_cube(
+    csv_path: str = DATA_PATH,
+    cache_dir: str = CACHE_DIR,
+    bins: Optional[Dict[str, int]] = None,
+) -> MarketCube:
+    """
+    Load the persisted cube for the current dataset, building (and saving)
+    it first if the dataset or the bin configuration changed.
+    """
+    bins = {**DEFAULT_BINS, **(bins or {})}
+    fingerprint = json.dumps(
+        {"data": dataset_fingerprint(csv_path, cache_dir), "bins": bins, "v": CUBE_VERSION},
+        sort_keys=True,
+    )
+    path = os.path.join(cache_dir, "market_cube.npz")
+
+    if os.path.exists(path):
+        cube, meta = MarketCube.load(path)
+        if meta.get("version") == CUBE_VERSION and meta.get("fingerprint") == fingerprint:
+            return cube
+
+    cube = MarketCube.build(load_dataset(CUBE_COLUMNS, csv_path, cache_dir), bins)
+    cube.save(path, fingerprint)
+    return cube
@@ -0,0 +1,449 @@
+"""
+Offline model scores for every listing, with per-segment top-K rankings.
+
+Both pipelines score the whole dataset once (``ScoreTable.build``). The
+results are stored compactly under data/cache/score_table/:
+
+- good-investment probability, model fair price and valuation gap, as float32
+  columns next to a few display columns;
+- for every City x Property_Type x BHK segment and every ranking in
+  ``RANKINGS``, the ids of its ``TOP_K`` best rows.
+
+Ranked lists such as "best 50 undervalued 3BHK in Pune" are then a lookup,
+and wider selections ("All" cities) only merge the matching segments' lists.
+
+Usage (the offline job; the dashboard only opens a table built here):
+    python src/app/score_table.py
+    python src/app/score_table.py --city Pune --bhk 3 --ranking undervalued --k 50
+"""
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.data.load_data import CACHE_DIR, DATA_PATH, dataset_fingerprint, load_dataset  # noqa: E402
+from src.models import registry  # noqa: E402
+from src.models.fast_path import file_sha256, native_artifact_paths  # noqa: E402
+
+# src.models.predict (sklearn / xgboost) is imported lazily: only scoring
+# needs it, and loading a current table must stay cheap for the dashboard.
+# The registry and fast_path imports above only need NumPy.
+
+# -------------------------------------------------------------------
+# Table layout
+# -------------------------------------------------------------------
+SEGMENT_COLUMNS = ["City", "Property_Type", "BHK"]
+# Copied from the dataset for display (besides Locality)
+DISPLAY_COLUMNS = ["ID", "Price_in_Lakhs", "Size_in_SqFt", "Age_of_Property"]
+# Model outputs, all float32
+SCORE_COLUMNS = ["good_investment_prob", "predicted_price_lakhs",
+                 "valuation_gap_lakhs", "valuation_gap_pct"]
+
+# Ranking name -> score column ranked in descending order
+RANKINGS = {
+    "undervalued": "valuation_gap_pct",       # fair price furthest above asking
+    "good_investment": "good_investment_prob",
+}
+
+# Rows kept per segment and ranking; larger requests scan the segments
+TOP_K = 200
+DEFAULT_K = 50
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Bump when the stored layout changes
+TABLE_VERSION = 1
+
+_COLUMN_ARRAYS = ("ID", "locality", "Price_in_Lakhs", "Size_in_SqFt", "Age_of_Property", *SCORE_COLUMNS)
+
+# Inside the table directory: one subdirectory per saved version and a
+# pointer file naming the current one
+CURRENT_FILENAME = "CURRENT"
+
+
+def _current_dir(path: str) -> Optional[str]:
+    """Version directory ``path/CURRENT`` points at, or None if there is none."""
+    try:
+        with open(os.path.join(path, CURRENT_FILENAME)) as f:
+            version_dir = os.path.join(path, f.read().strip())
+    except FileNotFoundError:
+        return None
+    return version_dir if os.path.isdir(version_dir) else None
+
+
+class ScoreTable:
+    """
+    Scored listings grouped by City x Property_Type x BHK segment.
+
+    Segment ``i`` is the contiguous slice ``offsets[i]:offsets[i + 1]`` of
+    every column. ``top[ranking]`` is an ``(n_segments, TOP_K)`` array of
+    row ids, best first and padded with -1, built per segment with
+    ``argpartition`` (O(n) per segment instead of a full sort).
+    """
+
+    def __init__(
+        self,
+        segments: List[Tuple[str, str, str]],
+        localities: List[str],
+        offsets: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        top: Dict[str, np.ndarray],
+    ):
+        self.segments = [tuple(s) for s in segments]
+        self.localities = localities
+        self.offsets = offsets   # (n_segments + 1,) row offsets
+        self.columns = columns   # name -> (n,) array in segment order
+        self.top = top           # ranking -> (n_segments, TOP_K) row ids
+        self._keys = np.array(self.segments, dtype=object).reshape(-1, len(SEGMENT_COLUMNS))
+
+    @property
+    def n_rows(self) -> int:
+        return int(self.offsets[-1])
+
+    @property
+    def top_k(self) -> int:
+        return next(iter(self.top.values())).shape[1]
+
+    # ---------------------------------------------------------------
+    # Build / persist
+    # ---------------------------------------------------------------
+    @classmethod
+    def build(cls, df: pd.DataFrame, top_k: int = TOP_K) -> "ScoreTable":
+        """
+        Table from a frame with ``SEGMENT_COLUMNS``, Locality,
+        ``DISPLAY_COLUMNS`` and the prediction columns of
+        ``predict_properties_batch`` (see ``score_dataset``).
+        """
+        keys = pd.DataFrame({c: df[c].astype(str) for c in SEGMENT_COLUMNS})
+        seg_codes, seg_uniques = pd.MultiIndex.from_frame(keys).factorize(sort=True)
+        order = np.argsort(seg_codes, kind="stable")
+        counts = np.bincount(seg_codes, minlength=len(seg_uniques))
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        asking = df["Price_in_Lakhs"].to_numpy(dtype=np.float64)
+        fair = df["predicted_price_lakhs"].to_numpy(dtype=np.float64)
+        gap = fair - asking
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gap_pct = np.where(asking > 0, gap / asking * 100.0, np.nan)
+
+        locality = pd.Categorical(df["Locality"].astype(str))
+        columns = {
+            "ID": df["ID"].to_numpy(dtype=np.int64),
+            "locality": locality.codes.astype(np.int32),
+            "Price_in_Lakhs": asking.astype(np.float32),
+            "Size_in_SqFt": df["Size_in_SqFt"].to_numpy(dtype=np.float32),
+            "Age_of_Property": df["Age_of_Property"].to_numpy(dtype=np.float32),
+            "good_investment_prob": df["good_investment_prob"].to_numpy(dtype=np.float32),
+            "predicted_price_lakhs": fair.astype(np.float32),
+            "valuation_gap_lakhs": gap.astype(np.float32),
+            "valuation_gap_pct": gap_pct.astype(np.float32),
+        }
+        columns = {name: np.ascontiguousarray(values[order]) for name, values in columns.items()}
+
+        top = {
+            ranking: _segment_top_k(columns[column], offsets, top_k)
+            for ranking, column in RANKINGS.items()
+        }
+        return cls(list(seg_uniques), [str(c) for c in locality.categories], offsets, columns, top)
+
+    def save(self, path: str, fingerprint: str = "") -> None:
+        """
+        Write a new version under the directory ``path`` and repoint
+        ``path/CURRENT`` at it with one atomic rename. The dashboard always
+        opens a complete table; the previous version is kept (it may still
+        be memory mapped) and older ones are removed.
+        """
+        meta = {
+            "version": TABLE_VERSION,
+            "fingerprint": fingerprint,
+            "segments": [list(s) for s in self.segments],
+            "localities": self.localities,
+            "rankings": list(self.top),
+        }
+        os.makedirs(path, exist_ok=True)
+        previous = _current_dir(path)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=path)
+        try:
+            np.save(os.path.join(tmp_dir, "offsets.npy"), self.offsets)
+            for name in _COLUMN_ARRAYS:
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), self.columns[name])
+            for ranking, ids in self.top.items():
+                np.save(os.path.join(tmp_dir, f"top_{ranking}.npy"), ids)
+            with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            version = "v-" + os.path.basename(tmp_dir)[len(".tmp-"):]
+            os.replace(tmp_dir, os.path.join(path, version))
+            pointer = os.path.join(path, CURRENT_FILENAME)
+            with open(pointer + ".tmp", "w") as f:
+                f.write(version)
+            os.replace(pointer + ".tmp", pointer)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        # Older versions (and files of the pre-pointer layout); in-progress
+        # saves are dot-prefixed and left alone
+        keep = {CURRENT_FILENAME, version, os.path.basename(previous or "")}
+        for entry in os.listdir(path):
+            if entry in keep or entry.startswith("."):
+                continue
+            stale = os.path.join(path, entry)
+            if os.path.isdir(stale):
+                shutil.rmtree(stale, ignore_errors=True)
+            else:
+                with contextlib.suppress(OSError):
+                    os.remove(stale)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["ScoreTable", Dict]:
+        """Memory-map the current version saved under ``path``."""
+        version_dir = _current_dir(path)
+        if version_dir is None:
+            raise FileNotFoundError(f"No saved score table in {path}")
+        with open(os.path.join(version_dir, "meta.json")) as f:
+            meta = json.load(f)
+
+        def array(name):
+            return np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode="r")
+
+        table = cls(
+            meta["segments"],
+            meta["localities"],
+            array("offsets"),
+            {name: array(name) for name in _COLUMN_ARRAYS},
+            {ranking: array(f"top_{ranking}") for ranking in meta["rankings"]},
+        )
+        return table, meta
+
+    # ---------------------------------------------------------------
+    # Query
+    # ---------------------------------------------------------------
+    def segment_ids(self, city=None, property_type=None, bhk=None) -> np.ndarray:
+        """Segments matching the given values; None or "All" matches any."""
+        mask = np.ones(len(self.segments), dtype=bool)
+        for j, value in enumerate((city, property_type, bhk)):
+            if value is not None and value != "All":
+                mask &= self._keys[:, j] == str(value)
+        return np.flatnonzero(mask)
+
+    def ranked(
+        self,
+        ranking: str = "undervalued",
+        city=None,
+        property_type=None,
+        bhk=None,
+        k: int = DEFAULT_K,
+    ) -> pd.DataFrame:
+        """
+        The ``k`` best listings by ``ranking`` (see ``RANKINGS``) among the
+        segments matching ``city`` / ``property_type`` / ``bhk`` (None or
+        "All" match any), best first. Columns: ID, the segment columns,
+        Locality, the other ``DISPLAY_COLUMNS`` and ``SCORE_COLUMNS``.
+        """
+        return self._frame(self.ranked_rows(ranking, city, property_type, bhk, k))
+
+    def ranked_rows(self, ranking: str, city=None, property_type=None, bhk=None,
+                    k: int = DEFAULT_K) -> np.ndarray:
+        """
+        Row ids behind ``ranked`` (ties broken by row order).
+
+        With ``k <= top_k`` only the stored per-segment lists are read: the
+        overall top ``k`` is always among the segments' own top ``k``.
+        """
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unknown ranking {ranking!r}; expected one of {list(RANKINGS)}.")
+        segs = self.segment_ids(city, property_type, bhk)
+        if k <= self.top_k:
+            candidates = np.asarray(self.top[ranking][segs, :k]).ravel()
+            candidates = candidates[candidates >= 0]
+            if len(segs) == 1:
+                return candidates  # already in order
+        else:
+            candidates = np.concatenate(
+                [np.arange(self.offsets[s], self.offsets[s + 1]) for s in segs] or [np.empty(0, dtype=np.int64)]
+            )
+        score = _ranking_key(np.asarray(self.columns[RANKINGS[ranking]][candidates]))
+        if len(candidates) > k:
+            keep = np.argpartition(-score, k - 1)[:k]
+            candidates, score = candidates[keep], score[keep]
+        return candidates[np.lexsort((candidates, -score))]
+
+    def _frame(self, rows: np.ndarray) -> pd.DataFrame:
+        c = self.columns
+        keys = self._keys[self._segment_of(rows)] if len(rows) else np.empty((0, 3), dtype=object)
+        return pd.DataFrame({
+            "ID": np.asarray(c["ID"][rows]),
+            "City": keys[:, 0],
+            "Locality": [self.localities[code] for code in c["locality"][rows]],
+            "Property_Type": keys[:, 1],
+            "BHK": keys[:, 2],
+            **{name: np.asarray(c[name][rows]) for name in DISPLAY_COLUMNS[1:] + SCORE_COLUMNS},
+        })
+
+    def _segment_of(self, rows: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.offsets, rows, side="right") - 1
+
+
+def _ranking_key(values: np.ndarray) -> np.ndarray:
+    """float64 sort key, higher = better; missing scores rank last."""
+    return np.nan_to_num(values.astype(np.float64), nan=-np.inf)
+
+
+def _segment_top_k(values: np.ndarray, offsets: np.ndarray, k: int) -> np.ndarray:
+    """(n_segments, k) row ids of each segment's k largest ``values``, -1 padded."""
+    top = np.full((len(offsets) - 1, k), -1, dtype=np.int32 if offsets[-1] < 2**31 else np.int64)
+    for s in range(len(offsets) - 1):
+        start, stop = int(offsets[s]), int(offsets[s + 1])
+        score = _ranking_key(values[start:stop])
+        n = min(k, len(score))
+        if n == 0:
+            continue
+        best = np.argpartition(-score, n - 1)[:n] if n < len(score) else np.arange(n)
+        best = best[np.lexsort((best, -score[best]))]
+        top[s, :n] = start + best
+    return top
+
+
+# -------------------------------------------------------------------
+# Scoring
+# -------------------------------------------------------------------
+SOURCE_COLUMNS = list(dict.fromkeys(SEGMENT_COLUMNS + ["Locality"] + DISPLAY_COLUMNS))
+
+
+def score_dataset(df: pd.DataFrame, chunk_size: int = DEFAULT_CHUNK_SIZE, models=None) -> pd.DataFrame:
+    """
+    ``df`` plus the three ``predict_properties_batch`` columns, scored in
+    chunks (bounded memory) on one model version throughout.
+    """
+    from src.models.predict import ALL_FEATURES, current_models, predict_properties_batch
+
+    models = models or current_models()
+    parts = []
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        parts.append(predict_properties_batch(chunk[ALL_FEATURES], models=models))
+    preds = pd.concat(parts) if parts else predict_properties_batch(df[ALL_FEATURES], models=models)
+    return pd.concat([df.reset_index(drop=True), preds.reset_index(drop=True)], axis=1)
+
+
+def model_fingerprint(versions: Dict[str, str] = None, models_dir: str = registry.MODELS_DIR) -> Dict[str, str]:
+    """
+    name -> id of the live model: its promoted registry version, or the
+    sha256 of the booster in models/ when nothing is promoted (the pickle
+    only if no booster was exported). Native-only deployments ship no
+    pickles, and neither sklearn nor xgboost is needed to compute it.
+
+    ``versions`` is ``registry.current_versions()`` or ``ModelSet.versions``
+    ("live" = the loose models/ files).
+    """
+    versions = registry.current_versions(models_dir) if versions is None else versions
+    fingerprint = {}
+    for name in registry.MODEL_NAMES:
+        version = versions.get(name, "live")
+        if version != "live":
+            fingerprint[name] = version
+            continue
+        path = native_artifact_paths(models_dir, name)[0]
+        if not os.path.exists(path):
+            path = os.path.join(models_dir, f"{name}_pipeline.pkl")
+        fingerprint[name] = "sha256:" + file_sha256(path)
+    return fingerprint
+
+
+# -------------------------------------------------------------------
+# Cached table for the dashboard
+# -------------------------------------------------------------------
+def _table_fingerprint(csv_path: str, cache_dir: str, versions: Dict[str, str] = None) -> str:
+    return json.dumps(
+        {"data": dataset_fingerprint(csv_path, cache_dir), "models": model_fingerprint(versions),
+         "top_k": TOP_K, "v": TABLE_VERSION},
+        sort_keys=True,
+    )
+
+
+def open_score_table(
+    csv_path: str = DATA_PATH,
+    cache_dir: str = CACHE_DIR,
+    versions: Dict[str, str] = None,
+) -> Optional[ScoreTable]:
+    """
+    Memory-map the persisted table if it is current for the dataset and the
+    live models, else None. Never scores, so no model is loaded; build the
+    table with ``load_score_table`` (the CLI below) first.
+    """
+    path = os.path.join(cache_dir, "score_table")
+    if _current_dir(path) is None:
+        return None
+    table, meta = ScoreTable.load(path)
+    if meta.get("version") == TABLE_VERSION and meta.get("fingerprint") == _table_fingerprint(
+        csv_path, cache_dir, versions
+    ):
+        return table
+    return None
+
+
+def load_score_table(
+    csv_path: str = DATA_PATH,
+    cache_dir: str = CACHE_DIR,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    rebuild: bool = False,
+) -> ScoreTable:
+    """
+    Memory-map the persisted table for the current dataset and models,
+    scoring the whole dataset (and saving the table) first if either
+    changed or ``rebuild`` is set.
+    """
+    if not rebuild:
+        table = open_score_table(csv_path, cache_dir)
+        if table is not None:
+            return table
+
+    from src.models.predict import ALL_FEATURES, current_models
+
+    models = current_models()
+    columns = list(dict.fromkeys(SOURCE_COLUMNS + ALL_FEATURES))
+    scored = score_dataset(load_dataset(columns, csv_path, cache_dir), chunk_size, models)
+    path = os.path.join(cache_dir, "score_table")
+    ScoreTable.build(scored).save(path, _table_fingerprint(csv_path, cache_dir, models.versions))
+    return ScoreTable.load(path)[0]
+
+
+# -------------------------------------------------------------------
+# CLI: (re)build the table offline, optionally print one ranking
+# -------------------------------------------------------------------
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score the dataset and build the ranking table.")
+    parser.add_argument("--rebuild", action="store_true", help="Re-score even if the table is current.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--ranking", choices=list(RANKINGS), default="undervalued")
+    parser.add_argument("--city")
+    parser.add_argument("--property-type")
+    parser.add_argument("--bhk")
+    parser.add_argument("--k", type=int, default=10)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+
+    start = time.perf_counter()
+    table = load_score_table(chunk_size=args.chunk_size, rebuild=args.rebuild)
+    print(f"Score table: {table.n_rows:,d} rows, {len(table.segments):,d} segments "
+          f"({time.perf_counter() - start:.2f}s)")
+
+    start = time.perf_counter()
+    top = table.ranked(args.ranking, args.city, args.property_type, args.bhk, k=args.k)
+    print(f"Top {len(top)} by {args.ranking} ({(time.perf_counter() - start) * 1000:.2f} ms):")
+    print(top.to_string(index=False))
+    sys.exit(0)
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+import pandas as pd
+
+# pyarrow is imported lazily inside the functions that need it.
+
+# -------------------------------------------------------------------
+# Paths / schema
+# -------------------------------------------------------------------
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "india_housing_with_targets.csv")
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache")
+
+# Stored as dictionary-encoded (pandas ``category``) columns
+CATEGORICAL_COLUMNS = ["City", "Locality", "Property_Type", "BHK"]
+
+# Bump when the conversion below changes, to force a rebuild
+CACHE_VERSION = 1
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _cache_paths(csv_path: str, cache_dir: str):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    arrow_path = os.path.join(cache_dir, f"{stem}.arrow")
+    return arrow_path, arrow_path + ".meta.json"
+
+
+def _cache_is_current(csv_path: str, arrow_path: str, meta_path: str) -> bool:
+    """
+    Cheap (size, mtime) check first; only re-hash the CSV when those moved,
+    so a touched-but-identical file does not trigger a rebuild.
+    """
+    if not (os.path.exists(arrow_path) and os.path.exists(meta_path)):
+        return False
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get("version") != CACHE_VERSION:
+        return False
+
+    st = os.stat(csv_path)
+    if meta.get("size") == st.st_size and meta.get("mtime_ns") == st.st_mtime_ns:
+        return True
+    if meta.get("size") != st.st_size or meta.get("sha256") != _sha256(csv_path):
+        return False
+
+    meta["mtime_ns"] = st.st_mtime_ns
+    _write_meta(meta_path, meta)
+    return True
+
+
+def _write_meta(meta_path: str, meta: dict) -> None:
+    """Write the cache metadata atomically, so readers never see half a file."""
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def build_cache(csv_path: str = DATA_PATH, cache_dir: str = CACHE_DIR) -> str:
+    """
+    Convert the CSV into a typed, uncompressed Arrow IPC file.
+
+    City / Locality / Property_Type / BHK become dictionary-encoded
+    categoricals (BHK as strings, like ``build_features``); other columns
+    keep the dtypes pandas infers from the CSV so model inputs are
+    unchanged. The file and its metadata are written atomically. Returns
+    its path.
+    """
+    import pyarrow as pa
+
+    arrow_path, meta_path = _cache_paths(csv_path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    df = pd.read_csv(csv_path)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(str).astype("category")
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = arrow_path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, arrow_path)
+
+    st = os.stat(csv_path)
+    _write_meta(
+        meta_path,
+        {
+            "version": CACHE_VERSION,
+            "source": os.path.abspath(csv_path),
+            "sha256": _sha256(csv_path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "rows": table.num_rows,
+        },
+    )
+    return arrow_path
+
+
+def ensure_cache(csv_path: str = DATA_PATH, cache_dir: str = CACHE_DIR) -> str:
+    """Path to an up-to-date Arrow cache of ``csv_path``, (re)building it if needed."""
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"Dataset not found at {csv_path}.")
+    arrow_path, meta_path = _cache_paths(csv_path, cache_dir)
+    if not _cache_is_current(csv_path, arrow_path, meta_path):
+        build_cache(csv_path, cache_dir)
+    return arrow_path
+
+
+def dataset_fingerprint(csv_path: str = DATA_PATH, cache_dir: str = CACHE_DIR) -> str:
+    """Content hash of the source CSV (from the cache metadata, no re-hashing)."""
+    arrow_path = ensure_cache(csv_path, cache_dir)
+    with open(arrow_path + ".meta.json") as f:
+        return json.load(f)["sha256"]
+
+
+def load_dataset(
+    columns: Optional[List[str]] = None,
+    csv_path: str = DATA_PATH,
+    cache_dir: str = CACHE_DIR,
+) -> pd.DataFrame:
+    """
+    Load the processed dataset from the Arrow cache.
+
+    The cache file is memory-mapped, so only the selected columns are read
+    from disk; converting them to pandas copies them into NumPy arrays
+    (categoricals as their integer codes plus one dictionary).
+
+    Parameters
+    ----------
+    columns : list of str, optional
+        Only these columns are read and converted (all when None).
+    csv_path : str
+        Source CSV; the cache is rebuilt when its content hash changes.
+    cache_dir : str
+        Where the Arrow file and its metadata live.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Categorical columns come back as pandas ``category`` dtype.
+    """
+    import pyarrow as pa
+
+    arrow_path = ensure_cache(csv_path, cache_dir)
+    # Not closed explicitly: Arrow buffers keep the mapping alive while in use
+    source = pa.memory_map(arrow_path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
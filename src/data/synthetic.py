@@ -0,0 +1,122 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------------------------
+# Vocabularies / ranges – mirror data/processed/india_housing_with_targets.csv
+# -------------------------------------------------------------------
+CITIES = [
+    "Ahmedabad", "Amritsar", "Bangalore", "Bhopal", "Bhubaneswar", "Bilaspur",
+    "Chennai", "Coimbatore", "Cuttack", "Dehradun", "Durgapur", "Dwarka",
+    "Faridabad", "Gaya", "Gurgaon", "Guwahati", "Haridwar", "Hyderabad",
+    "Indore", "Jaipur", "Jamshedpur", "Jodhpur", "Kochi", "Kolkata",
+    "Lucknow", "Ludhiana", "Mangalore", "Mumbai", "Mysore", "Nagpur",
+    "New Delhi", "Noida", "Patna", "Pune", "Raipur", "Ranchi", "Silchar",
+    "Surat", "Trivandrum", "Vijayawada", "Vishakhapatnam", "Warangal",
+]
+
+LOCALITIES = [f"Locality_{i}" for i in range(1, 501)]
+
+PROPERTY_TYPES = ["Apartment", "Independent House", "Villa"]
+
+BHKS = [1, 2, 3, 4, 5]
+
+
+def make_listings(n_rows: int, seed: int = 42, id_start: int = 1) -> pd.DataFrame:
+    """
+    Generate schema-faithful synthetic listings.
+
+    Columns match the processed training CSV (the subset used by the
+    feature pipeline, the targets and the dashboard), with value ranges
+    taken from the 250k-row source dataset.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of listings to generate.
+    seed : int
+        Seed for the NumPy random generator (same seed -> same frame).
+    id_start : int
+        ``ID`` of the first row (IDs are consecutive).
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+
+    size = rng.integers(500, 5001, n_rows)
+    price = np.round(rng.uniform(10.0, 500.0, n_rows), 2)
+    growth = np.round(rng.uniform(0.07, 0.10, n_rows), 4)
+    age = rng.integers(2, 36, n_rows)
+    schools = rng.integers(1, 11, n_rows)
+    hospitals = rng.integers(1, 11, n_rows)
+
+    calc_price_per_sqft = (price * 100000) / size
+    future_price_5y = price * np.power(1 + growth, 5)
+
+    # Simple rule-based label giving roughly the source ~27% positive rate
+    score = (
+        (calc_price_per_sqft < 8000).astype(int)
+        + (age <= 15).astype(int)
+        + (schools >= 6).astype(int)
+        + (hospitals >= 6).astype(int)
+        + (growth >= 0.09).astype(int)
+    )
+    good = (score >= 4).astype(int)
+
+    return pd.DataFrame(
+        {
+            "ID": np.arange(id_start, id_start + n_rows),
+            "City": rng.choice(CITIES, n_rows),
+            "Locality": rng.choice(LOCALITIES, n_rows),
+            "Property_Type": rng.choice(PROPERTY_TYPES, n_rows),
+            "BHK": rng.choice(BHKS, n_rows),
+            "Size_in_SqFt": size,
+            "Price_in_Lakhs": price,
+            "Age_of_Property": age,
+            "Nearby_Schools": schools,
+            "Nearby_Hospitals": hospitals,
+            "calc_price_per_sqft": calc_price_per_sqft,
+            "Annual_Growth_Rate": growth,
+            "Future_Price_5Y": future_price_5y,
+            "Good_Investment": good,
+        }
+    )
+
+
+def write_listings_csv(
+    path: str,
+    n_rows: int,
+    chunk_rows: int = 1_000_000,
+    seed: int = 42,
+) -> str:
+    """
+    Write ``n_rows`` synthetic listings to ``path`` in the processed CSV
+    schema, one ``chunk_rows`` frame at a time, so arbitrarily large files
+    can be generated in bounded memory. Chunk ``i`` uses seed ``seed + i``
+    (same arguments -> same file). The file is written atomically.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="") as f:
+        for i, start in enumerate(range(0, n_rows, chunk_rows)):
+            chunk = make_listings(min(chunk_rows, n_rows - start), seed=seed + i, id_start=start + 1)
+            chunk.to_csv(f, header=(i == 0), index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic listings CSV.")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    write_listings_csv(args.output, args.rows, chunk_rows=args.chunk_rows, seed=args.seed)
+    size_mb = os.path.getsize(args.output) / 1e6
+    print(f"Wrote {args.rows:,} rows ({size_mb:,.0f} MB) to {args.output}")
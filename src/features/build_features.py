@@ -1,21 +1,82 @@
+from typing import Dict, List, Optional
+
+import numpy as np
 import pandas as pd
 
-def build_features(df: pd.DataFrame) -> pd.DataFrame:
+NUMERIC_COLS = [
+    "Size_in_SqFt", "Age_of_Property", "Nearby_Schools",
+    "Nearby_Hospitals", "calc_price_per_sqft",
+    "Annual_Growth_Rate", "Future_Price_5Y"
+]
+
+CATEGORICAL_COLS = ["City", "Locality", "Property_Type", "BHK"]
+
+
+def _downcast_integral(series: pd.Series) -> pd.Series:
+    """
+    int16 / int32 for whole-number columns without missing values, else the
+    series unchanged. Float columns are never narrowed to float32: the scaler
+    would then run in float32 and predictions could shift in the last bit.
+    """
+    values = series.to_numpy()
+    if len(values) == 0 or not np.issubdtype(values.dtype, np.number):
+        return series
+    if np.issubdtype(values.dtype, np.floating):
+        if not np.isfinite(values).all() or not (values == np.floor(values)).all():
+            return series
+    lo, hi = values.min(), values.max()
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return series.astype(dtype)
+    return series
+
+
+def _to_category(series: pd.Series, categories: Optional[List[str]]) -> pd.Series:
+    # Same string normalisation as the non-compact path, then categorical.
+    # Already-categorical input (e.g. from the Arrow cache) only has its
+    # categories relabelled, never expanded to one Python string per row.
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.cat.rename_categories([str(c) for c in series.cat.categories])
+    else:
+        values = series.astype(str).astype("category")
+    if categories is None:
+        return values
+    # Values outside the vocabulary become NaN, which the one-hot encoder
+    # (handle_unknown="ignore") treats exactly like an unseen string
+    return values.cat.set_categories(categories)
+
+
+def build_features(
+    df: pd.DataFrame,
+    compact: bool = False,
+    vocabulary: Optional[Dict[str, List[str]]] = None,
+) -> pd.DataFrame:
     """
     Core feature engineering applied consistently across
     training and prediction.
+
+    compact=True works in place on ``df`` (no full copy), stores the
+    categorical columns as pandas ``category`` (with the fixed per-column
+    ``vocabulary`` saved with the model, when given) and downcasts
+    whole-number numeric columns to int16/int32. Model outputs are identical
+    to the default path.
     """
 
-    df = df.copy()
+    if not compact:
+        df = df.copy()
 
     # Ensure numeric types (safety for inference)
-    numeric_cols = [
-        "Size_in_SqFt", "Age_of_Property", "Nearby_Schools",
-        "Nearby_Hospitals", "calc_price_per_sqft",
-        "Annual_Growth_Rate", "Future_Price_5Y"
-    ]
-    for col in numeric_cols:
+    for col in NUMERIC_COLS:
         df[col] = pd.to_numeric(df[col], errors="coerce")
+        if compact:
+            df[col] = _downcast_integral(df[col])
+
+    if compact:
+        vocabulary = vocabulary or {}
+        for col in CATEGORICAL_COLS:
+            df[col] = _to_category(df[col], vocabulary.get(col))
+        return df
 
     # Convert BHK to categorical string
     df["BHK"] = df["BHK"].astype(str)
@@ -25,4 +86,4 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     for col in cat_cols:
         df[col] = df[col].astype(str)
 
-    return df
\ No newline at end of file
+    return df
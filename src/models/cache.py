@@ -0,0 +1,208 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# -------------------------------------------------------------------
+# Defaults – decimals kept per float feature when building cache keys
+# -------------------------------------------------------------------
+DEFAULT_FLOAT_PRECISION = {
+    "calc_price_per_sqft": 2,
+    "Annual_Growth_Rate": 4,
+    "Future_Price_5Y": 2,
+}
+
+DEFAULT_MAXSIZE = 4096
+
+# Minimum seconds between two artifact stat passes in ``check_artifacts``
+DEFAULT_CHECK_INTERVAL_S = 1.0
+
+
+def _artifact_signature(paths: Iterable[str]) -> Tuple:
+    """(mtime_ns, size) per artifact; changes whenever a model is re-saved."""
+    sig = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            sig.append((path, st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            sig.append((path, None, None))
+    return tuple(sig)
+
+
+class PredictionCache:
+    """
+    Bounded, thread-safe LRU cache (with optional TTL) for single-property
+    predictions.
+
+    Keys are built from the normalised feature values in the same way
+    ``build_features`` normalises them (numeric -> float, categorical ->
+    str), with float features rounded to a configurable precision so that
+    near-identical inputs share an entry. The whole cache is dropped when
+    a newer model generation is swapped in (``set_generation``); results
+    computed by an older generation are not stored after that. The owner
+    calls ``check_artifacts`` before scoring so that a model re-saved on
+    disk is reloaded rather than cached again under the old generation;
+    the files are stat-ed at most once per ``check_interval_s``.
+
+    Parameters
+    ----------
+    num_features, cat_features : list of str
+        Feature names, in key order.
+    maxsize : int
+        Maximum number of entries; least recently used are evicted first.
+    ttl_seconds : float, optional
+        Entry lifetime. ``None`` keeps entries until evicted/invalidated.
+    float_precision : dict, optional
+        Decimals per numeric feature. Features not listed are used as-is.
+    artifact_paths : iterable of str
+        Model files whose change invalidates the cache.
+    check_interval_s : float
+        Minimum seconds between two artifact checks (0 = every call).
+    """
+
+    def __init__(
+        self,
+        num_features,
+        cat_features,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl_seconds: Optional[float] = None,
+        float_precision: Optional[Dict[str, int]] = None,
+        artifact_paths: Iterable[str] = (),
+        check_interval_s: float = DEFAULT_CHECK_INTERVAL_S,
+    ):
+        self.num_features = list(num_features)
+        self.cat_features = list(cat_features)
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.float_precision = dict(
+            DEFAULT_FLOAT_PRECISION if float_precision is None else float_precision
+        )
+        self.artifact_paths = tuple(artifact_paths)
+        self.check_interval_s = check_interval_s
+
+        self._data: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._signature = _artifact_signature(self.artifact_paths)
+        self._next_check = time.monotonic() + check_interval_s
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    # ---------------------------------------------------------------
+    # Keys
+    # ---------------------------------------------------------------
+    def _num_key(self, name: str, value: Any) -> Optional[float]:
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None  # build_features coerces these to NaN
+        if math.isnan(value):
+            return None
+        digits = self.float_precision.get(name)
+        return round(value, digits) if digits is not None else value
+
+    def make_key(self, features: Dict[str, Any]) -> Tuple:
+        """Canonical, hashable key for a feature dict (extra keys ignored)."""
+        return tuple(
+            self._num_key(name, features.get(name)) for name in self.num_features
+        ) + tuple(str(features.get(name)) for name in self.cat_features)
+
+    # ---------------------------------------------------------------
+    # Lookup / insert
+    # ---------------------------------------------------------------
+    def check_artifacts(self, force: bool = False) -> bool:
+        """
+        Drop every entry if any artifact's mtime/size changed since the last
+        check. Returns True on a change; the caller must then load the new
+        models (and bump the generation) before scoring, or the old ones
+        would refill the cache.
+
+        Within ``check_interval_s`` of the previous check this returns False
+        without touching the files, unless ``force`` is set.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval_s
+        signature = _artifact_signature(self.artifact_paths)
+        with self._lock:
+            if signature == self._signature:
+                return False
+            self._signature = signature
+            self._data.clear()
+            self.invalidations += 1
+            return True
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, key: Tuple, value: Dict[str, Any], generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation < self.generation:
+                return  # scored by a model version that has been replaced
+            self._data[key] = (time.monotonic(), dict(value))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def set_generation(self, generation: int) -> None:
+        """A newer model set is live: drop every entry computed before it."""
+        with self._lock:
+            if generation > self.generation:
+                self.generation = generation
+                self._data.clear()
+                self.invalidations += 1
+
+    # ---------------------------------------------------------------
+    # Counters
+    # ---------------------------------------------------------------
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def prometheus_text(self, prefix: str = "prediction_cache") -> str:
+        """Counters in Prometheus text exposition format."""
+        stats = self.stats()
+        lines = []
+        for name in ("hits", "misses", "evictions", "expirations", "invalidations"):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {stats[name]}")
+        for name in ("size", "maxsize"):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {stats[name]}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,412 @@
+import hashlib
+import json
+import math
+import os
+import sys
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.models.tree_eval import TreeEnsemble, tree_table_path  # noqa: E402
+
+# sklearn / xgboost are imported lazily: loading native artifacts
+# (``CompiledPipeline.load``) must not pull in sklearn at all, and with the
+# "numpy" tree backend not xgboost either.
+
+# Bump when the sidecar layout changes
+SIDECAR_VERSION = 1
+
+# What evaluates the trees: XGBoost's own predictor, or the NumPy node
+# tables of src/models/tree_eval.py (float32-rounding equal, not bit-exact)
+TREE_BACKENDS = ("xgboost", "numpy")
+
+
+def native_artifact_paths(models_dir: str, name: str) -> Tuple[str, str]:
+    """(booster .ubj, preprocessing .json sidecar) for an exported pipeline."""
+    return (
+        os.path.join(models_dir, f"{name}_booster.ubj"),
+        os.path.join(models_dir, f"{name}_preprocess.json"),
+    )
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_sidecar(sidecar_path: str) -> Dict[str, Any]:
+    with open(sidecar_path) as f:
+        sidecar = json.load(f)
+    if sidecar.get("version") != SIDECAR_VERSION:
+        raise ValueError(
+            f"Unsupported sidecar version {sidecar.get('version')} in {sidecar_path}."
+        )
+    return sidecar
+
+
+def _unwrap(transformer, expected_type):
+    """Return the single estimator of a one-step Pipeline (or the estimator itself)."""
+    from sklearn.frozen import FrozenEstimator
+    from sklearn.pipeline import Pipeline
+
+    # Blocks kept fixed by incremental retraining are wrapped, not copied
+    if isinstance(transformer, FrozenEstimator):
+        transformer = transformer.estimator
+    if isinstance(transformer, Pipeline):
+        if len(transformer.steps) != 1:
+            raise ValueError(f"Expected a one-step pipeline, got {transformer.steps}.")
+        transformer = transformer.steps[0][1]
+    if not isinstance(transformer, expected_type):
+        raise ValueError(f"Expected {expected_type.__name__}, got {type(transformer).__name__}.")
+    return transformer
+
+
+class CompiledPipeline:
+    """
+    Inference-only copy of a fitted ``preprocessor -> XGBoost`` pipeline.
+
+    The StandardScaler statistics and OneHotEncoder vocabularies are pulled
+    out of the fitted ``ColumnTransformer`` once, so a feature dict can be
+    encoded straight into a NumPy row and handed to the booster without
+    building a DataFrame or running sklearn transformers. The encoding
+    reproduces ``Pipeline.predict`` exactly, including the sparse-output
+    convention: when the ColumnTransformer emits CSR, entries it does not
+    store are *missing* to XGBoost, so they are NaN here rather than 0.
+
+    Use ``from_pipeline`` to build one. Supported layouts are the ones from
+    ``src.models.preprocessing``: ``get_preprocessing_pipeline`` (scaled
+    numerics, then one-hot categoricals, remainder dropped; optionally with
+    incremental extension blocks) and ``NativeCategoricalEncoder`` (raw
+    numerics, then one category-code column per categorical feature).
+
+    With ``trees`` set (the "numpy" backend) predictions come from the
+    flattened ``TreeEnsemble`` instead of the booster, which may then be None.
+    Boosters the NumPy evaluator cannot flatten (categorical splits) keep
+    predicting with xgboost under either backend.
+    """
+
+    def __init__(
+        self,
+        num_features: List[str],
+        means: np.ndarray,
+        scales: np.ndarray,
+        cat_features: List[str],
+        vocabularies: List[Dict[str, int]],
+        sparse_output: bool,
+        booster,
+        iteration_range: Tuple[int, int] = (0, 0),
+        native_categorical: bool = False,
+        trees: TreeEnsemble = None,
+    ):
+        self.num_features = list(num_features)
+        self.means = np.asarray(means, dtype=np.float64)
+        self.scales = np.asarray(scales, dtype=np.float64)
+        self.cat_features = list(cat_features)
+        self.vocabularies = vocabularies
+        self.sparse_output = sparse_output
+        self.booster = booster
+        self.iteration_range = iteration_range
+        self.native_categorical = native_categorical
+        self.trees = trees
+
+        # Column offset of each one-hot block (native: each code column)
+        self.cat_offsets = []
+        offset = len(self.num_features)
+        for vocab in vocabularies:
+            self.cat_offsets.append(offset)
+            offset += 1 if native_categorical else len(vocab)
+        self.n_columns = offset
+
+    # ---------------------------------------------------------------
+    # Construction
+    # ---------------------------------------------------------------
+    @classmethod
+    def from_pipeline(cls, pipeline, backend: str = "xgboost") -> "CompiledPipeline":
+        """Extract preprocessing parameters and booster from a fitted pipeline."""
+        _check_backend(backend)
+        from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+        from src.models.preprocessing import CAT_EXTENSION_PREFIX, NativeCategoricalEncoder
+
+        preprocessor = pipeline.named_steps["preprocessor"]
+        model = pipeline.named_steps["model"]
+
+        booster = model.get_booster()
+        best_iteration = booster.attr("best_iteration")
+        iteration_range = (0, int(best_iteration) + 1) if best_iteration is not None else (0, 0)
+        trees = _numpy_trees(booster, iteration_range) if backend == "numpy" else None
+
+        if isinstance(preprocessor, NativeCategoricalEncoder):
+            n = len(preprocessor.numeric_features)
+            return cls(
+                preprocessor.numeric_features,
+                np.zeros(n),
+                np.ones(n),
+                preprocessor.categorical_features,
+                [{cat: i for i, cat in enumerate(cats)} for cats in preprocessor.categories_],
+                sparse_output=False,
+                booster=booster,
+                iteration_range=iteration_range,
+                native_categorical=True,
+                trees=trees,
+            )
+
+        num_features, means, scales = [], None, None
+        cat_features, vocabularies = [], []
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == "remainder":
+                if transformer != "drop":
+                    raise ValueError("Only remainder='drop' is supported.")
+                continue
+            if name == "num":
+                scaler = _unwrap(transformer, StandardScaler)
+                num_features = list(columns)
+                n = len(num_features)
+                means = scaler.mean_ if scaler.with_mean else np.zeros(n)
+                scales = scaler.scale_ if scaler.with_std else np.ones(n)
+            elif name == "cat" or name.startswith(CAT_EXTENSION_PREFIX):
+                # Extension blocks come after "cat" and are appended in order,
+                # so a column may own several one-hot blocks
+                encoder = _unwrap(transformer, OneHotEncoder)
+                if encoder.drop_idx_ is not None or encoder._infrequent_enabled:
+                    raise ValueError("OneHotEncoder with drop/infrequent categories is not supported.")
+                if encoder.handle_unknown != "ignore":
+                    raise ValueError("Only handle_unknown='ignore' is supported.")
+                cat_features.extend(columns)
+                vocabularies.extend(
+                    {str(cat): i for i, cat in enumerate(cats)} for cats in encoder.categories_
+                )
+            else:
+                raise ValueError(f"Unexpected transformer {name!r} in preprocessor.")
+
+        return cls(
+            num_features,
+            means,
+            scales,
+            cat_features,
+            vocabularies,
+            sparse_output=bool(preprocessor.sparse_output_),
+            booster=booster,
+            iteration_range=iteration_range,
+            trees=trees,
+        )
+
+    # ---------------------------------------------------------------
+    # Native artifacts: XGBoost UBJ + JSON sidecar (no pickle)
+    # ---------------------------------------------------------------
+    def save(self, models_dir: str, name: str, source_path: str = None) -> Tuple[str, ...]:
+        """
+        Write the booster in XGBoost's native UBJ format plus a JSON sidecar
+        with the preprocessing parameters, and the flattened tree tables for
+        the "numpy" backend when the trees allow it. Returns the paths written.
+
+        ``source_path`` (the pickle this was compiled from) is fingerprinted
+        into the sidecar so loaders can tell when the export is stale.
+        """
+        booster_path, sidecar_path = native_artifact_paths(models_dir, name)
+        os.makedirs(models_dir, exist_ok=True)
+
+        self.booster.save_model(booster_path)
+
+        inverse_vocabs = [
+            sorted(vocab, key=vocab.get) for vocab in self.vocabularies
+        ]
+        sidecar = {
+            "version": SIDECAR_VERSION,
+            "num_features": self.num_features,
+            "means": self.means.tolist(),
+            "scales": self.scales.tolist(),
+            "cat_features": self.cat_features,
+            "categories": inverse_vocabs,
+            "sparse_output": self.sparse_output,
+            "iteration_range": list(self.iteration_range),
+            "native_categorical": self.native_categorical,
+            "source_sha256": file_sha256(source_path) if source_path else None,
+        }
+        with open(sidecar_path, "w") as f:
+            json.dump(sidecar, f)
+
+        table_path = tree_table_path(models_dir, name)
+        trees = self.trees or _numpy_trees(self.booster, self.iteration_range)
+        if trees is None:
+            # e.g. categorical splits: only the xgboost backend can serve it
+            if os.path.exists(table_path):
+                os.remove(table_path)
+            return booster_path, sidecar_path
+        trees.save(table_path, source_sha256=file_sha256(booster_path))
+        return booster_path, sidecar_path, table_path
+
+    @classmethod
+    def load(cls, models_dir: str, name: str, backend: str = "xgboost") -> "CompiledPipeline":
+        """
+        Rebuild an inference-only predictor from ``save`` output.
+
+        The "numpy" backend reads the tree tables when they were exported
+        from this booster, and then never imports xgboost; otherwise the
+        tables are rebuilt from the booster.
+        """
+        _check_backend(backend)
+        booster_path, sidecar_path = native_artifact_paths(models_dir, name)
+        sidecar = read_sidecar(sidecar_path)
+        iteration_range = tuple(sidecar["iteration_range"])
+
+        booster, trees = None, None
+        if backend == "numpy":
+            trees = _load_tree_table(tree_table_path(models_dir, name), booster_path)
+        if trees is None:
+            import xgboost as xgb
+
+            booster = xgb.Booster()
+            booster.load_model(booster_path)
+            if backend == "numpy":
+                trees = _numpy_trees(booster, iteration_range)
+
+        return cls(
+            sidecar["num_features"],
+            np.array(sidecar["means"]),
+            np.array(sidecar["scales"]),
+            sidecar["cat_features"],
+            [{cat: i for i, cat in enumerate(cats)} for cats in sidecar["categories"]],
+            sparse_output=sidecar["sparse_output"],
+            booster=booster,
+            iteration_range=iteration_range,
+            native_categorical=sidecar.get("native_categorical", False),
+            trees=trees,
+        )
+
+    # ---------------------------------------------------------------
+    # Encoding
+    # ---------------------------------------------------------------
+    @staticmethod
+    def _to_float(value: Any) -> float:
+        # Mirrors pd.to_numeric(errors="coerce") in build_features, which
+        # (unlike float()) rejects "1_000" and non-ASCII digits
+        if isinstance(value, str) and ("_" in value or not value.isascii()):
+            return math.nan
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return math.nan
+
+    def encode(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """Encode feature dicts into the booster's (n_rows, n_columns) float32 layout."""
+        n_rows = len(records)
+        fill = np.nan if self.sparse_output or self.native_categorical else 0.0
+        X = np.full((n_rows, self.n_columns), fill, dtype=np.float32)
+
+        n_num = len(self.num_features)
+        raw = np.array(
+            [[self._to_float(r.get(c)) for c in self.num_features] for r in records],
+            dtype=np.float64,
+        ).reshape(n_rows, n_num)
+        scaled = (raw - self.means) / self.scales
+        if self.sparse_output:
+            # Exact zeros are not stored in CSR -> missing for XGBoost
+            scaled[scaled == 0.0] = np.nan
+        X[:, :n_num] = scaled
+
+        for name, vocab, offset in zip(self.cat_features, self.vocabularies, self.cat_offsets):
+            for i, r in enumerate(records):
+                idx = vocab.get(str(r.get(name)))
+                if idx is None:
+                    continue  # unknown: all-zero block / missing code
+                if self.native_categorical:
+                    X[i, offset] = idx
+                else:
+                    X[i, offset + idx] = 1.0
+        return X
+
+    def encode_varying(self, base: Dict[str, Any], numeric: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        ``encode`` of ``n`` copies of ``base`` in which the numeric features
+        named in ``numeric`` take per-row values (1-D arrays of length ``n``).
+        The base row is encoded once; only those columns are recomputed.
+        """
+        n_rows = len(next(iter(numeric.values())))
+        X = np.repeat(self.encode([base]), n_rows, axis=0)
+        for name, values in numeric.items():
+            j = self.num_features.index(name)
+            scaled = (np.asarray(values, dtype=np.float64) - self.means[j]) / self.scales[j]
+            if self.sparse_output:
+                scaled[scaled == 0.0] = np.nan
+            X[:, j] = scaled
+        return X
+
+    def same_encoding(self, other: "CompiledPipeline") -> bool:
+        """True if ``encode`` produces identical rows for both (shared preprocessor)."""
+        return (
+            self.num_features == other.num_features
+            and np.array_equal(self.means, other.means)
+            and np.array_equal(self.scales, other.scales)
+            and self.cat_features == other.cat_features
+            and self.vocabularies == other.vocabularies
+            and self.sparse_output == other.sparse_output
+            and self.native_categorical == other.native_categorical
+        )
+
+    # ---------------------------------------------------------------
+    # Prediction
+    # ---------------------------------------------------------------
+    def predict_encoded(self, X: np.ndarray) -> np.ndarray:
+        """Booster output for rows already produced by ``encode``."""
+        if self.trees is not None:
+            return self.trees.predict(X)
+        return self.booster.inplace_predict(
+            X, iteration_range=self.iteration_range, missing=np.nan
+        )
+
+    def predict_raw(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """Booster output: P(class 1) for binary:logistic, the value for regression."""
+        return self.predict_encoded(self.encode(records))
+
+
+def _check_backend(backend: str) -> None:
+    if backend not in TREE_BACKENDS:
+        raise ValueError(f"Unknown tree backend {backend!r}; expected one of {TREE_BACKENDS}.")
+
+
+def _numpy_trees(booster, iteration_range: Tuple[int, int]):
+    """``TreeEnsemble`` of the booster, or None if only xgboost can evaluate it."""
+    try:
+        return TreeEnsemble.from_booster(booster, iteration_range)
+    except ValueError:
+        return None
+
+
+def _load_tree_table(table_path: str, booster_path: str):
+    """Stored tree tables, or None when missing or exported from another booster."""
+    if not os.path.exists(table_path):
+        return None
+    trees, meta = TreeEnsemble.load(table_path)
+    if meta.get("source_sha256") != file_sha256(booster_path):
+        return None
+    return trees
+
+
+def export_pipeline(pipeline, models_dir: str, name: str, source_path: str = None) -> Tuple[str, ...]:
+    """Compile a fitted pipeline and write its native artifacts."""
+    return CompiledPipeline.from_pipeline(pipeline).save(models_dir, name, source_path)
+
+
+# -------------------------------------------------------------------
+# CLI: export native artifacts from the existing pickles
+# -------------------------------------------------------------------
+if __name__ == "__main__":
+    import joblib
+
+    models_dir = os.path.join(PROJECT_ROOT, "models")
+
+    for name in ("classifier", "regression"):
+        pkl_path = os.path.join(models_dir, f"{name}_pipeline.pkl")
+        pipeline = joblib.load(pkl_path)
+        for path in export_pipeline(pipeline, models_dir, name, source_path=pkl_path):
+            print(f"Wrote {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+    sys.exit(0)
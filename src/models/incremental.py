@@ -0,0 +1,294 @@
+"""
+Incremental (warm-start) retraining from a delta of new listings.
+
+The fitted preprocessor is kept as is (its vocabulary is only extended, for
+categories first seen in the delta) and boosting continues from the
+existing booster on the new rows only. Each run is registered as a new
+version in the model registry (models/registry/<name>/, see registry.py)
+and reports wall-clock and holdout metrics against the current model (and,
+optionally, a full retrain).
+
+Usage:
+    python src/models/incremental.py --task regression --delta data/deltas/2026-10-17.csv
+    python src/models/incremental.py --task classification --delta new.csv --compare-full --promote
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# sklearn / xgboost / joblib are imported lazily, like the training scripts.
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.data.load_data import load_dataset  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models import train_classification, train_regression  # noqa: E402
+from src.models import registry  # noqa: E402
+from src.models.fast_path import file_sha256  # noqa: E402
+
+MODELS_DIR = os.path.join(PROJECT_ROOT, "models")
+
+NUM_FEATURES = train_regression.NUM_FEATURES
+CAT_FEATURES = train_regression.CAT_FEATURES
+
+# task -> artifact name and target (split settings mirror the training scripts)
+TASKS = {
+    "classification": {"name": "classifier", "target": train_classification.TARGET, "stratify": True},
+    "regression": {"name": "regression", "target": train_regression.TARGET, "stratify": False},
+}
+
+# Boosting rounds added per delta, unless overridden
+DEFAULT_ROUNDS = 50
+
+
+# -------------------------------------------------------------------
+# Warm start
+# -------------------------------------------------------------------
+def _resize_booster(booster, n_features: int):
+    """
+    Booster that accepts ``n_features`` input columns. The trees are
+    untouched; new columns are appended after the old ones and the old
+    trees never split on them, so predictions on old columns are unchanged.
+    """
+    import xgboost as xgb
+
+    if booster.num_features() == n_features:
+        return booster
+    model = json.loads(booster.save_raw("json"))
+    learner = model["learner"]
+    learner["learner_model_param"]["num_feature"] = str(n_features)
+    for tree in learner["gradient_booster"]["model"]["trees"]:
+        tree["tree_param"]["num_feature"] = str(n_features)
+    if learner.get("feature_names"):
+        learner["feature_names"] += [f"f{i}" for i in range(len(learner["feature_names"]), n_features)]
+    if learner.get("feature_types"):
+        learner["feature_types"] += ["float"] * (n_features - len(learner["feature_types"]))
+
+    resized = xgb.Booster()
+    resized.load_model(bytearray(json.dumps(model).encode()))
+    return resized
+
+
+def warm_start(pipeline, X_new: pd.DataFrame, y_new: pd.Series, n_rounds: int = DEFAULT_ROUNDS):
+    """
+    Continue boosting a fitted ``preprocessor -> XGBoost`` pipeline on new rows.
+
+    Parameters
+    ----------
+    pipeline : sklearn.pipeline.Pipeline
+        Current fitted pipeline (not modified).
+    X_new, y_new :
+        Delta rows (after ``build_features``) and their target.
+    n_rounds : int
+        Trees added on top of the existing booster.
+
+    Returns
+    -------
+    pipeline : sklearn.pipeline.Pipeline
+        New pipeline: same scaling, vocabulary extended with the delta's
+        unseen categories, booster = old trees + ``n_rounds`` new ones.
+    added : dict
+        Column -> categories added to the vocabulary.
+    """
+    from sklearn.base import clone
+    from sklearn.pipeline import Pipeline
+
+    from src.models.preprocessing import NativeCategoricalEncoder, extend_preprocessing_pipeline
+
+    if isinstance(pipeline.named_steps["preprocessor"], NativeCategoricalEncoder):
+        raise ValueError(
+            "Warm start needs a one-hot pipeline; retrain native categorical models in full."
+        )
+
+    preprocessor, added = extend_preprocessing_pipeline(
+        pipeline.named_steps["preprocessor"], X_new
+    )
+    model = clone(pipeline.named_steps["model"]).set_params(n_estimators=n_rounds)
+    new_pipeline = Pipeline(steps=[("preprocessor", preprocessor), ("model", model)])
+
+    # Fit the (frozen + new-block) preprocessor first to learn the new width
+    Xt = preprocessor.fit_transform(X_new)
+    booster = _resize_booster(pipeline.named_steps["model"].get_booster(), Xt.shape[1])
+    model.fit(Xt, y_new, xgb_model=booster)
+    return new_pipeline, added
+
+
+# -------------------------------------------------------------------
+# Evaluation / artifacts
+# -------------------------------------------------------------------
+def evaluate(task: str, pipeline, X: pd.DataFrame, y: pd.Series) -> Dict[str, float]:
+    """Holdout metrics, matching the ones the training scripts print."""
+    if task == "classification":
+        return prediction_metrics(task, y, pipeline.predict_proba(X)[:, 1])
+    return prediction_metrics(task, y, pipeline.predict(X))
+
+
+def prediction_metrics(task: str, y, scores) -> Dict[str, float]:
+    """``evaluate`` from precomputed scores (positive-class probability / price)."""
+    if task == "classification":
+        from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+
+        pred = (scores > 0.5).astype(int)
+        metrics = {"accuracy": accuracy_score(y, pred), "f1_score": f1_score(y, pred)}
+        if len(np.unique(y)) > 1:
+            metrics["roc_auc"] = roc_auc_score(y, scores)
+        return {k: float(v) for k, v in metrics.items()}
+
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    return {
+        "rmse": float(mean_squared_error(y, scores) ** 0.5),
+        "mae": float(mean_absolute_error(y, scores)),
+        "r2": float(r2_score(y, scores)),
+    }
+
+
+# -------------------------------------------------------------------
+# Driver
+# -------------------------------------------------------------------
+def retrain_incremental(
+    task: str,
+    delta: pd.DataFrame,
+    n_rounds: int = DEFAULT_ROUNDS,
+    holdout_frac: float = 0.2,
+    compare_full: bool = False,
+    models_dir: str = MODELS_DIR,
+    base_data: Optional[pd.DataFrame] = None,
+    promote: bool = False,
+) -> Dict[str, Any]:
+    """
+    Warm-start the current ``task`` model on ``delta`` and save it as a new version.
+
+    The holdout is the training scripts' 20% test split of the base dataset
+    plus ``holdout_frac`` of the delta; the remaining delta rows are the
+    only rows the incremental model sees. With ``compare_full`` the same
+    model is also retrained from scratch on base-train + delta-train.
+
+    Returns a report dict (also stored as the version's manifest).
+    """
+    import joblib
+    from sklearn.base import clone
+    from sklearn.model_selection import train_test_split
+
+    cfg = TASKS[task]
+    name, target = cfg["name"], cfg["target"]
+    columns = NUM_FEATURES + CAT_FEATURES + [target]
+
+    base_path = os.path.join(models_dir, f"{name}_pipeline.pkl")
+    pipeline = joblib.load(base_path)
+
+    if base_data is None:
+        base_data = load_dataset(columns)
+    base = build_features(base_data[columns])
+    delta = build_features(delta[columns])
+
+    def split(df, test_size):
+        stratify = df[target] if cfg["stratify"] and df[target].nunique() > 1 else None
+        return train_test_split(df, test_size=test_size, random_state=42, stratify=stratify)
+
+    base_train, base_test = split(base, 0.2)
+    delta_train, delta_test = split(delta, holdout_frac)
+    holdout = pd.concat([base_test, delta_test])
+    X_hold, y_hold = holdout[NUM_FEATURES + CAT_FEATURES], holdout[target]
+
+    features = NUM_FEATURES + CAT_FEATURES
+    report = {
+        "task": task,
+        "mode": "incremental",
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "parent_sha256": file_sha256(base_path),
+        "delta_rows": int(len(delta_train)),
+        "n_rounds": n_rounds,
+        "holdout_rows": int(len(holdout)),
+        "metrics": {"before": evaluate(task, pipeline, X_hold, y_hold)},
+    }
+
+    start = time.perf_counter()
+    new_pipeline, added = warm_start(pipeline, delta_train[features], delta_train[target], n_rounds)
+    report["fit_seconds"] = {"incremental": time.perf_counter() - start}
+    report["added_categories"] = added
+    report["metrics"]["incremental"] = evaluate(task, new_pipeline, X_hold, y_hold)
+
+    if compare_full:
+        full_train = pd.concat([base_train, delta_train])
+        # From scratch with the standard layout and as many trees as the
+        # current model has in total, like re-running the training script
+        from sklearn.pipeline import Pipeline
+
+        from src.models.preprocessing import get_preprocessing_pipeline
+
+        total_rounds = pipeline.named_steps["model"].get_booster().num_boosted_rounds()
+        full_pipeline = Pipeline(steps=[
+            ("preprocessor", get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES)),
+            ("model", clone(pipeline.named_steps["model"]).set_params(n_estimators=total_rounds)),
+        ])
+        start = time.perf_counter()
+        full_pipeline.fit(full_train[features], full_train[target])
+        report["fit_seconds"]["full"] = time.perf_counter() - start
+        report["metrics"]["full"] = evaluate(task, full_pipeline, X_hold, y_hold)
+
+    report["version_dir"] = registry.register(new_pipeline, name, report, models_dir)
+    if promote:
+        registry.promote(name, os.path.basename(report["version_dir"]), models_dir)
+    report["promoted"] = promote
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"Incremental {report['task']} retrain -> {report['version_dir']}")
+    print(f"  delta rows     : {report['delta_rows']:,} (+{report['n_rounds']} rounds)")
+    added = report["added_categories"]
+    print(f"  new categories : {sum(len(v) for v in added.values())} {added if added else ''}")
+
+    seconds = report["fit_seconds"]
+    line = f"  fit time       : {seconds['incremental']:.2f} s"
+    if "full" in seconds:
+        saved = seconds["full"] - seconds["incremental"]
+        line += f" vs {seconds['full']:.2f} s full retrain ({saved:.2f} s / {seconds['full'] / seconds['incremental']:.1f}x saved)"
+    print(line)
+
+    metrics = report["metrics"]
+    print(f"  holdout ({report['holdout_rows']:,} rows):")
+    for key in metrics["before"]:
+        row = f"    {key:<9s} before {metrics['before'][key]:.4f}  incremental {metrics['incremental'][key]:.4f}"
+        row += f" ({metrics['incremental'][key] - metrics['before'][key]:+.4f})"
+        if "full" in metrics:
+            row += f"  full {metrics['full'][key]:.4f}"
+        print(row)
+    if report["promoted"]:
+        print("  promoted to the live models/ artifacts")
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Warm-start retraining from a delta CSV.")
+    parser.add_argument("--task", choices=sorted(TASKS), required=True)
+    parser.add_argument("--delta", required=True, help="CSV of new listings (processed schema).")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--holdout-frac", type=float, default=0.2)
+    parser.add_argument("--compare-full", action="store_true",
+                        help="Also time a full retrain on base + delta for comparison.")
+    parser.add_argument("--promote", action="store_true",
+                        help="Copy the new version over the live models/ artifacts.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    report = retrain_incremental(
+        args.task,
+        pd.read_csv(args.delta),
+        n_rounds=args.rounds,
+        holdout_frac=args.holdout_frac,
+        compare_full=args.compare_full,
+        promote=args.promote,
+    )
+    print_report(report)
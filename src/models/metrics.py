@@ -0,0 +1,444 @@
+"""
+Per-stage latency metrics for the prediction path.
+
+Every scoring entry point (single property, batch, Streamlit helper) runs
+as a *request*; the steps inside it (DataFrame build, feature engineering,
+each head's preprocess + predict, model loads) are *stages*. Both are timed
+into fixed-bucket histograms labelled with the request path, alongside
+counters for requests, rows scored, errors and model loads. Recording a
+stage costs two ``perf_counter`` calls, one bisect and a short lock hold.
+
+Exports:
+    PredictionMetrics.prometheus_text()   Prometheus text exposition format
+    PredictionMetrics.write_prometheus()  same, atomically to a file
+    PredictionMetrics.log_line()          one JSON summary line (p50/p95/p99)
+    log_request(request)                  one request's JSON line on the module logger
+    MetricsExporter                       thread doing the above periodically
+
+Profiling is opt-in: ``enable_profiling(top_n)`` runs each request under
+cProfile (or pyinstrument) and keeps the profiles of the ``top_n`` slowest
+requests for ``dump_profiles``.
+
+Metrics are per process: workers of ``predict_properties_parallel`` keep
+their own.
+"""
+import bisect
+import heapq
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# pyinstrument is imported lazily, only when chosen as the profiling backend.
+
+# -------------------------------------------------------------------
+# Histogram buckets: 10 per decade from 10 µs to 100 s (upper bounds, s)
+# -------------------------------------------------------------------
+BUCKET_BOUNDS = tuple(10 ** (k / 10) for k in range(-50, 21))
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+DEFAULT_EXPORT_INTERVAL_S = 60.0
+
+PROFILING_BACKENDS = ("cprofile", "pyinstrument")
+
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram (not thread-safe on its own)."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)  # last = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate from the buckets, interpolating linearly inside the bucket
+        holding the q-th observation (within one bucket width, ~26 %).
+        """
+        if not self.count:
+            return float("nan")
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKET_BOUNDS[i - 1] if i > 0 else 0.0
+                upper = BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+
+class _Stage:
+    """Context manager timing one stage into ``metrics``."""
+
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: "PredictionMetrics", name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _Request:
+    """
+    Context manager for one scoring request. The outermost request on a
+    thread owns the path label, row / error counters and profiling; nested
+    ones (e.g. the single-row fallback calling the batch path) only time
+    their stages. ``stages`` holds this request's stage times afterwards.
+    """
+
+    __slots__ = ("metrics", "path", "rows", "outer", "start", "seconds", "stages", "profiler")
+
+    def __init__(self, metrics: "PredictionMetrics", path: str, rows: int):
+        self.metrics = metrics
+        self.path = path
+        self.rows = rows
+        self.stages: Dict[str, float] = {}
+        self.seconds = 0.0
+        self.profiler = None
+
+    def __enter__(self):
+        local = self.metrics._local
+        self.outer = getattr(local, "request", None) is None
+        if self.outer:
+            local.request = self
+            self.profiler = self.metrics._start_profiler()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self.start
+        if not self.outer:
+            return False
+        m = self.metrics
+        m._local.request = None
+        if self.profiler is not None:
+            m._finish_profiler(self.profiler, self.seconds, self.path)
+        with m._lock:
+            m._histogram(self.path, "total").observe(self.seconds)
+            m._add("requests", self.path)
+            if exc_type is None:
+                m._add("rows_scored", self.path, self.rows)
+            else:
+                m._add("errors", self.path)
+        return False
+
+    def log_line(self) -> str:
+        """This request as one JSON line (milliseconds)."""
+        return json.dumps({
+            "event": "prediction_request",
+            "path": self.path,
+            "rows": self.rows,
+            "total_ms": round(self.seconds * 1000, 3),
+            "stages_ms": {k: round(v * 1000, 3) for k, v in self.stages.items()},
+        })
+
+
+class _Disabled:
+    """No-op stand-in for ``_Stage`` / ``_Request`` while metrics are off."""
+
+    stages: Dict[str, float] = {}
+    seconds = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def log_line(self) -> str:
+        return json.dumps({"event": "prediction_request", "metrics": "disabled"})
+
+
+_DISABLED = _Disabled()
+
+
+class PredictionMetrics:
+    """
+    Thread-safe registry of stage histograms and counters.
+
+    Histograms are keyed by (path, stage); ``total`` is the whole request.
+    Counters: ``requests`` / ``rows_scored`` / ``errors`` by path, and
+    ``model_loads`` by artifact.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._counters: Dict[Tuple[str, str], int] = {}
+        self._profile_top_n = 0
+        self._profile_backend = "cprofile"
+        self._profiles: List[Tuple[float, int, str, object]] = []  # min-heap on seconds
+        self._profile_ids = itertools.count()
+
+    # ---------------------------------------------------------------
+    # Recording
+    # ---------------------------------------------------------------
+    def request(self, path: str, rows: int = 1):
+        """Time a scoring request: ``with metrics.request("batch", len(df)):``."""
+        return _Request(self, path, rows) if self.enabled else _DISABLED
+
+    def stage(self, name: str):
+        """Time one stage of the current request: ``with metrics.stage("encode"):``."""
+        return _Stage(self, name) if self.enabled else _DISABLED
+
+    def observe(self, stage: str, seconds: float) -> None:
+        request = getattr(self._local, "request", None)
+        path = "other" if request is None else request.path
+        if request is not None:
+            request.stages[stage] = request.stages.get(stage, 0.0) + seconds
+        with self._lock:
+            self._histogram(path, stage).observe(seconds)
+
+    def count(self, name: str, label: str, n: int = 1) -> None:
+        """Bump counter ``name{label}`` (e.g. ``count("model_loads", "classifier")``)."""
+        if self.enabled:
+            with self._lock:
+                self._add(name, label, n)
+
+    def _histogram(self, path: str, stage: str) -> LatencyHistogram:
+        # Caller holds the lock
+        hist = self._histograms.get((path, stage))
+        if hist is None:
+            hist = self._histograms[(path, stage)] = LatencyHistogram()
+        return hist
+
+    def _add(self, name: str, label: str, n: int = 1) -> None:
+        # Caller holds the lock
+        self._counters[(name, label)] = self._counters.get((name, label), 0) + n
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._profiles.clear()
+
+    # ---------------------------------------------------------------
+    # Export
+    # ---------------------------------------------------------------
+    def snapshot(self) -> Dict:
+        """Counters plus count / mean / p50 / p95 / p99 / max (ms) per (path, stage)."""
+        with self._lock:
+            stages = {}
+            for (path, stage), h in sorted(self._histograms.items()):
+                summary = {"count": h.count, "mean_ms": h.sum / h.count * 1000}
+                for q in QUANTILES:
+                    summary[f"p{round(q * 100)}_ms"] = h.quantile(q) * 1000
+                summary["max_ms"] = h.max * 1000
+                stages.setdefault(path, {})[stage] = {k: round(v, 4) for k, v in summary.items()}
+            counters = {}
+            for (name, label), value in sorted(self._counters.items()):
+                counters.setdefault(name, {})[label] = value
+        return {"stages": stages, "counters": counters}
+
+    def log_line(self) -> str:
+        """The snapshot as one JSON line, for log-based collection."""
+        return json.dumps({"event": "prediction_metrics", "ts": round(time.time(), 3), **self.snapshot()})
+
+    def prometheus_text(self, prefix: str = "prediction") -> str:
+        """Histograms and counters in Prometheus text exposition format."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            lines = [f"# TYPE {prefix}_stage_seconds histogram"]
+            for (path, stage), h in histograms:
+                labels = f'path="{path}",stage="{stage}"'
+                cumulative = 0
+                for bound, n in zip(BUCKET_BOUNDS, h.counts):
+                    cumulative += n
+                    lines.append(f'{prefix}_stage_seconds_bucket{{{labels},le="{bound:.6g}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_seconds_bucket{{{labels},le="+Inf"}} {h.count}')
+                lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {h.sum!r}")
+                lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {h.count}")
+
+        label_names = {"model_loads": "artifact"}
+        for name in sorted({name for (name, _), _ in counters}):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            for (n, label), value in counters:
+                if n == name:
+                    lines.append(f'{prefix}_{name}_total{{{label_names.get(name, "path")}="{label}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically write ``prometheus_text`` (e.g. for a textfile collector)."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    # ---------------------------------------------------------------
+    # Opt-in profiling of the slowest requests
+    # ---------------------------------------------------------------
+    def enable_profiling(self, top_n: int = 10, backend: str = "cprofile") -> None:
+        """Profile every request and keep the ``top_n`` slowest."""
+        if backend not in PROFILING_BACKENDS:
+            raise ValueError(f"Unknown profiling backend {backend!r}; use one of {PROFILING_BACKENDS}.")
+        if backend == "pyinstrument":
+            import pyinstrument  # noqa: F401  (fail now, not on the first request)
+        with self._lock:
+            self._profile_backend = backend
+            self._profile_top_n = top_n
+            self._profiles.clear()
+
+    def disable_profiling(self) -> None:
+        with self._lock:
+            self._profile_top_n = 0
+
+    def _start_profiler(self):
+        if not self._profile_top_n:
+            return None
+        try:
+            if self._profile_backend == "pyinstrument":
+                import pyinstrument
+
+                profiler = pyinstrument.Profiler()
+                profiler.start()
+            else:
+                import cProfile
+
+                profiler = cProfile.Profile()
+                profiler.enable()
+        except (RuntimeError, ValueError):
+            return None  # another profiler is active on this thread: skip this one
+        return profiler
+
+    def _finish_profiler(self, profiler, seconds: float, path: str) -> None:
+        if hasattr(profiler, "output_html"):  # pyinstrument
+            profiler.stop()
+        else:
+            profiler.disable()
+        entry = (seconds, next(self._profile_ids), path, profiler)
+        with self._lock:
+            if len(self._profiles) < self._profile_top_n:
+                heapq.heappush(self._profiles, entry)
+            elif self._profiles and seconds > self._profiles[0][0]:
+                heapq.heapreplace(self._profiles, entry)
+
+    def slowest_profiles(self) -> List[Tuple[float, str, object]]:
+        """(seconds, path, profiler) of the slowest profiled requests, slowest first."""
+        with self._lock:
+            return [(s, p, prof) for s, _, p, prof in sorted(self._profiles, reverse=True)]
+
+    def dump_profiles(self, directory: str) -> List[str]:
+        """
+        Write the kept profiles to ``directory``: ``.prof`` files for cProfile
+        (open with ``python -m pstats`` or snakeviz), ``.html`` for
+        pyinstrument. Returns the paths, slowest first.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for rank, (seconds, path, profiler) in enumerate(self.slowest_profiles(), start=1):
+            stem = os.path.join(directory, f"{rank:02d}_{path}_{seconds * 1000:.1f}ms")
+            if hasattr(profiler, "output_html"):
+                with open(stem + ".html", "w") as f:
+                    f.write(profiler.output_html())
+                paths.append(stem + ".html")
+            else:
+                profiler.dump_stats(stem + ".prof")
+                paths.append(stem + ".prof")
+        return paths
+
+
+_metrics = PredictionMetrics()
+
+
+def get_metrics() -> PredictionMetrics:
+    """The process-wide prediction metrics."""
+    return _metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+def log_request(request) -> None:
+    """
+    Log ``request.log_line()`` at INFO on this module's logger
+    (``src.models.metrics``), so deployments can route, filter or silence
+    per-request lines with the usual logging configuration. When nothing
+    has configured logging, a stderr handler is attached so the lines stay
+    visible by default.
+    """
+    if not logger.hasHandlers():
+        logger.addHandler(logging.StreamHandler())
+        if logger.level == logging.NOTSET:
+            logger.setLevel(logging.INFO)
+    logger.info(request.log_line())
+
+
+# -------------------------------------------------------------------
+# Periodic export
+# -------------------------------------------------------------------
+class MetricsExporter:
+    """
+    Daemon thread that, every ``interval_s`` seconds, writes the Prometheus
+    text to ``path`` and/or prints the JSON summary line to ``stream``.
+    """
+
+    def __init__(
+        self,
+        interval_s: float = DEFAULT_EXPORT_INTERVAL_S,
+        path: Optional[str] = None,
+        log: bool = False,
+        stream=None,
+        metrics: PredictionMetrics = None,
+    ):
+        self.interval_s = interval_s
+        self.path = path
+        self.log = log
+        self.stream = stream
+        self.metrics = metrics or _metrics
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "MetricsExporter":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the thread after one final export."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.export()
+
+    def export(self) -> None:
+        try:
+            if self.path:
+                self.metrics.write_prometheus(self.path)
+            if self.log:
+                print(self.metrics.log_line(), file=self.stream or sys.stderr, flush=True)
+        except OSError:
+            self.errors += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.export()
@@ -0,0 +1,327 @@
+"""
+Out-of-core training for listing files larger than RAM.
+
+The CSV is never loaded whole. A first streaming pass fits the standard
+preprocessor (StandardScaler statistics via ``partial_fit``, one-hot
+vocabularies as the union of each chunk's categories). XGBoost then reads
+the training rows through a ``DataIter``: every chunk goes through
+``build_features`` and the fitted preprocessor and is handed over as CSR,
+and an ``ExtMemQuantileDMatrix`` keeps the quantised pages in an on-disk
+cache. Peak memory is bounded by the chunk size, not the file size.
+
+The holdout is a seeded per-chunk random mask, so both passes (and
+evaluation) see the same split without an index of the whole file. The
+result is a regular ``preprocessor -> XGBoost`` pipeline, registered as a
+new version in the model registry like incremental retraining.
+
+Usage:
+    python src/data/synthetic.py --rows 10000000 --output data/synthetic/listings_10m.csv
+    python src/models/out_of_core.py --task classification --csv data/synthetic/listings_10m.csv
+    python src/models/out_of_core.py --task regression --csv data/synthetic/listings_10m.csv --promote
+"""
+import argparse
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterator
+
+import numpy as np
+import pandas as pd
+
+# sklearn / xgboost are imported lazily, like the training scripts.
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.data.load_data import CACHE_DIR  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models import registry  # noqa: E402
+from src.models.incremental import MODELS_DIR, prediction_metrics  # noqa: E402
+from src.models.train_joint import (  # noqa: E402
+    CAT_FEATURES,
+    CLASSIFICATION_TARGET,
+    CLASSIFIER_PARAMS,
+    NUM_FEATURES,
+    REGRESSION_TARGET,
+    REGRESSOR_PARAMS,
+)
+
+FEATURES = NUM_FEATURES + CAT_FEATURES
+
+# On-disk page cache of the external-memory DMatrix (one temp dir per run)
+EXTERNAL_MEMORY_DIR = os.path.join(CACHE_DIR, "external_memory")
+
+DEFAULT_CHUNK_ROWS = 500_000
+DEFAULT_HOLDOUT_FRAC = 0.2
+SPLIT_SEED = 42
+
+# task -> artifact name, target, estimator hyperparameters (same as the
+# training scripts) and the matching native objective
+TASKS = {
+    "classification": {
+        "name": "classifier",
+        "target": CLASSIFICATION_TARGET,
+        "params": CLASSIFIER_PARAMS,
+        "objective": "binary:logistic",
+    },
+    "regression": {
+        "name": "regression",
+        "target": REGRESSION_TARGET,
+        "params": REGRESSOR_PARAMS,
+        "objective": "reg:squarederror",
+    },
+}
+
+
+# -------------------------------------------------------------------
+# Streaming input
+# -------------------------------------------------------------------
+def read_chunks(csv_path: str, target: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Feature-engineered ``chunk_rows`` frames (features + target) of a CSV."""
+    reader = pd.read_csv(csv_path, usecols=FEATURES + [target], chunksize=chunk_rows)
+    for chunk in reader:
+        yield build_features(chunk, compact=True)
+
+
+def holdout_mask(n_rows: int, chunk_index: int, holdout_frac: float = DEFAULT_HOLDOUT_FRAC) -> np.ndarray:
+    """Boolean holdout rows of chunk ``chunk_index``; the same on every pass."""
+    return np.random.default_rng([SPLIT_SEED, chunk_index]).random(n_rows) < holdout_frac
+
+
+def fit_streaming_preprocessor(
+    csv_path: str,
+    target: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    holdout_frac: float = DEFAULT_HOLDOUT_FRAC,
+):
+    """
+    Fit ``get_preprocessing_pipeline`` on the training rows in one pass.
+
+    Returns
+    -------
+    preprocessor : ColumnTransformer
+        Same layout as the in-memory training scripts. Scaler statistics
+        match a full fit up to floating-point rounding; the one-hot
+        vocabularies match exactly.
+    n_train : int
+        Training rows seen.
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    from src.models.preprocessing import get_preprocessing_pipeline
+
+    scaler = StandardScaler()
+    vocabularies = {col: set() for col in CAT_FEATURES}
+    n_train = 0
+    for i, chunk in enumerate(read_chunks(csv_path, target, chunk_rows)):
+        chunk = chunk[~holdout_mask(len(chunk), i, holdout_frac)]
+        if chunk.empty:
+            continue
+        scaler.partial_fit(chunk[NUM_FEATURES])
+        for col in CAT_FEATURES:
+            vocabularies[col].update(chunk[col].unique())
+        n_train += len(chunk)
+    if n_train == 0:
+        raise ValueError(f"No training rows in {csv_path}.")
+
+    # Fit the ColumnTransformer on a small frame holding every category, then
+    # install the streamed scaler statistics. Numerics alternate 0/1 so the
+    # frame's density (and so the sparse/dense output choice) matches real rows.
+    width = max(2, max(len(v) for v in vocabularies.values()))
+    frame = pd.DataFrame(
+        {col: np.arange(width) % 2 for col in NUM_FEATURES}
+        | {col: np.resize(sorted(vocabularies[col]), width) for col in CAT_FEATURES}
+    )
+    preprocessor = get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES).fit(frame)
+    fitted = preprocessor.named_transformers_["num"].named_steps["scaler"]
+    for attr in ("mean_", "var_", "scale_", "n_samples_seen_"):
+        setattr(fitted, attr, getattr(scaler, attr))
+    return preprocessor, n_train
+
+
+def external_memory_dmatrix(
+    csv_path: str,
+    target: str,
+    preprocessor,
+    cache_dir: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    holdout_frac: float = DEFAULT_HOLDOUT_FRAC,
+):
+    """
+    ``ExtMemQuantileDMatrix`` over the training rows of ``csv_path``,
+    encoded chunk by chunk with the fitted ``preprocessor``. Pages are
+    cached under ``cache_dir``.
+    """
+    import xgboost as xgb
+
+    class _EncodedChunks(xgb.DataIter):
+        def __init__(self):
+            self._chunks = None
+            self._index = 0
+            super().__init__(cache_prefix=os.path.join(cache_dir, "train"))
+
+        def reset(self):
+            self._chunks = None
+            self._index = 0
+
+        def next(self, input_data):
+            if self._chunks is None:
+                self._chunks = read_chunks(csv_path, target, chunk_rows)
+            for chunk in self._chunks:
+                chunk = chunk[~holdout_mask(len(chunk), self._index, holdout_frac)]
+                self._index += 1
+                if chunk.empty:
+                    continue
+                input_data(data=preprocessor.transform(chunk[FEATURES]), label=chunk[target].to_numpy())
+                return True
+            return False
+
+    return xgb.ExtMemQuantileDMatrix(_EncodedChunks())
+
+
+def _booster_params(task: str):
+    """(native xgb.train params, n_rounds) equivalent to the task's estimator."""
+    params = dict(TASKS[task]["params"])
+    n_rounds = params.pop("n_estimators")
+    params["seed"] = params.pop("random_state")
+    params.update(objective=TASKS[task]["objective"], tree_method="hist")
+    return params, n_rounds
+
+
+def evaluate_streaming(
+    task: str,
+    pipeline,
+    csv_path: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    holdout_frac: float = DEFAULT_HOLDOUT_FRAC,
+) -> Dict[str, float]:
+    """Holdout metrics from a chunked pass; only targets and scores are kept."""
+    target = TASKS[task]["target"]
+    ys, scores = [], []
+    for i, chunk in enumerate(read_chunks(csv_path, target, chunk_rows)):
+        chunk = chunk[holdout_mask(len(chunk), i, holdout_frac)]
+        if chunk.empty:
+            continue
+        X = chunk[FEATURES]
+        scores.append(pipeline.predict_proba(X)[:, 1] if task == "classification" else pipeline.predict(X))
+        ys.append(chunk[target].to_numpy())
+    return prediction_metrics(task, np.concatenate(ys), np.concatenate(scores))
+
+
+# -------------------------------------------------------------------
+# Driver
+# -------------------------------------------------------------------
+def train_out_of_core(
+    task: str,
+    csv_path: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    holdout_frac: float = DEFAULT_HOLDOUT_FRAC,
+    models_dir: str = MODELS_DIR,
+    save: bool = True,
+    promote: bool = False,
+) -> Dict[str, Any]:
+    """
+    Train the ``task`` model on ``csv_path`` without loading it into memory.
+
+    Returns a report dict (also stored as the version's manifest when
+    ``save``); ``report["pipeline"]`` is the fitted pipeline.
+    """
+    import resource
+
+    import xgboost as xgb
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBClassifier, XGBRegressor
+
+    cfg = TASKS[task]
+    timings = {}
+
+    start = time.perf_counter()
+    preprocessor, n_train = fit_streaming_preprocessor(csv_path, cfg["target"], chunk_rows, holdout_frac)
+    timings["preprocess"] = time.perf_counter() - start
+
+    os.makedirs(EXTERNAL_MEMORY_DIR, exist_ok=True)
+    cache_dir = tempfile.mkdtemp(dir=EXTERNAL_MEMORY_DIR)
+    try:
+        start = time.perf_counter()
+        dtrain = external_memory_dmatrix(
+            csv_path, cfg["target"], preprocessor, cache_dir, chunk_rows, holdout_frac
+        )
+        timings["dmatrix"] = time.perf_counter() - start
+
+        params, n_rounds = _booster_params(task)
+        start = time.perf_counter()
+        booster = xgb.train(params, dtrain, num_boost_round=n_rounds)
+        timings["fit"] = time.perf_counter() - start
+        del dtrain
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    # Wrap the booster in the usual estimator so predict.py / fast_path work unchanged
+    estimator = XGBClassifier if task == "classification" else XGBRegressor
+    model = estimator(**cfg["params"], n_jobs=-1)
+    model.load_model(bytearray(booster.save_raw("ubj")))
+    pipeline = Pipeline(steps=[("preprocessor", preprocessor), ("model", model)])
+
+    start = time.perf_counter()
+    metrics = evaluate_streaming(task, pipeline, csv_path, chunk_rows, holdout_frac)
+    timings["evaluate"] = time.perf_counter() - start
+
+    report = {
+        "task": task,
+        "mode": "out_of_core",
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "source": os.path.abspath(csv_path),
+        "train_rows": n_train,
+        "chunk_rows": chunk_rows,
+        "holdout_frac": holdout_frac,
+        "n_rounds": n_rounds,
+        "seconds": timings,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "metrics": metrics,
+    }
+    if save:
+        report["version_dir"] = registry.register(pipeline, cfg["name"], report, models_dir)
+        if promote:
+            registry.promote(cfg["name"], os.path.basename(report["version_dir"]), models_dir)
+    report["promoted"] = save and promote
+    report["pipeline"] = pipeline
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"Out-of-core {report['task']} training -> {report.get('version_dir', '(not saved)')}")
+    print(f"  train rows : {report['train_rows']:,} in chunks of {report['chunk_rows']:,}")
+    print("  timings    : " + ", ".join(f"{k} {v:.2f} s" for k, v in report["seconds"].items()))
+    print(f"  peak RSS   : {report['peak_rss_mb']:,.0f} MB")
+    print("  holdout    : " + ", ".join(f"{k} {v:.4f}" for k, v in report["metrics"].items()))
+    if report["promoted"]:
+        print("  promoted to the live models/ artifacts")
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train on a listings CSV larger than RAM.")
+    parser.add_argument("--task", choices=sorted(TASKS), required=True)
+    parser.add_argument("--csv", required=True, help="Listings CSV (processed schema).")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--holdout-frac", type=float, default=DEFAULT_HOLDOUT_FRAC)
+    parser.add_argument("--no-save", action="store_true", help="Do not write a model version.")
+    parser.add_argument("--promote", action="store_true",
+                        help="Copy the new version over the live models/ artifacts.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    report = train_out_of_core(
+        args.task,
+        args.csv,
+        chunk_rows=args.chunk_rows,
+        holdout_frac=args.holdout_frac,
+        save=not args.no_save,
+        promote=args.promote,
+    )
+    print_report(report)
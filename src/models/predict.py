@@ -1,8 +1,15 @@
+import argparse
+import itertools
+import json
 import os
+import shutil
 import sys
-from typing import Dict, Any
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Any, Iterable, Mapping, Tuple, Union
 
-import joblib
+import numpy as np
 import pandas as pd
 
 # -------------------------------------------------------------------
@@ -13,6 +20,22 @@ if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
 from src.features.build_features import build_features  # noqa: E402
+from src.models import registry  # noqa: E402
+from src.models.cache import (  # noqa: E402
+    DEFAULT_CHECK_INTERVAL_S,
+    DEFAULT_MAXSIZE,
+    PredictionCache,
+    _artifact_signature,
+)
+from src.models.fast_path import (  # noqa: E402
+    TREE_BACKENDS,
+    CompiledPipeline,
+    file_sha256,
+    native_artifact_paths,
+    read_sidecar,
+)
+from src.models.metrics import get_metrics  # noqa: E402
+from src.models.tree_eval import tree_table_path  # noqa: E402
 
 # -------------------------------------------------------------------
 # 2) Constants – must match training code
@@ -34,44 +57,519 @@ ALL_FEATURES = NUM_FEATURES + CAT_FEATURES
 CLASSIFIER_PATH = os.path.join(PROJECT_ROOT, "models", "classifier_pipeline.pkl")
 REGRESSOR_PATH = os.path.join(PROJECT_ROOT, "models", "regression_pipeline.pkl")
 
+# Native XGBoost + JSON sidecar exports (see src/models/fast_path.py)
+MODELS_DIR = os.path.join(PROJECT_ROOT, "models")
+NATIVE_ARTIFACT_PATHS = native_artifact_paths(MODELS_DIR, "classifier") + native_artifact_paths(
+    MODELS_DIR, "regression"
+)
+TREE_TABLE_PATHS = (
+    tree_table_path(MODELS_DIR, "classifier"),
+    tree_table_path(MODELS_DIR, "regression"),
+)
+
 # -------------------------------------------------------------------
-# 3) Lazy loaders – load once, reuse
+# 3) Model sets – one loaded version of both models, hot-swappable
 # -------------------------------------------------------------------
-_classifier_model = None
-_regression_model = None
+# How often the background watcher looks for a newly promoted version
+DEFAULT_WATCH_INTERVAL_S = 2.0
 
+# Stage timers / counters for every scoring path (see src/models/metrics.py)
+_metrics = get_metrics()
 
-def _load_classifier():
-    global _classifier_model
-    if _classifier_model is None:
-        if not os.path.exists(CLASSIFIER_PATH):
-            raise FileNotFoundError(
-                f"Classifier model file not found at {CLASSIFIER_PATH}. "
-                f"Run train_classification.py first."
+# Tree evaluator of the single-row fast path (see configure_tree_backend).
+# xgboost by default: fast-path results are bit-identical to Pipeline.predict.
+_tree_backend = "xgboost"
+
+_MISSING_MODEL_HINT = {
+    "classifier": ("Classifier", "train_classification.py"),
+    "regression": ("Regression", "train_regression.py"),
+}
+
+
+def _live_sources(models_dir: str = MODELS_DIR) -> Dict[str, str]:
+    """
+    name -> directory holding that model's live artifacts: its promoted
+    registry version, or models/ itself when nothing has been promoted.
+    """
+    current = registry.current_versions(models_dir)
+    return {
+        name: registry.version_dir(name, current[name], models_dir) if name in current else models_dir
+        for name in registry.MODEL_NAMES
+    }
+
+
+def _sources_signature(sources: Dict[str, str]) -> Tuple:
+    """
+    Changes whenever the live version does. Registry directories are
+    immutable, so only loose models/ files need their (mtime, size) checked.
+    """
+    sig = []
+    for name, directory in sorted(sources.items()):
+        if directory == MODELS_DIR:
+            paths = (
+                (os.path.join(directory, f"{name}_pipeline.pkl"),)
+                + native_artifact_paths(directory, name)
+                + (tree_table_path(directory, name),)
             )
-        _classifier_model = joblib.load(CLASSIFIER_PATH)
-    return _classifier_model
+            sig.append((name, directory, _artifact_signature(paths)))
+        else:
+            sig.append((name, directory))
+    return tuple(sig)
 
 
-def _load_regressor():
-    global _regression_model
-    if _regression_model is None:
-        if not os.path.exists(REGRESSOR_PATH):
+class ModelSet:
+    """
+    Both models of one live version.
+
+    Components (pipelines, compiled fast path, vocabulary) load lazily on
+    first use and are never replaced afterwards. Callers take one reference
+    with ``current_models()`` per request and use it throughout, so a request
+    always finishes on the version it started on, even if a newer set is
+    swapped in meanwhile.
+
+    Parameters
+    ----------
+    sources : dict
+        name -> directory with ``<name>_pipeline.pkl`` and native exports.
+    generation : int
+        Increases with every swap; tags prediction-cache entries.
+    tree_backend : str, optional
+        "xgboost" or "numpy" evaluator for the compiled fast path; defaults
+        to the one set by ``configure_tree_backend``.
+    """
+
+    def __init__(self, sources: Dict[str, str], generation: int = 0, tree_backend: str = None):
+        self.sources = dict(sources)
+        self.generation = generation
+        self.tree_backend = tree_backend or _tree_backend
+        self.signature = _sources_signature(self.sources)
+        self.versions = {
+            name: "live" if directory == MODELS_DIR else os.path.basename(directory)
+            for name, directory in self.sources.items()
+        }
+        self._lock = threading.RLock()
+        self._pipelines = {}
+        self._compiled = None  # None = not tried yet, False = unsupported layout
+        self._shared_encoding = None
+        self._category_vocabulary = None
+
+    def pipeline_path(self, name: str) -> str:
+        return os.path.join(self.sources[name], f"{name}_pipeline.pkl")
+
+    def pipeline(self, name: str):
+        """The fitted sklearn pipeline ("classifier" or "regression")."""
+        pipeline = self._pipelines.get(name)
+        if pipeline is not None:
+            return pipeline
+        with self._lock:
+            if name not in self._pipelines:
+                path = self.pipeline_path(name)
+                if not os.path.exists(path):
+                    label, script = _MISSING_MODEL_HINT[name]
+                    raise FileNotFoundError(
+                        f"{label} model file not found at {path}. Run {script} first."
+                    )
+                import joblib  # lazy: the native fast path never needs it
+
+                with _metrics.stage("model_load"):
+                    self._pipelines[name] = joblib.load(path)
+                _metrics.count("model_loads", name)
+            return self._pipelines[name]
+
+    def native_paths(self) -> Tuple[str, ...]:
+        return tuple(p for name in registry.MODEL_NAMES for p in native_artifact_paths(self.sources[name], name))
+
+    def native_predictors(self):
+        """
+        (classifier, regressor) inference-only predictors from the native
+        booster + sidecar exports, without unpickling any sklearn object.
+        """
+        missing = [p for p in self.native_paths() if not os.path.exists(p)]
+        if missing:
             raise FileNotFoundError(
-                f"Regression model file not found at {REGRESSOR_PATH}. "
-                f"Run train_regression.py first."
+                f"Native model artifacts not found: {missing}. "
+                f"Run the training scripts or `python -m src.models.fast_path` first."
             )
-        _regression_model = joblib.load(REGRESSOR_PATH)
-    return _regression_model
+        return tuple(
+            CompiledPipeline.load(self.sources[name], name, backend=self.tree_backend)
+            for name in registry.MODEL_NAMES
+        )
+
+    def native_current(self) -> bool:
+        """Native exports exist and were compiled from the pickles next to them."""
+        if not all(os.path.exists(p) for p in self.native_paths()):
+            return False
+        for name in registry.MODEL_NAMES:
+            pkl_path = self.pipeline_path(name)
+            if not os.path.exists(pkl_path):
+                continue  # native-only deployment
+            _, sidecar_path = native_artifact_paths(self.sources[name], name)
+            if read_sidecar(sidecar_path).get("source_sha256") != file_sha256(pkl_path):
+                return False
+        return True
+
+    def compiled(self):
+        """
+        (classifier, regressor) compiled for the single-row fast path, or None
+        if a pipeline has a layout CompiledPipeline does not support.
+
+        Up-to-date native exports are preferred, which skips unpickling the
+        sklearn pipelines entirely.
+        """
+        if self._compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    if self.native_current():
+                        with _metrics.stage("model_load"):
+                            self._compiled = self.native_predictors()
+                        _metrics.count("model_loads", "native")
+                    else:
+                        try:
+                            self._compiled = tuple(
+                                CompiledPipeline.from_pipeline(self.pipeline(name), backend=self.tree_backend)
+                                for name in registry.MODEL_NAMES
+                            )
+                        except ValueError:
+                            self._compiled = False
+        return self._compiled or None
+
+    def encoding_is_shared(self) -> bool:
+        """
+        Both pipelines encode features identically (e.g. trained together by
+        train_joint.py), so the encoded matrix can be computed once and fed to
+        both boosters. Checked once on the compiled parameters.
+        """
+        if self._shared_encoding is None:
+            compiled = self.compiled()
+            self._shared_encoding = compiled is not None and compiled[0].same_encoding(compiled[1])
+        return self._shared_encoding
+
+    def category_vocabulary(self):
+        """
+        Per-column category vocabulary saved with the models (union of both
+        pipelines' one-hot categories), or None if the pipelines cannot be
+        compiled. Used by the compact feature path.
+        """
+        if self._category_vocabulary is None:
+            compiled = self.compiled()
+            if compiled is None:
+                return None
+            vocab = {}
+            for model in compiled:
+                for col, cats in zip(model.cat_features, model.vocabularies):
+                    vocab[col] = sorted(set(vocab.get(col, ())) | set(cats))
+            self._category_vocabulary = vocab
+        return self._category_vocabulary
+
+    def warm(self, like: "ModelSet" = None) -> "ModelSet":
+        """
+        Load now what ``like`` (the set being replaced) has loaded, so the
+        first request after a swap does not pay for it. Without ``like``,
+        loads the single-row fast path.
+        """
+        if like is None or like._compiled is not None:
+            self.encoding_is_shared()
+        if like is not None:
+            for name in like._pipelines:
+                self.pipeline(name)
+            if like._category_vocabulary is not None:
+                self.category_vocabulary()
+        return self
+
+
+_models: ModelSet = None
+_models_lock = threading.Lock()  # guards creating the first set
+_reload_lock = threading.Lock()  # one reload at a time
+_generations = itertools.count(1)
+
+
+def current_models() -> ModelSet:
+    """The live model set. Take it once per request and keep the reference."""
+    global _models
+    models = _models
+    if models is None:
+        with _models_lock:
+            if _models is None:
+                _models = ModelSet(_live_sources(), next(_generations))
+            models = _models
+    return models
+
+
+def reload_models(force: bool = False) -> bool:
+    """
+    Load the live version if it changed since the current set was built,
+    fully on the calling thread, then swap it in with one reference
+    assignment. Requests keep running on the old set meanwhile and never
+    wait on the load. Returns whether a new set was swapped in.
+    """
+    global _models
+    with _reload_lock:
+        old = current_models()
+        sources = _live_sources()
+        if not force and _sources_signature(sources) == old.signature:
+            return False
+        new = ModelSet(sources, next(_generations)).warm(like=old)
+        _models = new
+        _prediction_cache.set_generation(new.generation)
+        return True
+
+
+def configure_tree_backend(backend: str = "xgboost") -> ModelSet:
+    """
+    Choose what evaluates the trees on the single-row fast path and swap in
+    a model set using it (the prediction cache starts a new generation).
+
+    "numpy" walks the flattened node tables of ``src.models.tree_eval``: it
+    is faster for one to a few dozen rows and loads without importing
+    xgboost, but only matches XGBoost to float32 rounding. Batch scoring
+    always goes through the pipelines.
+    """
+    global _tree_backend
+    if backend not in TREE_BACKENDS:
+        raise ValueError(f"Unknown tree backend {backend!r}; expected one of {TREE_BACKENDS}.")
+    _tree_backend = backend
+    reload_models(force=True)
+    return current_models()
+
+
+class ModelWatcher:
+    """
+    Daemon thread that calls ``reload_models`` every ``interval_s`` seconds.
+    A failed load (e.g. a half-written loose pickle) keeps the current set
+    and is retried on the next poll.
+    """
+
+    def __init__(self, interval_s: float = DEFAULT_WATCH_INTERVAL_S):
+        self.interval_s = interval_s
+        self.reloads = 0
+        self.errors = 0
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "ModelWatcher":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                if reload_models():
+                    self.reloads += 1
+            except Exception as e:
+                self.errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+
+
+_watcher: ModelWatcher = None
+
+
+def start_model_watcher(interval_s: float = DEFAULT_WATCH_INTERVAL_S) -> ModelWatcher:
+    """Start (once per process) the background hot-reload watcher."""
+    global _watcher
+    with _models_lock:
+        if _watcher is None:
+            _watcher = ModelWatcher(interval_s).start()
+    return _watcher
+
+
+def stop_model_watcher() -> None:
+    global _watcher
+    with _models_lock:
+        watcher, _watcher = _watcher, None
+    if watcher is not None:
+        watcher.stop()
+
+
+# Accessors on the live set, kept for callers of the single-version API
+def _load_classifier():
+    return current_models().pipeline("classifier")
+
+
+def _load_regressor():
+    return current_models().pipeline("regression")
+
+
+def load_native_predictors():
+    return current_models().native_predictors()
+
+
+def _load_compiled():
+    return current_models().compiled()
+
+
+def _encoding_is_shared() -> bool:
+    return current_models().encoding_is_shared()
+
+
+def _load_category_vocabulary():
+    return current_models().category_vocabulary()
+
+
+# -------------------------------------------------------------------
+# 4) Batch prediction for MANY properties
+# -------------------------------------------------------------------
+# Same threshold XGBClassifier.predict applies to the positive-class probability
+DECISION_THRESHOLD = 0.5
+
+BatchInput = Union[pd.DataFrame, Iterable[Mapping[str, Any]]]
+
+
+def _to_feature_frame(data: BatchInput) -> pd.DataFrame:
+    """
+    Normalise a DataFrame or an iterable of feature dicts into a frame
+    holding exactly ALL_FEATURES (missing columns become NaN, extras dropped).
+    """
+    if isinstance(data, pd.DataFrame):
+        return data.reindex(columns=ALL_FEATURES)
+    return pd.DataFrame(list(data)).reindex(columns=ALL_FEATURES)
+
+
+def predict_properties_batch(
+    data: BatchInput, compact: bool = False, models: ModelSet = None
+) -> pd.DataFrame:
+    """
+    Run both classification + regression models over many properties at once.
+
+    Feature engineering and each pipeline run a single time over the whole
+    frame. The classifier is evaluated once via ``predict_proba``; the label
+    is derived from that probability instead of a second ``predict`` call.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame or iterable of dict
+        One row / dict per property with the same keys accepted by
+        ``predict_property_investment``. Extra columns are ignored.
+    compact : bool
+        Build features in place with categorical / downcast dtypes
+        (``build_features(compact=True)``) to cut memory on large frames.
+        Predictions are identical.
+    models : ModelSet, optional
+        Version to score with; defaults to the live set at call time (the
+        whole batch is scored on that one version).
+
+    Returns
+    -------
+    pandas.DataFrame with columns (index preserved for DataFrame input):
+        - good_investment_label (int 0/1)
+        - good_investment_prob (float 0–1)
+        - predicted_price_lakhs (float)
+    """
+    with _metrics.request("batch") as request:
+        models = models or current_models()
+
+        # 1) Align input to the training schema
+        with _metrics.stage("dataframe"):
+            df = _to_feature_frame(data)
+        request.rows = len(df)
+
+        # 2) Apply same feature engineering as training
+        #    (_to_feature_frame returned a new frame, so compact may work in place)
+        with _metrics.stage("build_features"):
+            if compact:
+                df = build_features(df, compact=True, vocabulary=models.category_vocabulary())
+            else:
+                df = build_features(df)
+
+        # 3) Slice to the exact columns used by the pipelines
+        X = df[ALL_FEATURES]
+
+        # 4) Load models
+        clf = models.pipeline("classifier")
+        reg = models.pipeline("regression")
+
+        # 5) Shared preprocessor: encode once, reuse the matrix for both heads
+        if models.encoding_is_shared():
+            with _metrics.stage("preprocess"):
+                Xt = clf.named_steps["preprocessor"].transform(X)
+            clf, reg = clf.named_steps["model"], reg.named_steps["model"]
+            X = Xt
+
+        # 6) Classification prediction (single pass; includes its preprocessing
+        #    when the heads do not share it)
+        with _metrics.stage("classifier"):
+            good_prob = clf.predict_proba(X)[:, 1].astype(np.float64)
+        good_label = (good_prob > DECISION_THRESHOLD).astype(np.int64)
+
+        # 7) Regression prediction (price in Lakhs)
+        with _metrics.stage("regressor"):
+            predicted_price = reg.predict(X).astype(np.float64)
+
+    return pd.DataFrame(
+        {
+            "good_investment_label": good_label,
+            "good_investment_prob": good_prob,
+            "predicted_price_lakhs": predicted_price,
+        },
+        index=df.index,
+    )
 
 
 # -------------------------------------------------------------------
-# 4) Core prediction function for a SINGLE property
+# 5) Core prediction function for a SINGLE property (+ LRU cache)
 # -------------------------------------------------------------------
-def predict_property_investment(features: Dict[str, Any]) -> Dict[str, Any]:
+_prediction_cache = PredictionCache(
+    NUM_FEATURES,
+    CAT_FEATURES,
+    artifact_paths=(CLASSIFIER_PATH, REGRESSOR_PATH) + NATIVE_ARTIFACT_PATHS + TREE_TABLE_PATHS,
+)
+
+
+def configure_prediction_cache(
+    maxsize: int = DEFAULT_MAXSIZE,
+    ttl_seconds: float = None,
+    float_precision: Dict[str, int] = None,
+    check_interval_s: float = DEFAULT_CHECK_INTERVAL_S,
+) -> PredictionCache:
+    """
+    Replace the single-property prediction cache.
+
+    ``float_precision`` maps numeric feature -> decimals kept in the key
+    (see ``src.models.cache.DEFAULT_FLOAT_PRECISION``); model files are
+    checked for changes at most every ``check_interval_s`` seconds.
+    """
+    global _prediction_cache
+    _prediction_cache = PredictionCache(
+        NUM_FEATURES,
+        CAT_FEATURES,
+        maxsize=maxsize,
+        ttl_seconds=ttl_seconds,
+        float_precision=float_precision,
+        artifact_paths=(CLASSIFIER_PATH, REGRESSOR_PATH) + NATIVE_ARTIFACT_PATHS + TREE_TABLE_PATHS,
+        check_interval_s=check_interval_s,
+    )
+    return _prediction_cache
+
+
+def get_prediction_cache() -> PredictionCache:
+    """Current cache, e.g. for ``stats()`` / ``prometheus_text()`` scraping."""
+    return _prediction_cache
+
+
+def predict_property_investment(features: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
     """
     Run both classification + regression models for a single property.
 
+    Results are memoised in a bounded LRU cache keyed on the normalised
+    feature values (floats rounded, see ``configure_prediction_cache``);
+    when a model artifact changes on disk (checked at most once per
+    ``check_interval_s``) the models are reloaded, and the cache is dropped
+    whenever a new model version is swapped in.
+
+    Misses go through the compiled fast path (``src.models.fast_path``),
+    which encodes the dict straight into the booster's input layout and
+    matches ``Pipeline.predict`` exactly; pipelines it cannot compile fall
+    back to ``predict_properties_batch``.
+
     Parameters
     ----------
     features : dict
@@ -82,6 +580,8 @@ def predict_property_investment(features: Dict[str, Any]) -> Dict[str, Any]:
           "calc_price_per_sqft", "Annual_Growth_Rate", "Future_Price_5Y"
 
         Extra keys are ignored.
+    use_cache : bool
+        Set False to bypass the prediction cache.
 
     Returns
     -------
@@ -90,39 +590,329 @@ def predict_property_investment(features: Dict[str, Any]) -> Dict[str, Any]:
         - good_investment_prob (float 0–1)
         - predicted_price_lakhs (float)
     """
+    with _metrics.request("single"):
+        cache = _prediction_cache if use_cache else None
+        if cache is not None and cache.check_artifacts():
+            # A model file changed on disk: swap the new set in before scoring,
+            # so the old one cannot refill the cache
+            reload_models()
+        models = current_models()
+        if cache is not None:
+            with _metrics.stage("cache_lookup"):
+                key = cache.make_key(features)
+                cached = cache.get(key)
+            if cached is not None:
+                return cached
 
-    # 1) Build a single-row DataFrame
-    row = {col: features.get(col) for col in ALL_FEATURES}
-    df = pd.DataFrame([row])
+        compiled = models.compiled()
+        if compiled is not None:
+            clf, reg = compiled
+            with _metrics.stage("encode"):
+                X = clf.encode([features])
+                X_reg = X if models.encoding_is_shared() else reg.encode([features])
+            with _metrics.stage("classifier"):
+                good_prob = float(clf.predict_encoded(X)[0])
+            with _metrics.stage("regressor"):
+                predicted_price = float(reg.predict_encoded(X_reg)[0])
+            result = {
+                "good_investment_label": int(good_prob > DECISION_THRESHOLD),
+                "good_investment_prob": good_prob,
+                "predicted_price_lakhs": predicted_price,
+            }
+        else:
+            out = predict_properties_batch([features], models=models).iloc[0]
+            result = {
+                "good_investment_label": int(out["good_investment_label"]),
+                "good_investment_prob": float(out["good_investment_prob"]),
+                "predicted_price_lakhs": float(out["predicted_price_lakhs"]),
+            }
 
-    # 2) Apply same feature engineering as training
-    df = build_features(df)
+        if cache is not None:
+            cache.put(key, result, generation=models.generation)
+        return result
 
-    # 3) Slice to the exact columns used by the pipelines
-    X = df[ALL_FEATURES]
 
-    # 4) Load models
-    clf = _load_classifier()
-    reg = _load_regressor()
+# -------------------------------------------------------------------
+# 6) Multi-process parallel scoring for LARGE batches
+# -------------------------------------------------------------------
+DEFAULT_SHARD_SIZE = 20_000
 
-    # 5) Classification prediction
-    good_prob = float(clf.predict_proba(X)[0, 1])
-    good_label = int(clf.predict(X)[0])
 
-    # 6) Regression prediction (price in Lakhs)
-    predicted_price = float(reg.predict(X)[0])
+def _init_scoring_worker() -> None:
+    """
+    Process-pool initializer: load both pipelines once per worker.
 
-    return {
-        "good_investment_label": good_label,
-        "good_investment_prob": good_prob,
-        "predicted_price_lakhs": predicted_price,
+    XGBoost is pinned to one thread per worker so N workers use N cores
+    instead of N x N threads fighting over them. Workers keep the model
+    version that was live when the pool started; create a new pool to
+    score with a newer one.
+    """
+    for pipeline in (_load_classifier(), _load_regressor()):
+        pipeline.named_steps["model"].set_params(n_jobs=1)
+
+
+def _score_shard(shard: pd.DataFrame) -> pd.DataFrame:
+    return predict_properties_batch(shard)
+
+
+def make_scoring_pool(n_workers: int = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool whose workers have both pipelines preloaded.
+
+    Reuse one pool across calls to ``predict_properties_parallel`` to pay
+    the model-load cost only once per worker.
+    """
+    return ProcessPoolExecutor(
+        max_workers=n_workers or os.cpu_count(),
+        initializer=_init_scoring_worker,
+    )
+
+
+def predict_properties_parallel(
+    data: BatchInput,
+    n_workers: int = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    executor: Executor = None,
+) -> pd.DataFrame:
+    """
+    Score a large batch across processes.
+
+    The frame is split into contiguous shards of ``shard_size`` rows, each
+    scored by ``predict_properties_batch`` in a worker, and the results are
+    concatenated back in the original row order. Feature building and the
+    ColumnTransformer are single-threaded, so this is what spreads them
+    over all cores.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame or iterable of dict
+        Same input as ``predict_properties_batch``.
+    n_workers : int, optional
+        Pool size when ``executor`` is not given. Defaults to all cores.
+    shard_size : int
+        Rows per task.
+    executor : concurrent.futures.Executor, optional
+        Existing pool (see ``make_scoring_pool``); not shut down here.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Same columns and index as ``predict_properties_batch``.
+    """
+    df = _to_feature_frame(data)
+    if len(df) <= shard_size or (executor is None and n_workers == 1):
+        return predict_properties_batch(df)
+
+    shards = [df.iloc[i:i + shard_size] for i in range(0, len(df), shard_size)]
+
+    if executor is not None:
+        return pd.concat(executor.map(_score_shard, shards))
+
+    with make_scoring_pool(n_workers) as pool:
+        return pd.concat(pool.map(_score_shard, shards))
+
+
+# -------------------------------------------------------------------
+# 7) Streaming bulk scoring for CSV / Parquet dumps
+# -------------------------------------------------------------------
+DEFAULT_CHUNK_SIZE = 50_000
+
+_PARTS_META = "_meta.json"
+
+
+def _is_parquet(path: str) -> bool:
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def _iter_input_chunks(path: str, chunk_size: int):
+    """Yield fixed-size DataFrame chunks without reading the whole file."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def _prepare_parts_dir(parts_dir: str, input_path: str, chunk_size: int, resume: bool) -> None:
+    """
+    Create (or validate, when resuming) the directory holding per-chunk
+    outputs. Chunk boundaries must not move between runs and the parts
+    must come from the same input, so the chunk size and the input's
+    (mtime_ns, size) are recorded and checked.
+    """
+    meta_path = os.path.join(parts_dir, _PARTS_META)
+    st = os.stat(input_path)
+    meta = {
+        "input": os.path.abspath(input_path),
+        "input_mtime_ns": st.st_mtime_ns,
+        "input_size": st.st_size,
+        "chunk_size": chunk_size,
     }
 
+    if os.path.exists(meta_path) and resume:
+        with open(meta_path) as f:
+            previous = json.load(f)
+        if previous != meta:
+            raise ValueError(
+                f"Cannot resume: {parts_dir} was written for {previous}, "
+                f"not {meta}. Re-run without --resume to start over."
+            )
+        return
+
+    if os.path.exists(parts_dir):
+        shutil.rmtree(parts_dir)
+    os.makedirs(parts_dir)
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+
+
+def _merge_parts(part_paths, output_path: str) -> None:
+    """Stream part files into the final output, one part in memory at a time."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if _is_parquet(output_path):
+        schema = pa.unify_schemas(
+            [pq.read_schema(p) for p in part_paths], promote_options="permissive"
+        )
+        with pq.ParquetWriter(output_path, schema) as writer:
+            for part in part_paths:
+                writer.write_table(pq.read_table(part).cast(schema))
+    else:
+        for i, part in enumerate(part_paths):
+            pd.read_parquet(part).to_csv(
+                output_path, mode="w" if i == 0 else "a", header=(i == 0), index=False
+            )
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = False,
+    n_workers: int = 1,
+    compact: bool = False,
+) -> int:
+    """
+    Score a CSV / Parquet listing dump in fixed-size chunks.
+
+    Each chunk goes through ``predict_properties_batch`` and is written
+    atomically to ``<output>.parts/part-NNNNN.parquet``, so memory stays
+    bounded by ``chunk_size`` and an interrupted run can be resumed from
+    the last finished chunk. Parts are merged into ``output_path`` (Parquet
+    or CSV, by extension) at the end.
+
+    Parameters
+    ----------
+    input_path : str
+        ``.csv`` or ``.parquet`` file with the feature columns.
+    output_path : str
+        Destination file; input columns plus the three prediction columns.
+    chunk_size : int
+        Rows scored per chunk.
+    resume : bool
+        Skip chunks already completed by a previous run with the same
+        input file (path, size and mtime) and chunk size.
+    n_workers : int
+        Score each chunk across this many processes (1 = in-process).
+    compact : bool
+        Use the memory-compact feature path for in-process scoring.
+
+    Returns
+    -------
+    int
+        Number of rows written to ``output_path``.
+    """
+    parts_dir = output_path + ".parts"
+    _prepare_parts_dir(parts_dir, input_path, chunk_size, resume)
+
+    pool = make_scoring_pool(n_workers) if n_workers > 1 else None
+    try:
+        total_rows, scored_rows, part_paths, elapsed = _score_chunks(
+            input_path, parts_dir, chunk_size, pool, n_workers, compact
+        )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if part_paths:
+        _merge_parts(part_paths, output_path)
+    shutil.rmtree(parts_dir)
+
+    print(f"Scored {scored_rows:,d} new rows ({total_rows:,d} total) in {elapsed:.2f}s "
+          f"-> {scored_rows / max(elapsed, 1e-9):,.0f} rows/s. Output: {output_path}")
+    return total_rows
+
+
+def _score_chunks(
+    input_path: str, parts_dir: str, chunk_size: int, pool, n_workers: int, compact: bool
+):
+    """Score every not-yet-finished chunk into its part file."""
+    part_paths = []
+    total_rows = 0
+    scored_rows = 0
+    start = time.perf_counter()
+
+    for i, chunk in enumerate(_iter_input_chunks(input_path, chunk_size)):
+        part_path = os.path.join(parts_dir, f"part-{i:05d}.parquet")
+        part_paths.append(part_path)
+        total_rows += len(chunk)
+
+        if os.path.exists(part_path):
+            print(f"chunk {i:>5d}: already scored, skipping")
+            continue
+
+        chunk_start = time.perf_counter()
+        if pool is not None:
+            # One shard per worker keeps every core busy on each chunk
+            shard_size = -(-len(chunk) // n_workers)
+            preds = predict_properties_parallel(chunk, shard_size=shard_size, executor=pool)
+        else:
+            preds = predict_properties_batch(chunk, compact=compact)
+        scored = pd.concat([chunk, preds], axis=1)
+
+        tmp_path = part_path + ".tmp"
+        scored.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, part_path)
+
+        elapsed = time.perf_counter() - chunk_start
+        scored_rows += len(chunk)
+        print(f"chunk {i:>5d}: {len(chunk):>8,d} rows in {elapsed:7.2f}s "
+              f"({len(chunk) / elapsed:,.0f} rows/s)")
+
+    return total_rows, scored_rows, part_paths, time.perf_counter() - start
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score a CSV/Parquet listing dump with both pipelines."
+    )
+    parser.add_argument("--input", help="Input .csv or .parquet file.")
+    parser.add_argument("--output", help="Output .parquet or .csv file.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the last finished chunk of a previous run.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes used to score each chunk (0 = all cores).")
+    parser.add_argument("--compact", action="store_true",
+                        help="Memory-compact feature dtypes (identical predictions).")
+    return parser.parse_args(argv)
+
 
 # -------------------------------------------------------------------
-# 5) Quick CLI test (optional)
+# 8) CLI: bulk scoring, or a quick sanity test with no arguments
 # -------------------------------------------------------------------
 if __name__ == "__main__":
+    args = _parse_args()
+    if args.input:
+        if not args.output:
+            raise SystemExit("--output is required with --input")
+        score_file(args.input, args.output, chunk_size=args.chunk_size, resume=args.resume,
+                   n_workers=args.workers or os.cpu_count(), compact=args.compact)
+        sys.exit(0)
+
     # Dumb sanity check with fake values. Replace with a real row if you want.
     sample = {
         "City": "Hyderabad",
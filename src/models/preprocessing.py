@@ -1,7 +1,19 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.pipeline import Pipeline
 
+# Name prefix of the one-hot blocks added by incremental retraining
+CAT_EXTENSION_PREFIX = "cat_ext_"
+
+# How categorical columns reach XGBoost:
+#   "onehot" - scaled numerics + OneHotEncoder (sparse), the default
+#   "native" - raw numerics + pandas categoricals, split on natively by
+#              XGBoost (enable_categorical, hist / QuantileDMatrix)
+CATEGORICAL_MODES = ("onehot", "native")
+
 
 def get_preprocessing_pipeline(numeric_features, categorical_features):
     """
@@ -42,4 +54,151 @@ def get_preprocessing_pipeline(numeric_features, categorical_features):
         ]
     )
 
-    return preprocessor
\ No newline at end of file
+    return preprocessor
+
+
+class NativeCategoricalEncoder(TransformerMixin, BaseEstimator):
+    """
+    Preprocessing for XGBoost's native categorical support.
+
+    Numeric columns pass through unscaled (trees are scale-invariant);
+    categorical columns become pandas ``category`` with the vocabulary fixed
+    at fit time, so category codes are identical at training and inference.
+    Values outside the vocabulary become missing, which XGBoost routes
+    down each split's default branch (like an all-zero one-hot block).
+
+    Parameters
+    ----------
+    numeric_features : list of str
+        Numeric columns, passed through as float.
+    categorical_features : list of str
+        Columns to encode as fixed-vocabulary categoricals.
+    """
+
+    def __init__(self, numeric_features, categorical_features):
+        self.numeric_features = numeric_features
+        self.categorical_features = categorical_features
+
+    @staticmethod
+    def _as_str(series: pd.Series) -> pd.Series:
+        # Same string view of a value as OneHotEncoder sees after build_features
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.rename_categories([str(c) for c in series.cat.categories])
+        return series.astype(str)
+
+    def fit(self, X, y=None):
+        self.categories_ = [
+            sorted(set(self._as_str(X[col]).dropna().unique()))
+            for col in self.categorical_features
+        ]
+        return self
+
+    def transform(self, X):
+        out = {}
+        for col in self.numeric_features:
+            out[col] = pd.to_numeric(X[col], errors="coerce").astype(np.float64)
+        for col, cats in zip(self.categorical_features, self.categories_):
+            values = self._as_str(X[col])
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                out[col] = values.cat.set_categories(cats)
+            else:
+                # Mask unseen values first: pandas is deprecating silent coercion
+                out[col] = pd.Categorical(values.where(values.isin(cats)), categories=cats)
+        return pd.DataFrame(out, index=X.index)
+
+    def get_feature_names_out(self, input_features=None):
+        return np.array(list(self.numeric_features) + list(self.categorical_features), dtype=object)
+
+
+def get_model_preprocessor(numeric_features, categorical_features, categorical="onehot"):
+    """
+    Preprocessor for the chosen categorical mode (see ``CATEGORICAL_MODES``).
+    Pair it with ``xgb_categorical_params(categorical)`` on the model.
+    """
+    if categorical == "onehot":
+        return get_preprocessing_pipeline(numeric_features, categorical_features)
+    if categorical == "native":
+        return NativeCategoricalEncoder(numeric_features, categorical_features)
+    raise ValueError(f"Unknown categorical mode {categorical!r}; use one of {CATEGORICAL_MODES}.")
+
+
+def xgb_categorical_params(categorical="onehot"):
+    """Extra XGBoost estimator parameters for the chosen categorical mode."""
+    if categorical == "native":
+        # hist makes the sklearn wrapper build a QuantileDMatrix
+        return {"enable_categorical": True, "tree_method": "hist"}
+    return {}
+
+
+def extend_preprocessing_pipeline(preprocessor, X_new):
+    """
+    Copy of a fitted preprocessor whose one-hot vocabulary also covers the
+    categories first seen in ``X_new``.
+
+    Existing blocks are frozen (their scaling statistics and column positions
+    never change) and the new categories get their own one-hot block
+    appended after every existing column, so a booster trained on the old
+    layout reads the same features at the same indices.
+
+    Parameters
+    ----------
+    preprocessor : ColumnTransformer
+        Fitted output of ``get_preprocessing_pipeline`` (possibly already
+        extended).
+    X_new : pandas.DataFrame
+        New rows, after ``build_features``.
+
+    Returns
+    -------
+    preprocessor : ColumnTransformer
+        Unfitted-looking copy; ``fit`` only fits the new block.
+    added : dict
+        Column name -> list of newly added categories (empty if none).
+    """
+    from sklearn.frozen import FrozenEstimator
+
+    known = {}
+    for name, transformer, columns in preprocessor.transformers_:
+        if name == "cat" or name.startswith(CAT_EXTENSION_PREFIX):
+            encoder = _one_hot_encoder(transformer)
+            for col, cats in zip(columns, encoder.categories_):
+                known.setdefault(col, set()).update(str(c) for c in cats)
+
+    added = {}
+    for col in known:
+        seen = set(X_new[col].dropna().astype(str).unique())
+        new = sorted(seen - known[col])
+        if new:
+            added[col] = new
+
+    transformers = [
+        (name, t if isinstance(t, FrozenEstimator) else FrozenEstimator(t), columns)
+        for name, t, columns in preprocessor.transformers_
+        if name != "remainder"
+    ]
+    if added:
+        n_blocks = sum(name.startswith(CAT_EXTENSION_PREFIX) for name, _, _ in transformers)
+        transformers.append((
+            f"{CAT_EXTENSION_PREFIX}{n_blocks + 1}",
+            OneHotEncoder(categories=list(added.values()), handle_unknown="ignore"),
+            list(added),
+        ))
+
+    extended = ColumnTransformer(
+        transformers=transformers,
+        # Keep the fitted output format: for sparse output, entries that are
+        # not stored are *missing* to XGBoost, so flipping to dense would
+        # change what the existing trees see
+        sparse_threshold=1.0 if preprocessor.sparse_output_ else 0.0,
+    )
+    return extended, added
+
+
+def _one_hot_encoder(transformer):
+    from sklearn.frozen import FrozenEstimator
+
+    if isinstance(transformer, FrozenEstimator):
+        transformer = transformer.estimator
+    if isinstance(transformer, Pipeline):
+        transformer = transformer.steps[-1][1]
+    return transformer
@@ -0,0 +1,236 @@
+"""
+Local model registry: content-hashed, immutable artifact directories plus
+an index naming the live version of each model.
+
+Layout (under models/registry/):
+    registry.json             {"current": {name: version}, "history": [...]}
+    <name>/<version>/         version = first 16 hex digits of the pickle's sha256
+        <name>_pipeline.pkl
+        <name>_booster.ubj    native export + sidecar (see fast_path.py)
+        <name>_preprocess.json
+        <name>_trees.npz      flattened trees for the NumPy backend (see tree_eval.py)
+        manifest.json         training report / metadata
+
+A version directory is assembled under a temporary name, renamed into place
+and never modified afterwards. Promoting a version rewrites registry.json
+atomically, so a reader such as the predictor's model watcher sees either the
+old or the new version, never a mix. Promotion also copies the artifacts over
+models/<name>_* for tools that read the live files directly.
+
+Usage:
+    python src/models/registry.py list
+    python src/models/registry.py import-live
+    python src/models/registry.py promote --name classifier --version 3f2a9c0d1e4b5a67
+"""
+import argparse
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+# joblib is imported lazily, like the training scripts.
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.models.fast_path import export_pipeline, file_sha256, native_artifact_paths  # noqa: E402
+from src.models.tree_eval import tree_table_path  # noqa: E402
+
+MODELS_DIR = os.path.join(PROJECT_ROOT, "models")
+
+MODEL_NAMES = ("classifier", "regression")
+
+INDEX_FILENAME = "registry.json"
+MANIFEST_FILENAME = "manifest.json"
+
+# Hex digits of the pickle's sha256 used as the version id
+VERSION_LENGTH = 16
+
+
+def registry_dir(models_dir: str = MODELS_DIR) -> str:
+    return os.path.join(models_dir, "registry")
+
+
+def version_dir(name: str, version: str, models_dir: str = MODELS_DIR) -> str:
+    return os.path.join(registry_dir(models_dir), name, version)
+
+
+def artifact_filenames(name: str) -> List[str]:
+    """Files every version directory holds (besides the manifest)."""
+    return (
+        [f"{name}_pipeline.pkl"]
+        + [os.path.basename(p) for p in native_artifact_paths("", name)]
+        + [os.path.basename(tree_table_path("", name))]
+    )
+
+
+# -------------------------------------------------------------------
+# Index (registry.json)
+# -------------------------------------------------------------------
+def read_index(models_dir: str = MODELS_DIR) -> Dict[str, Any]:
+    path = os.path.join(registry_dir(models_dir), INDEX_FILENAME)
+    if not os.path.exists(path):
+        return {"current": {}, "history": []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_index(index: Dict[str, Any], models_dir: str) -> None:
+    path = os.path.join(registry_dir(models_dir), INDEX_FILENAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def current_versions(models_dir: str = MODELS_DIR) -> Dict[str, str]:
+    """name -> promoted version ({} when nothing has been promoted)."""
+    return dict(read_index(models_dir)["current"])
+
+
+def list_versions(name: str, models_dir: str = MODELS_DIR) -> List[Dict[str, Any]]:
+    """Manifests of every registered ``name`` version, oldest first."""
+    root = os.path.join(registry_dir(models_dir), name)
+    if not os.path.isdir(root):
+        return []
+    manifests = []
+    for version in os.listdir(root):
+        path = os.path.join(root, version, MANIFEST_FILENAME)
+        if os.path.exists(path):
+            with open(path) as f:
+                manifests.append(json.load(f))
+    return sorted(manifests, key=lambda m: m["registered_at"])
+
+
+# -------------------------------------------------------------------
+# Register / promote
+# -------------------------------------------------------------------
+def register(pipeline, name: str, metadata: Dict[str, Any] = None, models_dir: str = MODELS_DIR) -> str:
+    """
+    Store a fitted pipeline as an immutable version: pickle, native export
+    and ``manifest.json`` (``metadata`` plus name / version / sha256).
+    Registering identical bytes again returns the existing directory.
+
+    Returns the version directory.
+    """
+    import joblib
+
+    root = os.path.join(registry_dir(models_dir), name)
+    os.makedirs(root, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=root)
+    try:
+        pkl_path = os.path.join(tmp_dir, f"{name}_pipeline.pkl")
+        joblib.dump(pipeline, pkl_path)
+        sha256 = file_sha256(pkl_path)
+        version = sha256[:VERSION_LENGTH]
+        final_dir = os.path.join(root, version)
+        if os.path.exists(final_dir):
+            return final_dir
+
+        export_pipeline(pipeline, tmp_dir, name, source_path=pkl_path)
+        manifest = {
+            **(metadata or {}),
+            "name": name,
+            "version": version,
+            "sha256": sha256,
+            "registered_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        with open(os.path.join(tmp_dir, MANIFEST_FILENAME), "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_dir, final_dir)
+        return final_dir
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def promote(name: str, version: str, models_dir: str = MODELS_DIR) -> None:
+    """
+    Make ``version`` the live ``name`` model: copy its artifacts over
+    models/<name>_*, then point registry.json at it (one atomic rename).
+    Promoting an older version is a rollback.
+    """
+    promote_versions({name: version}, models_dir)
+
+
+def promote_versions(versions: Dict[str, str], models_dir: str = MODELS_DIR) -> None:
+    """``promote`` several models with a single index update (no mixed state)."""
+    for name, version in versions.items():
+        if not os.path.isdir(version_dir(name, version, models_dir)):
+            raise FileNotFoundError(f"No {name} version {version!r} in {registry_dir(models_dir)}.")
+
+    for name, version in versions.items():
+        source_dir = version_dir(name, version, models_dir)
+        for filename in artifact_filenames(name):
+            source_path, live_path = os.path.join(source_dir, filename), os.path.join(models_dir, filename)
+            if not os.path.exists(source_path) and filename == os.path.basename(tree_table_path("", name)):
+                # Older versions (or trees the NumPy evaluator cannot flatten) have none;
+                # drop the live copy so it does not outlive its booster
+                if os.path.exists(live_path):
+                    os.remove(live_path)
+                continue
+            tmp_path = live_path + ".tmp"
+            shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, live_path)
+
+    index = read_index(models_dir)
+    promoted_at = datetime.datetime.now().isoformat(timespec="seconds")
+    for name, version in versions.items():
+        index["current"][name] = version
+        index["history"].append({"name": name, "version": version, "promoted_at": promoted_at})
+    _write_index(index, models_dir)
+
+
+def publish(pipeline, name: str, metadata: Dict[str, Any] = None, models_dir: str = MODELS_DIR) -> str:
+    """``register`` then ``promote``; returns the version directory."""
+    directory = register(pipeline, name, metadata, models_dir)
+    promote(name, os.path.basename(directory), models_dir)
+    return directory
+
+
+def import_live(models_dir: str = MODELS_DIR) -> Dict[str, str]:
+    """Register and promote the loose models/<name>_pipeline.pkl files."""
+    import joblib
+
+    imported = {}
+    for name in MODEL_NAMES:
+        pkl_path = os.path.join(models_dir, f"{name}_pipeline.pkl")
+        if os.path.exists(pkl_path):
+            directory = register(joblib.load(pkl_path), name, {"source": "import-live"}, models_dir)
+            imported[name] = os.path.basename(directory)
+    promote_versions(imported, models_dir)
+    return imported
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and promote registered model versions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Registered versions; * marks the live one.")
+    sub.add_parser("import-live", help="Register + promote the current models/*.pkl.")
+    p = sub.add_parser("promote", help="Make a version live (or roll back to it).")
+    p.add_argument("--name", choices=MODEL_NAMES, required=True)
+    p.add_argument("--version", required=True)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    if args.command == "promote":
+        promote(args.name, args.version)
+        print(f"Promoted {args.name} {args.version}")
+    elif args.command == "import-live":
+        for name, version in import_live().items():
+            print(f"Registered and promoted {name} {version}")
+    else:
+        current = current_versions()
+        for name in MODEL_NAMES:
+            print(f"{name}:")
+            for m in list_versions(name):
+                marker = "*" if current.get(name) == m["version"] else " "
+                print(f"  {marker} {m['version']}  {m['registered_at']}  {m.get('mode', m.get('source', ''))}")
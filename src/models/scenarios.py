@@ -0,0 +1,172 @@
+"""
+What-if scenario sweeps for a single property.
+
+The app derives ``Annual_Growth_Rate``, ``Future_Price_5Y`` and
+``calc_price_per_sqft`` from one growth / horizon / asking-price setting.
+``scenario_grid`` derives them for a whole grid at once with NumPy
+broadcasting and scores every cell in one batched pass. With the compiled
+fast path the property is encoded once and only the three derived columns
+are recomputed per cell. The result is a (price, growth, horizon) cube of
+probabilities and fair prices, small and fast enough for an interactive
+heatmap.
+
+Usage:
+    python src/models/scenarios.py
+"""
+import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.models.predict import (  # noqa: E402
+    ALL_FEATURES,
+    ModelSet,
+    current_models,
+    predict_properties_batch,
+)
+
+# Defaults cover the app's slider ranges; prices are factors of the asking price
+DEFAULT_GROWTH_PCT = np.round(np.arange(5.0, 12.0 + 1e-9, 0.5), 1)
+DEFAULT_HORIZONS = np.arange(3, 11)
+DEFAULT_PRICE_FACTORS = np.round(np.linspace(0.6, 1.4, 17), 3)
+
+
+def derive_features(price_lakhs, size_sqft, growth_pct, horizon_years) -> Dict[str, Any]:
+    """
+    The model's derived inputs from the user's assumptions, exactly as the
+    app computes them for one setting. Arguments broadcast against each other.
+    """
+    growth_rate = np.asarray(growth_pct, dtype=np.float64) / 100.0
+    price_lakhs = np.asarray(price_lakhs, dtype=np.float64)
+    return {
+        "calc_price_per_sqft": (price_lakhs * 100000) / size_sqft,
+        "Annual_Growth_Rate": growth_rate,
+        "Future_Price_5Y": price_lakhs * np.power(1 + growth_rate, horizon_years),
+    }
+
+
+@dataclass
+class ScenarioGrid:
+    """Scores of one property over asking price x growth x horizon."""
+
+    prices: np.ndarray           # (P,) asking price, ₹ Lakhs
+    growth_pct: np.ndarray       # (G,) annual growth, %
+    horizons: np.ndarray         # (H,) years
+    good_prob: np.ndarray        # (P, G, H)
+    predicted_price: np.ndarray  # (P, G, H) model fair price, ₹ Lakhs
+
+    @property
+    def valuation_gap(self) -> np.ndarray:
+        """Fair price minus asking price (positive = under-valued), (P, G, H)."""
+        return self.predicted_price - self.prices[:, None, None]
+
+    def frame(self) -> pd.DataFrame:
+        """Long format: one row per scenario."""
+        P, G, H = np.meshgrid(self.prices, self.growth_pct, self.horizons, indexing="ij")
+        return pd.DataFrame({
+            "asking_price_lakhs": P.ravel(),
+            "growth_pct": G.ravel(),
+            "horizon_years": H.ravel(),
+            "good_investment_prob": self.good_prob.ravel(),
+            "predicted_price_lakhs": self.predicted_price.ravel(),
+            "valuation_gap_lakhs": self.valuation_gap.ravel(),
+        })
+
+
+def scenario_grid(
+    features: Dict[str, Any],
+    prices: Sequence[float] = None,
+    growth_pct: Sequence[float] = DEFAULT_GROWTH_PCT,
+    horizons: Sequence[int] = DEFAULT_HORIZONS,
+    price_lakhs: float = None,
+    models: ModelSet = None,
+) -> ScenarioGrid:
+    """
+    Score one property over every (asking price, growth, horizon) scenario.
+
+    Parameters
+    ----------
+    features : dict
+        The property, as for ``predict_property_investment``. Its derived
+        features are ignored and recomputed per scenario.
+    prices : sequence of float, optional
+        Asking prices (₹ Lakhs). Default: ``DEFAULT_PRICE_FACTORS`` times
+        ``price_lakhs``.
+    growth_pct, horizons : sequences
+        Annual growth (%) and investment horizon (years) axes.
+    price_lakhs : float, optional
+        Asking price the default price axis is built around.
+    models : ModelSet, optional
+        Version to score with (default: the live one).
+
+    Returns
+    -------
+    ScenarioGrid
+    """
+    models = models or current_models()
+    if prices is None:
+        if price_lakhs is None:
+            raise ValueError("Pass either prices or price_lakhs.")
+        prices = price_lakhs * DEFAULT_PRICE_FACTORS
+    prices = np.asarray(prices, dtype=np.float64)
+    growth_pct = np.asarray(growth_pct, dtype=np.float64)
+    horizons = np.asarray(horizons)
+
+    size_sqft = float(features["Size_in_SqFt"])
+    if not size_sqft > 0:
+        raise ValueError("Size_in_SqFt must be > 0.")
+
+    # (P, G, H) scenario axes, flattened to one row per scenario
+    P, G, H = np.meshgrid(prices, growth_pct, horizons, indexing="ij")
+    derived = {k: np.ravel(v) for k, v in derive_features(P, size_sqft, G, H).items()}
+    shape = P.shape
+
+    compiled = models.compiled()
+    if compiled is not None:
+        clf, reg = compiled
+        X = clf.encode_varying(features, derived)
+        X_reg = X if models.encoding_is_shared() else reg.encode_varying(features, derived)
+        good_prob = clf.predict_encoded(X).astype(np.float64)
+        predicted_price = reg.predict_encoded(X_reg).astype(np.float64)
+    else:
+        base = {name: features.get(name) for name in ALL_FEATURES}
+        frame = pd.DataFrame({**base, **derived}, index=pd.RangeIndex(P.size))
+        preds = predict_properties_batch(frame, models=models)
+        good_prob = preds["good_investment_prob"].to_numpy()
+        predicted_price = preds["predicted_price_lakhs"].to_numpy()
+
+    return ScenarioGrid(
+        prices=prices,
+        growth_pct=growth_pct,
+        horizons=horizons,
+        good_prob=good_prob.reshape(shape),
+        predicted_price=predicted_price.reshape(shape),
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    sample = {
+        "City": "Hyderabad",
+        "Locality": "Locality_1",
+        "Property_Type": "Apartment",
+        "BHK": "3",
+        "Size_in_SqFt": 1500,
+        "Age_of_Property": 10,
+        "Nearby_Schools": 5,
+        "Nearby_Hospitals": 3,
+    }
+    scenario_grid(sample, price_lakhs=250.0)  # load models
+    start = time.perf_counter()
+    grid = scenario_grid(sample, price_lakhs=250.0)
+    elapsed = time.perf_counter() - start
+    print(f"{grid.good_prob.size:,} scenarios in {elapsed * 1000:.1f} ms")
+    print(grid.frame().sort_values("good_investment_prob", ascending=False).head(10).to_string(index=False))
@@ -1,23 +1,18 @@
+import argparse
 import os
 import sys
-import joblib
 
-
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
-from sklearn.pipeline import Pipeline
-from xgboost import XGBClassifier
-import mlflow
-import mlflow.sklearn
+# Heavy dependencies (sklearn, xgboost, mlflow, joblib) are imported inside
+# main() so importing this module for its constants stays cheap.
 
 # Make sure project root is on sys.path when running as a script
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
+from src.data.load_data import load_dataset
 from src.features.build_features import build_features
-from src.models.preprocessing import get_preprocessing_pipeline
+from src.models.registry import publish
 
 
 # -----------------------------
@@ -40,11 +35,18 @@ CAT_FEATURES = ["City", "Locality", "Property_Type", "BHK"]
 TARGET = "Good_Investment"
 
 
-def main():
+def main(categorical: str = "onehot"):
+    from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+    from sklearn.model_selection import train_test_split
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBClassifier
+
+    from src.models.preprocessing import get_model_preprocessor, xgb_categorical_params
+
     # -----------------------------
     # 1. Load & feature engineering
     # -----------------------------
-    df = pd.read_csv(DATA_PATH)
+    df = load_dataset(NUM_FEATURES + CAT_FEATURES + [TARGET], csv_path=DATA_PATH)
     df = build_features(df)
 
     X = df[NUM_FEATURES + CAT_FEATURES]
@@ -57,7 +59,8 @@ def main():
     # -----------------------------
     # 2. Build preprocessing + model pipeline
     # -----------------------------
-    preprocessor = get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES)
+    # "onehot" (default) or "native" XGBoost categoricals, see preprocessing.py
+    preprocessor = get_model_preprocessor(NUM_FEATURES, CAT_FEATURES, categorical)
 
     clf = XGBClassifier(
         n_estimators=200,
@@ -68,6 +71,7 @@ def main():
         random_state=42,
         n_jobs=-1,
         eval_metric="logloss",
+        **xgb_categorical_params(categorical),
     )
 
     model_pipeline = Pipeline(
@@ -100,6 +104,9 @@ def main():
     # -----------------------------
     # 5. Log to MLflow
     # -----------------------------
+    import mlflow
+    import mlflow.sklearn
+
     mlflow.set_experiment("india_property_investment_classification")
 
     with mlflow.start_run():
@@ -108,6 +115,7 @@ def main():
         mlflow.log_param("n_estimators", clf.n_estimators)
         mlflow.log_param("max_depth", clf.max_depth)
         mlflow.log_param("learning_rate", clf.learning_rate)
+        mlflow.log_param("categorical", categorical)
 
         # Log metrics
         mlflow.log_metric("accuracy", acc)
@@ -126,13 +134,29 @@ def main():
         models_dir = os.path.join(PROJECT_ROOT, "models")
         os.makedirs(models_dir, exist_ok=True)
 
+        # Registered as a new version and promoted: copied over
+        # models/classifier_* and hot-swapped by running predictors
+        version_dir = publish(
+            model_pipeline,
+            "classifier",
+            {
+                "script": "train_classification.py",
+                "categorical": categorical,
+                "metrics": {"accuracy": acc, "f1_score": f1, "roc_auc": roc},
+            },
+            models_dir,
+        )
         clf_path = os.path.join(models_dir, "classifier_pipeline.pkl")
-        joblib.dump(model_pipeline, clf_path)
 
-        print(f"Saved classification pipeline to: {clf_path}")
+        print(f"Saved classification pipeline to: {clf_path} (version {os.path.basename(version_dir)})")
     # -----------------------------------------------------------
 
 
 
 if __name__ == "__main__":
-    main()
+    from src.models.preprocessing import CATEGORICAL_MODES
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--categorical", choices=CATEGORICAL_MODES, default="onehot",
+                        help="How categorical columns reach XGBoost (default: onehot).")
+    main(categorical=parser.parse_args().categorical)
@@ -0,0 +1,266 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Heavy dependencies (sklearn, xgboost, mlflow, joblib) are imported inside
+# the functions so importing this module for its constants stays cheap.
+
+# Make sure project root is on sys.path when running as a script
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.data.load_data import load_dataset  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models.registry import promote_versions, register  # noqa: E402
+
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+DATA_PATH = os.path.join(PROJECT_ROOT, "data", "processed", "india_housing_with_targets.csv")
+
+NUM_FEATURES = [
+    "Size_in_SqFt",
+    "Age_of_Property",
+    "Nearby_Schools",
+    "Nearby_Hospitals",
+    "calc_price_per_sqft",
+    "Annual_Growth_Rate",
+    "Future_Price_5Y",
+]
+
+CAT_FEATURES = ["City", "Locality", "Property_Type", "BHK"]
+
+CLASSIFICATION_TARGET = "Good_Investment"
+REGRESSION_TARGET = "Price_in_Lakhs"
+
+# Same hyperparameters as train_classification.py / train_regression.py
+CLASSIFIER_PARAMS = dict(
+    n_estimators=200,
+    max_depth=5,
+    learning_rate=0.1,
+    subsample=0.8,
+    colsample_bytree=0.8,
+    random_state=42,
+    eval_metric="logloss",
+)
+
+REGRESSOR_PARAMS = dict(
+    n_estimators=300,
+    max_depth=5,
+    learning_rate=0.1,
+    subsample=0.8,
+    colsample_bytree=0.8,
+    random_state=42,
+)
+
+
+def fit_joint(df, n_threads: int = None, categorical: str = "onehot"):
+    """
+    Fit the shared preprocessor once and both XGBoost heads on its output.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Raw rows with NUM_FEATURES + CAT_FEATURES and both targets.
+    n_threads : int, optional
+        Total threads to use (default: all cores). With two or more, the
+        classifier and regressor are trained concurrently on half each.
+    categorical : {"onehot", "native"}
+        How categorical columns reach XGBoost (see ``preprocessing.py``).
+
+    Returns
+    -------
+    clf_pipeline, reg_pipeline : sklearn.pipeline.Pipeline
+        Both share the same fitted preprocessor.
+    split : dict
+        X_test, y_clf_test, y_reg_test for evaluation.
+    timings : dict
+        Seconds per stage.
+    """
+    from sklearn.model_selection import train_test_split
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBClassifier, XGBRegressor
+
+    from src.models.preprocessing import get_model_preprocessor, xgb_categorical_params
+
+    timings = {}
+
+    # -----------------------------
+    # 1. Feature engineering (once)
+    # -----------------------------
+    start = time.perf_counter()
+    df = build_features(df)
+    X = df[NUM_FEATURES + CAT_FEATURES]
+    y_clf = df[CLASSIFICATION_TARGET]
+    y_reg = df[REGRESSION_TARGET]
+
+    # One split for both heads, stratified on the classification label: the
+    # classifier's split matches train_classification.py, but the regressor's
+    # differs from train_regression.py's unstratified one (see README)
+    X_train, X_test, y_clf_train, y_clf_test, y_reg_train, y_reg_test = train_test_split(
+        X, y_clf, y_reg, test_size=0.2, random_state=42, stratify=y_clf
+    )
+    timings["features"] = time.perf_counter() - start
+
+    # -----------------------------
+    # 2. Shared preprocessing (fit once, one design matrix)
+    # -----------------------------
+    start = time.perf_counter()
+    preprocessor = get_model_preprocessor(NUM_FEATURES, CAT_FEATURES, categorical)
+    Xt_train = preprocessor.fit_transform(X_train)
+    timings["preprocess"] = time.perf_counter() - start
+
+    # -----------------------------
+    # 3. Train both heads on the same matrix
+    # -----------------------------
+    n_threads = n_threads or os.cpu_count() or 1
+    concurrent = n_threads >= 2
+    per_model = max(1, n_threads // 2) if concurrent else n_threads
+
+    extra = xgb_categorical_params(categorical)
+    clf = XGBClassifier(**CLASSIFIER_PARAMS, **extra, n_jobs=per_model)
+    reg = XGBRegressor(**REGRESSOR_PARAMS, **extra, n_jobs=per_model)
+
+    start = time.perf_counter()
+    if concurrent:
+        # XGBoost releases the GIL while boosting, so threads overlap fully
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(clf.fit, Xt_train, y_clf_train),
+                       pool.submit(reg.fit, Xt_train, y_reg_train)]
+            for future in futures:
+                future.result()
+    else:
+        clf.fit(Xt_train, y_clf_train)
+        reg.fit(Xt_train, y_reg_train)
+    timings["fit"] = time.perf_counter() - start
+
+    # Saved models predict with all cores, like the per-task scripts
+    for model in (clf, reg):
+        model.set_params(n_jobs=-1)
+
+    clf_pipeline = Pipeline(steps=[("preprocessor", preprocessor), ("model", clf)])
+    reg_pipeline = Pipeline(steps=[("preprocessor", preprocessor), ("model", reg)])
+
+    split = {"X_test": X_test, "y_clf_test": y_clf_test, "y_reg_test": y_reg_test}
+    return clf_pipeline, reg_pipeline, split, timings
+
+
+def main(categorical: str = "onehot"):
+    from sklearn.metrics import (
+        accuracy_score,
+        f1_score,
+        mean_absolute_error,
+        mean_squared_error,
+        r2_score,
+        roc_auc_score,
+    )
+
+    # -----------------------------
+    # 1. Load (once, both targets)
+    # -----------------------------
+    start = time.perf_counter()
+    df = load_dataset(
+        NUM_FEATURES + CAT_FEATURES + [CLASSIFICATION_TARGET, REGRESSION_TARGET],
+        csv_path=DATA_PATH,
+    )
+    load_seconds = time.perf_counter() - start
+
+    # -----------------------------
+    # 2. Features + shared preprocessing + both models
+    # -----------------------------
+    clf_pipeline, reg_pipeline, split, timings = fit_joint(df, categorical=categorical)
+    timings = {"load": load_seconds, **timings}
+    print("Timings (s): " + ", ".join(f"{k} {v:.2f}" for k, v in timings.items()))
+
+    # -----------------------------
+    # 3. Evaluate (test matrix encoded once, reused by both heads)
+    # -----------------------------
+    preprocessor = clf_pipeline.named_steps["preprocessor"]
+    clf = clf_pipeline.named_steps["model"]
+    reg = reg_pipeline.named_steps["model"]
+
+    Xt_test = preprocessor.transform(split["X_test"])
+    y_clf_test, y_reg_test = split["y_clf_test"], split["y_reg_test"]
+
+    y_proba = clf.predict_proba(Xt_test)[:, 1]
+    y_pred = (y_proba > 0.5).astype(int)
+    acc = accuracy_score(y_clf_test, y_pred)
+    f1 = f1_score(y_clf_test, y_pred)
+    roc = roc_auc_score(y_clf_test, y_proba)
+
+    price_pred = reg.predict(Xt_test)
+    rmse = mean_squared_error(y_reg_test, price_pred) ** 0.5
+    mae = mean_absolute_error(y_reg_test, price_pred)
+    r2 = r2_score(y_reg_test, price_pred)
+
+    print("Classification metrics:")
+    print(f"  Accuracy : {acc:.4f}")
+    print(f"  F1-score : {f1:.4f}")
+    print(f"  ROC-AUC  : {roc:.4f}")
+    print("Regression metrics:")
+    print(f"  RMSE : {rmse:.4f}")
+    print(f"  MAE  : {mae:.4f}")
+    print(f"  R^2  : {r2:.4f}")
+
+    # -----------------------------
+    # 4. Register both versions (pickle + native export each) and promote
+    #    them; running predictors hot-swap to the pair
+    # -----------------------------
+    models_dir = os.path.join(PROJECT_ROOT, "models")
+    os.makedirs(models_dir, exist_ok=True)
+
+    versions = {}
+    for name, pipeline, metrics in (
+        ("classifier", clf_pipeline, {"accuracy": acc, "f1_score": f1, "roc_auc": roc}),
+        ("regression", reg_pipeline, {"rmse": rmse, "mae": mae, "r2": r2}),
+    ):
+        metadata = {"script": "train_joint.py", "categorical": categorical, "metrics": metrics}
+        versions[name] = os.path.basename(register(pipeline, name, metadata, models_dir))
+    # Both at once, so no predictor ever pairs a new head with an old one
+    promote_versions(versions, models_dir)
+    for name, version in versions.items():
+        pkl_path = os.path.join(models_dir, f"{name}_pipeline.pkl")
+        print(f"Saved {name} pipeline to: {pkl_path} (version {version})")
+
+    # -----------------------------
+    # 5. Log to MLflow (same experiments as the per-task scripts)
+    # -----------------------------
+    import mlflow
+    import mlflow.sklearn
+
+    runs = (
+        ("india_property_investment_classification", "XGBClassifier", clf_pipeline,
+         {"accuracy": acc, "f1_score": f1, "roc_auc": roc}),
+        ("india_property_investment_regression", "XGBRegressor", reg_pipeline,
+         {"rmse": rmse, "mae": mae, "r2": r2}),
+    )
+    for experiment, model_type, pipeline, metrics in runs:
+        mlflow.set_experiment(experiment)
+        with mlflow.start_run():
+            model = pipeline.named_steps["model"]
+            mlflow.log_param("model_type", model_type)
+            mlflow.log_param("n_estimators", model.n_estimators)
+            mlflow.log_param("max_depth", model.max_depth)
+            mlflow.log_param("learning_rate", model.learning_rate)
+            mlflow.log_param("training", "joint")
+            mlflow.log_param("categorical", categorical)
+            for key, value in metrics.items():
+                mlflow.log_metric(key, value)
+            for key, value in timings.items():
+                mlflow.log_metric(f"{key}_seconds", value)
+            mlflow.sklearn.log_model(pipeline, "model")
+
+    print("Both models and metrics logged to MLflow.")
+
+
+if __name__ == "__main__":
+    from src.models.preprocessing import CATEGORICAL_MODES
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--categorical", choices=CATEGORICAL_MODES, default="onehot",
+                        help="How categorical columns reach XGBoost (default: onehot).")
+    main(categorical=parser.parse_args().categorical)
@@ -1,22 +1,18 @@
+import argparse
 import os
 import sys
-import joblib
 
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from sklearn.pipeline import Pipeline
-from xgboost import XGBRegressor
-import mlflow
-import mlflow.sklearn
+# Heavy dependencies (sklearn, xgboost, mlflow, joblib) are imported inside
+# main() so importing this module for its constants stays cheap.
 
 # Ensure project root on path
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
+from src.data.load_data import load_dataset
 from src.features.build_features import build_features
-from src.models.preprocessing import get_preprocessing_pipeline
+from src.models.registry import publish
 
 
 # -----------------------------
@@ -39,11 +35,18 @@ CAT_FEATURES = ["City", "Locality", "Property_Type", "BHK"]
 TARGET = "Price_in_Lakhs"
 
 
-def main():
+def main(categorical: str = "onehot"):
+    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+    from sklearn.model_selection import train_test_split
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBRegressor
+
+    from src.models.preprocessing import get_model_preprocessor, xgb_categorical_params
+
     # -----------------------------
     # 1. Load & feature engineering
     # -----------------------------
-    df = pd.read_csv(DATA_PATH)
+    df = load_dataset(NUM_FEATURES + CAT_FEATURES + [TARGET], csv_path=DATA_PATH)
     df = build_features(df)
 
     X = df[NUM_FEATURES + CAT_FEATURES]
@@ -56,7 +59,8 @@ def main():
     # -----------------------------
     # 2. Build preprocessing + model pipeline
     # -----------------------------
-    preprocessor = get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES)
+    # "onehot" (default) or "native" XGBoost categoricals, see preprocessing.py
+    preprocessor = get_model_preprocessor(NUM_FEATURES, CAT_FEATURES, categorical)
 
     reg = XGBRegressor(
         n_estimators=300,
@@ -66,6 +70,7 @@ def main():
         colsample_bytree=0.8,
         random_state=42,
         n_jobs=-1,
+        **xgb_categorical_params(categorical),
     )
 
     model_pipeline = Pipeline(
@@ -103,6 +108,9 @@ def main():
     # -----------------------------
     # 5. Log to MLflow
     # -----------------------------
+    import mlflow
+    import mlflow.sklearn
+
     mlflow.set_experiment("india_property_investment_regression")
 
     with mlflow.start_run():
@@ -110,6 +118,7 @@ def main():
         mlflow.log_param("n_estimators", reg.n_estimators)
         mlflow.log_param("max_depth", reg.max_depth)
         mlflow.log_param("learning_rate", reg.learning_rate)
+        mlflow.log_param("categorical", categorical)
 
         mlflow.log_metric("rmse", rmse)
         mlflow.log_metric("mae", mae)
@@ -125,13 +134,29 @@ def main():
         models_dir = os.path.join(PROJECT_ROOT, "models")
         os.makedirs(models_dir, exist_ok=True)
 
+        # Registered as a new version and promoted: copied over
+        # models/regression_* and hot-swapped by running predictors
+        version_dir = publish(
+            model_pipeline,
+            "regression",
+            {
+                "script": "train_regression.py",
+                "categorical": categorical,
+                "metrics": {"rmse": rmse, "mae": mae, "r2": r2},
+            },
+            models_dir,
+        )
         reg_path = os.path.join(models_dir, "regression_pipeline.pkl")
-        joblib.dump(model_pipeline, reg_path)
 
-        print(f"Saved regression pipeline to: {reg_path}")
+        print(f"Saved regression pipeline to: {reg_path} (version {os.path.basename(version_dir)})")
     # -----------------------------------------------------------
 
 
 
 if __name__ == "__main__":
-    main()
+    from src.models.preprocessing import CATEGORICAL_MODES
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--categorical", choices=CATEGORICAL_MODES, default="onehot",
+                        help="How categorical columns reach XGBoost (default: onehot).")
+    main(categorical=parser.parse_args().categorical)
@@ -0,0 +1,271 @@
+"""
+Pure-NumPy evaluator for the XGBoost tree ensembles.
+
+``TreeEnsemble`` flattens a booster's trees into node tables: split
+feature, threshold and default (missing-value) direction for the internal
+nodes, and a value for each leaf. Every tree is padded to a complete binary
+tree of the ensemble's maximum depth and stored in heap order, so the
+children of node ``i`` are ``2i + 1`` and ``2i + 2`` and need no lookup; a
+leaf above the bottom level is copied into every bottom slot beneath it.
+
+Prediction walks all trees for a block of rows at once, one level per step.
+Missing values are handled without masks: ``X`` is widened to two copies
+with NaN replaced by ``-inf`` (always goes left) and ``+inf`` (always goes
+right), and each node reads its feature from the copy that matches its
+default direction. One step is then a gather of node columns and
+thresholds, a gather of feature values and a comparison.
+
+Loading the tables from ``<name>_trees.npz`` needs neither xgboost nor
+sklearn, which is what makes this path cheap to import and start. Outputs
+match ``inplace_predict`` to float32 rounding (leaf values are summed in
+tree order in float32, as XGBoost does), not necessarily bit for bit.
+"""
+import json
+import os
+from typing import Tuple
+
+import numpy as np
+
+# Bump when the stored layout changes
+TREE_TABLE_VERSION = 1
+
+# Padding to complete trees costs 2 ** depth slots per tree
+MAX_DEPTH = 12
+
+# (row, tree) pairs evaluated per block; bounds the per-step temporaries
+DEFAULT_BLOCK_PAIRS = 1 << 16
+
+OBJECTIVES = ("binary:logistic", "reg:squarederror")
+
+_ARRAYS = ("feature", "threshold", "default_left", "value")
+
+
+def tree_table_path(models_dir: str, name: str) -> str:
+    return os.path.join(models_dir, f"{name}_trees.npz")
+
+
+def _base_margin(base_score: float, objective: str) -> np.float32:
+    """Initial margin from the stored base_score (probability for logistic)."""
+    base_score = np.float32(base_score)
+    if objective == "binary:logistic":
+        return np.float32(-np.log(np.float32(1.0) / base_score - np.float32(1.0)))
+    return base_score
+
+
+class TreeEnsemble:
+    """
+    Node tables of every tree of a booster, plus what turns the summed leaf
+    values into predictions.
+
+    Parameters
+    ----------
+    feature, threshold, default_left : numpy.ndarray
+        ``(n_trees, 2 ** depth - 1)`` internal nodes in heap order; a node
+        goes left when ``x < threshold``, or when ``x`` is missing and
+        ``default_left``. Padding nodes have threshold ``+inf``.
+    value : numpy.ndarray
+        ``(n_trees, 2 ** depth)`` leaf values on the bottom level.
+    base_margin : float
+        Margin every prediction starts from.
+    objective : str
+        ``binary:logistic`` (sigmoid applied) or ``reg:squarederror``.
+    n_features : int
+        Columns expected in ``X``.
+    """
+
+    def __init__(self, feature, threshold, default_left, value,
+                 base_margin: float, objective: str, n_features: int):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unsupported objective {objective!r}; expected one of {OBJECTIVES}.")
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.value = np.asarray(value, dtype=np.float32)
+        self.base_margin = np.float32(base_margin)
+        self.objective = objective
+        self.n_features = int(n_features)
+        self.depth = int(np.log2(self.value.shape[1]))
+
+        # Only the features some split reads are widened, into
+        # [NaN -> +inf | NaN -> -inf] halves; each node reads from the half
+        # that sends missing values its default way
+        split = np.isfinite(self.threshold)
+        self._used = np.unique(self.feature[split]).astype(np.intp)
+        local = np.searchsorted(self._used, self.feature)
+        self._column = np.where(split, local + self.default_left * len(self._used), 0).ravel().astype(np.intp)
+        self._threshold = self.threshold.ravel()
+        self._value = self.value.ravel()
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.value)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, k).nbytes for k in _ARRAYS)
+
+    # ---------------------------------------------------------------
+    # Construction
+    # ---------------------------------------------------------------
+    @classmethod
+    def from_booster(cls, booster, iteration_range: Tuple[int, int] = (0, 0)) -> "TreeEnsemble":
+        """Flatten the trees of ``iteration_range`` ((0, 0) = all) of an xgboost Booster."""
+        model = json.loads(booster.save_raw(raw_format="json"))
+        learner = model["learner"]
+        gbm = learner["gradient_booster"]
+        if gbm["name"] != "gbtree":
+            raise ValueError(f"Only gbtree boosters are supported, got {gbm['name']!r}.")
+        params = learner["learner_model_param"]
+        if int(params.get("num_target", 1)) != 1 or int(params.get("num_class", 0)) > 1:
+            raise ValueError("Only single-output models are supported.")
+
+        trees = gbm["model"]["trees"]
+        indptr = gbm["model"].get("iteration_indptr") or list(range(len(trees) + 1))
+        start, stop = iteration_range
+        if (start, stop) != (0, 0):
+            trees = trees[indptr[start]:indptr[stop]]
+        for tree in trees:
+            if any(tree["split_type"]):
+                raise ValueError("Categorical splits are not supported by the NumPy evaluator.")
+
+        depths = [_node_depths(tree["left_children"], tree["right_children"]) for tree in trees]
+        depth = max((int(d.max()) for d in depths), default=0)
+        if depth > MAX_DEPTH:
+            raise ValueError(f"Trees of depth {depth} exceed the supported {MAX_DEPTH}.")
+
+        n_internal, n_leaves = 2 ** depth - 1, 2 ** depth
+        feature = np.zeros((len(trees), n_internal), dtype=np.int32)
+        threshold = np.full((len(trees), n_internal), np.inf, dtype=np.float32)
+        default_left = np.ones((len(trees), n_internal), dtype=bool)
+        value = np.zeros((len(trees), n_leaves), dtype=np.float32)
+        for t, (tree, node_depth) in enumerate(zip(trees, depths)):
+            left, right = tree["left_children"], tree["right_children"]
+            cond = np.asarray(tree["split_conditions"], dtype=np.float32)
+            # Heap position of every node, parents before children
+            heap = np.zeros(len(left), dtype=np.int64)
+            for i in range(len(left)):
+                if left[i] == -1:
+                    d = node_depth[i]
+                    first = (heap[i] - (2 ** d - 1)) << (depth - d)
+                    value[t, first:first + (1 << (depth - d))] = cond[i]
+                    continue
+                heap[left[i]], heap[right[i]] = 2 * heap[i] + 1, 2 * heap[i] + 2
+                feature[t, heap[i]] = tree["split_indices"][i]
+                threshold[t, heap[i]] = cond[i]
+                default_left[t, heap[i]] = tree["default_left"][i]
+
+        base_score = float(str(params["base_score"]).strip("[]"))
+        objective = learner["objective"]["name"]
+        return cls(
+            feature, threshold, default_left, value,
+            base_margin=_base_margin(base_score, objective),
+            objective=objective,
+            n_features=int(params["num_feature"]),
+        )
+
+    # ---------------------------------------------------------------
+    # Persist
+    # ---------------------------------------------------------------
+    def save(self, path: str, source_sha256: str = None) -> str:
+        """Write the tables to ``path`` (``.npz``); ``source_sha256`` identifies the booster."""
+        meta = {
+            "version": TREE_TABLE_VERSION,
+            "base_margin": float(self.base_margin),
+            "objective": self.objective,
+            "n_features": self.n_features,
+            "source_sha256": source_sha256,
+        }
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, meta=np.array(json.dumps(meta)),
+                 **{k: getattr(self, k) for k in _ARRAYS})
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["TreeEnsemble", dict]:
+        """Tables and metadata written by :meth:`save`."""
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != TREE_TABLE_VERSION:
+                raise ValueError(f"Unsupported tree table version {meta.get('version')} in {path}.")
+            arrays = {k: data[k] for k in _ARRAYS}
+        ensemble = cls(**arrays, base_margin=meta["base_margin"],
+                       objective=meta["objective"], n_features=meta["n_features"])
+        return ensemble, meta
+
+    # ---------------------------------------------------------------
+    # Prediction
+    # ---------------------------------------------------------------
+    def margin(self, X, block_pairs: int = DEFAULT_BLOCK_PAIRS) -> np.ndarray:
+        """Raw scores (before the sigmoid) for a dense array or scipy sparse matrix."""
+        X = self._as_dense(X)
+        out = np.empty(len(X), dtype=np.float32)
+        block = max(1, block_pairs // max(1, self.n_trees))
+        for start in range(0, len(X), block):
+            out[start:start + block] = self._margin_block(X[start:start + block])
+        return out
+
+    def predict(self, X, block_pairs: int = DEFAULT_BLOCK_PAIRS) -> np.ndarray:
+        """Same output as ``Booster.inplace_predict``: P(class 1) or the regression value."""
+        m = self.margin(X, block_pairs)
+        if self.objective == "binary:logistic":
+            return np.float32(1.0) / (np.float32(1.0) + np.exp(-m))
+        return m
+
+    def _margin_block(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_trees = len(X), self.n_trees
+        n_internal = 2 ** self.depth - 1
+        X = X[:, self._used]
+        missing = np.isnan(X)
+        wide = np.concatenate([np.where(missing, np.float32(np.inf), X),
+                               np.where(missing, np.float32(-np.inf), X)], axis=1).ravel()
+        row_start = (np.arange(n_rows, dtype=np.intp) * (2 * len(self._used)))[:, None]
+        tree_start = np.arange(n_trees, dtype=np.intp) * n_internal
+
+        # Absolute node ids; the children of tree_start + h are tree_start + 2h + 1 (+ 1)
+        node = np.empty((n_rows, n_trees), dtype=np.intp)
+        node[:] = tree_start
+        step = 1 - tree_start
+        index = np.empty_like(node)
+        x = np.empty(node.shape, dtype=np.float32)
+        threshold = np.empty_like(x)
+        go_right = np.empty(node.shape, dtype=bool)
+        for _ in range(self.depth):
+            np.take(self._column, node, out=index)
+            index += row_start
+            np.take(wide, index, out=x)
+            np.take(self._threshold, node, out=threshold)
+            np.greater_equal(x, threshold, out=go_right)
+            node *= 2
+            node += step
+            node += go_right
+
+        # Bottom-level heap slot h of tree t is leaf t * 2 ** depth + h - n_internal
+        node += np.arange(n_trees, dtype=np.intp) - n_internal
+        leaves = np.empty((n_rows, n_trees + 1), dtype=np.float32)
+        leaves[:, 0] = self.base_margin
+        leaves[:, 1:] = np.take(self._value, node)
+        # cumsum adds left to right in float32, the order XGBoost accumulates trees in
+        return np.cumsum(leaves, axis=1, dtype=np.float32)[:, -1]
+
+    def _as_dense(self, X) -> np.ndarray:
+        """float32 rows; entries a sparse matrix does not store are missing (NaN), as in XGBoost."""
+        if hasattr(X, "tocsr"):
+            X = X.tocsr()
+            dense = np.full(X.shape, np.nan, dtype=np.float32)
+            rows = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+            dense[rows, X.indices] = X.data
+            X = dense
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected (n_rows, {self.n_features}) input, got {X.shape}.")
+        return X
+
+
+def _node_depths(left, right) -> np.ndarray:
+    """Depth of each node of one tree (XGBoost numbers children after their parent)."""
+    depth = np.zeros(len(left), dtype=np.int64)
+    for i, child in enumerate(left):
+        if child != -1:
+            depth[child] = depth[right[i]] = depth[i] + 1
+    return depth
@@ -0,0 +1,455 @@
+"""
+Hyperparameter search for the XGBoost heads: successive halving (optionally
+Hyperband brackets) over randomly sampled configurations, trials run in a
+process pool with early stopping on a validation split.
+
+The design matrix is encoded once per (task, dataset version), cached under
+data/cache/tuning/ and loaded once per worker, so no trial re-encodes the
+rows. Promoted trials continue boosting from their previous booster instead
+of starting over. Every trial is logged to the local mlflow.db; nothing
+needs network access.
+
+Usage:
+    python src/models/tuning.py --task regression
+    python src/models/tuning.py --task classification --trials 27 --workers 4 --brackets 3
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# sklearn / xgboost / scipy / mlflow are imported lazily, like the training scripts.
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.data.load_data import CACHE_DIR, DATA_PATH, dataset_fingerprint, load_dataset  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models import train_classification, train_regression  # noqa: E402
+
+MLFLOW_TRACKING_URI = "sqlite:///" + os.path.join(PROJECT_ROOT, "mlflow.db")
+
+NUM_FEATURES = train_regression.NUM_FEATURES
+CAT_FEATURES = train_regression.CAT_FEATURES
+
+# task -> target, XGBoost objective / validation metric (lower is better),
+# MLflow experiment. Splits mirror the training scripts.
+TASKS = {
+    "classification": {
+        "target": train_classification.TARGET,
+        "objective": "binary:logistic",
+        "metric": "logloss",
+        "stratify": True,
+        "experiment": "india_property_investment_classification_tuning",
+    },
+    "regression": {
+        "target": train_regression.TARGET,
+        "objective": "reg:squarederror",
+        "metric": "rmse",
+        "stratify": False,
+        "experiment": "india_property_investment_regression_tuning",
+    },
+}
+
+# (low, high, kind): "int" uniform, "float" uniform, "log" log-uniform
+SEARCH_SPACE = {
+    "max_depth": (3, 10, "int"),
+    "learning_rate": (0.02, 0.3, "log"),
+    "subsample": (0.6, 1.0, "float"),
+    "colsample_bytree": (0.5, 1.0, "float"),
+    "min_child_weight": (1.0, 20.0, "log"),
+    "reg_lambda": (0.1, 10.0, "log"),
+}
+
+DEFAULT_MIN_ROUNDS = 25
+DEFAULT_MAX_ROUNDS = 675
+DEFAULT_ETA = 3
+DEFAULT_EARLY_STOPPING = 20
+
+
+def sample_configs(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(n):
+        config = {}
+        for name, (low, high, kind) in SEARCH_SPACE.items():
+            if kind == "int":
+                config[name] = int(rng.integers(low, high + 1))
+            elif kind == "log":
+                config[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            else:
+                config[name] = float(rng.uniform(low, high))
+        configs.append(config)
+    return configs
+
+
+# -------------------------------------------------------------------
+# Design-matrix cache (encode once per task + dataset version)
+# -------------------------------------------------------------------
+def _save_csr(arrays: Dict[str, np.ndarray], prefix: str, matrix) -> None:
+    matrix = matrix.tocsr()
+    arrays[f"{prefix}_data"] = matrix.data
+    arrays[f"{prefix}_indices"] = matrix.indices
+    arrays[f"{prefix}_indptr"] = matrix.indptr
+    arrays[f"{prefix}_shape"] = np.array(matrix.shape)
+
+
+def _load_csr(data, prefix: str):
+    import scipy.sparse as sp
+
+    return sp.csr_matrix(
+        (data[f"{prefix}_data"], data[f"{prefix}_indices"], data[f"{prefix}_indptr"]),
+        shape=tuple(data[f"{prefix}_shape"]),
+    )
+
+
+def design_matrix_path(
+    task: str, csv_path: str = DATA_PATH, cache_dir: str = CACHE_DIR
+) -> str:
+    """
+    Encoded train / validation matrices for ``task`` (built if missing).
+
+    Same 80/20 train/test split as the training scripts (the test rows are
+    never touched here); 20% of the training rows become the validation
+    split used for early stopping and ranking trials.
+    """
+    from scipy import sparse as sp
+    from sklearn.model_selection import train_test_split
+
+    from src.models.preprocessing import get_preprocessing_pipeline
+
+    cfg = TASKS[task]
+    fingerprint = dataset_fingerprint(csv_path, cache_dir)[:16]
+    path = os.path.join(cache_dir, "tuning", f"{task}-{fingerprint}.npz")
+    if os.path.exists(path):
+        return path
+
+    target = cfg["target"]
+    df = build_features(load_dataset(NUM_FEATURES + CAT_FEATURES + [target], csv_path, cache_dir))
+    X, y = df[NUM_FEATURES + CAT_FEATURES], df[target]
+
+    def split(X, y):
+        return train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y if cfg["stratify"] else None
+        )
+
+    X_train, _, y_train, _ = split(X, y)
+    X_fit, X_valid, y_fit, y_valid = split(X_train, y_train)
+
+    preprocessor = get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES)
+    arrays = {
+        "y_train": y_fit.to_numpy(dtype=np.float32),
+        "y_valid": y_valid.to_numpy(dtype=np.float32),
+    }
+    Xt_fit = preprocessor.fit_transform(X_fit)
+    Xt_valid = preprocessor.transform(X_valid)
+    # Matches the pipelines: sparse output -> unstored entries are missing
+    _save_csr(arrays, "X_train", sp.csr_matrix(Xt_fit))
+    _save_csr(arrays, "X_valid", sp.csr_matrix(Xt_valid))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp.npz"
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+
+# -------------------------------------------------------------------
+# Worker side
+# -------------------------------------------------------------------
+_worker_data = None
+
+
+def _init_worker(matrix_path: str, nthread: int) -> None:
+    """Load the cached matrices into DMatrix objects once per worker."""
+    import xgboost as xgb
+
+    global _worker_data
+    with np.load(matrix_path) as data:
+        dtrain = xgb.DMatrix(_load_csr(data, "X_train"), label=data["y_train"], nthread=nthread)
+        dvalid = xgb.DMatrix(_load_csr(data, "X_valid"), label=data["y_valid"], nthread=nthread)
+    _worker_data = (dtrain, dvalid, nthread)
+
+
+def _run_trial(
+    task: str,
+    config: Dict[str, Any],
+    target_rounds: int,
+    early_stopping: int,
+    booster_raw: Optional[bytearray],
+) -> Dict[str, Any]:
+    """
+    Train (or continue) one configuration up to ``target_rounds`` total
+    rounds with early stopping on the validation split.
+    """
+    import xgboost as xgb
+
+    dtrain, dvalid, nthread = _worker_data
+    cfg = TASKS[task]
+    params = {
+        **config,
+        "objective": cfg["objective"],
+        "eval_metric": cfg["metric"],
+        "tree_method": "hist",
+        "nthread": nthread,
+        "seed": 42,
+    }
+
+    previous = None
+    done_rounds = 0
+    if booster_raw is not None:
+        previous = xgb.Booster()
+        previous.load_model(booster_raw)
+        done_rounds = previous.num_boosted_rounds()
+
+    start = time.perf_counter()
+    booster = xgb.train(
+        params,
+        dtrain,
+        num_boost_round=target_rounds - done_rounds,
+        evals=[(dvalid, "valid")],
+        early_stopping_rounds=early_stopping,
+        xgb_model=previous,
+        verbose_eval=False,
+    )
+    seconds = time.perf_counter() - start
+
+    total_rounds = booster.num_boosted_rounds()
+    return {
+        "score": float(booster.best_score),
+        "best_iteration": int(booster.best_iteration),
+        "rounds": total_rounds,
+        "rounds_trained": total_rounds - done_rounds,
+        # Stopped before the rung's budget: more rounds will not help
+        "converged": total_rounds < target_rounds,
+        "seconds": seconds,
+        "booster": booster.save_raw("ubj"),
+    }
+
+
+# -------------------------------------------------------------------
+# Search
+# -------------------------------------------------------------------
+def _rung_budgets(min_rounds: int, max_rounds: int, eta: int) -> List[int]:
+    budgets = [min_rounds]
+    while budgets[-1] * eta <= max_rounds:
+        budgets.append(budgets[-1] * eta)
+    return budgets
+
+
+def successive_halving(
+    pool: ProcessPoolExecutor,
+    task: str,
+    configs: List[Dict[str, Any]],
+    budgets: List[int],
+    eta: int,
+    early_stopping: int,
+    first_trial_id: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Run every config at ``budgets[0]`` rounds, keep the best 1/eta, continue
+    those to the next budget, and so on. Returns one record per trial.
+    """
+    trials = [
+        {"trial_id": first_trial_id + i, "config": c, "rungs": [], "booster": None}
+        for i, c in enumerate(configs)
+    ]
+    alive = trials
+    for rung, budget in enumerate(budgets):
+        futures = []
+        for trial in alive:
+            last = trial["rungs"][-1] if trial["rungs"] else None
+            if last is not None and last["converged"]:
+                futures.append(None)  # early-stopped already; score is final
+            else:
+                futures.append(pool.submit(
+                    _run_trial, task, trial["config"], budget, early_stopping, trial["booster"]
+                ))
+        for trial, future in zip(alive, futures):
+            if future is None:
+                continue
+            result = future.result()
+            trial["booster"] = result.pop("booster")
+            last = trial["rungs"][-1] if trial["rungs"] else None
+            if last is not None and last["score"] <= result["score"]:
+                # Continued rounds never beat the earlier optimum
+                result["score"], result["best_iteration"] = last["score"], last["best_iteration"]
+            trial["rungs"].append({"rung": rung, "budget": budget, **result})
+
+        if rung == len(budgets) - 1:
+            break
+        alive = sorted(alive, key=lambda t: t["rungs"][-1]["score"])
+        alive = alive[:max(1, len(alive) // eta)]
+    return trials
+
+
+def hyperband(
+    task: str,
+    n_trials: int = 27,
+    min_rounds: int = DEFAULT_MIN_ROUNDS,
+    max_rounds: int = DEFAULT_MAX_ROUNDS,
+    eta: int = DEFAULT_ETA,
+    brackets: int = 1,
+    early_stopping: int = DEFAULT_EARLY_STOPPING,
+    n_workers: int = None,
+    seed: int = 42,
+    matrix_path: str = None,
+) -> Dict[str, Any]:
+    """
+    Successive halving over ``n_trials`` sampled configs (``brackets=1``), or
+    Hyperband: ``brackets`` successive-halving runs that trade the number of
+    configs against their starting budget.
+
+    Returns a report with every trial, the best configuration and the
+    compute used (boosting rounds and worker seconds).
+    """
+    matrix_path = matrix_path or design_matrix_path(task)
+    n_workers = n_workers or os.cpu_count() or 1
+    nthread = max(1, (os.cpu_count() or 1) // n_workers)
+
+    all_budgets = _rung_budgets(min_rounds, max_rounds, eta)
+    brackets = max(1, min(brackets, len(all_budgets)))
+    configs = sample_configs(n_trials * brackets, seed)
+
+    start = time.perf_counter()
+    trials = []
+    with ProcessPoolExecutor(
+        max_workers=n_workers, initializer=_init_worker, initargs=(matrix_path, nthread)
+    ) as pool:
+        for b in range(brackets):
+            # Bracket b starts b rungs later with eta^b fewer configs
+            budgets = all_budgets[b:]
+            n = max(1, n_trials // eta ** b)
+            bracket_configs = configs[b * n_trials:b * n_trials + n]
+            for trial in successive_halving(
+                pool, task, bracket_configs, budgets, eta, early_stopping, len(trials)
+            ):
+                trial["bracket"] = b
+                trials.append(trial)
+    wall_seconds = time.perf_counter() - start
+
+    def final(trial):
+        return trial["rungs"][-1]
+
+    best = min(trials, key=lambda t: final(t)["score"])
+    rounds_used = sum(r["rounds_trained"] for t in trials for r in t["rungs"])
+    return {
+        "task": task,
+        "metric": TASKS[task]["metric"],
+        "n_trials": len(trials),
+        "budgets": all_budgets,
+        "eta": eta,
+        "brackets": brackets,
+        "n_workers": n_workers,
+        "trials": trials,
+        "best": {
+            "trial_id": best["trial_id"],
+            "config": best["config"],
+            "score": final(best)["score"],
+            # Trees to train with, as n_estimators (early-stopping optimum)
+            "n_estimators": final(best)["best_iteration"] + 1,
+        },
+        "compute": {
+            "boosting_rounds": rounds_used,
+            "exhaustive_rounds": len(trials) * all_budgets[-1],
+            "worker_seconds": sum(r["seconds"] for t in trials for r in t["rungs"]),
+            "wall_seconds": wall_seconds,
+        },
+    }
+
+
+# -------------------------------------------------------------------
+# Reporting
+# -------------------------------------------------------------------
+def log_to_mlflow(report: Dict[str, Any], tracking_uri: str = MLFLOW_TRACKING_URI) -> None:
+    """One parent run per search, one nested run per trial (metric per rung)."""
+    import mlflow
+
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_experiment(TASKS[report["task"]]["experiment"])
+    metric = report["metric"]
+
+    with mlflow.start_run(run_name=f"{report['task']}-search"):
+        mlflow.log_params({
+            "n_trials": report["n_trials"],
+            "eta": report["eta"],
+            "brackets": report["brackets"],
+            "budgets": ",".join(map(str, report["budgets"])),
+        })
+        for trial in report["trials"]:
+            with mlflow.start_run(run_name=f"trial-{trial['trial_id']}", nested=True):
+                mlflow.log_params(trial["config"])
+                mlflow.log_param("bracket", trial["bracket"])
+                for r in trial["rungs"]:
+                    mlflow.log_metric(f"valid_{metric}", r["score"], step=r["rounds"])
+                mlflow.log_metric("rounds", trial["rungs"][-1]["rounds"])
+                mlflow.log_metric("best_iteration", trial["rungs"][-1]["best_iteration"])
+        mlflow.log_params({f"best_{k}": v for k, v in report["best"]["config"].items()})
+        mlflow.log_metric(f"best_valid_{metric}", report["best"]["score"])
+        mlflow.log_metric("best_n_estimators", report["best"]["n_estimators"])
+        for key, value in report["compute"].items():
+            mlflow.log_metric(key, value)
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    compute, best = report["compute"], report["best"]
+    print(f"{report['task']}: {report['n_trials']} trials, rung budgets {report['budgets']}, "
+          f"eta {report['eta']}, {report['brackets']} bracket(s), {report['n_workers']} worker(s)")
+    ranked = sorted(report["trials"], key=lambda t: t["rungs"][-1]["score"])
+    for trial in ranked[:5]:
+        last = trial["rungs"][-1]
+        print(f"  trial {trial['trial_id']:>3d}  valid {report['metric']} {last['score']:.4f}  "
+              f"rounds {last['rounds']:>4d}  {trial['config']}")
+    print(f"Best: trial {best['trial_id']}  valid {report['metric']} {best['score']:.4f}  "
+          f"n_estimators {best['n_estimators']}")
+    print(f"  {json.dumps(best['config'])}")
+    print(f"Compute: {compute['boosting_rounds']:,} boosting rounds "
+          f"({compute['boosting_rounds'] / compute['exhaustive_rounds']:.0%} of running every "
+          f"trial to {report['budgets'][-1]}), {compute['worker_seconds']:.1f} worker-s, "
+          f"{compute['wall_seconds']:.1f} s wall")
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Successive-halving / Hyperband search.")
+    parser.add_argument("--task", choices=sorted(TASKS), required=True)
+    parser.add_argument("--trials", type=int, default=27,
+                        help="Configurations in the first (largest) bracket.")
+    parser.add_argument("--min-rounds", type=int, default=DEFAULT_MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=DEFAULT_MAX_ROUNDS)
+    parser.add_argument("--eta", type=int, default=DEFAULT_ETA)
+    parser.add_argument("--brackets", type=int, default=1,
+                        help="1 = successive halving; >1 = Hyperband brackets.")
+    parser.add_argument("--early-stopping", type=int, default=DEFAULT_EARLY_STOPPING)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write the best config + compute as JSON.")
+    parser.add_argument("--no-mlflow", action="store_true", help="Skip logging to mlflow.db.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    report = hyperband(
+        args.task,
+        n_trials=args.trials,
+        min_rounds=args.min_rounds,
+        max_rounds=args.max_rounds,
+        eta=args.eta,
+        brackets=args.brackets,
+        early_stopping=args.early_stopping,
+        n_workers=args.workers,
+        seed=args.seed,
+    )
+    print_report(report)
+    if not args.no_mlflow:
+        log_to_mlflow(report)
+        print(f"Logged {report['n_trials']} trials to {MLFLOW_TRACKING_URI}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({k: report[k] for k in ("task", "metric", "best", "compute", "budgets")}, f, indent=2)
@@ -0,0 +1,122 @@
+"""
+The inference service (src/app/api.py) through Starlette's TestClient:
+concurrent /predict calls share micro-batches, and one record that cannot
+be scored fails on its own.
+"""
+import asyncio
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import pytest  # noqa: E402
+from starlette.testclient import TestClient  # noqa: E402
+
+from src.app.api import MicroBatcher, create_app  # noqa: E402
+from src.data.synthetic import make_listings  # noqa: E402
+from src.models.predict import ALL_FEATURES, configure_prediction_cache, predict_properties_batch  # noqa: E402
+
+N_REQUESTS = 16
+
+
+class RecordingScorer:
+    """predict_properties_batch that records batch sizes and fails on a marked record."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def __call__(self, records):
+        with self._lock:
+            self.batch_sizes.append(len(records))
+        if any(r.get("poison") for r in records):
+            raise ValueError("poisoned record")
+        return predict_properties_batch(records)
+
+
+@pytest.fixture
+def records():
+    return make_listings(N_REQUESTS, seed=11)[ALL_FEATURES].to_dict("records")
+
+
+@pytest.fixture
+def client_and_scorer():
+    configure_prediction_cache()  # no hits from other tests
+    scorer = RecordingScorer()
+    app = create_app(score_fn=scorer, max_wait_ms=200, watch_models=False)
+    with TestClient(app) as client:
+        yield client, scorer
+
+
+def _post_all(client, bodies):
+    with ThreadPoolExecutor(max_workers=len(bodies)) as pool:
+        return list(pool.map(lambda body: client.post("/predict", json=body), bodies))
+
+
+def test_concurrent_requests_are_batched(client_and_scorer, records):
+    client, scorer = client_and_scorer
+    responses = _post_all(client, records)
+
+    assert [r.status_code for r in responses] == [200] * N_REQUESTS
+    assert max(scorer.batch_sizes) > 1
+    assert sum(scorer.batch_sizes) == N_REQUESTS
+
+    expected = predict_properties_batch(records)
+    for response, (_, row) in zip(responses, expected.iterrows()):
+        body = response.json()
+        assert body["good_investment_label"] == row["good_investment_label"]
+        assert body["good_investment_prob"] == pytest.approx(row["good_investment_prob"], abs=1e-6)
+        assert body["predicted_price_lakhs"] == pytest.approx(row["predicted_price_lakhs"], rel=1e-6)
+
+
+def test_bad_record_fails_alone(client_and_scorer, records):
+    client, scorer = client_and_scorer
+    bodies = [dict(r) for r in records]
+    bodies[3]["poison"] = True
+    responses = _post_all(client, bodies)
+
+    statuses = [r.status_code for r in responses]
+    assert statuses[3] == 500
+    assert "poisoned record" in responses[3].json()["error"]
+    assert statuses[:3] + statuses[4:] == [200] * (N_REQUESTS - 1)
+
+
+def test_unscorable_values_are_rejected(client_and_scorer, records):
+    client, scorer = client_and_scorer
+    # JSON 1e999 parses to inf, which the scaler refuses
+    response = client.post(
+        "/predict", content=b'{"Size_in_SqFt": 1e999}', headers={"content-type": "application/json"}
+    )
+    assert response.status_code == 400
+    assert "Size_in_SqFt" in response.json()["error"]
+
+    response = client.post("/predict_batch", json=[records[0], dict(records[1], City=["Pune"])])
+    assert response.status_code == 400
+    assert response.json()["error"].startswith("Record 1:")
+    assert scorer.batch_sizes == []
+
+
+def test_stop_fails_the_batch_in_flight():
+    release = threading.Event()
+
+    def blocked(records):
+        release.wait(10)
+        return predict_properties_batch(records)
+
+    async def scenario():
+        batcher = MicroBatcher(blocked, max_wait_ms=1)
+        await batcher.start()
+        pending = asyncio.ensure_future(batcher.submit({}))
+        await asyncio.sleep(0.1)  # collected and handed to the worker thread
+        await batcher.stop()
+        try:
+            with pytest.raises(RuntimeError, match="stopped"):
+                await asyncio.wait_for(pending, 1)
+        finally:
+            release.set()
+
+    asyncio.run(scenario())
@@ -0,0 +1,79 @@
+"""
+Feature engineering (src/features/build_features.py): the compact mode works
+in place with categorical / narrow integer dtypes, holds the same values as
+the default path and gives identical model outputs.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.features.build_features import CATEGORICAL_COLS, NUMERIC_COLS, build_features  # noqa: E402
+from src.models import predict  # noqa: E402
+from src.models.predict import ALL_FEATURES  # noqa: E402
+
+
+@pytest.fixture
+def raw():
+    df = make_listings(400, seed=17)
+    df["BHK"] = df["BHK"].astype(int)
+    df.loc[3, "Nearby_Schools"] = np.nan  # a missing value keeps the column float
+    df["Size_in_SqFt"] = df["Size_in_SqFt"].astype(object)
+    df.loc[5, "Size_in_SqFt"] = "1_200"   # unparseable -> NaN on both paths
+    return df
+
+
+def test_default_copies_and_compact_works_in_place(raw):
+    before = raw.copy()
+    out = build_features(raw)
+    assert out is not raw
+    pd.testing.assert_frame_equal(raw, before)
+
+    compact = build_features(raw, compact=True)
+    assert compact is raw
+
+
+def test_compact_holds_the_same_values(raw):
+    default = build_features(raw.copy())
+    compact = build_features(raw.copy(), compact=True)
+
+    for col in CATEGORICAL_COLS:
+        assert isinstance(compact[col].dtype, pd.CategoricalDtype)
+        assert compact[col].astype(str).tolist() == default[col].tolist()
+    for col in NUMERIC_COLS:
+        np.testing.assert_array_equal(compact[col].to_numpy(dtype=np.float64), default[col].to_numpy())
+
+    assert compact["Age_of_Property"].dtype == np.int16
+    assert compact["Nearby_Hospitals"].dtype == np.int16
+    # Missing values and fractional floats are never narrowed
+    assert compact["Nearby_Schools"].dtype == np.float64
+    assert compact["Size_in_SqFt"].dtype == np.float64
+    assert compact["Annual_Growth_Rate"].dtype == np.float64
+
+
+def test_vocabulary_and_categorical_input(raw):
+    cities = sorted(raw["City"].unique())
+    vocabulary = {"City": cities[:-1], "BHK": ["1", "2", "3", "4", "5"]}
+    df = raw.copy()
+    df["BHK"] = df["BHK"].astype("category")  # as the Arrow cache returns it
+    compact = build_features(df, compact=True, vocabulary=vocabulary)
+
+    assert list(compact["City"].cat.categories) == cities[:-1]
+    assert compact["City"].isna().tolist() == (raw["City"] == cities[-1]).tolist()
+    assert list(compact["BHK"].cat.categories) == vocabulary["BHK"]
+    assert compact["BHK"].astype(str).tolist() == raw["BHK"].astype(str).tolist()
+
+
+def test_compact_scoring_matches_default(raw):
+    records = raw[ALL_FEATURES]
+    pd.testing.assert_frame_equal(
+        predict.predict_properties_batch(records.copy(), compact=True),
+        predict.predict_properties_batch(records.copy()),
+    )
@@ -0,0 +1,68 @@
+"""
+Chart downsampling (src/app/charting.py): the chunked reservoir sample is
+Algorithm R exactly, deterministic per seed and uniform over the stream.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from src.app.charting import reservoir_sample  # noqa: E402
+
+
+def _chunks(n, size):
+    return [np.arange(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def _algorithm_r(chunks, k, seed):
+    """Item-by-item Algorithm R fed the same random draws as reservoir_sample."""
+    rng = np.random.default_rng(seed)
+    reservoir, seen = [], 0
+    for chunk in chunks:
+        take = min(max(k - seen, 0), len(chunk))
+        reservoir.extend(chunk[:take])
+        rest = chunk[take:]
+        if len(rest):
+            t = np.arange(seen + take, seen + len(chunk))
+            for item, j in zip(rest, rng.integers(0, t + 1)):
+                if j < k:
+                    reservoir[j] = item
+        seen += len(chunk)
+    return np.array(reservoir)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 50, 1000])
+def test_matches_item_by_item_algorithm_r(chunk_size):
+    # k small against the chunks: many items in one chunk draw the same slot
+    for seed in range(20):
+        chunks = _chunks(1000, chunk_size)
+        np.testing.assert_array_equal(reservoir_sample(chunks, 5, seed), _algorithm_r(chunks, 5, seed))
+
+
+def test_deterministic_per_seed():
+    chunks = _chunks(10_000, 999)
+    first = reservoir_sample(chunks, 100, seed=3)
+    np.testing.assert_array_equal(reservoir_sample(chunks, 100, seed=3), first)
+    assert not np.array_equal(reservoir_sample(chunks, 100, seed=4), first)
+    assert len(np.unique(first)) == 100
+
+
+def test_uniform_inclusion():
+    n, k, trials = 60, 6, 3000
+    counts = np.zeros(n)
+    for seed in range(trials):
+        counts[reservoir_sample(_chunks(n, 25), k, seed)] += 1
+    # Each item is kept with probability k / n; allow 5 standard deviations
+    expected = trials * k / n
+    sd = np.sqrt(trials * (k / n) * (1 - k / n))
+    assert np.abs(counts - expected).max() < 5 * sd
+
+
+def test_short_stream():
+    np.testing.assert_array_equal(reservoir_sample(_chunks(4, 3), 10), np.arange(4))
+    assert len(reservoir_sample([], 10)) == 0
@@ -0,0 +1,96 @@
+"""
+Comparables index persistence (src/app/comparables.py): a save never
+disturbs the version readers already have open, and a failed save leaves
+the current one in place.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.app import comparables  # noqa: E402
+from src.app.comparables import CURRENT_FILENAME, INDEX_COLUMNS, ComparablesIndex  # noqa: E402
+from src.data.synthetic import make_listings  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+
+QUERY = dict(size_sqft=1500, age=10, price_per_sqft=6000)
+
+
+def _index(seed):
+    return ComparablesIndex.build(build_features(make_listings(2000, seed=seed))[INDEX_COLUMNS])
+
+
+def _query(index):
+    city, property_type, bhk = index.segments[0]
+    return index.query(city, property_type, bhk, **QUERY)
+
+
+def _versions(path):
+    return sorted(e for e in os.listdir(path) if e.startswith("v-"))
+
+
+def test_save_keeps_open_versions_readable(tmp_path):
+    path = str(tmp_path / "comparables")
+    first, second = _index(1), _index(2)
+
+    first.save(path, "one")
+    loaded, meta = ComparablesIndex.load(path)
+    assert meta["fingerprint"] == "one"
+    before = _query(loaded)
+    pd.testing.assert_frame_equal(before, _query(first))
+
+    second.save(path, "two")
+    # The memory-mapped first version is untouched; new loads see the second
+    pd.testing.assert_frame_equal(_query(loaded), before)
+    assert ComparablesIndex.load(path)[1]["fingerprint"] == "two"
+
+    # Only the current and previous versions are kept
+    _index(3).save(path, "three")
+    assert len(_versions(path)) == 2
+    with open(os.path.join(path, CURRENT_FILENAME)) as f:
+        assert f.read() in _versions(path)
+    assert ComparablesIndex.load(path)[1]["fingerprint"] == "three"
+
+
+def test_failed_save_keeps_current(tmp_path, monkeypatch):
+    path = str(tmp_path / "comparables")
+    index = _index(1)
+    index.save(path, "one")
+
+    real_save = np.save
+
+    def fail_on_display(file, arr, *args, **kwargs):
+        if str(file).endswith("display.npy"):
+            raise OSError("disk full")
+        return real_save(file, arr, *args, **kwargs)
+
+    monkeypatch.setattr(comparables.np, "save", fail_on_display)
+    with pytest.raises(OSError, match="disk full"):
+        _index(2).save(path, "two")
+    monkeypatch.undo()
+
+    loaded, meta = ComparablesIndex.load(path)
+    assert meta["fingerprint"] == "one"
+    pd.testing.assert_frame_equal(_query(loaded), _query(index))
+    assert [e for e in os.listdir(path) if e.startswith(".")] == []
+
+
+def test_replaces_the_flat_layout(tmp_path):
+    # Before versioned saves, the arrays lived directly in the directory
+    path = tmp_path / "comparables"
+    path.mkdir()
+    (path / "meta.json").write_text("{}")
+    (path / "points.npy").write_bytes(b"old")
+    assert comparables._current_dir(str(path)) is None
+    with pytest.raises(FileNotFoundError):
+        ComparablesIndex.load(str(path))
+
+    _index(1).save(str(path), "one")
+    assert sorted(os.listdir(path)) == [CURRENT_FILENAME] + _versions(str(path))
+    assert ComparablesIndex.load(str(path))[1]["fingerprint"] == "one"
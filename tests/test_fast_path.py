@@ -0,0 +1,177 @@
+"""
+The compiled fast path (src/models/fast_path.py) must reproduce
+Pipeline.predict_proba / Pipeline.predict exactly, on synthetic listings and
+on inputs the encoder has to handle like the ColumnTransformer does.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models import registry  # noqa: E402
+from src.models.fast_path import CompiledPipeline, tree_table_path  # noqa: E402
+from src.models.predict import (  # noqa: E402
+    ALL_FEATURES, CAT_FEATURES, NUM_FEATURES, ModelSet, _load_classifier, _load_regressor,
+)
+
+N_ROWS = 500
+
+
+def _edge_cases(base):
+    """Rows the one-hot / numeric encoding must treat as the pipeline does."""
+    return [
+        dict(base, Locality="Nowhere"),          # unknown category -> all zeros
+        dict(base, City=float("nan")),           # missing category
+        dict(base, Size_in_SqFt=float("nan")),   # missing numeric
+        dict(base, Size_in_SqFt=None),
+        dict(base, BHK="9"),                     # outside the BHK vocabulary
+        dict(base, BHK=9),
+        dict(base, Age_of_Property="not a number"),
+        dict(base, Size_in_SqFt="1_000"),        # float() accepts it, pd.to_numeric does not
+        dict(base, Age_of_Property="١٢"),        # non-ASCII digits, likewise
+        dict(base, Size_in_SqFt=" 1200 "),       # both accept surrounding whitespace
+    ]
+
+
+def _frame(records):
+    # The frame predict_properties_batch hands to the pipelines
+    return build_features(pd.DataFrame(records))[ALL_FEATURES]
+
+
+@pytest.fixture(scope="module")
+def records():
+    rows = make_listings(N_ROWS, seed=7)[ALL_FEATURES].to_dict("records")
+    return rows + _edge_cases(rows[0])
+
+
+@pytest.mark.parametrize("load, method", [
+    (_load_classifier, "predict_proba"),
+    (_load_regressor, "predict"),
+])
+def test_live_models_match_pipeline(records, load, method):
+    pipeline = load()
+    compiled = CompiledPipeline.from_pipeline(pipeline)
+
+    expected = getattr(pipeline, method)(_frame(records))
+    if method == "predict_proba":
+        expected = expected[:, 1]
+    np.testing.assert_array_equal(compiled.predict_encoded(compiled.encode(records)), expected)
+
+
+@pytest.mark.parametrize("sparse_threshold", [0.0, 1.0])
+def test_dense_and_sparse_output(records, sparse_threshold):
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBRegressor
+
+    from src.models.preprocessing import get_preprocessing_pipeline
+
+    train = make_listings(2000, seed=3)
+    preprocessor = get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES)
+    preprocessor.set_params(sparse_threshold=sparse_threshold)
+    pipeline = Pipeline([
+        ("preprocessor", preprocessor),
+        ("model", XGBRegressor(n_estimators=20, max_depth=4, random_state=0)),
+    ])
+    pipeline.fit(_frame(train[ALL_FEATURES]), train["Price_in_Lakhs"])
+    compiled = CompiledPipeline.from_pipeline(pipeline)
+    assert compiled.sparse_output == (sparse_threshold == 1.0)
+
+    # A value equal to the scaler mean scales to exactly 0: not stored in
+    # CSR, so missing (NaN) to XGBoost with sparse output, 0.0 with dense
+    j = NUM_FEATURES.index("Size_in_SqFt")
+    at_mean = dict(records[0], Size_in_SqFt=float(compiled.means[j]))
+    rows = records + [at_mean]
+
+    X = compiled.encode(rows)
+    if compiled.sparse_output:
+        assert np.isnan(X[-1, j])
+        assert np.isnan(X[0, compiled.cat_offsets[0]:]).sum() > 0  # unset one-hot cells
+    else:
+        assert X[-1, j] == 0.0
+        assert not np.isnan(X[0, compiled.cat_offsets[0]:]).any()
+    np.testing.assert_array_equal(compiled.predict_encoded(X), pipeline.predict(_frame(rows)))
+
+
+# -------------------------------------------------------------------
+# NumPy tree backend
+# -------------------------------------------------------------------
+def _fit_pair(categorical: str, n_estimators: int = 20):
+    """{name: fitted pipeline} for both models in the given categorical mode."""
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBClassifier, XGBRegressor
+
+    from src.models.preprocessing import get_model_preprocessor, xgb_categorical_params
+
+    train = build_features(make_listings(1500, seed=11))
+    pipelines = {}
+    for name, estimator, target in (
+        ("classifier", XGBClassifier, "Good_Investment"),
+        ("regression", XGBRegressor, "Price_in_Lakhs"),
+    ):
+        model = estimator(n_estimators=n_estimators, max_depth=4, **xgb_categorical_params(categorical))
+        pipeline = Pipeline([("preprocessor", get_model_preprocessor(NUM_FEATURES, CAT_FEATURES, categorical)),
+                             ("model", model)])
+        pipelines[name] = pipeline.fit(train[ALL_FEATURES], train[target])
+    return pipelines
+
+
+def _scores(pipeline, records):
+    X = _frame(records)
+    return pipeline.predict_proba(X)[:, 1] if hasattr(pipeline, "predict_proba") else pipeline.predict(X)
+
+
+@pytest.fixture(scope="module")
+def onehot_pipelines():
+    return _fit_pair("onehot")
+
+
+def test_numpy_backend_serves_the_exported_tables(onehot_pipelines, records, tmp_path):
+    models = ModelSet(
+        {name: registry.register(p, name, {}, str(tmp_path)) for name, p in onehot_pipelines.items()},
+        tree_backend="numpy",
+    )
+    assert models.native_current()
+    for name, compiled in zip(registry.MODEL_NAMES, models.compiled()):
+        assert compiled.trees is not None and compiled.booster is None  # tables, no xgboost
+        expected = _scores(onehot_pipelines[name], records)
+        np.testing.assert_allclose(compiled.predict_raw(records), expected, rtol=0, atol=1e-5)
+
+
+def test_numpy_backend_rebuilds_stale_tables(onehot_pipelines, records, tmp_path):
+    models_dir = str(tmp_path)
+    pipeline = onehot_pipelines["regression"]
+    CompiledPipeline.from_pipeline(pipeline).save(models_dir, "regression")
+    table = tree_table_path(models_dir, "regression")
+    stale = table + ".old"
+    os.replace(table, stale)
+
+    # A new booster next to the previous booster's tables: those are ignored
+    newer = _fit_pair("onehot", n_estimators=30)["regression"]
+    CompiledPipeline.from_pipeline(newer).save(models_dir, "regression")
+    os.replace(stale, table)
+    loaded = CompiledPipeline.load(models_dir, "regression", backend="numpy")
+    assert loaded.booster is not None and loaded.trees.n_trees == 30
+    np.testing.assert_allclose(loaded.predict_raw(records), _scores(newer, records), rtol=0, atol=1e-5)
+
+
+def test_numpy_backend_keeps_xgboost_for_categorical_splits(records, tmp_path):
+    pipelines = _fit_pair("native")
+    models = ModelSet(
+        {name: registry.register(p, name, {}, str(tmp_path)) for name, p in pipelines.items()},
+        tree_backend="numpy",
+    )
+    assert not any(os.path.exists(tree_table_path(d, n)) for n, d in models.sources.items())
+    assert models.native_current()
+    for name, compiled in zip(registry.MODEL_NAMES, models.compiled()):
+        assert compiled.trees is None
+        np.testing.assert_array_equal(compiled.predict_raw(records), _scores(pipelines[name], records))
+        from_pipeline = CompiledPipeline.from_pipeline(pipelines[name], backend="numpy")
+        assert from_pipeline.trees is None
@@ -0,0 +1,107 @@
+"""
+Filter index (src/app/filter_index.py): ``select`` and ``restrict`` return
+exactly the rows a pandas mask selects, including the packed-bitmap padding
+of a row count that is not a multiple of 8 and missing range values.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.app.filter_index import EQUALITY_COLUMNS, RANGE_COLUMNS, FilterIndex  # noqa: E402
+from src.data.synthetic import make_listings  # noqa: E402
+
+N_ROWS = 2003  # not a multiple of 8: the last bitmap byte is padded
+N_FILTERS = 100
+
+
+@pytest.fixture(scope="module")
+def listings():
+    df = make_listings(N_ROWS, seed=41)[EQUALITY_COLUMNS + RANGE_COLUMNS].copy()
+    df.loc[df.sample(50, random_state=1).index, "Age_of_Property"] = np.nan
+    return df
+
+
+@pytest.fixture(scope="module")
+def index(listings):
+    return FilterIndex.build(listings)
+
+
+def _random_filters(rng, index):
+    equals, ranges = {}, {}
+    for col in EQUALITY_COLUMNS:
+        r = rng.random()
+        if r < 0.3:
+            equals[col] = str(rng.choice(index.categories[col]))
+        elif r < 0.45:
+            equals[col] = list(rng.choice(index.categories[col], 2, replace=False))
+        elif r < 0.5:
+            equals[col] = "All"
+    for col in RANGE_COLUMNS:
+        if rng.random() < 0.5:
+            values = index.sorted_values[col]
+            lo, hi = np.sort(rng.uniform(values[0], np.nanmax(values), 2))
+            ranges[col] = (float(lo), float(hi))
+    return equals, ranges
+
+
+def _mask(df, equals, ranges):
+    mask = np.ones(len(df), dtype=bool)
+    for col, value in equals.items():
+        if value == "All":
+            continue
+        values = value if isinstance(value, list) else [value]
+        mask &= df[col].astype(str).isin([str(v) for v in values]).to_numpy()
+    for col, (lo, hi) in ranges.items():
+        mask &= df[col].between(lo, hi).to_numpy()
+    return mask
+
+
+def test_select_matches_pandas(listings, index):
+    rng = np.random.default_rng(0)
+    for _ in range(N_FILTERS):
+        equals, ranges = _random_filters(rng, index)
+        ids = index.select(equals, ranges)
+        expected = np.flatnonzero(_mask(listings, equals, ranges))
+        if ids is None:
+            assert len(expected) == N_ROWS
+        else:
+            np.testing.assert_array_equal(ids, expected)
+
+
+def test_restrict_matches_pandas(listings, index):
+    rng = np.random.default_rng(1)
+    for _ in range(N_FILTERS):
+        equals, ranges = _random_filters(rng, index)
+        # Unsorted candidates, including the last (padded) byte's rows
+        ids = np.concatenate([rng.choice(N_ROWS - 8, 300, replace=False), np.arange(N_ROWS - 8, N_ROWS)])
+        rng.shuffle(ids)
+        expected = ids[_mask(listings, equals, ranges)[ids]]
+        np.testing.assert_array_equal(index.restrict(ids, equals, ranges), expected)
+
+
+def test_edge_cases(listings, index):
+    assert index.select() is None
+    assert index.select({"City": "All"}, {"Price_in_Lakhs": (-np.inf, np.inf)}) is None
+    assert len(index.select({"City": "Atlantis"})) == 0
+    # Integer values match their string category; NaN never falls in a range
+    good = index.select({"Good_Investment": 1})
+    np.testing.assert_array_equal(good, np.flatnonzero(listings["Good_Investment"].to_numpy() == 1))
+    aged = index.select(ranges={"Age_of_Property": (-np.inf, np.inf)})
+    np.testing.assert_array_equal(aged, np.flatnonzero(listings["Age_of_Property"].notna().to_numpy()))
+    pd.testing.assert_frame_equal(index.take(listings, good), listings.iloc[good])
+
+
+def test_save_load_roundtrip(listings, index, tmp_path):
+    path = str(tmp_path / "filter_index.npz")
+    index.save(path, "fp")
+    loaded, meta = FilterIndex.load(path)
+    assert meta["fingerprint"] == "fp"
+    equals, ranges = {"City": index.categories["City"][0]}, {"Size_in_SqFt": (1000, 2500)}
+    np.testing.assert_array_equal(loaded.select(equals, ranges), index.select(equals, ranges))
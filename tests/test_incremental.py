@@ -0,0 +1,165 @@
+"""
+Warm-start retraining (src/models/incremental.py): the fitted preprocessing
+is kept frozen with its column layout, categories first seen in the delta
+land in an appended ``cat_ext_N`` block, and the old trees still read the
+same columns.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+import xgboost as xgb  # noqa: E402
+from sklearn.frozen import FrozenEstimator  # noqa: E402
+from sklearn.pipeline import Pipeline  # noqa: E402
+from xgboost import XGBRegressor  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models.fast_path import CompiledPipeline  # noqa: E402
+from src.models.incremental import CAT_FEATURES, NUM_FEATURES, _resize_booster, warm_start  # noqa: E402
+from src.models.preprocessing import NativeCategoricalEncoder, get_preprocessing_pipeline  # noqa: E402
+
+FEATURES = NUM_FEATURES + CAT_FEATURES
+TARGET = "Price_in_Lakhs"
+HELD_BACK = ["Pune", "Surat"]  # cities the base model never sees
+BASE_ROUNDS = 20
+
+
+def _listings(n_rows, seed, exclude=()):
+    df = build_features(make_listings(n_rows, seed=seed))
+    return df[~df["City"].isin(exclude)].reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def base():
+    df = _listings(1500, seed=1, exclude=HELD_BACK)
+    pipeline = Pipeline([
+        ("preprocessor", get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES)),
+        ("model", XGBRegressor(n_estimators=BASE_ROUNDS, max_depth=4, random_state=0)),
+    ])
+    return pipeline.fit(df[FEATURES], df[TARGET]), df
+
+
+@pytest.fixture(scope="module")
+def warm(base):
+    pipeline, _ = base
+    delta = _listings(400, seed=2)
+    new_pipeline, added = warm_start(pipeline, delta[FEATURES], delta[TARGET], n_rounds=10)
+    return new_pipeline, added, delta
+
+
+def _dense(X):
+    return X.toarray() if hasattr(X, "toarray") else np.asarray(X)
+
+
+def test_preprocessing_is_frozen_and_extended(base, warm):
+    pipeline, base_df = base
+    new_pipeline, added, delta = warm
+    old_pre = pipeline.named_steps["preprocessor"]
+    new_pre = new_pipeline.named_steps["preprocessor"]
+
+    assert added["City"] == sorted(HELD_BACK)
+    assert [name for name, _, _ in new_pre.transformers_ if name != "remainder"] == ["num", "cat", "cat_ext_1"]
+    for name in ("num", "cat"):
+        frozen = new_pre.named_transformers_[name]
+        assert isinstance(frozen, FrozenEstimator)
+        assert frozen.estimator is old_pre.named_transformers_[name]
+    assert new_pre.sparse_output_ == old_pre.sparse_output_
+
+    # Old columns keep their positions and values; the new block is empty for old rows
+    old_X = _dense(old_pre.transform(base_df[FEATURES]))
+    new_X = _dense(new_pre.transform(base_df[FEATURES]))
+    width = old_X.shape[1]
+    np.testing.assert_array_equal(new_X[:, :width], old_X)
+    assert not new_X[:, width:].any()
+
+
+def test_unseen_categories_land_in_extension_block(base, warm):
+    pipeline, _ = base
+    new_pipeline, added, delta = warm
+    old_pre = pipeline.named_steps["preprocessor"]
+    new_pre = new_pipeline.named_steps["preprocessor"]
+
+    rows = delta[delta["City"].isin(HELD_BACK)]
+    old_X = _dense(old_pre.transform(rows[FEATURES]))
+    new_X = _dense(new_pre.transform(rows[FEATURES]))
+    width = old_X.shape[1]
+
+    ext = new_pre.named_transformers_["cat_ext_1"]
+    city_block = list(ext.feature_names_in_).index("City")
+    offset = width + sum(len(c) for c in ext.categories_[:city_block])
+    cities = list(ext.categories_[city_block])
+    for i, city in enumerate(rows["City"]):
+        hot = np.flatnonzero(new_X[i, offset:offset + len(cities)] == 1.0)
+        assert [cities[j] for j in hot] == [city]
+    # Seen through the old block, the held-back cities are all-zero (unknown)
+    np.testing.assert_array_equal(new_X[:, :width], old_X)
+
+
+def test_old_trees_unchanged_and_new_rounds_added(base, warm):
+    pipeline, base_df = base
+    new_pipeline, _, delta = warm
+    old_booster = pipeline.named_steps["model"].get_booster()
+    new_booster = new_pipeline.named_steps["model"].get_booster()
+    assert new_booster.num_boosted_rounds() == BASE_ROUNDS + 10
+
+    X = base_df[FEATURES]
+    old_margin = old_booster.predict(
+        xgb.DMatrix(pipeline.named_steps["preprocessor"].transform(X)), output_margin=True
+    )
+    new_margin = new_booster.predict(
+        xgb.DMatrix(new_pipeline.named_steps["preprocessor"].transform(X)),
+        output_margin=True, iteration_range=(0, BASE_ROUNDS),
+    )
+    np.testing.assert_allclose(new_margin, old_margin, rtol=0, atol=1e-5)
+
+    # The original pipeline is left as it was
+    assert not any(isinstance(t, FrozenEstimator)
+                   for _, t, _ in pipeline.named_steps["preprocessor"].transformers_)
+    assert old_booster.num_boosted_rounds() == BASE_ROUNDS
+
+
+def test_resize_booster_keeps_predictions(base):
+    pipeline, base_df = base
+    booster = pipeline.named_steps["model"].get_booster()
+    X = _dense(pipeline.named_steps["preprocessor"].transform(base_df[FEATURES]))
+
+    resized = _resize_booster(booster, X.shape[1] + 3)
+    assert resized.num_features() == X.shape[1] + 3
+    widened = np.hstack([X, np.zeros((len(X), 3))])
+    np.testing.assert_array_equal(resized.predict(xgb.DMatrix(widened)), booster.predict(xgb.DMatrix(X)))
+    assert _resize_booster(booster, X.shape[1]) is booster
+
+
+def test_second_delta_adds_next_block_and_compiles(warm):
+    new_pipeline, _, delta = warm
+    second = build_features(make_listings(200, seed=3))
+    second["Locality"] = "Locality_new"
+    newer, added = warm_start(new_pipeline, second[FEATURES], second[TARGET], n_rounds=5)
+
+    assert added == {"Locality": ["Locality_new"]}
+    names = [name for name, _, _ in newer.named_steps["preprocessor"].transformers_ if name != "remainder"]
+    assert names == ["num", "cat", "cat_ext_1", "cat_ext_2"]
+
+    # The extended layout is still one the fast path reproduces
+    rows = pd.concat([second.head(50), delta.head(50)], ignore_index=True)
+    compiled = CompiledPipeline.from_pipeline(newer)
+    np.testing.assert_allclose(
+        compiled.predict_raw(rows[FEATURES].to_dict("records")), newer.predict(rows[FEATURES]), rtol=1e-5
+    )
+
+
+def test_native_categorical_pipeline_is_refused(base):
+    _, base_df = base
+    native = Pipeline([
+        ("preprocessor", NativeCategoricalEncoder(NUM_FEATURES, CAT_FEATURES)),
+        ("model", XGBRegressor(n_estimators=5, enable_categorical=True, tree_method="hist")),
+    ]).fit(base_df[FEATURES], base_df[TARGET])
+    with pytest.raises(ValueError, match="one-hot"):
+        warm_start(native, base_df[FEATURES], base_df[TARGET], n_rounds=1)
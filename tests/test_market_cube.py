@@ -0,0 +1,133 @@
+"""
+Market cube (src/app/market_cube.py): every KPI and chart series of a
+random filter state matches the same aggregation done with pandas on the
+listings, with and without range sliders cutting through bins.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.app.charting import histogram  # noqa: E402
+from src.app.filter_index import FilterIndex  # noqa: E402
+from src.app.market_cube import CUBE_COLUMNS, HIST_BINS, RANGE_DIMS, ROW_COLUMNS, MarketCube  # noqa: E402
+from src.data.synthetic import make_listings  # noqa: E402
+
+N_STATES = 60
+RANGE_ARGS = dict(zip(RANGE_DIMS, ("price_range", "size_range", "age_range")))
+
+
+@pytest.fixture(scope="module")
+def listings():
+    df = make_listings(5000, seed=31)[CUBE_COLUMNS]
+    df["BHK"] = df["BHK"].astype(str)
+    return df
+
+
+@pytest.fixture(scope="module")
+def cube(listings):
+    return MarketCube.build(listings)
+
+
+@pytest.fixture(scope="module")
+def index(listings):
+    return FilterIndex.build(listings)
+
+
+def _random_state(rng, cube):
+    """Query kwargs: each filter set with probability 1/2, ranges anywhere."""
+    state = {}
+    for col, arg in (("City", "city"), ("Property_Type", "property_type"), ("BHK", "bhk")):
+        state[arg] = str(rng.choice(cube.categories[col])) if rng.random() < 0.5 else "All"
+    state["good_only"] = bool(rng.random() < 0.3)
+    for col, arg in RANGE_ARGS.items():
+        if rng.random() < 0.5:
+            edges = cube.edges[col]
+            lo, hi = np.sort(rng.uniform(edges[0], edges[-1], 2))
+            state[arg] = (round(float(lo), 2), round(float(hi), 2))
+    return state
+
+
+def _matching(df, state):
+    mask = np.ones(len(df), dtype=bool)
+    for col, arg in (("City", "city"), ("Property_Type", "property_type"), ("BHK", "bhk")):
+        if state[arg] != "All":
+            mask &= df[col] == state[arg]
+    if state["good_only"]:
+        mask &= df["Good_Investment"] == 1
+    for col, arg in RANGE_ARGS.items():
+        if arg in state:
+            mask &= df[col].between(*state[arg])
+    return df[mask]
+
+
+def _assert_top(series: pd.DataFrame, key: str, value: str, expected: pd.Series, n: int = None):
+    """Series ranked by value: same values per key, and the top ``n`` values overall."""
+    got = series.set_index(key)[value]
+    np.testing.assert_allclose(got.to_numpy(), expected.reindex(got.index).to_numpy(), rtol=1e-9)
+    top = np.sort(expected.to_numpy())[::-1][:n]
+    np.testing.assert_allclose(np.sort(got.to_numpy())[::-1], top, rtol=1e-9)
+
+
+def _assert_matches_pandas(res, rows, cube, state):
+    assert res.listings == len(rows)
+    if not len(rows):
+        return
+    assert res.avg_price_lakhs == pytest.approx(rows["Price_in_Lakhs"].mean(), rel=1e-9)
+    assert res.avg_price_per_sqft == pytest.approx(rows["calc_price_per_sqft"].mean(), rel=1e-9)
+    assert res.good_rate == pytest.approx(rows["Good_Investment"].mean(), rel=1e-9)
+
+    by_city, by_type = rows.groupby("City"), rows.groupby("Property_Type")
+    _assert_top(res.city_price_per_sqft, "City", "calc_price_per_sqft", by_city["calc_price_per_sqft"].mean(), 15)
+    _assert_top(res.good_rate_by_city, "City", "Good_Investment", by_city["Good_Investment"].mean() * 100, 15)
+    _assert_top(res.good_rate_by_type, "Property_Type", "Good_Investment", by_type["Good_Investment"].mean() * 100)
+    assert res.type_counts.set_index("Property_Type")["Count"].to_dict() == by_type.size().to_dict()
+
+    # Histograms: fine bins on the stored edges, cut to a narrowed range
+    for col, hist in (("Price_in_Lakhs", res.price_hist), ("Age_of_Property", res.age_hist)):
+        edges = cube.hist_edges[col]
+        expected = histogram(rows[col].to_numpy(), bins=HIST_BINS[col], value_range=(edges[0], edges[-1]))
+        if RANGE_ARGS[col] in state:
+            lo, hi = state[RANGE_ARGS[col]]
+            expected = expected[(expected["bin_end"] >= lo) & (expected["bin_start"] <= hi)]
+        np.testing.assert_array_equal(hist["count"].to_numpy(), expected["count"].to_numpy())
+        np.testing.assert_array_equal(hist["bin_start"].to_numpy(), expected["bin_start"].to_numpy())
+
+
+def test_random_states_match_pandas(listings, cube, index):
+    rng = np.random.default_rng(0)
+    narrowed = 0
+    for _ in range(N_STATES):
+        state = _random_state(rng, cube)
+        narrowed += cube.narrows(state.get("price_range"), state.get("size_range"), state.get("age_range"))
+        res = cube.query(**state, index=index, rows=listings[ROW_COLUMNS])
+        _assert_matches_pandas(res, _matching(listings, state), cube, state)
+    assert 0 < narrowed < N_STATES  # both the cube-only and the exact path ran
+
+
+def test_without_index_a_range_takes_whole_bins(listings, cube):
+    edges = cube.edges["Price_in_Lakhs"]
+    # A range from the middle of bin 2 to the middle of bin 5: bins 3 and 4 only
+    lo, hi = (edges[2] + edges[3]) / 2, (edges[5] + edges[6]) / 2
+    res = cube.query(price_range=(lo, hi))
+    whole = listings[listings["Price_in_Lakhs"].between(edges[3], edges[5], inclusive="left")]
+    assert res.listings == len(whole)
+    assert res.price_hist["count"].sum() == len(whole)
+
+
+def test_save_load_roundtrip(listings, cube, index, tmp_path):
+    path = str(tmp_path / "market_cube.npz")
+    cube.save(path, "fp")
+    loaded, meta = MarketCube.load(path)
+    assert meta["fingerprint"] == "fp"
+    state = {"city": cube.categories["City"][0], "price_range": (50.0, 250.0)}
+    rows = listings[ROW_COLUMNS]
+    a, b = cube.query(**state, index=index, rows=rows), loaded.query(**state, index=index, rows=rows)
+    assert (a.listings, a.avg_price_lakhs) == (b.listings, b.avg_price_lakhs)
+    pd.testing.assert_frame_equal(a.price_hist, b.price_hist)
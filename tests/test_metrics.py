@@ -0,0 +1,137 @@
+"""
+Prediction metrics (src/models/metrics.py): per-request log lines, the
+Prometheus text exposition and the periodic exporter.
+"""
+import io
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.models.metrics import BUCKET_BOUNDS, MetricsExporter, PredictionMetrics, log_request  # noqa: E402
+
+SAMPLE = re.compile(r'^(\w+)\{([^}]*)\} (\S+)$')
+
+
+def _recorded():
+    """Metrics with known stage times: 3 encode (2 ms) + 1 predict (50 ms), 1 error."""
+    metrics = PredictionMetrics()
+    for rows in (1, 4, 5):
+        with metrics.request("api", rows=rows):
+            metrics.observe("encode", 0.002)
+    try:
+        with metrics.request("batch", rows=10):
+            metrics.observe("predict", 0.05)
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    metrics.count("model_loads", "native")
+    return metrics
+
+
+def _parse(text):
+    """Prometheus text -> ({metric: type}, [(name, labels, value)])."""
+    types, samples = {}, []
+    assert text.endswith("\n")
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split()
+            types[name] = kind
+            continue
+        name, labels, value = SAMPLE.match(line).groups()
+        labels = dict(re.findall(r'(\w+)="([^"]*)"', labels))
+        samples.append((name, labels, float(value)))
+    return types, samples
+
+
+def test_request_line_goes_to_the_metrics_logger(caplog):
+    metrics = PredictionMetrics()
+    with metrics.request("streamlit") as request:
+        with metrics.stage("encode"):
+            pass
+
+    with caplog.at_level(logging.INFO, logger="src.models.metrics"):
+        log_request(request)
+    [record] = caplog.records
+    assert record.name == "src.models.metrics" and record.levelno == logging.INFO
+    line = json.loads(record.getMessage())
+    assert line["event"] == "prediction_request" and line["path"] == "streamlit"
+    assert set(line["stages_ms"]) == {"encode"}
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="src.models.metrics"):
+        log_request(request)
+    assert caplog.records == []
+
+
+def test_prometheus_text():
+    types, samples = _parse(_recorded().prometheus_text())
+    assert types == {
+        "prediction_stage_seconds": "histogram",
+        "prediction_requests_total": "counter",
+        "prediction_rows_scored_total": "counter",
+        "prediction_errors_total": "counter",
+        "prediction_model_loads_total": "counter",
+    }
+    counters = {(n, tuple(sorted(l.items()))): v for n, l, v in samples if n.endswith("_total")}
+    assert counters == {
+        ("prediction_requests_total", (("path", "api"),)): 3,
+        ("prediction_requests_total", (("path", "batch"),)): 1,
+        ("prediction_rows_scored_total", (("path", "api"),)): 10,
+        ("prediction_errors_total", (("path", "batch"),)): 1,
+        ("prediction_model_loads_total", (("artifact", "native"),)): 1,
+    }
+
+    def series(suffix, path, stage):
+        return [(l.get("le"), v) for n, l, v in samples
+                if n == f"prediction_stage_seconds_{suffix}" and (l["path"], l["stage"]) == (path, stage)]
+
+    for path, stage, n, seconds in (("api", "encode", 3, 0.002), ("batch", "predict", 1, 0.05)):
+        buckets = series("bucket", path, stage)
+        # One cumulative bucket per bound plus +Inf, in order
+        assert [le for le, _ in buckets] == [f"{b:.6g}" for b in BUCKET_BOUNDS] + ["+Inf"]
+        counts = [v for _, v in buckets]
+        assert counts == sorted(counts) and counts[-1] == n
+        assert all(v == (n if float(le) >= seconds else 0) for le, v in buckets)
+        assert series("count", path, stage) == [(None, n)]
+        assert series("sum", path, stage)[0][1] == n * seconds
+    for path in ("api", "batch"):
+        assert series("count", path, "total")[0][1] == series("bucket", path, "total")[-1][1]
+
+    # Nothing recorded: just the histogram's TYPE line
+    assert PredictionMetrics().prometheus_text() == "# TYPE prediction_stage_seconds histogram\n"
+
+
+def test_exporter_writes_the_file_and_log_lines(tmp_path):
+    metrics = _recorded()
+    path = str(tmp_path / "prediction.prom")
+    stream = io.StringIO()
+    exporter = MetricsExporter(interval_s=0.01, path=path, log=True, stream=stream, metrics=metrics).start()
+    deadline = time.monotonic() + 5
+    while stream.getvalue().count("\n") < 2 and time.monotonic() < deadline:  # two periodic exports
+        time.sleep(0.005)
+    metrics.count("model_loads", "classifier")
+    exporter.stop()
+
+    # The final export on stop() sees the last update
+    with open(path) as f:
+        assert f.read() == metrics.prometheus_text()
+    assert 'prediction_model_loads_total{artifact="classifier"} 1' in metrics.prometheus_text()
+    assert os.listdir(tmp_path) == ["prediction.prom"]  # written via a temp file + rename
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(lines) >= 3 and all(line["event"] == "prediction_metrics" for line in lines)
+    assert lines[-1]["counters"]["model_loads"] == {"classifier": 1, "native": 1}
+    assert exporter.errors == 0
+
+
+def test_exporter_counts_write_errors(tmp_path):
+    exporter = MetricsExporter(path=str(tmp_path / "missing" / "prediction.prom"), metrics=_recorded())
+    exporter.export()
+    exporter.export()
+    assert exporter.errors == 2
@@ -0,0 +1,94 @@
+"""
+Out-of-core training (src/models/out_of_core.py): streaming a CSV in chunks
+that do not line up with anything fits the same preprocessor, trains the
+same model and reports the same holdout metrics as doing it in memory.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.data.synthetic import write_listings_csv  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models import out_of_core  # noqa: E402
+from src.models.incremental import prediction_metrics  # noqa: E402
+from src.models.out_of_core import CAT_FEATURES, FEATURES, NUM_FEATURES, TASKS  # noqa: E402
+from src.models.preprocessing import get_preprocessing_pipeline  # noqa: E402
+
+N_ROWS = 3000
+CHUNK_ROWS = 700  # the last chunk is short
+
+
+@pytest.fixture(scope="module")
+def csv_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("out_of_core") / "listings.csv")
+    return write_listings_csv(path, N_ROWS, chunk_rows=1000, seed=81)
+
+
+@pytest.fixture(scope="module")
+def in_memory(csv_path):
+    """All rows, and the holdout mask the chunked passes use."""
+    df = build_features(pd.read_csv(csv_path))
+    starts = range(0, N_ROWS, CHUNK_ROWS)
+    holdout = np.concatenate([
+        out_of_core.holdout_mask(min(CHUNK_ROWS, N_ROWS - start), i) for i, start in enumerate(starts)
+    ])
+    return df, holdout
+
+
+def _dense(X):
+    return X.toarray() if hasattr(X, "toarray") else X
+
+
+@pytest.mark.parametrize("task", sorted(TASKS))
+def test_matches_in_memory_training(task, csv_path, in_memory, tmp_path, monkeypatch):
+    import xgboost as xgb
+
+    monkeypatch.setattr(out_of_core, "EXTERNAL_MEMORY_DIR", str(tmp_path / "external_memory"))
+    monkeypatch.setitem(TASKS[task]["params"], "n_estimators", 20)
+    report = out_of_core.train_out_of_core(task, csv_path, chunk_rows=CHUNK_ROWS, save=False)
+    assert os.listdir(tmp_path / "external_memory") == []  # page cache removed
+
+    df, holdout = in_memory
+    target = TASKS[task]["target"]
+    train, test = df[~holdout], df[holdout]
+    assert report["train_rows"] == len(train)
+
+    # Preprocessor: streamed scaler statistics and vocabularies = a full fit
+    streamed = report["pipeline"].named_steps["preprocessor"]
+    fitted = get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES).fit(train[FEATURES])
+    scalers = [p.named_transformers_["num"].named_steps["scaler"] for p in (streamed, fitted)]
+    np.testing.assert_allclose(scalers[0].mean_, scalers[1].mean_, rtol=1e-12)
+    np.testing.assert_allclose(scalers[0].var_, scalers[1].var_, rtol=1e-12)
+    encoders = [p.named_transformers_["cat"].named_steps["onehot"] for p in (streamed, fitted)]
+    for a, b in zip(encoders[0].categories_, encoders[1].categories_):
+        np.testing.assert_array_equal(a, b)
+    np.testing.assert_allclose(
+        _dense(streamed.transform(df[FEATURES])), _dense(fitted.transform(df[FEATURES])), atol=1e-12
+    )
+
+    # Model: external-memory training = in-memory training on the same rows
+    params, n_rounds = out_of_core._booster_params(task)
+    booster = xgb.train(
+        params, xgb.QuantileDMatrix(fitted.transform(train[FEATURES]), label=train[target]), n_rounds
+    )
+    expected = booster.predict(xgb.DMatrix(fitted.transform(test[FEATURES])))
+    pipeline = report["pipeline"]
+    got = pipeline.predict_proba(test[FEATURES])[:, 1] if task == "classification" else pipeline.predict(test[FEATURES])
+    np.testing.assert_allclose(got, expected, rtol=1e-6)
+
+    for name, value in prediction_metrics(task, test[target].to_numpy(), expected).items():
+        assert report["metrics"][name] == pytest.approx(value, rel=1e-6)
+
+
+def test_holdout_mask_is_fixed_per_chunk():
+    masks = [out_of_core.holdout_mask(10_000, i) for i in range(3)]
+    np.testing.assert_array_equal(masks[0], out_of_core.holdout_mask(10_000, 0))
+    assert not np.array_equal(masks[0], masks[1])  # chunks are not split alike
+    assert all(abs(m.mean() - out_of_core.DEFAULT_HOLDOUT_FRAC) < 0.02 for m in masks)
@@ -0,0 +1,59 @@
+"""
+Multi-process scoring (src/models/predict.py ``predict_properties_parallel``):
+sharded results come back complete, in input order and identical to one
+``predict_properties_batch`` call.
+"""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.models import predict  # noqa: E402
+from src.models.predict import ALL_FEATURES  # noqa: E402
+
+SHARD_SIZE = 64
+
+
+@pytest.fixture(scope="module")
+def frame():
+    # A shuffled, non-contiguous index: shards must be put back by position
+    df = make_listings(300, seed=13)[ALL_FEATURES]
+    return df.sample(frac=1.0, random_state=0).set_index(pd.Index(range(1000, 1300)))
+
+
+@pytest.fixture(scope="module")
+def expected(frame):
+    return predict.predict_properties_batch(frame)
+
+
+def test_process_pool_matches_batch(frame, expected):
+    result = predict.predict_properties_parallel(frame, n_workers=2, shard_size=SHARD_SIZE)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_shared_executor_and_records(frame, expected):
+    records = frame.to_dict("records")
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        result = predict.predict_properties_parallel(records, shard_size=SHARD_SIZE, executor=pool)
+    pd.testing.assert_frame_equal(result, predict.predict_properties_batch(records))
+    assert result["predicted_price_lakhs"].tolist() == expected["predicted_price_lakhs"].tolist()
+
+
+def test_small_batches_skip_the_pool(frame, expected, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("pool created for a single shard")
+
+    monkeypatch.setattr(predict, "make_scoring_pool", no_pool)
+    pd.testing.assert_frame_equal(
+        predict.predict_properties_parallel(frame, shard_size=len(frame)), expected
+    )
+    pd.testing.assert_frame_equal(
+        predict.predict_properties_parallel(frame, n_workers=1, shard_size=SHARD_SIZE), expected
+    )
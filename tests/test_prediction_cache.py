@@ -0,0 +1,161 @@
+"""
+PredictionCache (src/models/cache.py): key normalisation, TTL, LRU eviction
+and the invalidation rules that keep results from an older model version
+out of the cache.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import pytest  # noqa: E402
+
+from src.models import cache as cache_module  # noqa: E402
+from src.models.cache import PredictionCache  # noqa: E402
+
+NUM = ["Size_in_SqFt", "calc_price_per_sqft", "Annual_Growth_Rate"]
+CAT = ["City", "BHK"]
+BASE = {"Size_in_SqFt": 1200, "calc_price_per_sqft": 5000.0, "Annual_Growth_Rate": 0.08,
+        "City": "Pune", "BHK": 3}
+RESULT = {"good_investment_label": 1, "good_investment_prob": 0.9, "predicted_price_lakhs": 60.0}
+
+
+class Clock:
+    """Stand-in for time.monotonic inside src.models.cache."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def _cache(**kwargs):
+    return PredictionCache(NUM, CAT, **kwargs)
+
+
+# -------------------------------------------------------------------
+# Keys
+# -------------------------------------------------------------------
+def test_make_key_rounds_listed_floats():
+    cache = _cache()
+    key = cache.make_key(BASE)
+    # Within the configured precision (2 and 4 decimals): same entry
+    assert cache.make_key(dict(BASE, calc_price_per_sqft=5000.004)) == key
+    assert cache.make_key(dict(BASE, Annual_Growth_Rate=0.080049)) == key
+    # Beyond it: a different entry
+    assert cache.make_key(dict(BASE, calc_price_per_sqft=5000.01)) != key
+    assert cache.make_key(dict(BASE, Annual_Growth_Rate=0.0801)) != key
+    # Features without a precision are used as-is
+    assert cache.make_key(dict(BASE, Size_in_SqFt=1200.0001)) != key
+
+
+def test_make_key_normalises_like_build_features():
+    cache = _cache()
+    key = cache.make_key(BASE)
+    assert cache.make_key(dict(BASE, Size_in_SqFt="1200", BHK="3")) == key
+    assert cache.make_key(dict(BASE, extra="ignored")) == key
+    # Unparseable and NaN numerics both become missing
+    assert (cache.make_key(dict(BASE, Size_in_SqFt="n/a"))
+            == cache.make_key(dict(BASE, Size_in_SqFt=float("nan"))))
+
+
+# -------------------------------------------------------------------
+# TTL / LRU
+# -------------------------------------------------------------------
+def test_ttl_expiry(clock):
+    cache = _cache(ttl_seconds=10)
+    cache.put("k", RESULT)
+
+    clock.now += 10
+    assert cache.get("k") == RESULT
+    clock.now += 0.5
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction():
+    cache = _cache(maxsize=2)
+    cache.put("a", RESULT)
+    cache.put("b", RESULT)
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", RESULT)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_get_returns_a_copy():
+    cache = _cache()
+    cache.put("k", RESULT)
+    cache.get("k")["good_investment_prob"] = 0.0
+    assert cache.get("k") == RESULT
+
+
+# -------------------------------------------------------------------
+# Invalidation
+# -------------------------------------------------------------------
+def test_generation_bump_drops_entries_and_stale_puts():
+    cache = _cache()
+    cache.put("old", RESULT, generation=0)
+    cache.set_generation(1)
+
+    assert cache.get("old") is None
+    # A request that started on generation 0 finishes after the swap
+    cache.put("late", RESULT, generation=0)
+    assert cache.get("late") is None
+    cache.put("new", RESULT, generation=1)
+    assert cache.get("new") == RESULT
+    # Going back is a no-op
+    cache.set_generation(0)
+    assert cache.get("new") == RESULT
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_artifact_change_drops_entries(tmp_path):
+    path = tmp_path / "classifier_pipeline.pkl"
+    path.write_bytes(b"v1")
+    cache = _cache(artifact_paths=[str(path)], check_interval_s=0)
+    cache.put("k", RESULT)
+
+    assert cache.check_artifacts() is False
+    assert cache.get("k") == RESULT
+
+    path.write_bytes(b"version 2")
+    assert cache.check_artifacts() is True
+    assert cache.get("k") is None
+    assert cache.check_artifacts() is False  # reported once
+
+    path.unlink()  # a removed artifact is a change too
+    assert cache.check_artifacts() is True
+
+
+def test_artifact_checks_are_throttled(tmp_path, clock):
+    path = tmp_path / "regression_pipeline.pkl"
+    path.write_bytes(b"v1")
+    cache = _cache(artifact_paths=[str(path)], check_interval_s=5)
+    cache.put("k", RESULT)
+    path.write_bytes(b"version 2")
+
+    assert cache.check_artifacts() is False  # within the interval: no stat
+    assert cache.get("k") == RESULT
+    assert cache.check_artifacts(force=True) is True
+
+    cache.put("k", RESULT)
+    path.write_bytes(b"version three")
+    clock.now += 4.9
+    assert cache.check_artifacts() is False
+    clock.now += 0.2
+    assert cache.check_artifacts() is True
+    assert cache.get("k") is None
@@ -0,0 +1,108 @@
+"""
+Native categorical preprocessing (src/models/preprocessing.py): the
+fixed-vocabulary encoder gives the same category codes for string and
+categorical input, survives pickling, and a native-categorical model scores
+the same through the pipeline and through its compiled export.
+"""
+import os
+import pickle
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models.fast_path import CompiledPipeline, export_pipeline  # noqa: E402
+from src.models.predict import ALL_FEATURES, CAT_FEATURES, NUM_FEATURES  # noqa: E402
+from src.models.preprocessing import NativeCategoricalEncoder, get_model_preprocessor  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def train():
+    df = make_listings(1500, seed=71)
+    return build_features(df[df["City"] != "Pune"])
+
+
+@pytest.fixture(scope="module")
+def encoder(train):
+    return NativeCategoricalEncoder(NUM_FEATURES, CAT_FEATURES).fit(train[ALL_FEATURES])
+
+
+@pytest.fixture(scope="module")
+def unseen():
+    """Rows with a city and a BHK value outside the fitted vocabulary."""
+    df = build_features(make_listings(200, seed=72))
+    df.loc[df.index[:5], "BHK"] = "9"
+    return df
+
+
+def test_codes_round_trip_to_the_input(encoder, train, unseen):
+    for df in (train, unseen):
+        out = encoder.transform(df[ALL_FEATURES])
+        assert list(out.columns) == list(encoder.get_feature_names_out())
+        for col in NUM_FEATURES:
+            assert out[col].dtype == np.float64
+            np.testing.assert_array_equal(out[col].to_numpy(), df[col].to_numpy(dtype=np.float64))
+        for col, cats in zip(CAT_FEATURES, encoder.categories_):
+            assert list(out[col].cat.categories) == cats
+            known = df[col].astype(str).isin(cats)
+            # Known values decode to themselves; anything else is missing
+            assert out[col][known].astype(str).tolist() == df[col][known].astype(str).tolist()
+            assert out[col][~known].isna().all()
+    assert "Pune" not in encoder.categories_[CAT_FEATURES.index("City")]
+    assert unseen["City"].eq("Pune").any()
+
+
+def test_categorical_input_gets_the_same_codes(encoder, unseen):
+    strings = unseen[ALL_FEATURES]
+    # Categoricals with their own (reversed, partly unseen) category order,
+    # and BHK as integers the way the Arrow cache may hold them
+    categorical = strings.copy()
+    for col in CAT_FEATURES:
+        cats = sorted(strings[col].astype(str).unique(), reverse=True)
+        categorical[col] = pd.Categorical(strings[col].astype(str), categories=cats)
+    categorical["BHK"] = pd.Categorical(strings["BHK"].astype(int))
+
+    a, b = encoder.transform(strings), encoder.transform(categorical)
+    for col in CAT_FEATURES:
+        np.testing.assert_array_equal(a[col].cat.codes.to_numpy(), b[col].cat.codes.to_numpy())
+
+
+def test_pickled_encoder_transforms_identically(encoder, unseen):
+    loaded = pickle.loads(pickle.dumps(encoder))
+    assert loaded.categories_ == encoder.categories_
+    pd.testing.assert_frame_equal(loaded.transform(unseen[ALL_FEATURES]), encoder.transform(unseen[ALL_FEATURES]))
+    with pytest.raises(ValueError, match="Unknown categorical mode"):
+        get_model_preprocessor(NUM_FEATURES, CAT_FEATURES, categorical="ordinal")
+
+
+def test_native_model_round_trips_through_the_export(train, unseen, tmp_path):
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBRegressor
+
+    from src.models.preprocessing import xgb_categorical_params
+
+    pipeline = Pipeline([
+        ("preprocessor", get_model_preprocessor(NUM_FEATURES, CAT_FEATURES, categorical="native")),
+        ("model", XGBRegressor(n_estimators=20, max_depth=4, random_state=0, **xgb_categorical_params("native"))),
+    ])
+    pipeline.fit(train[ALL_FEATURES], train["Price_in_Lakhs"])
+    expected = pipeline.predict(unseen[ALL_FEATURES])
+
+    records = unseen[ALL_FEATURES].to_dict("records")
+    compiled = CompiledPipeline.from_pipeline(pipeline)
+    assert compiled.native_categorical
+    np.testing.assert_array_equal(compiled.predict_raw(records), expected)
+
+    export_pipeline(pipeline, str(tmp_path), "regressor")
+    loaded = CompiledPipeline.load(str(tmp_path), "regressor")
+    np.testing.assert_array_equal(loaded.predict_raw(records), expected)
+    np.testing.assert_array_equal(
+        pickle.loads(pickle.dumps(pipeline)).predict(unseen[ALL_FEATURES]), expected
+    )
@@ -0,0 +1,201 @@
+"""
+Model registry (src/models/registry.py) and hot swap (src/models/predict.py):
+register / promote versions in a temporary models/ directory, swap the live
+ModelSet while requests keep using the old one, and keep the current set
+when the new version fails to load.
+"""
+import os
+import sys
+import threading
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models import predict, registry  # noqa: E402
+from src.models.fast_path import file_sha256  # noqa: E402
+from src.models.predict import ALL_FEATURES, CAT_FEATURES, NUM_FEATURES  # noqa: E402
+
+
+def _fit(name: str, n_estimators: int):
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBClassifier, XGBRegressor
+
+    from src.models.preprocessing import get_preprocessing_pipeline
+
+    df = build_features(make_listings(1000, seed=5))
+    if name == "classifier":
+        model, target = XGBClassifier(n_estimators=n_estimators, max_depth=3), "Good_Investment"
+    else:
+        model, target = XGBRegressor(n_estimators=n_estimators, max_depth=3), "Price_in_Lakhs"
+    pipeline = Pipeline([
+        ("preprocessor", get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES)),
+        ("model", model),
+    ])
+    return pipeline.fit(df[ALL_FEATURES], df[target])
+
+
+@pytest.fixture(scope="module")
+def pipelines():
+    """{version label: {name: fitted pipeline}}; v1 and v2 differ in size."""
+    return {
+        label: {name: _fit(name, n) for name in registry.MODEL_NAMES}
+        for label, n in (("v1", 5), ("v2", 15))
+    }
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    path = tmp_path / "models"
+    path.mkdir()
+    return str(path)
+
+
+@pytest.fixture
+def versions(models_dir, pipelines):
+    """{label: {name: registered version id}} in ``models_dir``."""
+    return {
+        label: {
+            name: os.path.basename(registry.register(pipeline, name, {"label": label}, models_dir))
+            for name, pipeline in by_name.items()
+        }
+        for label, by_name in pipelines.items()
+    }
+
+
+@pytest.fixture
+def live(monkeypatch, models_dir):
+    """Point predict's live-model lookup at ``models_dir`` with no set loaded yet."""
+    live_sources = predict._live_sources
+    monkeypatch.setattr(predict, "_live_sources", lambda: live_sources(models_dir))
+    monkeypatch.setattr(predict, "_models", None)
+
+
+@pytest.fixture
+def records():
+    return make_listings(50, seed=9)[ALL_FEATURES].to_dict("records")
+
+
+def _expected(pipelines, label, records):
+    X = build_features(pd.DataFrame(records))[ALL_FEATURES]
+    return (pipelines[label]["classifier"].predict_proba(X)[:, 1],
+            pipelines[label]["regression"].predict(X))
+
+
+# -------------------------------------------------------------------
+# Register / promote
+# -------------------------------------------------------------------
+def test_register_is_content_addressed(models_dir, pipelines, versions):
+    assert versions["v1"]["classifier"] != versions["v2"]["classifier"]
+    again = registry.register(pipelines["v1"]["classifier"], "classifier", models_dir=models_dir)
+    assert os.path.basename(again) == versions["v1"]["classifier"]
+
+    listed = registry.list_versions("classifier", models_dir)
+    assert {m["version"] for m in listed} == {versions["v1"]["classifier"], versions["v2"]["classifier"]}
+    assert {m["label"] for m in listed} == {"v1", "v2"}
+    for m in listed:
+        directory = registry.version_dir("classifier", m["version"], models_dir)
+        assert file_sha256(os.path.join(directory, "classifier_pipeline.pkl")) == m["sha256"]
+
+
+def test_promote_copies_artifacts_and_updates_index(models_dir, versions):
+    assert registry.current_versions(models_dir) == {}
+    registry.promote_versions(versions["v1"], models_dir)
+    registry.promote("classifier", versions["v2"]["classifier"], models_dir)
+
+    current = registry.current_versions(models_dir)
+    assert current == {"classifier": versions["v2"]["classifier"], "regression": versions["v1"]["regression"]}
+    for name, version in current.items():
+        pkl = f"{name}_pipeline.pkl"
+        assert file_sha256(os.path.join(models_dir, pkl)) == file_sha256(
+            os.path.join(registry.version_dir(name, version, models_dir), pkl)
+        )
+    assert len(registry.read_index(models_dir)["history"]) == 3
+
+    with pytest.raises(FileNotFoundError):
+        registry.promote("classifier", "0" * registry.VERSION_LENGTH, models_dir)
+    assert registry.current_versions(models_dir) == current
+
+
+# -------------------------------------------------------------------
+# Hot swap
+# -------------------------------------------------------------------
+def test_reload_swaps_atomically_while_old_set_serves(live, models_dir, pipelines, versions, records):
+    registry.promote_versions(versions["v1"], models_dir)
+    old = predict.current_models()
+    assert old.versions == versions["v1"]
+    predict.predict_properties_batch(records, models=old)  # loads the v1 pipelines
+
+    assert predict.reload_models() is False  # nothing changed
+    registry.promote_versions(versions["v2"], models_dir)
+
+    # Requests take one reference and use it throughout: every set observed
+    # during the swap is entirely v1 or entirely v2 and scores like it
+    observed, stop = [], threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            models = predict.current_models()
+            observed.append((models.versions, predict.predict_properties_batch(records, models=models)))
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    try:
+        assert predict.reload_models() is True
+    finally:
+        stop.set()
+        thread.join()
+
+    assert observed
+    new = predict.current_models()
+    assert new is not old and new.generation > old.generation
+    assert new.versions == versions["v2"]
+    assert predict.get_prediction_cache().generation == new.generation
+
+    expected = {label: _expected(pipelines, label, records) for label in ("v1", "v2")}
+    for seen_versions, preds in observed + [(old.versions, predict.predict_properties_batch(records, models=old))]:
+        label = "v1" if seen_versions == versions["v1"] else "v2"
+        assert seen_versions == versions[label]
+        prob, price = expected[label]
+        np.testing.assert_allclose(preds["good_investment_prob"], prob, rtol=1e-6)
+        np.testing.assert_allclose(preds["predicted_price_lakhs"], price, rtol=1e-6)
+
+
+def test_failed_load_keeps_current_set(live, models_dir, pipelines, versions, records):
+    registry.promote_versions(versions["v1"], models_dir)
+    old = predict.current_models()
+    predict.predict_properties_batch(records, models=old)
+    generation = predict.get_prediction_cache().generation
+
+    # v2's pickle is damaged after registration (e.g. a bad copy)
+    broken_dir = registry.version_dir("classifier", versions["v2"]["classifier"], models_dir)
+    with open(os.path.join(broken_dir, "classifier_pipeline.pkl"), "wb") as f:
+        f.write(b"not a pickle")
+    registry.promote("classifier", versions["v2"]["classifier"], models_dir)
+
+    with pytest.raises(KeyError):  # how joblib.load reports a non-pickle
+        predict.reload_models()
+    assert predict.current_models() is old
+    assert predict.get_prediction_cache().generation == generation
+
+    prob, price = _expected(pipelines, "v1", records)
+    preds = predict.predict_properties_batch(records)
+    np.testing.assert_allclose(preds["good_investment_prob"], prob, rtol=1e-6)
+
+    # The watcher counts the failure, keeps the set and retries next poll
+    watcher = predict.ModelWatcher(interval_s=0.01).start()
+    try:
+        for _ in range(200):
+            if watcher.errors:
+                break
+            threading.Event().wait(0.01)
+    finally:
+        watcher.stop()
+    assert watcher.errors >= 1 and watcher.reloads == 0
+    assert predict.current_models() is old
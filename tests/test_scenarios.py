@@ -0,0 +1,123 @@
+"""
+What-if sweeps (src/models/scenarios.py): every cell of a scenario grid
+matches scoring that one setting the way the app does, on the compiled fast
+path (shared or separate encodings) and on the pipeline fallback.
+"""
+import math
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models import registry, train_joint  # noqa: E402
+from src.models.predict import ALL_FEATURES, CAT_FEATURES, NUM_FEATURES, ModelSet  # noqa: E402
+from src.models.scenarios import scenario_grid  # noqa: E402
+
+PRICES = [80.0, 150.0, 260.0]
+GROWTH_PCT = [5.0, 7.5, 11.0]
+HORIZONS = [3, 5, 10]
+
+
+def _separate_pipelines(df):
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBClassifier, XGBRegressor
+
+    from src.models.preprocessing import get_preprocessing_pipeline
+
+    pipelines = {}
+    for name, model, target, rows in (
+        ("classifier", XGBClassifier(n_estimators=20, max_depth=4), "Good_Investment", df.iloc[::2]),
+        ("regression", XGBRegressor(n_estimators=20, max_depth=4), "Price_in_Lakhs", df.iloc[1::2]),
+    ):
+        pipeline = Pipeline([("preprocessor", get_preprocessing_pipeline(NUM_FEATURES, CAT_FEATURES)), ("model", model)])
+        pipelines[name] = pipeline.fit(rows[ALL_FEATURES], rows[target])
+    return pipelines
+
+
+@pytest.fixture(scope="module", params=["joint", "separate"])
+def pipelines(request):
+    df = build_features(make_listings(1500, seed=91))
+    if request.param == "separate":
+        return _separate_pipelines(df)
+    with pytest.MonkeyPatch.context() as m:
+        m.setitem(train_joint.CLASSIFIER_PARAMS, "n_estimators", 20)
+        m.setitem(train_joint.REGRESSOR_PARAMS, "n_estimators", 20)
+        clf, reg, _, _ = train_joint.fit_joint(df, n_threads=1)
+    return {"classifier": clf, "regression": reg}
+
+
+@pytest.fixture(scope="module")
+def models(pipelines, tmp_path_factory):
+    models_dir = str(tmp_path_factory.mktemp("models"))
+    return ModelSet({
+        name: registry.register(pipeline, name, {}, models_dir) for name, pipeline in pipelines.items()
+    })
+
+
+@pytest.fixture(scope="module")
+def features():
+    return make_listings(1, seed=92)[ALL_FEATURES].iloc[0].to_dict()
+
+
+def _pointwise(pipelines, features, price_lakhs, growth_pct, horizon_years):
+    """One setting, derived and scored as Property_Investment_Advisor.py does."""
+    size_sqft = features["Size_in_SqFt"]
+    annual_growth_rate = growth_pct / 100.0
+    row = dict(
+        features,
+        calc_price_per_sqft=(price_lakhs * 100000) / size_sqft,
+        Annual_Growth_Rate=annual_growth_rate,
+        Future_Price_5Y=price_lakhs * math.pow(1 + annual_growth_rate, horizon_years),
+    )
+    X = build_features(pd.DataFrame([row]))[ALL_FEATURES]
+    return pipelines["classifier"].predict_proba(X)[0, 1], pipelines["regression"].predict(X)[0]
+
+
+def _assert_matches_pointwise(grid, pipelines, features):
+    assert grid.good_prob.shape == grid.predicted_price.shape == (len(PRICES), len(GROWTH_PCT), len(HORIZONS))
+    for i, price in enumerate(PRICES):
+        for j, growth in enumerate(GROWTH_PCT):
+            for k, horizon in enumerate(HORIZONS):
+                prob, fair_price = _pointwise(pipelines, features, price, growth, horizon)
+                assert grid.good_prob[i, j, k] == pytest.approx(prob, rel=1e-6)
+                assert grid.predicted_price[i, j, k] == pytest.approx(fair_price, rel=1e-6)
+
+
+def test_compiled_grid_matches_pointwise(models, pipelines, features):
+    assert models.compiled() is not None
+    assert models.encoding_is_shared() == (pipelines["classifier"][0] is pipelines["regression"][0])
+    grid = scenario_grid(features, PRICES, GROWTH_PCT, HORIZONS, models=models)
+    _assert_matches_pointwise(grid, pipelines, features)
+
+
+def test_pipeline_fallback_matches_pointwise(models, pipelines, features, monkeypatch):
+    monkeypatch.setattr(models, "compiled", lambda: None)
+    grid = scenario_grid(features, PRICES, GROWTH_PCT, HORIZONS, models=models)
+    _assert_matches_pointwise(grid, pipelines, features)
+
+
+def test_frame_and_default_axes(models, features):
+    grid = scenario_grid(features, price_lakhs=200.0, models=models)
+    frame = grid.frame()
+    assert len(frame) == grid.good_prob.size
+    # Row order is C order over (price, growth, horizon)
+    for i, j, k in [(0, 0, 0), (3, 7, 2), (16, 14, 7)]:
+        row = frame.iloc[np.ravel_multi_index((i, j, k), grid.good_prob.shape)]
+        assert (row["asking_price_lakhs"], row["growth_pct"], row["horizon_years"]) == (
+            grid.prices[i], grid.growth_pct[j], grid.horizons[k]
+        )
+        assert row["good_investment_prob"] == grid.good_prob[i, j, k]
+        assert row["valuation_gap_lakhs"] == grid.predicted_price[i, j, k] - grid.prices[i]
+
+    with pytest.raises(ValueError, match="prices or price_lakhs"):
+        scenario_grid(features, models=models)
+    with pytest.raises(ValueError, match="Size_in_SqFt"):
+        scenario_grid(dict(features, Size_in_SqFt=0), price_lakhs=200.0, models=models)
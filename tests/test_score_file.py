@@ -0,0 +1,99 @@
+"""
+Streaming bulk scoring (src/models/predict.py ``score_file``): a run that is
+interrupted after some chunks and resumed writes the same output as one
+uninterrupted run, and parts from a different input are never reused.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.models import predict  # noqa: E402
+
+N_ROWS = 1000
+CHUNK_SIZE = 128  # 8 chunks, the last one partial
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def input_csv(tmp_path):
+    path = str(tmp_path / "listings.csv")
+    make_listings(N_ROWS, seed=4).to_csv(path, index=False)
+    return path
+
+
+def _interrupt_after(monkeypatch, n_chunks):
+    """Make predict_properties_batch fail once ``n_chunks`` chunks were scored."""
+    score = predict.predict_properties_batch
+    calls = []
+
+    def flaky(chunk, **kwargs):
+        if len(calls) == n_chunks:
+            raise Interrupted()
+        calls.append(len(chunk))
+        return score(chunk, **kwargs)
+
+    monkeypatch.setattr(predict, "predict_properties_batch", flaky)
+    return calls
+
+
+def _read(path):
+    return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".csv"])
+def test_resume_matches_single_pass(tmp_path, monkeypatch, input_csv, suffix):
+    expected_path = str(tmp_path / f"single{suffix}")
+    assert predict.score_file(input_csv, expected_path, chunk_size=CHUNK_SIZE) == N_ROWS
+
+    output_path = str(tmp_path / f"resumed{suffix}")
+    parts_dir = output_path + ".parts"
+    with monkeypatch.context() as m:
+        _interrupt_after(m, 3)
+        with pytest.raises(Interrupted):
+            predict.score_file(input_csv, output_path, chunk_size=CHUNK_SIZE)
+    assert sorted(f for f in os.listdir(parts_dir) if f.endswith(".parquet")) == [
+        "part-00000.parquet", "part-00001.parquet", "part-00002.parquet",
+    ]
+    assert not os.path.exists(output_path)
+
+    with monkeypatch.context() as m:
+        calls = _interrupt_after(m, 100)
+        assert predict.score_file(input_csv, output_path, chunk_size=CHUNK_SIZE, resume=True) == N_ROWS
+    assert len(calls) == 5  # only the chunks the first run did not finish
+    assert not os.path.exists(parts_dir)
+
+    pd.testing.assert_frame_equal(_read(output_path), _read(expected_path))
+
+
+def test_changed_input_or_chunk_size_invalidates_parts(tmp_path, monkeypatch, input_csv):
+    output_path = str(tmp_path / "scored.parquet")
+    with monkeypatch.context() as m:
+        _interrupt_after(m, 2)
+        with pytest.raises(Interrupted):
+            predict.score_file(input_csv, output_path, chunk_size=CHUNK_SIZE)
+
+    with pytest.raises(ValueError, match="Cannot resume"):
+        predict.score_file(input_csv, output_path, chunk_size=CHUNK_SIZE * 2, resume=True)
+
+    # Same path, different listings
+    make_listings(N_ROWS, seed=5).to_csv(input_csv, index=False)
+    with pytest.raises(ValueError, match="Cannot resume"):
+        predict.score_file(input_csv, output_path, chunk_size=CHUNK_SIZE, resume=True)
+
+    # Without --resume the stale parts are discarded and everything is rescored
+    with monkeypatch.context() as m:
+        calls = _interrupt_after(m, 100)
+        predict.score_file(input_csv, output_path, chunk_size=CHUNK_SIZE)
+    assert len(calls) == 8
+    scored = pd.read_parquet(output_path)
+    pd.testing.assert_series_equal(scored["City"], pd.read_csv(input_csv)["City"])
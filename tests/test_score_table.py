@@ -0,0 +1,93 @@
+"""
+Score table persistence (src/app/score_table.py): a rebuild never disturbs
+the table the dashboard already has open, a failed save leaves the current
+table in place, and only a current table is opened.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from src.app import score_table  # noqa: E402
+from src.app.score_table import CURRENT_FILENAME, ScoreTable  # noqa: E402
+from src.data.synthetic import make_listings  # noqa: E402
+
+
+def _table(seed):
+    """Table over synthetic listings with random scores (no model needed)."""
+    df = make_listings(3000, seed=seed)
+    rng = np.random.default_rng(seed)
+    df["good_investment_prob"] = rng.random(len(df))
+    df["good_investment_label"] = (df["good_investment_prob"] > 0.5).astype(int)
+    df["predicted_price_lakhs"] = df["Price_in_Lakhs"] * rng.uniform(0.7, 1.3, len(df))
+    return ScoreTable.build(df)
+
+
+def _versions(path):
+    return sorted(e for e in os.listdir(path) if e.startswith("v-"))
+
+
+def test_rebuild_keeps_open_table_readable(tmp_path):
+    path = str(tmp_path / "score_table")
+    first = _table(1)
+    first.save(path, "one")
+    opened, meta = ScoreTable.load(path)
+    assert meta["fingerprint"] == "one"
+    before = opened.ranked("undervalued", city="Pune")
+    pd.testing.assert_frame_equal(before, first.ranked("undervalued", city="Pune"))
+
+    _table(2).save(path, "two")
+    pd.testing.assert_frame_equal(opened.ranked("undervalued", city="Pune"), before)
+    assert ScoreTable.load(path)[1]["fingerprint"] == "two"
+
+    _table(3).save(path, "three")
+    assert len(_versions(path)) == 2
+    with open(os.path.join(path, CURRENT_FILENAME)) as f:
+        assert f.read() in _versions(path)
+    assert ScoreTable.load(path)[1]["fingerprint"] == "three"
+
+
+def test_failed_save_keeps_current(tmp_path, monkeypatch):
+    path = str(tmp_path / "score_table")
+    table = _table(1)
+    table.save(path, "one")
+
+    real_save = np.save
+
+    def fail_on_rankings(file, arr, *args, **kwargs):
+        if os.path.basename(str(file)).startswith("top_"):
+            raise OSError("disk full")
+        return real_save(file, arr, *args, **kwargs)
+
+    monkeypatch.setattr(score_table.np, "save", fail_on_rankings)
+    with pytest.raises(OSError, match="disk full"):
+        _table(2).save(path, "two")
+    monkeypatch.undo()
+
+    opened, meta = ScoreTable.load(path)
+    assert meta["fingerprint"] == "one"
+    pd.testing.assert_frame_equal(opened.ranked("good_investment"), table.ranked("good_investment"))
+    assert [e for e in os.listdir(path) if e.startswith(".")] == []
+
+
+def test_open_score_table_needs_a_current_table(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path)
+    monkeypatch.setattr(score_table, "_table_fingerprint", lambda csv_path, cache_dir, versions: versions["tag"])
+    assert score_table.open_score_table("unused.csv", cache_dir, {"tag": "one"}) is None
+
+    # A table in the flat pre-pointer layout is not opened, and is replaced
+    flat = tmp_path / "score_table"
+    flat.mkdir()
+    (flat / "meta.json").write_text('{"fingerprint": "one"}')
+    assert score_table.open_score_table("unused.csv", cache_dir, {"tag": "one"}) is None
+
+    _table(1).save(str(flat), "one")
+    assert sorted(os.listdir(flat)) == [CURRENT_FILENAME] + _versions(str(flat))
+    assert score_table.open_score_table("unused.csv", cache_dir, {"tag": "one"}) is not None
+    assert score_table.open_score_table("unused.csv", cache_dir, {"tag": "two"}) is None
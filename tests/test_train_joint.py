@@ -0,0 +1,67 @@
+"""
+Joint training (src/models/train_joint.py): one split stratified on the
+classification label serves both heads, the classifier sees the same split
+as train_classification.py, and both pipelines share one preprocessor.
+"""
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+from sklearn.model_selection import train_test_split  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.features.build_features import build_features  # noqa: E402
+from src.models import train_joint  # noqa: E402
+from src.models.train_joint import CAT_FEATURES, CLASSIFICATION_TARGET, NUM_FEATURES, REGRESSION_TARGET  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def listings():
+    df = make_listings(1500, seed=51)
+    # Imbalanced label: an unstratified 20% split would drift from 10%
+    rng = np.random.default_rng(0)
+    df[CLASSIFICATION_TARGET] = (rng.random(len(df)) < 0.1).astype(int)
+    return df
+
+
+@pytest.fixture(scope="module")
+def fitted(listings):
+    with pytest.MonkeyPatch.context() as m:
+        m.setitem(train_joint.CLASSIFIER_PARAMS, "n_estimators", 20)
+        m.setitem(train_joint.REGRESSOR_PARAMS, "n_estimators", 20)
+        return {n: train_joint.fit_joint(listings, n_threads=n) for n in (1, 2)}
+
+
+def test_split_is_stratified_and_shared(listings, fitted):
+    clf, reg, split, _ = fitted[1]
+    X_test = split["X_test"]
+    y = listings[CLASSIFICATION_TARGET]
+
+    assert len(X_test) == len(listings) // 5
+    # Stratified: the test positives are the overall rate to within one row
+    assert abs(split["y_clf_test"].sum() - y.mean() * len(X_test)) <= 1
+    # The same rows as train_classification.py's split
+    features = build_features(listings)
+    _, expected_test = train_test_split(
+        features[NUM_FEATURES + CAT_FEATURES], test_size=0.2, random_state=42, stratify=features[CLASSIFICATION_TARGET]
+    )
+    assert list(X_test.index) == list(expected_test.index)
+    # Both targets belong to the test rows
+    pd.testing.assert_series_equal(split["y_clf_test"], listings.loc[X_test.index, CLASSIFICATION_TARGET])
+    pd.testing.assert_series_equal(split["y_reg_test"], listings.loc[X_test.index, REGRESSION_TARGET])
+
+    assert clf.named_steps["preprocessor"] is reg.named_steps["preprocessor"]
+    assert clf.named_steps["model"].get_params()["n_jobs"] == -1
+
+
+def test_concurrent_fit_matches_sequential(fitted):
+    (clf_1, reg_1, split, _), (clf_2, reg_2, _, _) = fitted[1], fitted[2]
+    X_test = split["X_test"]
+    np.testing.assert_array_equal(clf_1.predict_proba(X_test), clf_2.predict_proba(X_test))
+    np.testing.assert_array_equal(reg_1.predict(X_test), reg_2.predict(X_test))
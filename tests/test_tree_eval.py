@@ -0,0 +1,132 @@
+"""
+TreeEnsemble (src/models/tree_eval.py) against Booster.inplace_predict on
+small boosters trained here, so the layouts the node tables have to handle
+are known to occur: missing values sent both ways and leaves above the
+bottom level.
+"""
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+import xgboost as xgb  # noqa: E402
+
+from src.models.tree_eval import TreeEnsemble, _node_depths  # noqa: E402
+
+N_ROWS = 2000
+N_FEATURES = 6
+
+
+def _data(seed=0):
+    """Rows whose targets depend on missingness, so splits learn both default directions."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(N_ROWS, N_FEATURES)).astype(np.float32)
+    y_reg = 3 * X[:, 0] + np.where(X[:, 1] > 0, 2.0, -1.0) + rng.normal(scale=0.1, size=N_ROWS)
+    # Missing x0 behaves like a large value, missing x1 like a small one
+    X[rng.random(N_ROWS) < 0.2, 0] = np.nan
+    X[rng.random(N_ROWS) < 0.2, 1] = np.nan
+    y_reg = np.where(np.isnan(X[:, 0]), y_reg + 5, y_reg)
+    y_reg = np.where(np.isnan(X[:, 1]), y_reg - 5, y_reg)
+    return X, y_reg.astype(np.float32), (y_reg > np.median(y_reg)).astype(np.float32)
+
+
+def _train(X, y, objective, **params):
+    params = dict(dict(objective=objective, max_depth=5, eta=0.3), **params)
+    return xgb.train(params, xgb.DMatrix(X, label=y, missing=np.nan), num_boost_round=30)
+
+
+def _rows_with_missing(X):
+    """The training rows plus all-missing and single-missing rows."""
+    extra = np.tile(X[:4], (N_FEATURES + 1, 1))
+    for j in range(N_FEATURES):
+        extra[4 * j:4 * j + 4, j] = np.nan
+    extra[-4:] = np.nan
+    return np.vstack([X, extra])
+
+
+@pytest.fixture(scope="module")
+def data():
+    return _data()
+
+
+@pytest.mark.parametrize("objective", ["binary:logistic", "reg:squarederror"])
+def test_matches_inplace_predict(data, objective):
+    X, y_reg, y_clf = data
+    booster = _train(X, y_clf if objective == "binary:logistic" else y_reg, objective)
+    trees = TreeEnsemble.from_booster(booster)
+
+    # Both default directions occur, so both halves of the widened input are read
+    split = np.isfinite(trees.threshold)
+    assert trees.default_left[split].any() and not trees.default_left[split].all()
+
+    rows = _rows_with_missing(X)
+    expected = booster.inplace_predict(rows, missing=np.nan)
+    np.testing.assert_allclose(trees.predict(rows), expected, rtol=0, atol=1e-6)
+    # Small blocks split the (row, tree) pairs across several passes
+    np.testing.assert_allclose(trees.predict(rows, block_pairs=97), expected, rtol=0, atol=1e-6)
+
+
+def test_leaves_above_max_depth_are_padded(data):
+    X, y_reg, _ = data
+    # min_child_weight stops some branches early, so trees are ragged
+    booster = _train(X, y_reg, "reg:squarederror", max_depth=6, min_child_weight=50)
+    trees = TreeEnsemble.from_booster(booster)
+
+    # Leaves above the bottom level are copied into every slot beneath them
+    shallow = 0
+    model = json.loads(booster.save_raw(raw_format="json"))
+    for tree in model["learner"]["gradient_booster"]["model"]["trees"]:
+        left = tree["left_children"]
+        depths = _node_depths(left, tree["right_children"])
+        shallow += sum(1 for i, child in enumerate(left) if child == -1 and depths[i] < trees.depth)
+    assert shallow > 0
+
+    rows = _rows_with_missing(X)
+    np.testing.assert_allclose(
+        trees.predict(rows), booster.inplace_predict(rows, missing=np.nan), rtol=0, atol=1e-6
+    )
+
+
+def test_iteration_range(data):
+    X, _, y_clf = data
+    booster = _train(X, y_clf, "binary:logistic")
+    trees = TreeEnsemble.from_booster(booster, iteration_range=(0, 10))
+
+    assert trees.n_trees == 10
+    np.testing.assert_allclose(
+        trees.predict(X), booster.inplace_predict(X, iteration_range=(0, 10), missing=np.nan),
+        rtol=0, atol=1e-6,
+    )
+
+
+def test_save_load_roundtrip(data, tmp_path):
+    X, y_reg, _ = data
+    trees = TreeEnsemble.from_booster(_train(X, y_reg, "reg:squarederror"))
+    path = trees.save(str(tmp_path / "regression_trees.npz"), source_sha256="abc")
+
+    loaded, meta = TreeEnsemble.load(path)
+    assert meta["source_sha256"] == "abc"
+    np.testing.assert_array_equal(loaded.predict(X), trees.predict(X))
+
+
+def test_categorical_splits_raise():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({
+        "city": pd.Categorical(rng.choice(["a", "b", "c", "d"], size=500)),
+        "size": rng.normal(size=500),
+    })
+    y = (X["city"].isin(["a", "c"]) ^ (X["size"] > 0)).astype(float)
+    booster = xgb.train(
+        {"objective": "binary:logistic", "tree_method": "hist", "max_cat_to_onehot": 1},
+        xgb.DMatrix(X, label=y, enable_categorical=True),
+        num_boost_round=5,
+    )
+
+    with pytest.raises(ValueError, match="Categorical splits"):
+        TreeEnsemble.from_booster(booster)
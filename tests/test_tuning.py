@@ -0,0 +1,140 @@
+"""
+Hyperparameter search (src/models/tuning.py): successive halving promotes
+exactly the best 1/eta of each rung on their latest score, continues their
+boosters instead of restarting, and never re-runs an early-stopped trial.
+"""
+import os
+import sys
+from concurrent.futures import Future
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from src.data.synthetic import make_listings  # noqa: E402
+from src.models import tuning  # noqa: E402
+
+BUDGETS = [2, 6, 18]
+ETA = 3
+
+
+class InlinePool:
+    """Runs submitted calls immediately; stands in for the process pool."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+@pytest.fixture
+def scripted(monkeypatch):
+    """
+    Replace the trial runner: a config's score at a budget is
+    ``config["scores"][budget]`` and it converges when the budget is listed
+    in ``config["converges_at"]``. Every call is recorded.
+    """
+    calls = []
+
+    def run_trial(task, config, target_rounds, early_stopping, booster_raw):
+        calls.append((config["name"], target_rounds, booster_raw))
+        done = int(booster_raw.split(b"@")[1]) if booster_raw else 0
+        converged = target_rounds in config.get("converges_at", ())
+        return {
+            "score": config["scores"][target_rounds],
+            "best_iteration": target_rounds - 1,
+            "rounds": target_rounds,
+            "rounds_trained": target_rounds - done,
+            "converged": converged,
+            "seconds": 0.0,
+            "booster": f"{config['name']}@{target_rounds}".encode(),
+        }
+
+    monkeypatch.setattr(tuning, "_run_trial", run_trial)
+    return calls
+
+
+def _configs(rng, n):
+    """Scores improve every rung (no clamping) but re-rank at random."""
+    offsets = np.arange(len(BUDGETS))[::-1]
+    return [
+        {"name": f"c{i}", "scores": dict(zip(BUDGETS, (rng.random(len(BUDGETS)) + offsets).tolist()))}
+        for i in range(n)
+    ]
+
+
+def _run(configs):
+    return tuning.successive_halving(InlinePool(), "regression", configs, BUDGETS, ETA, 5, first_trial_id=10)
+
+
+def test_best_third_of_each_rung_survives(scripted):
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        configs = _configs(rng, 9)
+        trials = _run(configs)
+        assert [t["trial_id"] for t in trials] == list(range(10, 19))
+
+        alive = trials
+        for rung, budget in enumerate(BUDGETS):
+            assert all(t["rungs"][rung]["budget"] == budget for t in alive)
+            ran = {t["config"]["name"] for t in trials if len(t["rungs"]) > rung}
+            assert ran == {t["config"]["name"] for t in alive}
+            # Promotion ranks on this rung's score, not the first one
+            alive = sorted(alive, key=lambda t: t["rungs"][rung]["score"])[:max(1, len(alive) // ETA)]
+        assert [len(t["rungs"]) for t in trials].count(len(BUDGETS)) == 1
+
+
+def test_promoted_trials_continue_their_booster(scripted):
+    trials = _run(_configs(np.random.default_rng(1), 9))
+    previous = {}
+    for name, budget, booster in scripted:
+        assert booster == previous.get(name)
+        previous[name] = f"{name}@{budget}".encode()
+    for trial in trials:
+        assert sum(r["rounds_trained"] for r in trial["rungs"]) == trial["rungs"][-1]["budget"]
+
+
+def test_converged_trials_keep_their_score(scripted):
+    configs = [
+        {"name": "early", "scores": {2: 0.1, 6: 0.05, 18: 0.01}, "converges_at": (6,)},
+        {"name": "worse", "scores": {2: 0.2, 6: 0.3, 18: 0.4}},
+        {"name": "late", "scores": {2: 0.3, 6: 0.5, 18: 0.5}},
+    ]
+    early = _run(configs)[0]
+    # Early-stopped at rung 1: promoted but never submitted again
+    assert [c[:2] for c in scripted if c[0] == "early"] == [("early", 2), ("early", 6)]
+    assert [r["score"] for r in early["rungs"]] == [0.1, 0.05]
+
+
+def test_more_rounds_never_lose_the_earlier_optimum(scripted):
+    configs = [
+        {"name": "overfits", "scores": {2: 0.1, 6: 0.3, 18: 0.2}},
+        {"name": "other", "scores": {2: 0.2, 6: 0.1, 18: 0.1}},
+    ]
+    trials = _run(configs)
+    assert [r["score"] for r in trials[0]["rungs"]] == [0.1, 0.1, 0.1]
+    assert [r["best_iteration"] for r in trials[0]["rungs"]] == [1, 1, 1]
+
+
+def test_hyperband_on_a_real_design_matrix(tmp_path):
+    csv_path = str(tmp_path / "listings.csv")
+    make_listings(600, seed=61).to_csv(csv_path, index=False)
+    matrix_path = tuning.design_matrix_path("regression", csv_path, str(tmp_path / "cache"))
+
+    report = tuning.hyperband(
+        "regression", n_trials=9, min_rounds=2, max_rounds=18, eta=ETA,
+        early_stopping=50, n_workers=1, matrix_path=matrix_path,
+    )
+    assert report["budgets"] == BUDGETS
+    assert sorted(len(t["rungs"]) for t in report["trials"]) == [1] * 6 + [2] * 2 + [3]
+    # Each rung keeps the best, so the finalist is the best trial overall
+    finalist = max(report["trials"], key=lambda t: len(t["rungs"]))
+    assert report["best"]["trial_id"] == finalist["trial_id"]
+    assert [r["rounds"] for r in finalist["rungs"]] == BUDGETS
+    assert [r["rounds_trained"] for r in finalist["rungs"]] == [2, 4, 12]
+    # 9x2 + 3x4 + 1x12 rounds instead of 9x18
+    assert report["compute"]["boosting_rounds"] == 42
+    assert report["compute"]["exhaustive_rounds"] == 162